@@ -6,18 +6,48 @@ security, and reliability.
 
 __version__ = "1.3.3"
 
-from .core import (
-    TzstArchive,
-    create_archive,
-    extract_archive,
-    list_archive,
-    test_archive,
-)
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .core import (
+        ContextPool,
+        TzstArchive,
+        convert,
+        convert_many,
+        create_archive,
+        create_archive_from_iter,
+        extract_archive,
+        list_archive,
+        merge_archives,
+        recompress,
+        test_archive,
+    )
 
 __all__ = [
+    "ContextPool",
     "TzstArchive",
+    "convert",
+    "convert_many",
     "create_archive",
+    "create_archive_from_iter",
     "extract_archive",
     "list_archive",
+    "merge_archives",
+    "recompress",
     "test_archive",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import :mod:`tzst.core` on first use of the API, not on ``import tzst``.
+
+    Loading zstandard, tarfile and tempfile is most of the start-up time of
+    a short ``tzst`` command, and ``tzst --version`` does not need them.
+    """
+    if name in __all__:
+        from . import core
+
+        value = getattr(core, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,715 @@
+"""Asynchronous interface for tzst archives.
+
+The :class:`TzstArchive` class and convenience functions in this module mirror
+the synchronous API in :mod:`tzst.core` without blocking the event loop. All
+zstd (de)compression and file I/O runs in an executor one member or one chunk
+at a time, so other tasks keep running, readers only pull as much data as they
+consume, and cancellation takes effect at the next chunk boundary.
+
+Example:
+    >>> import asyncio
+    >>> from tzst import aio
+    >>> async def main():
+    ...     await aio.create_archive("backup.tzst", ["docs/"])
+    ...     async with aio.TzstArchive("backup.tzst") as archive:
+    ...         async for member in archive:
+    ...             print(member.name)
+    >>> asyncio.run(main())
+"""
+
+import asyncio
+import functools
+import os
+import re
+import sys
+import tarfile
+import tempfile
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from . import core
+from .core import (
+    ConflictResolution,
+    ConflictResolutionState,
+    Durability,
+    _collect_archive_entries,
+    _commit_file,
+    _DestinationCache,
+    _durability,
+    _ExtractionSync,
+    _fsync_path,
+    _handle_file_conflict,
+    _MemberMatcher,
+    _normalize_archive_path,
+    _prepare_target,
+    _write_member_data,
+)
+from .exceptions import TzstArchiveError
+
+#: Number of bytes moved per executor call when reading or writing member data.
+CHUNK_SIZE = 1024 * 1024
+
+_EXTRACTION_FILTERS: dict[str, Callable] = {
+    "data": tarfile.data_filter,
+    "tar": tarfile.tar_filter,
+    "fully_trusted": tarfile.fully_trusted_filter,
+}
+
+
+class _Cancelled(Exception):
+    """Raised inside a worker thread once the awaiting task was cancelled."""
+
+
+class _CancellableReader:
+    """File wrapper that aborts the next read once *event* is set."""
+
+    def __init__(self, fileobj: BinaryIO, event: threading.Event):
+        self._fileobj = fileobj
+        self._event = event
+
+    def read(self, size: int = -1) -> bytes:
+        if self._event.is_set():
+            raise _Cancelled
+        return self._fileobj.read(size)
+
+
+async def _run(
+    executor: Executor | None,
+    call: Callable[[], Any],
+    cancel_event: threading.Event | None = None,
+) -> Any:
+    """Run *call* in *executor* and wait for it even if the caller is cancelled.
+
+    A worker thread cannot be interrupted, so on cancellation *cancel_event* is
+    set to ask cooperative code to stop and the current call is allowed to
+    return before ``CancelledError`` propagates. Callers therefore never leave
+    a thread touching an archive or temp file they have already released.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, call)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if cancel_event is not None:
+            cancel_event.set()
+        await asyncio.wait([future])
+        if not future.cancelled():
+            future.exception()  # Mark as retrieved; cancellation wins
+        raise
+    except _Cancelled:
+        raise asyncio.CancelledError from None
+
+
+def _resolve_filter(filter: str | Callable | None) -> Callable:
+    """Return the tarfile extraction filter function for *filter*."""
+    if callable(filter):
+        return filter
+    if filter is None:
+        # Match tarfile's default: fully trusted before 3.14, data afterwards
+        if sys.version_info >= (3, 14):
+            return tarfile.data_filter
+        return tarfile.fully_trusted_filter
+    try:
+        return _EXTRACTION_FILTERS[filter]
+    except KeyError:
+        raise ValueError(f"Invalid extraction filter: {filter!r}") from None
+
+
+def _filtered_target(
+    filter: str | Callable | None,
+    member: tarfile.TarInfo,
+    dest: Path,
+    flatten: bool,
+) -> Path | None:
+    """Return where *member* is extracted to, or None if *filter* skips it.
+
+    The path is built from the name the filter leaves (e.g. without a
+    leading ``/``), never from the raw name. Members the filter rejects raise
+    :class:`tarfile.FilterError` as in :meth:`tarfile.TarFile.extractall`,
+    and so do paths that still resolve outside *dest*.
+    """
+    filtered = _resolve_filter(filter)(member, str(dest))
+    if filtered is None:
+        return None
+    name = Path(filtered.name).name if flatten else filtered.name
+    target = dest / name
+    if not target.resolve().is_relative_to(dest.resolve()):
+        raise tarfile.OutsideDestinationError(filtered, str(target))
+    return target
+
+
+def _add_path(
+    tf: tarfile.TarFile,
+    name: str,
+    arcname: str,
+    recursive: bool,
+    cancel_event: threading.Event,
+) -> None:
+    """Mirror :meth:`tarfile.TarFile.add` with cancellable reads of file data."""
+    tarinfo = tf.gettarinfo(name, arcname)
+    if tarinfo is None:
+        # Unsupported type such as a socket, skipped just like tarfile does
+        return
+
+    if tarinfo.isreg():
+        with open(name, "rb") as f:
+            tf.addfile(tarinfo, _CancellableReader(f, cancel_event))
+    else:
+        tf.addfile(tarinfo)
+        if tarinfo.isdir() and recursive:
+            for entry in sorted(os.listdir(name)):
+                _add_path(
+                    tf,
+                    os.path.join(name, entry),
+                    os.path.join(arcname, entry),
+                    recursive,
+                    cancel_event,
+                )
+
+
+def _copy_chunk(src: BinaryIO, dst: BinaryIO, size: int) -> int:
+    """Copy up to *size* bytes from *src* to *dst* and return the count."""
+    chunk = src.read(size)
+    if chunk:
+        dst.write(chunk)
+    return len(chunk)
+
+
+def _apply_attributes(
+    tf: tarfile.TarFile, member: tarfile.TarInfo, target: str
+) -> None:
+    """Apply ownership, permissions and mtime the way tarfile.extract does."""
+    tf.chown(member, target, False)
+    tf.chmod(member, target)
+    tf.utime(member, target)
+
+
+class AsyncMemberReader:
+    """Asynchronous file-like object for a single archive member."""
+
+    def __init__(self, archive: "TzstArchive", fileobj: BinaryIO):
+        self._archive = archive
+        self._fileobj = fileobj
+
+    async def read(self, size: int = -1) -> bytes:
+        """Read up to *size* bytes (all remaining data if negative)."""
+        return await self._archive._call(functools.partial(self._fileobj.read, size))
+
+    async def copy_to(self, dst: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+        """Copy the remaining member data into *dst* chunk by chunk.
+
+        Returns:
+            Number of bytes copied
+        """
+        total = 0
+        while True:
+            copied = await self._archive._call(
+                functools.partial(_copy_chunk, self._fileobj, dst, chunk_size)
+            )
+            if not copied:
+                return total
+            total += copied
+
+    def close(self) -> None:
+        """Close the underlying member reader."""
+        self._fileobj.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TzstArchive:
+    """Asynchronous counterpart of :class:`tzst.core.TzstArchive`.
+
+    Calls on one archive are serialized because :mod:`tarfile` is not thread
+    safe; use separate archive objects to work on several archives at once.
+    """
+
+    def __init__(
+        self,
+        filename: str | Path | None = None,
+        mode: str = "r",
+        compression_level: int = 3,
+        streaming: bool = False,
+        fileobj: BinaryIO | None = None,
+        *,
+        executor: Executor | None = None,
+    ):
+        """
+        Initialize an asynchronous TzstArchive.
+
+        Args:
+            filename: Path to the archive file
+            mode: Open mode ('r', 'w')
+            compression_level: Zstandard compression level (1-22)
+            streaming: If True, use streaming mode for reading
+            fileobj: Binary file object to use instead of ``filename``
+            executor: Executor used for blocking work (default: the loop's
+                      default executor)
+        """
+        self._archive = core.TzstArchive(
+            filename, mode, compression_level, streaming, fileobj
+        )
+        self._executor = executor
+        self._lock = asyncio.Lock()
+        self._cancel_event = threading.Event()
+
+    @property
+    def filename(self) -> Path | None:
+        return self._archive.filename
+
+    @property
+    def mode(self) -> str:
+        return self._archive.mode
+
+    @property
+    def streaming(self) -> bool:
+        return self._archive.streaming
+
+    async def _call(self, call: Callable[[], Any]) -> Any:
+        async with self._lock:
+            return await _run(self._executor, call, self._cancel_event)
+
+    def _require_tarfile(self, mode: str) -> tarfile.TarFile:
+        tf = self._archive._tarfile
+        if not tf:
+            raise RuntimeError("Archive not open")
+        if not self.mode.startswith(mode):
+            action = "reading" if mode == "r" else "writing"
+            raise RuntimeError(f"Archive not open for {action}")
+        return tf
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self.close()
+        except Exception:
+            # Suppress exceptions during cleanup to avoid masking original exceptions
+            pass
+
+    async def open(self) -> None:
+        """Open the archive."""
+        await self._call(self._archive.open)
+
+    async def close(self) -> None:
+        """Close the archive."""
+        await self._call(self._archive.close)
+
+    async def add(
+        self,
+        name: str | Path,
+        arcname: str | None = None,
+        recursive: bool = True,
+    ) -> None:
+        """
+        Add a file or directory to the archive.
+
+        File data is read in chunks that stop as soon as the calling task is
+        cancelled. A cancelled write leaves a truncated tar stream behind, so
+        the archive refuses further additions afterwards.
+        """
+        tf = self._require_tarfile("w")
+        if self._cancel_event.is_set():
+            raise TzstArchiveError("Archive write was cancelled")
+
+        path = Path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {name}")
+
+        try:
+            await self._call(
+                functools.partial(
+                    _add_path,
+                    tf,
+                    str(path),
+                    arcname if arcname is not None else str(path),
+                    recursive,
+                    self._cancel_event,
+                )
+            )
+        except PermissionError as e:
+            raise TzstArchiveError(f"Failed to add {name}: {e}") from e
+
+    async def __aiter__(self) -> AsyncIterator[tarfile.TarInfo]:
+        """Yield archive members one at a time, reading headers lazily."""
+        tf = self._require_tarfile("r")
+        # Same walk as tarfile.TarFile.__iter__, with each header read off-loop
+        index = 0
+        if not tf._loaded and tf.firstmember is not None:
+            member = await self._call(tf.next)
+            index += 1
+            yield member
+        while True:
+            if index < len(tf.members):
+                member = tf.members[index]
+            elif tf._loaded:
+                return
+            else:
+                member = await self._call(tf.next)
+                if member is None:
+                    tf._loaded = True
+                    return
+            index += 1
+            yield member
+
+    async def getmembers(self) -> list[tarfile.TarInfo]:
+        """Get list of all members in the archive."""
+        return await self._call(self._require_tarfile("r").getmembers)
+
+    async def getnames(self) -> list[str]:
+        """Get list of all member names in the archive."""
+        return await self._call(self._require_tarfile("r").getnames)
+
+    async def list(self, verbose: bool = False) -> list[dict]:
+        """List contents of the archive (see :meth:`tzst.core.TzstArchive.list`)."""
+        self._require_tarfile("r")
+        return await self._call(functools.partial(self._archive.list, verbose))
+
+    async def extractfile(
+        self, member: str | tarfile.TarInfo
+    ) -> AsyncMemberReader | None:
+        """Return an asynchronous reader for *member*, or None if not a file."""
+        tf = self._require_tarfile("r")
+        fileobj = await self._call(functools.partial(tf.extractfile, member))
+        if fileobj is None:
+            return None
+        return AsyncMemberReader(self, fileobj)
+
+    async def extract_member(
+        self,
+        member: tarfile.TarInfo,
+        path: str | Path = ".",
+        filter: str | Callable | None = "data",
+        target_path: Path | None = None,
+    ) -> Path | None:
+        """
+        Extract a single member, copying file data in chunks.
+
+        Args:
+            member: Member to extract
+            path: Destination directory used for filtering and default placement
+            filter: Extraction filter, as for :meth:`tzst.core.TzstArchive.extract`
+            target_path: Explicit output path for regular files (e.g. a renamed
+                         or flattened location)
+
+        Returns:
+            The path written to, or None if the filter rejected the member
+        """
+        tf = self._require_tarfile("r")
+        dest = Path(path)
+        filtered = await self._call(
+            functools.partial(_resolve_filter(filter), member, str(dest))
+        )
+        if filtered is None:
+            return None
+
+        if not filtered.isreg():
+            await self._call(
+                functools.partial(tf.extract, member, str(dest), filter=filter)
+            )
+            return dest / filtered.name
+
+        target = target_path if target_path is not None else dest / filtered.name
+        await self._call(
+            functools.partial(target.parent.mkdir, parents=True, exist_ok=True)
+        )
+        dst = await self._call(functools.partial(open, target, "wb"))
+        try:
+            if member.sparse is not None:
+                # Holes are skipped with seeks rather than written as zeros
+                await self._call(functools.partial(_write_member_data, tf, member, dst))
+            else:
+                await self._call(functools.partial(_prepare_target, tf, member, dst))
+                reader = await self.extractfile(member)
+                await reader.copy_to(dst)
+        finally:
+            await self._call(dst.close)
+        await self._call(
+            functools.partial(_apply_attributes, tf, filtered, str(target))
+        )
+        return target
+
+    async def extractall(
+        self,
+        path: str | Path = ".",
+        *,
+        filter: str | Callable | None = "data",
+    ) -> None:
+        """Extract all members, one member and one chunk at a time."""
+        self._require_tarfile("r")
+        async for member in self:
+            await self.extract_member(member, path, filter=filter)
+
+    async def test(self) -> bool:
+        """
+        Test the integrity of the archive by decompressing every member.
+
+        Unlike the synchronous version this also reads file data in streaming
+        mode, because members are visited in archive order.
+        """
+        self._require_tarfile("r")
+        try:
+            async for member in self:
+                if member.isfile():
+                    reader = await self.extractfile(member)
+                    if reader:
+                        while await reader.read(CHUNK_SIZE):
+                            pass
+            return True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return False
+
+
+# Convenience functions
+
+
+async def create_archive(
+    archive_path: str | Path,
+    files: Sequence[str | Path],
+    compression_level: int = 3,
+    use_temp_file: bool = True,
+    *,
+    durability: Durability | str = Durability.BATCH,
+    executor: Executor | None = None,
+) -> None:
+    """
+    Create a new .tzst archive without blocking the event loop.
+
+    Args:
+        archive_path: Path for the new archive
+        files: List of files/directories to add
+        compression_level: Zstandard compression level (1-22)
+        use_temp_file: If True, create archive in temporary file first, then move
+                      to final location for atomic operation
+        durability: How to flush the finished archive; see
+                    :func:`tzst.create_archive`
+        executor: Executor used for blocking work
+
+    Note:
+        If the task is cancelled during an atomic create, the temporary file
+        is removed before ``CancelledError`` propagates and the target path is
+        left untouched.
+
+    See Also:
+        :func:`tzst.create_archive`: Synchronous version
+    """
+    if not 1 <= compression_level <= 22:
+        raise ValueError(
+            f"Invalid compression level '{compression_level}'. Must be between 1 and 22."
+        )
+
+    durability = _durability(durability)
+    archive_path = _normalize_archive_path(archive_path)
+    entries = await _run(
+        executor, functools.partial(_collect_archive_entries, archive_path, files)
+    )
+
+    async def write(path: Path) -> None:
+        async with TzstArchive(
+            path, "w", compression_level, executor=executor
+        ) as archive:
+            for source_path, arcname in entries:
+                await archive.add(source_path, arcname=arcname)
+
+    if not use_temp_file:
+        await write(archive_path)
+        if durability is not Durability.NONE:
+            await _run(executor, functools.partial(_fsync_path, archive_path))
+            await _run(executor, functools.partial(_fsync_path, archive_path.parent))
+        return
+
+    temp_fd, temp_path_str = await _run(
+        executor,
+        functools.partial(
+            tempfile.mkstemp,
+            suffix=".tmp",
+            prefix=f".{archive_path.name}.",
+            dir=archive_path.parent,
+        ),
+    )
+    os.close(temp_fd)
+    temp_path = Path(temp_path_str)
+    try:
+        await write(temp_path)
+        await _run(
+            executor,
+            functools.partial(_commit_file, temp_path, archive_path, durability),
+        )
+    except BaseException:
+        # Also runs on CancelledError so no partial temp file is left behind
+        try:
+            temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        raise
+
+
+async def extract_archive(
+    archive_path: str | Path,
+    extract_path: str | Path = ".",
+    members: list[str] | None = None,
+    flatten: bool = False,
+    streaming: bool = False,
+    filter: str | Callable | None = "data",
+    conflict_resolution: ConflictResolution | str = ConflictResolution.REPLACE,
+    interactive_callback: Callable[[Path], ConflictResolution] | None = None,
+    include: Iterable[str | re.Pattern[str]] | None = None,
+    exclude: Iterable[str | re.Pattern[str]] | None = None,
+    *,
+    durability: Durability | str = Durability.NONE,
+    executor: Executor | None = None,
+) -> None:
+    """
+    Extract files from a .tzst archive without blocking the event loop.
+
+    Arguments match :func:`tzst.extract_archive`. Members are extracted in
+    archive order in a single pass, so ``streaming=True`` also works together
+    with ``members`` and ``flatten``. *interactive_callback* is invoked from
+    the executor, so it may block (e.g. prompt the user).
+
+    See Also:
+        :func:`tzst.extract_archive`: Synchronous version
+    """
+    if isinstance(conflict_resolution, str):
+        try:
+            conflict_resolution = ConflictResolution(conflict_resolution)
+        except ValueError:
+            conflict_resolution = ConflictResolution.REPLACE
+
+    state = ConflictResolutionState(conflict_resolution)
+    matcher = _MemberMatcher(members, include, exclude)
+    extract_dir = Path(extract_path)
+    sync = _ExtractionSync(_durability(durability), extract_dir)
+    destination = _DestinationCache()
+
+    async with TzstArchive(
+        archive_path, "r", streaming=streaming, executor=executor
+    ) as archive:
+        await _run(
+            executor, functools.partial(extract_dir.mkdir, parents=True, exist_ok=True)
+        )
+        if not archive.streaming:
+            matcher.count_copies(await archive.getmembers())
+        async for member in archive:
+            if not state.should_continue():
+                break
+            if not matcher(member.name):
+                if matcher.exhausted:
+                    break
+                continue
+            if flatten and not member.isfile():
+                continue
+
+            target_path = await _run(
+                executor,
+                functools.partial(
+                    _filtered_target, filter, member, extract_dir, flatten
+                ),
+            )
+            if target_path is None:
+                continue
+
+            if member.isfile() and await _run(
+                executor, functools.partial(destination.exists, target_path)
+            ):
+                current_resolution = state.global_resolution or conflict_resolution
+                actual_resolution, final_path = await _run(
+                    executor,
+                    functools.partial(
+                        _handle_file_conflict,
+                        target_path,
+                        current_resolution,
+                        interactive_callback,
+                        destination,
+                    ),
+                )
+                state.update_resolution(actual_resolution)
+
+                if actual_resolution in (
+                    ConflictResolution.SKIP,
+                    ConflictResolution.SKIP_ALL,
+                ):
+                    continue
+                elif actual_resolution == ConflictResolution.EXIT:
+                    break
+                renamed = target_path != final_path
+                target_path = final_path
+            else:
+                renamed = False
+
+            written = None
+            try:
+                written = await archive.extract_member(
+                    member,
+                    extract_dir,
+                    filter=filter,
+                    target_path=target_path if member.isfile() else None,
+                )
+            finally:
+                # Failed or cancelled: drop the auto-rename placeholder
+                if renamed and written is None:
+                    destination.discard(target_path)
+            if written is not None:
+                destination.added(written)
+                if member.isreg():
+                    await _run(executor, functools.partial(sync.written, written))
+            if matcher.exhausted:
+                # Nothing else was requested; skip the rest of the archive
+                break
+        await _run(executor, sync.finish)
+
+
+async def list_archive(
+    archive_path: str | Path,
+    verbose: bool = False,
+    streaming: bool = False,
+    *,
+    executor: Executor | None = None,
+) -> list[dict]:
+    """
+    List contents of a .tzst archive without blocking the event loop.
+
+    See Also:
+        :func:`tzst.list_archive`: Synchronous version
+    """
+    async with TzstArchive(
+        archive_path, "r", streaming=streaming, executor=executor
+    ) as archive:
+        return await archive.list(verbose=verbose)
+
+
+async def test_archive(
+    archive_path: str | Path,
+    streaming: bool = False,
+    *,
+    executor: Executor | None = None,
+) -> bool:
+    """
+    Test the integrity of a .tzst archive without blocking the event loop.
+
+    Returns:
+        True if archive is valid, False otherwise
+
+    See Also:
+        :func:`tzst.test_archive`: Synchronous version
+    """
+    try:
+        async with TzstArchive(
+            archive_path, "r", streaming=streaming, executor=executor
+        ) as archive:
+            return await archive.test()
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        return False
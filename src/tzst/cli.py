@@ -1,20 +1,102 @@
-"""Command-line interface for tzst."""
+"""Command-line interface for tzst.
+
+:mod:`tzst.core`, and with it zstandard, tarfile and tempfile, is imported
+by the first command that needs it rather than on ``import tzst.cli``, so
+``tzst --version`` and argument errors return without loading them.
+"""
+
+from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
+import re
 import sys
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal, cast
 
 from . import __version__
-from .core import (
-    ConflictResolution,
-    create_archive,
-    extract_archive,
-    list_archive,
-    test_archive,
+from .exceptions import (
+    TzstArchiveError,
+    TzstDecompressionError,
+    TzstMemoryLimitError,
+)
+
+if TYPE_CHECKING:
+    from .core import (
+        ConflictResolution,
+        ContextPool,
+        TzstArchive,
+        convert,
+        convert_many,
+        create_archive,
+        extract_archive,
+        list_archive,
+        merge_archives,
+        recompress,
+        test_archive,
+    )
+
+_CORE_NAMES = (
+    "ConflictResolution",
+    "ContextPool",
+    "TzstArchive",
+    "convert",
+    "convert_many",
+    "create_archive",
+    "extract_archive",
+    "list_archive",
+    "merge_archives",
+    "recompress",
+    "test_archive",
 )
-from .exceptions import TzstArchiveError, TzstDecompressionError
+
+
+_core_loaded = False
+
+
+def _load_core() -> None:
+    """Bind the :mod:`tzst.core` names the commands use into this module.
+
+    Only the first call binds them, so a name replaced later, e.g. by a
+    test, stays replaced. ``mock.patch`` reads a name through
+    :func:`__getattr__` before replacing it, which loads them all first.
+    """
+    global _core_loaded
+    if _core_loaded:
+        return
+    from . import core
+
+    for name in _CORE_NAMES:
+        globals()[name] = getattr(core, name)
+    _core_loaded = True
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve :mod:`tzst.core` names on first access from outside the module.
+
+    A name is missing again after ``mock.patch`` deletes the one it replaced;
+    it checks with :func:`hasattr`, which binds the original here.
+    """
+    if name in _CORE_NAMES:
+        from . import core
+
+        _load_core()
+        value = globals()[name] = getattr(core, name)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _with_core(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Import :mod:`tzst.core` before running a function that uses it."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        _load_core()
+        return func(*args, **kwargs)
+
+    return wrapper
 
 
 def _normalize_archive_path(archive_path: Path) -> Path:
@@ -42,6 +124,19 @@ def _normalize_archive_path(archive_path: Path) -> Path:
     return archive_path
 
 
+def _is_stdio(archive_arg: str) -> bool:
+    """Return True if the archive argument is ``-`` (stdin/stdout)."""
+    return archive_arg == "-"
+
+
+def _input_archive(archive_arg: str) -> Path | BinaryIO:
+    """Return the archive path, or the binary stdin stream for ``-``."""
+    if _is_stdio(archive_arg):
+        return sys.stdin.buffer
+    return Path(archive_arg)
+
+
+@_with_core
 def _interactive_conflict_callback(target_path: Path) -> ConflictResolution:
     """Interactive callback for handling file conflicts in CLI.
 
@@ -104,6 +199,8 @@ def _wants_json_output(args) -> bool:
 
 def _emit_json(payload: dict[str, Any], *, to_stderr: bool = False) -> None:
     """Emit a JSON payload to stdout or stderr."""
+    import json
+
     stream = sys.stderr if to_stderr else sys.stdout
     print(json.dumps(payload, ensure_ascii=True), file=stream)
 
@@ -157,6 +254,38 @@ def _should_print_banner(argv: list[str] | None) -> bool:
     return "--json" not in cli_args and "--no-banner" not in cli_args
 
 
+def _streams_archive(args) -> bool:
+    """Return True if the archive passes through stdin or stdout.
+
+    Only the archive positionals count; a member named ``-`` does not.
+    """
+    return any(
+        isinstance(value, str) and _is_stdio(value)
+        for value in (
+            getattr(args, "archive", None),
+            getattr(args, "source", None),
+            getattr(args, "target", None),
+        )
+    )
+
+
+def _conflict_resolution_arg(args) -> str:
+    """Return the conflict resolution requested on the command line.
+
+    Without ``--conflict-resolution`` extraction asks about each conflict,
+    unless the archive is read from stdin, where a prompt would read its
+    answer from the archive stream; those extractions replace, like tar.
+    """
+    if getattr(args, "interactive", False):
+        return "ask"
+    conflict_resolution = getattr(args, "conflict_resolution", None)
+    if conflict_resolution is None:
+        archive = getattr(args, "archive", None)
+        stdin = isinstance(archive, str) and _is_stdio(archive)
+        return "replace" if stdin else "ask"
+    return conflict_resolution
+
+
 def format_size(size: int) -> str:
     """Format file size in human-readable format.
 
@@ -211,6 +340,110 @@ def validate_compression_level(value: str) -> int:
         ) from None
 
 
+def _parse_size(value: str, what: str, example: str) -> int:
+    """Parse a size in bytes with an optional binary suffix."""
+    match = re.fullmatch(r"(\d+)(?:([KMGT])(?:i?B)?)?", value.strip(), re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(
+            f"Invalid {what}: '{value}'. Use a number of bytes with an "
+            f"optional K, M, G or T suffix, e.g. {example}."
+        )
+    number, unit = match.groups()
+    return int(number) * 1024 ** (" KMGT".index(unit.upper()) if unit else 0)
+
+
+def validate_volume_size(value: str) -> int:
+    """Parse a volume size such as ``5G``, ``100M`` or ``65536``.
+
+    Args:
+        value: String value from command line; ``K``, ``M``, ``G`` and ``T``
+            suffixes (optionally followed by ``B`` or ``iB``) are powers of 1024
+
+    Returns:
+        int: Size in bytes
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a size
+    """
+    return _parse_size(value, "volume size", "5G")
+
+
+def validate_memory_limit(value: str) -> int:
+    """Parse a memory limit such as ``256M`` or ``1G``.
+
+    Args:
+        value: String value from command line, with the suffixes of
+            :func:`validate_volume_size`
+
+    Returns:
+        int: Limit in bytes
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a size or is below 16 MiB
+    """
+    limit = _parse_size(value, "memory limit", "256M")
+    if limit < 16 * 1024 * 1024:
+        raise argparse.ArgumentTypeError(
+            f"Invalid memory limit: '{value}'. Must be at least 16M."
+        )
+    return limit
+
+
+def _volume_names(archive_path: Path) -> list[str]:
+    """Return the volume files written for a split archive, in order."""
+    names = []
+    while (path := Path(f"{archive_path}.{len(names) + 1:03d}")).is_file():
+        names.append(str(path))
+    return names
+
+
+def validate_regex(value: str) -> re.Pattern[str]:
+    """Compile a member-selection regular expression.
+
+    Args:
+        value: String value from command line
+
+    Returns:
+        re.Pattern: The compiled expression
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a valid regular expression
+    """
+    try:
+        return re.compile(value)
+    except re.error as e:
+        raise argparse.ArgumentTypeError(
+            f"Invalid regular expression: '{value}' ({e})"
+        ) from None
+
+
+def _member_patterns(
+    args,
+) -> tuple[list[str | re.Pattern[str]], list[str | re.Pattern[str]]]:
+    """Collect include/exclude globs and regular expressions from arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        tuple: (include, exclude) pattern lists, empty if none were given
+    """
+    include: list[str | re.Pattern[str]] = [
+        *(getattr(args, "include", None) or []),
+        *(getattr(args, "include_regex", None) or []),
+    ]
+    exclude: list[str | re.Pattern[str]] = [
+        *(getattr(args, "exclude", None) or []),
+        *(getattr(args, "exclude_regex", None) or []),
+    ]
+    return include, exclude
+
+
+def _pattern_strings(patterns: list[str | re.Pattern[str]]) -> list[str]:
+    """Return patterns as strings for JSON output."""
+    return [p.pattern if isinstance(p, re.Pattern) else p for p in patterns]
+
+
 def _process_file_paths(file_args: list[str]) -> list[Path]:
     """Process file arguments into resolved Path objects.
 
@@ -265,15 +498,37 @@ def _extract_add_params(args) -> tuple[int, bool]:
     return compression_level, use_temp_file
 
 
-def _prepare_archive_creation(args) -> tuple[Path, list[Path], int, bool] | int:
+def _read_exclude_files(paths: list[str]) -> list[str]:
+    """Read ``--exclude-from`` files, one ``.gitignore``-style pattern per line.
+
+    Args:
+        paths: Pattern files given on the command line
+
+    Returns:
+        list[str]: All lines, in order; comments and blank lines are kept and
+        ignored later by the matcher
+
+    Raises:
+        OSError: If a file cannot be read
+    """
+    patterns: list[str] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            patterns.extend(f.read().splitlines())
+    return patterns
+
+
+def _prepare_archive_creation(
+    args,
+) -> tuple[Path, list[Path], int, bool, list[str]] | int:
     """Prepare and validate inputs for archive creation.
 
     Args:
         args: Parsed command line arguments
 
     Returns:
-        tuple or int: Either (archive_path, files, compression_level, use_temp_file)
-                     or error code if validation fails
+        tuple or int: Either (archive_path, files, compression_level, use_temp_file,
+                     exclude) or error code if validation fails
     """
     archive_path = Path(args.archive)
     files = _process_file_paths(args.files)
@@ -288,16 +543,32 @@ def _prepare_archive_creation(args) -> tuple[Path, list[Path], int, bool] | int:
             details={"missing_files": [str(path) for path in missing_files]},
         )
 
+    exclude_from = getattr(args, "exclude_from", None) or []
+    try:
+        exclude = [
+            *(getattr(args, "exclude", None) or []),
+            *_read_exclude_files(exclude_from),
+        ]
+    except OSError as e:
+        return _emit_error(
+            args,
+            f"Error: Cannot read exclude file - {e}",
+            error_type="exclude_file_unreadable",
+            details={"exclude_from": exclude_from},
+        )
+
     compression_level, use_temp_file = _extract_add_params(args)
-    return archive_path, files, compression_level, use_temp_file
+    return archive_path, files, compression_level, use_temp_file, exclude
 
 
+@_with_core
 def _execute_archive_creation(
     args,
     archive_path: Path,
     files: list[Path],
     compression_level: int,
     use_temp_file: bool,
+    exclude: list[str] | None = None,
 ) -> int:
     """Execute the archive creation process.
 
@@ -306,21 +577,55 @@ def _execute_archive_creation(
         files: List of files to add to archive
         compression_level: Compression level to use
         use_temp_file: Whether to use atomic file operations
+        exclude: Exclude patterns from --exclude and --exclude-from
 
     Returns:
         int: Exit code (0 for success, non-zero for failure)
     """
-    # Normalize archive path to show the correct final filename
-    normalized_archive_path = _normalize_archive_path(archive_path)
+    to_stdout = _is_stdio(str(archive_path))
+    if to_stdout:
+        # The archive itself goes to stdout, so status output moves to stderr
+        normalized_archive_path = archive_path
+        use_temp_file = False
+        status_stream = sys.stderr
+    else:
+        # Normalize archive path to show the correct final filename
+        normalized_archive_path = _normalize_archive_path(archive_path)
+        status_stream = sys.stdout
+
+    exclude = exclude or []
+    include = getattr(args, "include", None) or []
+    respect_gitignore = getattr(args, "respect_gitignore", False)
+    sparse = not getattr(args, "no_sparse", False)
+    durability = getattr(args, "durability", "batch")
+    volume_size = getattr(args, "volume_size", None)
+    shards = getattr(args, "jobs", 1)
+    memory_limit = getattr(args, "memory_limit", None)
 
     if not _wants_json_output(args):
-        print(f"Creating archive: {normalized_archive_path}")
+        print(f"Creating archive: {normalized_archive_path}", file=status_stream)
         for file_path in files:
-            print(f"  Adding: {file_path}")
+            print(f"  Adding: {file_path}", file=status_stream)
+        if respect_gitignore:
+            print("Skipping paths ignored by .gitignore", file=status_stream)
 
     # Use atomic file operations by default for better reliability
     # This creates the archive in a temporary file first, then moves it
-    create_archive(archive_path, files, compression_level, use_temp_file=use_temp_file)
+    create_archive(
+        sys.stdout.buffer if to_stdout else archive_path,
+        files,
+        compression_level,
+        use_temp_file=use_temp_file,
+        exclude=exclude or None,
+        include=include or None,
+        respect_gitignore=respect_gitignore,
+        sparse=sparse,
+        durability=durability,
+        volume_size=volume_size,
+        shards=shards,
+        memory_limit=memory_limit,
+    )
+    volumes = _volume_names(normalized_archive_path) if volume_size else None
 
     if _wants_json_output(args):
         _emit_json(
@@ -332,10 +637,28 @@ def _execute_archive_creation(
                 "added": [str(file_path) for file_path in files],
                 "compression_level": compression_level,
                 "atomic": use_temp_file,
-            }
+                "exclude": exclude,
+                "include": include,
+                "respect_gitignore": respect_gitignore,
+                "sparse": sparse,
+                "durability": durability,
+                "volume_size": volume_size,
+                "volumes": volumes,
+                "shards": shards,
+                "memory_limit": memory_limit,
+            },
+            to_stderr=to_stdout,
+        )
+    elif volumes:
+        print(
+            f"Archive created successfully - {volumes[0]} ({len(volumes)} volumes)",
+            file=status_stream,
         )
     else:
-        print(f"Archive created successfully - {normalized_archive_path}")
+        print(
+            f"Archive created successfully - {normalized_archive_path}",
+            file=status_stream,
+        )
 
     return 0
 
@@ -361,6 +684,12 @@ def _handle_archive_creation_exceptions(command_args, func, *args, **kwargs) ->
             f"Error: Invalid parameter - {e}",
             error_type="invalid_parameter",
         )
+    except TzstMemoryLimitError as e:
+        return _emit_error(
+            command_args,
+            f"Error: Memory limit exceeded - {e}",
+            error_type="memory_limit_exceeded",
+        )
     except TzstArchiveError as e:
         return _emit_error(
             command_args,
@@ -384,6 +713,248 @@ def _handle_archive_creation_exceptions(command_args, func, *args, **kwargs) ->
         )
 
 
+_BATCH_ERRORS: tuple[tuple[type[BaseException], str, str], ...] = (
+    (FileNotFoundError, "file_not_found", "File not found"),
+    (TzstMemoryLimitError, "memory_limit_exceeded", "Memory limit exceeded"),
+    (TzstDecompressionError, "decompression_failed", "Archive decompression failed"),
+    (TzstArchiveError, "archive_operation_failed", "Archive operation failed"),
+)
+
+
+def _read_archive_list(list_path: str) -> list[str]:
+    """Read archive paths, one per line, from a file or ``-`` for stdin.
+
+    Blank lines and lines starting with ``#`` are skipped.
+    """
+    if _is_stdio(list_path):
+        lines = sys.stdin.read().splitlines()
+    else:
+        lines = Path(list_path).read_text(encoding="utf-8").splitlines()
+    return [
+        line.strip()
+        for line in lines
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+
+def _is_batch(args) -> bool:
+    """Return True when a command was given several archives or an archive list."""
+    return (
+        getattr(args, "archive", "") is None
+        or bool(getattr(args, "archives", None))
+        or getattr(args, "from_file", None) is not None
+    )
+
+
+def _archive_size(archive: str) -> int:
+    """Return the size of an archive file, or 0 if it cannot be read."""
+    try:
+        return Path(archive).stat().st_size
+    except OSError:
+        return 0
+
+
+@functools.cache
+def _batch_context_pool() -> ContextPool:
+    """Return the zstd context pool shared by the batch tasks of this process."""
+    return ContextPool(max_idle=os.cpu_count() or 1)
+
+
+@_with_core
+def _batch_task(command: str, archive: str, options: dict[str, Any]) -> dict[str, Any]:
+    """Run one command of a batch on one archive; runs in a worker.
+
+    Failures are returned in the result rather than raised, so one bad
+    archive does not stop the others. Tasks running in the same process
+    reuse each other's zstd contexts.
+    """
+    result: dict[str, Any] = {"ok": True, "command": command, "archive": archive}
+    try:
+        with _batch_context_pool().activate():
+            if not Path(archive).exists():
+                result.update(
+                    ok=False,
+                    error={
+                        "type": "archive_not_found",
+                        "message": f"Error: Archive not found - {archive}",
+                    },
+                )
+            elif command == "list":
+                contents = list_archive(Path(archive), **options)
+                result.update(contents=contents, summary=_summarize_listing(contents))
+            elif command == "test":
+                healthy = test_archive(Path(archive), **options)
+                result.update(ok=healthy, healthy=healthy)
+                if not healthy:
+                    result["error"] = {
+                        "type": "integrity_check_failed",
+                        "message": "Archive test failed - errors detected",
+                    }
+            else:
+                extract_archive(Path(archive), **options)
+    except Exception as e:
+        verb = command.split("-")[0]
+        error_type, reason = next(
+            (
+                (error_type, reason)
+                for error, error_type, reason in _BATCH_ERRORS
+                if isinstance(e, error)
+            ),
+            (f"{verb}_failed", f"Failed to {verb} archive"),
+        )
+        result.update(
+            ok=False, error={"type": error_type, "message": f"Error: {reason} - {e}"}
+        )
+    return result
+
+
+def _print_batch_result(args, result: dict[str, Any]) -> None:
+    """Print the result of one archive of a batch."""
+    if _wants_json_output(args):
+        # One line per archive, so callers can stream the results
+        _emit_json(result)
+        return
+
+    archive = result["archive"]
+    if not result["ok"]:
+        print(f"{archive}: {result['error']['message']}", file=sys.stderr)
+    elif result["command"] == "list":
+        print(f"Listing contents of: {archive}")
+        print()
+        if getattr(args, "verbose", False):
+            _print_verbose_listing(result["contents"])
+        else:
+            _print_simple_listing(result["contents"])
+        print()
+    elif result["command"] == "test":
+        print(f"{archive}: OK")
+    else:
+        print(f"{archive}: extracted")
+
+
+def _batch_options(args, command: str) -> dict[str, Any]:
+    """Build the keyword arguments a batch command passes for every archive."""
+    reading = {
+        "streaming": getattr(args, "streaming", False),
+        "memory_map": getattr(args, "mmap", False),
+        "memory_limit": getattr(args, "memory_limit", None),
+    }
+    if command == "list":
+        return {"verbose": getattr(args, "verbose", False), **reading}
+    if command == "test":
+        return reading
+
+    include, exclude = _member_patterns(args)
+    return {
+        "extract_path": Path(args.output) if args.output else Path.cwd(),
+        "members": getattr(args, "files", None) or None,
+        "flatten": command == "extract-flat",
+        **reading,
+        "filter": getattr(args, "filter", "data"),
+        "conflict_resolution": ConflictResolution(_conflict_resolution_arg(args)),
+        "include": include or None,
+        "exclude": exclude or None,
+        "preallocate": not getattr(args, "no_preallocate", False),
+        "durability": getattr(args, "durability", "none"),
+    }
+
+
+def _cmd_batch(args, command: str) -> int:
+    """Run a list, test or extract command over many archives.
+
+    Archives come from the command line and ``--from-file``. They are
+    started largest first, so a big archive does not hold up the end of the
+    run, in a pool of ``--jobs`` worker processes (or threads with
+    ``--pool thread``) that pay the interpreter and zstandard start-up cost
+    once. Each archive's result is printed as soon as it is ready, as one
+    JSON line in JSON mode.
+
+    Args:
+        args: Parsed command line arguments
+        command: "list", "test", "extract" or "extract-flat"
+
+    Returns:
+        int: 0 if every archive succeeded, 1 if any failed, 130 if interrupted
+    """
+    archives = [args.archive] if args.archive else []
+    archives += getattr(args, "archives", None) or []
+    from_file = getattr(args, "from_file", None)
+    try:
+        if from_file is not None:
+            archives += _read_archive_list(from_file)
+    except OSError as e:
+        return _emit_error(
+            args,
+            f"Error: Cannot read archive list - {e}",
+            error_type="file_not_found",
+        )
+    if not archives and from_file is None:
+        return _emit_error(
+            args, "Error: No archive given", error_type="invalid_parameter"
+        )
+    if "-" in archives:
+        return _emit_error(
+            args,
+            "Error: stdin cannot be read as one of several archives",
+            error_type="invalid_parameter",
+        )
+    if command.startswith("extract") and _conflict_resolution_arg(args) == "ask":
+        return _emit_error(
+            args,
+            "Error: Interactive conflict prompts are unavailable when extracting "
+            "several archives; pass --conflict-resolution",
+            error_type="interactive_conflict_not_supported",
+        )
+
+    from concurrent.futures import (
+        Executor,
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+        as_completed,
+    )
+
+    options = _batch_options(args, command)
+    archives.sort(key=_archive_size, reverse=True)
+    workers = min(max(getattr(args, "jobs", 1), 1), max(len(archives), 1))
+    failed = 0
+    try:
+        if workers == 1:
+            results = (_batch_task(command, archive, options) for archive in archives)
+            for result in results:
+                failed += not result["ok"]
+                _print_batch_result(args, result)
+        else:
+            pool_type: type[Executor] = (
+                ThreadPoolExecutor
+                if getattr(args, "pool", "process") == "thread"
+                else ProcessPoolExecutor
+            )
+            with pool_type(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_batch_task, command, archive, options)
+                    for archive in archives
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    failed += not result["ok"]
+                    _print_batch_result(args, result)
+    except KeyboardInterrupt:
+        return _emit_error(
+            args,
+            "Operation interrupted by user",
+            error_type="interrupted",
+            exit_code=130,
+        )
+
+    if not _wants_json_output(args):
+        print(
+            f"Processed {len(archives)} archives, {failed} failed",
+            file=sys.stderr if failed else sys.stdout,
+        )
+    return 1 if failed else 0
+
+
+@_with_core
 def cmd_add(args) -> int:
     """Command handler for creating/adding to archives.
 
@@ -397,6 +968,9 @@ def cmd_add(args) -> int:
             - files (list[str]): List of files/directories to add
             - compression_level (int, optional): Compression level 1-22
             - no_atomic (bool, optional): Disable atomic file operations
+            - volume_size (int, optional): Split the archive into volumes
+            - jobs (int, optional): Shards compressed in parallel processes
+            - memory_limit (int, optional): Bytes of memory compression may use
 
     Returns:
         int: Exit code (0 for success, non-zero for failure)
@@ -419,14 +993,12 @@ def cmd_add(args) -> int:
         if isinstance(preparation_result, int):
             return preparation_result
 
-        archive_path, files, compression_level, use_temp_file = preparation_result
-        return _execute_archive_creation(
-            args, archive_path, files, compression_level, use_temp_file
-        )
+        return _execute_archive_creation(args, *preparation_result)
 
     return _handle_archive_creation_exceptions(args, _create_archive_workflow)
 
 
+@_with_core
 def cmd_extract_full(args) -> int:
     """Command handler for extracting archives with full directory structure.
 
@@ -440,6 +1012,8 @@ def cmd_extract_full(args) -> int:
             - files (list[str], optional): Specific files to extract
             - streaming (bool, optional): Use streaming mode for large archives
             - filter (str, optional): Security filter ('data', 'tar', 'fully_trusted')
+            - from_file, jobs, pool (optional): Further archives to extract
+              in one run, see :func:`_cmd_batch`
 
     Returns:
         int: Exit code (0 for success, non-zero for failure)
@@ -456,9 +1030,11 @@ def cmd_extract_full(args) -> int:
         :meth:`TzstArchive.extract`: The core method for extracting from archives
         :func:`cmd_extract_flat`: For flat extraction without directory structure
     """
+    if _is_batch(args):
+        return _cmd_batch(args, "extract")
     try:
         archive_path = Path(args.archive)
-        if not archive_path.exists():
+        if not _is_stdio(args.archive) and not archive_path.exists():
             return _emit_error(
                 args,
                 f"Error: Archive not found - {archive_path}",
@@ -468,21 +1044,15 @@ def cmd_extract_full(args) -> int:
 
         output_dir = Path(args.output) if args.output else Path.cwd()
         members = args.files if hasattr(args, "files") and args.files else None
+        include, exclude = _member_patterns(args)
         streaming = getattr(args, "streaming", False)
+        durability = getattr(args, "durability", "none")
         filter_type = cast(
             Literal["data", "tar", "fully_trusted"], getattr(args, "filter", "data")
         )
 
-        # Handle conflict resolution parameters
-        conflict_resolution_str = getattr(args, "conflict_resolution", "ask")
-        interactive_flag = getattr(args, "interactive", False)
-
-        # If --interactive is specified, use "ask" regardless of --conflict-resolution
-        if interactive_flag:
-            conflict_resolution_str = "ask"
-
-        # Convert string to ConflictResolution enum
-        conflict_resolution = ConflictResolution(conflict_resolution_str)
+        # --interactive asks regardless of --conflict-resolution
+        conflict_resolution = ConflictResolution(_conflict_resolution_arg(args))
 
         if _wants_json_output(args) and conflict_resolution == ConflictResolution.ASK:
             return _emit_error(
@@ -491,6 +1061,14 @@ def cmd_extract_full(args) -> int:
                 error_type="interactive_conflict_not_supported",
             )
 
+        if _is_stdio(args.archive) and conflict_resolution == ConflictResolution.ASK:
+            return _emit_error(
+                args,
+                "Error: Interactive conflict prompts are unavailable when reading "
+                "the archive from stdin; pass a non-interactive --conflict-resolution",
+                error_type="interactive_conflict_not_supported",
+            )
+
         # Set up interactive callback if needed
         interactive_callback = None
         if conflict_resolution == ConflictResolution.ASK:
@@ -507,7 +1085,7 @@ def cmd_extract_full(args) -> int:
                 print(f"Conflict resolution: {conflict_resolution.value}")
 
         extract_archive(
-            archive_path,
+            _input_archive(args.archive),
             output_dir,
             members,
             flatten=False,
@@ -515,6 +1093,13 @@ def cmd_extract_full(args) -> int:
             filter=filter_type,
             conflict_resolution=conflict_resolution,
             interactive_callback=interactive_callback,
+            include=include or None,
+            exclude=exclude or None,
+            preallocate=not getattr(args, "no_preallocate", False),
+            durability=durability,
+            workers=getattr(args, "jobs", 1),
+            memory_map=getattr(args, "mmap", False),
+            memory_limit=getattr(args, "memory_limit", None),
         )
 
         if _wants_json_output(args):
@@ -525,10 +1110,13 @@ def cmd_extract_full(args) -> int:
                     "archive": str(archive_path),
                     "output_dir": str(output_dir),
                     "members": members or [],
+                    "include": _pattern_strings(include),
+                    "exclude": _pattern_strings(exclude),
                     "flatten": False,
                     "streaming": streaming,
                     "filter": filter_type,
                     "conflict_resolution": conflict_resolution.value,
+                    "durability": durability,
                 }
             )
         else:
@@ -541,6 +1129,12 @@ def cmd_extract_full(args) -> int:
             f"Error: File not found - {e}",
             error_type="file_not_found",
         )
+    except TzstMemoryLimitError as e:
+        return _emit_error(
+            args,
+            f"Error: Memory limit exceeded - {e}",
+            error_type="memory_limit_exceeded",
+        )
     except TzstDecompressionError as e:
         return _emit_error(
             args,
@@ -568,6 +1162,7 @@ def cmd_extract_full(args) -> int:
         )
 
 
+@_with_core
 def cmd_extract_flat(args) -> int:
     """Command handler for flat extraction without directory structure.
 
@@ -582,6 +1177,8 @@ def cmd_extract_flat(args) -> int:
             - files (list[str], optional): Specific files to extract
             - streaming (bool, optional): Use streaming mode for large archives
             - filter (str, optional): Security filter ('data', 'tar', 'fully_trusted')
+            - from_file, jobs, pool (optional): Further archives to extract
+              in one run, see :func:`_cmd_batch`
 
     Returns:
         int: Exit code (0 for success, non-zero for failure)
@@ -598,9 +1195,11 @@ def cmd_extract_flat(args) -> int:
         :meth:`TzstArchive.extract`: The core method for extracting from archives
         :func:`cmd_extract_full`: For extraction with directory structure
     """
+    if _is_batch(args):
+        return _cmd_batch(args, "extract-flat")
     try:
         archive_path = Path(args.archive)
-        if not archive_path.exists():
+        if not _is_stdio(args.archive) and not archive_path.exists():
             return _emit_error(
                 args,
                 f"Error: Archive not found - {archive_path}",
@@ -610,21 +1209,15 @@ def cmd_extract_flat(args) -> int:
 
         output_dir = Path(args.output) if args.output else Path.cwd()
         members = args.files if hasattr(args, "files") and args.files else None
+        include, exclude = _member_patterns(args)
         streaming = getattr(args, "streaming", False)
+        durability = getattr(args, "durability", "none")
         filter_type = cast(
             Literal["data", "tar", "fully_trusted"], getattr(args, "filter", "data")
         )
 
-        # Handle conflict resolution parameters
-        conflict_resolution_str = getattr(args, "conflict_resolution", "ask")
-        interactive_flag = getattr(args, "interactive", False)
-
-        # If --interactive is specified, use "ask" regardless of --conflict-resolution
-        if interactive_flag:
-            conflict_resolution_str = "ask"
-
-        # Convert string to ConflictResolution enum
-        conflict_resolution = ConflictResolution(conflict_resolution_str)
+        # --interactive asks regardless of --conflict-resolution
+        conflict_resolution = ConflictResolution(_conflict_resolution_arg(args))
 
         if _wants_json_output(args) and conflict_resolution == ConflictResolution.ASK:
             return _emit_error(
@@ -633,6 +1226,14 @@ def cmd_extract_flat(args) -> int:
                 error_type="interactive_conflict_not_supported",
             )
 
+        if _is_stdio(args.archive) and conflict_resolution == ConflictResolution.ASK:
+            return _emit_error(
+                args,
+                "Error: Interactive conflict prompts are unavailable when reading "
+                "the archive from stdin; pass a non-interactive --conflict-resolution",
+                error_type="interactive_conflict_not_supported",
+            )
+
         # Set up interactive callback if needed
         interactive_callback = None
         if conflict_resolution == ConflictResolution.ASK:
@@ -641,13 +1242,15 @@ def cmd_extract_flat(args) -> int:
         if not _wants_json_output(args):
             print(f"Extracting from: {archive_path}")
             print(f"Output directory: {output_dir}")
+            if streaming:
+                print("Using streaming mode (memory efficient)")
             if filter_type != "data":
                 print(f"Using security filter: {filter_type}")
             if conflict_resolution != ConflictResolution.REPLACE:
                 print(f"Conflict resolution: {conflict_resolution.value}")
 
         extract_archive(
-            archive_path,
+            _input_archive(args.archive),
             output_dir,
             members,
             flatten=True,
@@ -655,6 +1258,13 @@ def cmd_extract_flat(args) -> int:
             filter=filter_type,
             conflict_resolution=conflict_resolution,
             interactive_callback=interactive_callback,
+            include=include or None,
+            exclude=exclude or None,
+            preallocate=not getattr(args, "no_preallocate", False),
+            durability=durability,
+            workers=getattr(args, "jobs", 1),
+            memory_map=getattr(args, "mmap", False),
+            memory_limit=getattr(args, "memory_limit", None),
         )
 
         if _wants_json_output(args):
@@ -665,10 +1275,13 @@ def cmd_extract_flat(args) -> int:
                     "archive": str(archive_path),
                     "output_dir": str(output_dir),
                     "members": members or [],
+                    "include": _pattern_strings(include),
+                    "exclude": _pattern_strings(exclude),
                     "flatten": True,
                     "streaming": streaming,
                     "filter": filter_type,
                     "conflict_resolution": conflict_resolution.value,
+                    "durability": durability,
                 }
             )
         else:
@@ -681,6 +1294,12 @@ def cmd_extract_flat(args) -> int:
             f"Error: File not found - {e}",
             error_type="file_not_found",
         )
+    except TzstMemoryLimitError as e:
+        return _emit_error(
+            args,
+            f"Error: Memory limit exceeded - {e}",
+            error_type="memory_limit_exceeded",
+        )
     except TzstDecompressionError as e:
         return _emit_error(
             args,
@@ -734,6 +1353,7 @@ def _print_simple_listing(contents: list) -> None:
     print(total_msg)
 
 
+@_with_core
 def cmd_list(args) -> int:
     """Command handler for listing archive contents.
 
@@ -745,6 +1365,8 @@ def cmd_list(args) -> int:
             - archive (str): Path to the archive file to list
             - verbose (bool, optional): Show detailed file information
             - streaming (bool, optional): Use streaming mode for large archives
+            - archives, from_file, jobs, pool (optional): Further archives to
+              list in one run, see :func:`_cmd_batch`
 
     Returns:
         int: Exit code (0 for success, non-zero for failure)
@@ -760,9 +1382,11 @@ def cmd_list(args) -> int:
         :func:`tzst.list_archive`: The underlying function for listing contents
         :meth:`TzstArchive.list`: The core method for listing archive contents
     """
+    if _is_batch(args):
+        return _cmd_batch(args, "list")
     try:
         archive_path = Path(args.archive)
-        if not archive_path.exists():
+        if not _is_stdio(args.archive) and not archive_path.exists():
             return _emit_error(
                 args,
                 f"Error: Archive not found - {archive_path}",
@@ -779,7 +1403,13 @@ def cmd_list(args) -> int:
                 print("Using streaming mode (memory efficient)")
             print()
 
-        contents = list_archive(archive_path, verbose=verbose, streaming=streaming)
+        contents = list_archive(
+            _input_archive(args.archive),
+            verbose=verbose,
+            streaming=streaming,
+            memory_map=getattr(args, "mmap", False),
+            memory_limit=getattr(args, "memory_limit", None),
+        )
 
         if _wants_json_output(args):
             _emit_json(
@@ -806,6 +1436,12 @@ def cmd_list(args) -> int:
             f"Error: File not found - {e}",
             error_type="file_not_found",
         )
+    except TzstMemoryLimitError as e:
+        return _emit_error(
+            args,
+            f"Error: Memory limit exceeded - {e}",
+            error_type="memory_limit_exceeded",
+        )
     except TzstDecompressionError as e:
         return _emit_error(
             args,
@@ -833,6 +1469,7 @@ def cmd_list(args) -> int:
         )
 
 
+@_with_core
 def cmd_test(args) -> int:
     """Command handler for testing archive integrity.
 
@@ -843,6 +1480,8 @@ def cmd_test(args) -> int:
         args: Parsed command line arguments containing:
             - archive (str): Path to the archive file to test
             - streaming (bool, optional): Use streaming mode for large archives
+            - archives, from_file, jobs, pool (optional): Further archives to
+              test in one run, see :func:`_cmd_batch`
 
     Returns:
         int: Exit code (0 for success, non-zero for failure)
@@ -859,9 +1498,11 @@ def cmd_test(args) -> int:
         :func:`tzst.test_archive`: The underlying function for integrity testing
         :meth:`TzstArchive.test`: The core method for testing archive integrity
     """
+    if _is_batch(args):
+        return _cmd_batch(args, "test")
     try:
         archive_path = Path(args.archive)
-        if not archive_path.exists():
+        if not _is_stdio(args.archive) and not archive_path.exists():
             return _emit_error(
                 args,
                 f"Error: Archive not found - {archive_path}",
@@ -876,7 +1517,12 @@ def cmd_test(args) -> int:
             if streaming:
                 print("Using streaming mode (memory efficient)")
 
-        healthy = test_archive(archive_path, streaming=streaming)
+        healthy = test_archive(
+            _input_archive(args.archive),
+            streaming=streaming,
+            memory_map=getattr(args, "mmap", False),
+            memory_limit=getattr(args, "memory_limit", None),
+        )
         if healthy:
             if _wants_json_output(args):
                 _emit_json(
@@ -910,6 +1556,12 @@ def cmd_test(args) -> int:
             f"Error: File not found - {e}",
             error_type="file_not_found",
         )
+    except TzstMemoryLimitError as e:
+        return _emit_error(
+            args,
+            f"Error: Memory limit exceeded - {e}",
+            error_type="memory_limit_exceeded",
+        )
     except TzstDecompressionError as e:
         return _emit_error(
             args,
@@ -937,65 +1589,651 @@ def cmd_test(args) -> int:
         )
 
 
-def cmd_version(args) -> int:
-    """Command handler for version display.
-
-    Returns:
-        int: Exit code (always 0)
-    """
-    if _wants_json_output(args):
-        _emit_json({"ok": True, "command": "version", "version": __version__})
-    elif getattr(args, "no_banner", False):
-        print(f"tzst {__version__}")
+def _with_throughput(result: dict[str, Any]) -> dict[str, Any]:
+    """Add the data rate of a conversion result in bytes per second."""
+    if "error" not in result:
+        seconds = result["seconds"]
+        result["throughput_bytes_per_second"] = (
+            result["size"] / seconds if seconds > 0 else None
+        )
+    return result
+
+
+def _print_conversion(
+    result: dict[str, Any], stream=None, action: str = "Converted"
+) -> None:
+    """Print one line describing a conversion or recompression result."""
+    source = result["source"] or "stdin"
+    target = result["target"] or "stdout"
+    if "error" in result:
+        print(f"Failed: {source} - {result['error']}", file=stream or sys.stderr)
+        return
+    details = []
+    if "format" in result:
+        details += [result["format"], f"{result['members']} members"]
+    if result["source_size"] is not None and result["target_size"] is not None:
+        details.append(
+            f"{format_size(result['source_size']).strip()} -> "
+            f"{format_size(result['target_size']).strip()}"
+        )
+    rate = result["throughput_bytes_per_second"]
+    if rate is not None:
+        details.append(f"{format_size(int(rate)).strip()}/s")
+    print(f"{action}: {source} -> {target} ({', '.join(details)})", file=stream)
 
-    return 0
 
+@_with_core
+def cmd_convert(args) -> int:
+    """Command handler for converting other archive formats to tzst.
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create and configure the command-line argument parser.
+    Processes the 'convert' CLI command. A single tar, tar.gz, tar.bz2,
+    tar.xz or zip archive is rewritten as tzst in one streaming pass; a
+    directory converts every such archive inside it, one worker process per
+    archive.
 
-    Sets up the argparse ArgumentParser with all subcommands and their
-    respective arguments for the tzst CLI interface. Includes comprehensive
-    help text and command reference documentation.
+    Args:
+        args: Parsed command line arguments containing:
+            - source (str): Archive or directory to convert ('-' for stdin)
+            - target (str, optional): Output archive ('-' for stdout), or
+              output directory when converting a directory
+            - compression_level (int): Zstandard compression level
+            - threads (int): zstd worker threads per conversion
+            - jobs (int, optional): Worker processes for a directory
+            - durability (str): How to flush the finished archives
 
     Returns:
-        argparse.ArgumentParser: Configured parser ready for argument parsing
-
-    Note:
-        The parser is configured with RawDescriptionHelpFormatter to preserve
-        formatting in the epilog help text, and includes detailed command
-        reference and security notes.
-
-    Commands Created:
-        - a, add, create: Archive creation with compression levels
-        - x, extract: Full extraction with directory structure
-        - e, extract-flat: Flat extraction without directories
-        - l, list: Archive content listing
-        - t, test: Archive integrity testing
+        int: Exit code (0 for success, non-zero for failure)
+            - 0: All archives converted
+            - 1: Source not found or a conversion failed
+            - 130: Operation interrupted by user (Ctrl+C)
 
     See Also:
-        :func:`main`: The main entry point that uses this parser
+        :func:`tzst.convert`: The underlying function for single conversions
+        :func:`tzst.convert_many`: The underlying function for batches
+    """
+    try:
+        source_path = Path(args.source)
+        if not _is_stdio(args.source) and not source_path.exists():
+            return _emit_error(
+                args,
+                f"Error: Source not found - {source_path}",
+                error_type="source_not_found",
+                details={"source": str(source_path)},
+            )
+
+        if source_path.is_dir():
+            results = convert_many(
+                [source_path],
+                args.target,
+                compression_level=args.compression_level,
+                threads=args.threads,
+                workers=args.jobs,
+                durability=args.durability,
+            )
+        else:
+            target: Path | BinaryIO | None = None
+            if _is_stdio(args.target or args.source):
+                target = sys.stdout.buffer
+            elif args.target is not None:
+                target = Path(args.target)
+            results = [
+                convert(
+                    _input_archive(args.source),
+                    target,
+                    compression_level=args.compression_level,
+                    threads=args.threads,
+                    durability=args.durability,
+                )
+            ]
+        results = [_with_throughput(result) for result in results]
+        failed = sum("error" in result for result in results)
+
+        if _wants_json_output(args):
+            _emit_json(
+                {
+                    "ok": not failed,
+                    "command": "convert",
+                    "compression_level": args.compression_level,
+                    "archives": results,
+                },
+                to_stderr=bool(failed),
+            )
+        else:
+            # Keep stdout clean when the archive itself is written there
+            stream = sys.stderr if _is_stdio(args.target or "") else None
+            for result in results:
+                _print_conversion(result, stream)
+            if not results:
+                print(f"No archives to convert in {source_path}", file=stream)
+            elif failed:
+                print(f"{failed} of {len(results)} conversions failed", file=sys.stderr)
+        return 1 if failed else 0
+
+    except FileNotFoundError as e:
+        return _emit_error(
+            args,
+            f"Error: File not found - {e}",
+            error_type="file_not_found",
+        )
+    except (TzstArchiveError, ValueError) as e:
+        return _emit_error(
+            args,
+            f"Error: Conversion failed - {e}",
+            error_type="conversion_failed",
+        )
+    except KeyboardInterrupt:
+        return _emit_error(
+            args,
+            "Operation interrupted by user",
+            error_type="interrupted",
+            exit_code=130,
+        )
+    except Exception as e:
+        return _emit_error(
+            args,
+            f"Error: Failed to convert archive - {e}",
+            error_type="convert_failed",
+        )
+
+
+@_with_core
+def cmd_recompress(args) -> int:
+    """Command handler for re-encoding a tzst archive at another level.
+
+    Processes the 'recompress' CLI command. The zstd stream is decoded and
+    encoded again without extracting anything, keeping the tar stream
+    byte-for-byte identical.
+
+    Args:
+        args: Parsed command line arguments containing:
+            - source (str): Archive to re-encode ('-' for stdin)
+            - target (str): Output archive ('-' for stdout); may equal source
+            - compression_level (int): New Zstandard compression level
+            - threads (int): zstd worker threads
+            - long (bool): Enable long distance matching
+            - memory_limit (int, optional): Bytes of memory recompression may use
+            - durability (str): How to flush the finished archive
+
+    Returns:
+        int: Exit code (0 for success, non-zero for failure)
+            - 0: Archive re-encoded
+            - 1: Source not found or the source is not a valid archive
+            - 130: Operation interrupted by user (Ctrl+C)
+
+    See Also:
+        :func:`tzst.recompress`: The underlying function
+    """
+    try:
+        source_path = Path(args.source)
+        if not _is_stdio(args.source) and not source_path.exists():
+            return _emit_error(
+                args,
+                f"Error: Archive not found - {source_path}",
+                error_type="archive_not_found",
+                details={"archive": str(source_path)},
+            )
+
+        to_stdout = _is_stdio(args.target)
+        result = _with_throughput(
+            recompress(
+                _input_archive(args.source),
+                sys.stdout.buffer if to_stdout else Path(args.target),
+                compression_level=args.compression_level,
+                threads=args.threads,
+                long_distance=args.long,
+                durability=args.durability,
+                memory_limit=getattr(args, "memory_limit", None),
+            )
+        )
+
+        if _wants_json_output(args):
+            _emit_json(
+                {
+                    "ok": True,
+                    "command": "recompress",
+                    "compression_level": args.compression_level,
+                    "long": args.long,
+                    **result,
+                },
+                to_stderr=to_stdout,
+            )
+        else:
+            # Keep stdout clean when the archive itself is written there
+            stream = sys.stderr if to_stdout else None
+            _print_conversion(result, stream, action="Recompressed")
+        return 0
+
+    except FileNotFoundError as e:
+        return _emit_error(
+            args,
+            f"Error: File not found - {e}",
+            error_type="file_not_found",
+        )
+    except TzstMemoryLimitError as e:
+        return _emit_error(
+            args,
+            f"Error: Memory limit exceeded - {e}",
+            error_type="memory_limit_exceeded",
+        )
+    except TzstDecompressionError as e:
+        return _emit_error(
+            args,
+            f"Error: Archive decompression failed - {e}",
+            error_type="decompression_failed",
+        )
+    except KeyboardInterrupt:
+        return _emit_error(
+            args,
+            "Operation interrupted by user",
+            error_type="interrupted",
+            exit_code=130,
+        )
+    except Exception as e:
+        return _emit_error(
+            args,
+            f"Error: Failed to recompress archive - {e}",
+            error_type="recompress_failed",
+        )
+
+
+@_with_core
+def cmd_merge(args) -> int:
+    """Command handler for merging archives.
+
+    Processes the 'merge' CLI command. The member frames of each source are
+    copied verbatim into the target; only sources that cannot be copied that
+    way, or lose members to the duplicate policy, are recompressed.
+
+    Args:
+        args: Parsed command line arguments containing:
+            - target (str): Path of the merged archive
+            - sources (list[str]): Archives to merge, in order
+            - duplicates (str): keep, first, last or error
+            - compression_level (int): Level for recompressed sources
+            - durability (str): How to flush the finished archive
+
+    Returns:
+        int: Exit code (0 for success, non-zero for failure)
+            - 0: Archives merged
+            - 1: A source is missing or invalid, or a name repeats with
+              ``--duplicates error``
+            - 130: Operation interrupted by user (Ctrl+C)
+
+    See Also:
+        :func:`tzst.merge_archives`: The underlying function
+    """
+    try:
+        for source in args.sources:
+            if not Path(source).is_file():
+                return _emit_error(
+                    args,
+                    f"Error: Archive not found - {source}",
+                    error_type="archive_not_found",
+                    details={"archive": source},
+                )
+
+        result = merge_archives(
+            args.target,
+            args.sources,
+            duplicates=args.duplicates,
+            compression_level=args.compression_level,
+            durability=args.durability,
+        )
+
+        if _wants_json_output(args):
+            _emit_json({"ok": True, "command": "merge", **result})
+        else:
+            print(
+                f"Merged {result['sources']} archives into {result['target']} "
+                f"({result['copied']} copied, {result['recompressed']} recompressed"
+                + (
+                    f", {result['dropped']} duplicates dropped"
+                    if result["dropped"]
+                    else ""
+                )
+                + f", {format_size(result['target_size']).strip()})"
+            )
+        return 0
+
+    except TzstDecompressionError as e:
+        return _emit_error(
+            args,
+            f"Error: Archive decompression failed - {e}",
+            error_type="decompression_failed",
+        )
+    except TzstArchiveError as e:
+        return _emit_error(
+            args,
+            f"Error: Archive operation failed - {e}",
+            error_type="archive_operation_failed",
+        )
+    except KeyboardInterrupt:
+        return _emit_error(
+            args,
+            "Operation interrupted by user",
+            error_type="interrupted",
+            exit_code=130,
+        )
+    except Exception as e:
+        return _emit_error(
+            args,
+            f"Error: Failed to merge archives - {e}",
+            error_type="merge_failed",
+        )
+
+
+@_with_core
+def cmd_delete(args) -> int:
+    """Command handler for deleting members from an archive.
+
+    Processes the 'delete' or 'd' CLI commands. Only the zstd frames that
+    hold the named members are recompressed; the rest of the archive is
+    copied as it is.
+
+    Args:
+        args: Parsed command line arguments containing:
+            - archive (str): Path to the archive file
+            - files (list[str]): Names of the members to delete
+            - compression_level (int): Level of the recompressed frames
+
+    Returns:
+        int: Exit code (0 for success, non-zero for failure)
+            - 0: Members deleted
+            - 1: Archive or member not found, or operation failed
+            - 130: Operation interrupted by user (Ctrl+C)
+
+    See Also:
+        :meth:`TzstArchive.delete`: The underlying method
+    """
+    try:
+        archive_path = Path(args.archive)
+        if not archive_path.is_file():
+            return _emit_error(
+                args,
+                f"Error: Archive not found - {archive_path}",
+                error_type="archive_not_found",
+                details={"archive": str(archive_path)},
+            )
+
+        compression_level = getattr(args, "compression_level", 3)
+        with TzstArchive(archive_path, "r", streaming=True) as archive:
+            deleted = archive.delete(args.files, compression_level=compression_level)
+
+        if _wants_json_output(args):
+            _emit_json(
+                {
+                    "ok": True,
+                    "command": "delete",
+                    "archive": str(archive_path),
+                    "deleted": deleted,
+                    "compression_level": compression_level,
+                }
+            )
+        else:
+            print(f"Deleted {deleted} members from {archive_path}")
+        return 0
+
+    except KeyError as e:
+        return _emit_error(
+            args,
+            f"Error: Member not found - {e.args[0]}",
+            error_type="member_not_found",
+        )
+    except TzstDecompressionError as e:
+        return _emit_error(
+            args,
+            f"Error: Archive decompression failed - {e}",
+            error_type="decompression_failed",
+        )
+    except TzstArchiveError as e:
+        return _emit_error(
+            args,
+            f"Error: Archive operation failed - {e}",
+            error_type="archive_operation_failed",
+        )
+    except KeyboardInterrupt:
+        return _emit_error(
+            args,
+            "Operation interrupted by user",
+            error_type="interrupted",
+            exit_code=130,
+        )
+    except Exception as e:
+        return _emit_error(
+            args,
+            f"Error: Failed to delete members - {e}",
+            error_type="delete_failed",
+        )
+
+
+def cmd_serve(args) -> int:
+    """Command handler for running tzst as a long-lived worker.
+
+    Processes the 'serve' CLI command: listens on a Unix domain socket and
+    runs the add, extract, list and test requests clients send as JSON
+    lines, until interrupted or terminated.
+
+    Args:
+        args: Parsed command line arguments containing:
+            - socket (str): Path of the Unix domain socket to listen on
+            - jobs (int, optional): Requests run at the same time
+
+    Returns:
+        int: Exit code (0 when stopped, non-zero if the server cannot start)
+
+    See Also:
+        :mod:`tzst.server`: The request protocol
+    """
+    import signal
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        return _emit_error(
+            args,
+            "Error: tzst serve needs Unix domain sockets",
+            error_type="unsupported_platform",
+        )
+
+    from .server import TzstServer
+
+    try:
+        server = TzstServer(args.socket, args.jobs)
+    except (OSError, ValueError) as e:
+        return _emit_error(
+            args,
+            f"Error: Cannot listen on {args.socket} - {e}",
+            error_type="serve_failed",
+        )
+
+    with server:
+        if _wants_json_output(args):
+            _emit_json(
+                {
+                    "ok": True,
+                    "command": "serve",
+                    "socket": str(args.socket),
+                    "workers": server.workers,
+                }
+            )
+        else:
+            print(f"Serving on {args.socket} ({server.workers} workers)", flush=True)
+        # Stop cleanly, removing the socket, on SIGTERM as on Ctrl+C
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def cmd_version(args) -> int:
+    """Command handler for version display.
+
+    Returns:
+        int: Exit code (always 0)
+    """
+    if _wants_json_output(args):
+        _emit_json({"ok": True, "command": "version", "version": __version__})
+    elif getattr(args, "no_banner", False):
+        print(f"tzst {__version__}")
+
+    return 0
+
+
+def _add_batch_arguments(subparser: argparse.ArgumentParser) -> None:
+    """Add --from-file/--pool options for running a command over many archives."""
+    subparser.add_argument(
+        "--from-file",
+        metavar="FILE",
+        help="also process the archives listed in FILE, one per line ('-' for stdin)",
+    )
+    subparser.add_argument(
+        "--pool",
+        choices=["process", "thread"],
+        default="process",
+        help="run several archives in worker processes or threads (default: process)",
+    )
+
+
+def _add_member_selection_arguments(subparser: argparse.ArgumentParser) -> None:
+    """Add --include/--exclude member selection options to an extract parser."""
+    subparser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help=(
+            "extract only members matching GLOB (repeatable); '*' stays within "
+            "a directory, '**' spans directories, e.g. 'logs/2024-06-*/*.json'"
+        ),
+    )
+    subparser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help="skip members matching GLOB (repeatable, wins over --include)",
+    )
+    subparser.add_argument(
+        "--include-regex",
+        action="append",
+        type=validate_regex,
+        metavar="REGEX",
+        help="extract only members whose full name matches REGEX (repeatable)",
+    )
+    subparser.add_argument(
+        "--exclude-regex",
+        action="append",
+        type=validate_regex,
+        metavar="REGEX",
+        help="skip members whose full name matches REGEX (repeatable)",
+    )
+
+
+def _builds(command: str | None, *names: str) -> bool:
+    """Return True if the parser for *command* needs the subcommand *names*."""
+    return command is None or command in names
+
+
+def create_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Create and configure the command-line argument parser.
+
+    Sets up the argparse ArgumentParser with all subcommands and their
+    respective arguments for the tzst CLI interface. Includes comprehensive
+    help text and command reference documentation.
+
+    Args:
+        command: Only add the subcommand with this name or alias, which is
+            all :func:`main` needs once it knows the command; None adds all
+
+    Returns:
+        argparse.ArgumentParser: Configured parser ready for argument parsing
+
+    Note:
+        The parser is configured with RawDescriptionHelpFormatter to preserve
+        formatting in the epilog help text, and includes detailed command
+        reference and security notes.
+
+    Commands Created:
+        - a, add, create: Archive creation with compression levels
+        - x, extract: Full extraction with directory structure
+        - e, extract-flat: Flat extraction without directories
+        - l, list: Archive content listing
+        - t, test: Archive integrity testing
+        - d, delete: Removal of members, recompressing only their frames
+        - convert: Conversion of tar, tar.gz, tar.bz2, tar.xz and zip archives
+        - recompress: Re-encoding at another compression level
+        - merge: Concatenation of archives without recompression
+        - serve: Long-running worker answering JSON requests on a socket
+
+    See Also:
+        :func:`main`: The main entry point that uses this parser
     """
     epilog = """
 command reference:
   archive:
     a, add, create    tzst a archive.tzst files...  [-l LEVEL] [--no-atomic]
+                      [--exclude PATTERN] [--exclude-from FILE] [--include PATTERN]
+                      [--respect-gitignore] [--no-sparse] [--durability MODE]
+                      [--volume-size SIZE] [--memory-limit SIZE] [-j N]
 
   extract:
     x, extract        tzst x archive.tzst [files...] [-o DIR] [--streaming] [--filter FILTER]
     e, extract-flat   tzst e archive.tzst [files...] [-o DIR] [--streaming] [--filter FILTER]
+                      [--include GLOB] [--exclude GLOB] [--include-regex RE] [--exclude-regex RE]
+                      [--mmap] [--memory-limit SIZE] [--no-preallocate]
+                      [--durability MODE] [-j N]
+                      tzst x --from-file LIST [-o DIR] --conflict-resolution MODE [-j N]
 
   manage:
-    l, list           tzst l archive.tzst [-v] [--streaming]
-    t, test           tzst t archive.tzst [--streaming]
+    l, list           tzst l archive.tzst... [-v] [--streaming] [--mmap] [--from-file LIST] [-j N]
+    t, test           tzst t archive.tzst... [--streaming] [--mmap] [--from-file LIST] [-j N]
+                      (l, t also take [--memory-limit SIZE])
+    d, delete         tzst d archive.tzst files... [-l LEVEL]
+
+  migrate:
+    convert           tzst convert archive.tar.gz [out.tzst] [-l LEVEL] [--threads N]
+                      tzst convert DIR [OUTDIR] [-j JOBS]
+    recompress        tzst recompress in.tzst out.tzst [-l LEVEL] [--threads N] [--long]
+                      [--memory-limit SIZE]
+    merge             tzst merge out.tzst a.tzst b.tzst... [--duplicates POLICY]
+
+  service:
+    serve             tzst serve --socket /run/tzst.sock [-j N]
 
 arguments:
   -l, --level LEVEL   compression level (1-22, default: 3)
   -o, --output DIR    output directory (default: current directory)
   -v, --verbose       show detailed information
   --streaming         use streaming mode for memory efficiency with large archives
+  --mmap              decompress from a memory mapping of the archive file (x, e, l, t)
+  --memory-limit SIZE bound the memory of buffers, zstd windows and contexts
+                      (e.g. 256M, at least 16M); archives needing a larger
+                      window fail with memory_limit_exceeded (a, x, e, l, t, recompress)
   --filter FILTER     security filter for extraction: data (safest, default), tar, fully_trusted
+  --include GLOB      extract only matching members, e.g. 'logs/2024-06-*/*.json'
+  --exclude GLOB      skip matching members ('**' matches across directories)
+                      (a: .gitignore-style patterns such as 'node_modules/' or '*.pyc')
+  --respect-gitignore when adding, skip paths ignored by .gitignore files
+  --no-sparse         when adding, store holes in sparse files as zeros
+  --no-preallocate    when extracting, do not reserve space for large files up front
+  --durability MODE   none, batch or strict: fsync written data once at the end
+                      or after every file (default: batch for a, none for x/e)
   --no-atomic         disable atomic file operations (not recommended)
+  --threads N         zstd worker threads per archive (-1: one per CPU)
+  --long              recompress with long distance matching (128 MiB window)
+  --duplicates POLICY keep, first, last or error: merging archives that share names
+  --volume-size SIZE  when adding, split the archive into volumes (e.g. 5G)
+  -j, --jobs N        archives converted in parallel for a directory, volumes
+                      of a split archive extracted in parallel (x, e), shards
+                      of the input compressed in parallel (a), or archives of
+                      a batch processed in parallel (x, e, l, t)
+  --from-file LIST    also process the archives listed in LIST, one per line,
+                      printing one JSON line per archive with --json (x, e, l, t)
+  --pool KIND         process (default) or thread workers for a batch
+  --socket PATH       Unix domain socket of `tzst serve`, taking one JSON request
+                      per line, e.g. {"command": "test", "archive": "a.tzst"}
+  -                   use stdout (a) or stdin (x, e, l, t) as the archive, e.g.
+                      tzst a - dir | ssh host 'tzst x - --conflict-resolution skip'
+  ARCHIVE.001         the first volume of a split archive stands for all of them
 
 security note:
   always use --filter=data (default) when extracting archives from untrusted sources
@@ -1031,155 +2269,579 @@ documentation:
     )
 
     # Add/Create command
-    parser_add = subparsers.add_parser(
-        "a", aliases=["add", "create"], help="add files to archive"
-    )
-    parser_add.add_argument("archive", help="archive file path")
-    parser_add.add_argument("files", nargs="+", help="files/directories to add")
-    parser_add.add_argument(
-        "-c",
-        "-l",
-        "--level",
-        dest="compression_level",
-        type=validate_compression_level,
-        default=3,
-        metavar="LEVEL",
-        help="compression level (1-22, default: 3)",
-    )
-    parser_add.add_argument(
-        "--no-atomic",
-        action="store_true",
-        help=(
-            "Disable atomic file operations (not recommended - creates archive "
-            "directly without temporary file)"
-        ),
-    )
-    parser_add.set_defaults(func=cmd_add)
+    if _builds(command, "a", "add", "create"):
+        parser_add = subparsers.add_parser(
+            "a", aliases=["add", "create"], help="add files to archive"
+        )
+        parser_add.add_argument(
+            "archive", help="archive file path ('-' writes the archive to stdout)"
+        )
+        parser_add.add_argument("files", nargs="+", help="files/directories to add")
+        parser_add.add_argument(
+            "-c",
+            "-l",
+            "--level",
+            dest="compression_level",
+            type=validate_compression_level,
+            default=3,
+            metavar="LEVEL",
+            help="compression level (1-22, default: 3)",
+        )
+        parser_add.add_argument(
+            "--no-atomic",
+            action="store_true",
+            help=(
+                "Disable atomic file operations (not recommended - creates archive "
+                "directly without temporary file)"
+            ),
+        )
+        parser_add.add_argument(
+            "--exclude",
+            action="append",
+            metavar="PATTERN",
+            help=(
+                "skip paths matching PATTERN (repeatable, .gitignore syntax: "
+                "'node_modules/', '*.pyc', '/build'); excluded directories are "
+                "not scanned"
+            ),
+        )
+        parser_add.add_argument(
+            "--exclude-from",
+            action="append",
+            metavar="FILE",
+            help="read exclude patterns from FILE, one per line (repeatable)",
+        )
+        parser_add.add_argument(
+            "--include",
+            action="append",
+            metavar="PATTERN",
+            help="only add files matching PATTERN (repeatable, .gitignore syntax)",
+        )
+        parser_add.add_argument(
+            "--respect-gitignore",
+            action="store_true",
+            help="skip paths ignored by .gitignore files and the .git directory",
+        )
+        parser_add.add_argument(
+            "--no-sparse",
+            action="store_true",
+            help="store files with holes densely instead of as sparse members",
+        )
+        parser_add.add_argument(
+            "--durability",
+            choices=["none", "batch", "strict"],
+            default="batch",
+            help="how to flush the finished archive to disk (default: batch)",
+        )
+        parser_add.add_argument(
+            "--volume-size",
+            type=validate_volume_size,
+            default=None,
+            metavar="SIZE",
+            help=(
+                "split the archive into volumes of at most SIZE bytes (K, M, G, T "
+                "suffixes), written as ARCHIVE.001, .002, ..."
+            ),
+        )
+        parser_add.add_argument(
+            "--memory-limit",
+            type=validate_memory_limit,
+            default=None,
+            metavar="SIZE",
+            help="bound the memory used for compression to SIZE (at least 16M)",
+        )
+        parser_add.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help=(
+                "compress the input in N size-balanced shards in parallel "
+                "processes (default: 1)"
+            ),
+        )
+        parser_add.set_defaults(func=cmd_add)
 
     # Extract with full paths command
-    parser_extract = subparsers.add_parser(
-        "x", aliases=["extract"], help="eXtract files with full paths"
-    )
-    parser_extract.add_argument("archive", help="archive file path")
-    parser_extract.add_argument("files", nargs="*", help="specific files to extract")
-    parser_extract.add_argument(
-        "-o", "--output", help="output directory (default: current directory)"
-    )
-    parser_extract.add_argument(
-        "--streaming",
-        action="store_true",
-        help="use streaming mode for memory efficiency with large archives",
-    )
-    parser_extract.add_argument(
-        "--filter",
-        choices=["data", "tar", "fully_trusted"],
-        default="data",
-        help=(
-            "Extraction filter for security (default: data). 'data' is safest "
-            "for untrusted archives, 'tar' honors most tar features, "
-            "'fully_trusted' honors all metadata"
-        ),
-    )
-    parser_extract.add_argument(
-        "--conflict-resolution",
-        choices=[
-            "replace",
-            "skip",
-            "replace_all",
-            "skip_all",
-            "auto_rename",
-            "auto_rename_all",
-            "ask",
-        ],
-        default="ask",
-        help=(
-            "How to handle file conflicts during extraction (default: ask). "
-            "'ask' prompts for each conflict, 'replace' overwrites existing files, "
-            "'skip' skips existing files, 'auto_rename' creates new names. "
-            "Adding '_all' applies the action to all subsequent conflicts."
-        ),
-    )
-    parser_extract.set_defaults(func=cmd_extract_full)
+    if _builds(command, "x", "extract"):
+        parser_extract = subparsers.add_parser(
+            "x", aliases=["extract"], help="eXtract files with full paths"
+        )
+        parser_extract.add_argument(
+            "archive",
+            nargs="?",
+            help="archive file path ('-' reads the archive from stdin)",
+        )
+        parser_extract.add_argument(
+            "files", nargs="*", help="specific files to extract"
+        )
+        parser_extract.add_argument(
+            "-o", "--output", help="output directory (default: current directory)"
+        )
+        parser_extract.add_argument(
+            "--streaming",
+            action="store_true",
+            help="use streaming mode for memory efficiency with large archives",
+        )
+        parser_extract.add_argument(
+            "--mmap",
+            action="store_true",
+            help="decompress from a memory mapping of the archive file",
+        )
+        parser_extract.add_argument(
+            "--memory-limit",
+            type=validate_memory_limit,
+            default=None,
+            metavar="SIZE",
+            help="bound the memory used for buffers to SIZE (at least 16M)",
+        )
+        parser_extract.add_argument(
+            "--filter",
+            choices=["data", "tar", "fully_trusted"],
+            default="data",
+            help=(
+                "Extraction filter for security (default: data). 'data' is safest "
+                "for untrusted archives, 'tar' honors most tar features, "
+                "'fully_trusted' honors all metadata"
+            ),
+        )
+        parser_extract.add_argument(
+            "--conflict-resolution",
+            choices=[
+                "replace",
+                "skip",
+                "replace_all",
+                "skip_all",
+                "auto_rename",
+                "auto_rename_all",
+                "ask",
+            ],
+            default=None,
+            help=(
+                "How to handle file conflicts during extraction (default: ask, or "
+                "replace when the archive is read from stdin). "
+                "'ask' prompts for each conflict, 'replace' overwrites existing files, "
+                "'skip' skips existing files, 'auto_rename' creates new names. "
+                "Adding '_all' applies the action to all subsequent conflicts."
+            ),
+        )
+        _add_member_selection_arguments(parser_extract)
+        parser_extract.add_argument(
+            "--no-preallocate",
+            action="store_true",
+            help="do not reserve space for large files before writing them",
+        )
+        parser_extract.add_argument(
+            "--durability",
+            choices=["none", "batch", "strict"],
+            default="none",
+            help=(
+                "flush extracted files to disk: 'batch' once at the end, 'strict' "
+                "after every file (default: none)"
+            ),
+        )
+        parser_extract.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help=(
+                "archives of --from-file, or volumes of a split archive, extracted "
+                "in parallel (default: 1)"
+            ),
+        )
+        _add_batch_arguments(parser_extract)
+        parser_extract.set_defaults(func=cmd_extract_full)
 
     # Extract flat command
-    parser_extract_flat = subparsers.add_parser(
-        "e",
-        aliases=["extract-flat"],
-        help="extract files from archive (without using directory names)",
-    )
-    parser_extract_flat.add_argument("archive", help="archive file path")
-    parser_extract_flat.add_argument(
-        "files", nargs="*", help="specific files to extract"
-    )
-    parser_extract_flat.add_argument(
-        "-o", "--output", help="output directory (default: current directory)"
-    )
-    parser_extract_flat.add_argument(
-        "--streaming",
-        action="store_true",
-        help="use streaming mode for memory efficiency with large archives",
-    )
-    parser_extract_flat.add_argument(
-        "--filter",
-        choices=["data", "tar", "fully_trusted"],
-        default="data",
-        help=(
-            "Extraction filter for security (default: data). 'data' is safest "
-            "for untrusted archives, 'tar' honors most tar features, "
-            "'fully_trusted' honors all metadata"
-        ),
-    )
-    parser_extract_flat.add_argument(
-        "--conflict-resolution",
-        choices=[
-            "replace",
-            "skip",
-            "replace_all",
-            "skip_all",
-            "auto_rename",
-            "auto_rename_all",
-            "ask",
-        ],
-        default="ask",
-        help=(
-            "How to handle file conflicts during extraction (default: ask). "
-            "'ask' prompts for each conflict, 'replace' overwrites existing files, "
-            "'skip' skips existing files, 'auto_rename' creates new names. "
-            "Adding '_all' applies the action to all subsequent conflicts."
-        ),
-    )
-    parser_extract_flat.set_defaults(func=cmd_extract_flat)
+    if _builds(command, "e", "extract-flat"):
+        parser_extract_flat = subparsers.add_parser(
+            "e",
+            aliases=["extract-flat"],
+            help="extract files from archive (without using directory names)",
+        )
+        parser_extract_flat.add_argument(
+            "archive",
+            nargs="?",
+            help="archive file path ('-' reads the archive from stdin)",
+        )
+        parser_extract_flat.add_argument(
+            "files", nargs="*", help="specific files to extract"
+        )
+        parser_extract_flat.add_argument(
+            "-o", "--output", help="output directory (default: current directory)"
+        )
+        parser_extract_flat.add_argument(
+            "--streaming",
+            action="store_true",
+            help="use streaming mode for memory efficiency with large archives",
+        )
+        parser_extract_flat.add_argument(
+            "--mmap",
+            action="store_true",
+            help="decompress from a memory mapping of the archive file",
+        )
+        parser_extract_flat.add_argument(
+            "--memory-limit",
+            type=validate_memory_limit,
+            default=None,
+            metavar="SIZE",
+            help="bound the memory used for buffers to SIZE (at least 16M)",
+        )
+        parser_extract_flat.add_argument(
+            "--filter",
+            choices=["data", "tar", "fully_trusted"],
+            default="data",
+            help=(
+                "Extraction filter for security (default: data). 'data' is safest "
+                "for untrusted archives, 'tar' honors most tar features, "
+                "'fully_trusted' honors all metadata"
+            ),
+        )
+        parser_extract_flat.add_argument(
+            "--conflict-resolution",
+            choices=[
+                "replace",
+                "skip",
+                "replace_all",
+                "skip_all",
+                "auto_rename",
+                "auto_rename_all",
+                "ask",
+            ],
+            default=None,
+            help=(
+                "How to handle file conflicts during extraction (default: ask, or "
+                "replace when the archive is read from stdin). "
+                "'ask' prompts for each conflict, 'replace' overwrites existing files, "
+                "'skip' skips existing files, 'auto_rename' creates new names. "
+                "Adding '_all' applies the action to all subsequent conflicts."
+            ),
+        )
+        _add_member_selection_arguments(parser_extract_flat)
+        parser_extract_flat.add_argument(
+            "--no-preallocate",
+            action="store_true",
+            help="do not reserve space for large files before writing them",
+        )
+        parser_extract_flat.add_argument(
+            "--durability",
+            choices=["none", "batch", "strict"],
+            default="none",
+            help=(
+                "flush extracted files to disk: 'batch' once at the end, 'strict' "
+                "after every file (default: none)"
+            ),
+        )
+        parser_extract_flat.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help=(
+                "archives of --from-file, or volumes of a split archive, extracted "
+                "in parallel (default: 1)"
+            ),
+        )
+        _add_batch_arguments(parser_extract_flat)
+        parser_extract_flat.set_defaults(func=cmd_extract_flat)
 
     # List command
-    parser_list = subparsers.add_parser(
-        "l", aliases=["list"], help="list contents of archive"
-    )
-    parser_list.add_argument("archive", help="archive file path")
-    parser_list.add_argument(
-        "-v", "--verbose", action="store_true", help="show detailed information"
-    )
-    parser_list.add_argument(
-        "--streaming",
-        action="store_true",
-        help="use streaming mode for memory efficiency with large archives",
-    )
-    parser_list.set_defaults(func=cmd_list)
+    if _builds(command, "l", "list"):
+        parser_list = subparsers.add_parser(
+            "l", aliases=["list"], help="list contents of archive"
+        )
+        parser_list.add_argument(
+            "archive",
+            nargs="?",
+            help="archive file path ('-' reads the archive from stdin)",
+        )
+        parser_list.add_argument(
+            "archives", nargs="*", help="more archives to process in one run"
+        )
+        parser_list.add_argument(
+            "-v", "--verbose", action="store_true", help="show detailed information"
+        )
+        parser_list.add_argument(
+            "--streaming",
+            action="store_true",
+            help="use streaming mode for memory efficiency with large archives",
+        )
+        parser_list.add_argument(
+            "--mmap",
+            action="store_true",
+            help="decompress from a memory mapping of the archive file",
+        )
+        parser_list.add_argument(
+            "--memory-limit",
+            type=validate_memory_limit,
+            default=None,
+            metavar="SIZE",
+            help="bound the memory used for buffers to SIZE (at least 16M)",
+        )
+        parser_list.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="archives listed in parallel when given several (default: 1)",
+        )
+        _add_batch_arguments(parser_list)
+        parser_list.set_defaults(func=cmd_list)
 
     # Test command
-    parser_test = subparsers.add_parser(
-        "t", aliases=["test"], help="test integrity of archive"
-    )
-    parser_test.add_argument("archive", help="archive file path")
-    parser_test.add_argument(
-        "--streaming",
-        action="store_true",
-        help="use streaming mode for memory efficiency with large archives",
-    )
-    parser_test.set_defaults(func=cmd_test)
+    if _builds(command, "t", "test"):
+        parser_test = subparsers.add_parser(
+            "t", aliases=["test"], help="test integrity of archive"
+        )
+        parser_test.add_argument(
+            "archive",
+            nargs="?",
+            help="archive file path ('-' reads the archive from stdin)",
+        )
+        parser_test.add_argument(
+            "archives", nargs="*", help="more archives to process in one run"
+        )
+        parser_test.add_argument(
+            "--streaming",
+            action="store_true",
+            help="use streaming mode for memory efficiency with large archives",
+        )
+        parser_test.add_argument(
+            "--mmap",
+            action="store_true",
+            help="decompress from a memory mapping of the archive file",
+        )
+        parser_test.add_argument(
+            "--memory-limit",
+            type=validate_memory_limit,
+            default=None,
+            metavar="SIZE",
+            help="bound the memory used for buffers to SIZE (at least 16M)",
+        )
+        parser_test.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="archives tested in parallel when given several (default: 1)",
+        )
+        _add_batch_arguments(parser_test)
+        parser_test.set_defaults(func=cmd_test)
+
+    # Delete command
+    if _builds(command, "d", "delete"):
+        parser_delete = subparsers.add_parser(
+            "d", aliases=["delete"], help="delete members from archive"
+        )
+        parser_delete.add_argument("archive", help="archive file path")
+        parser_delete.add_argument(
+            "files", nargs="+", help="names of members to delete"
+        )
+        parser_delete.add_argument(
+            "-l",
+            "--level",
+            dest="compression_level",
+            type=validate_compression_level,
+            default=3,
+            metavar="LEVEL",
+            help=(
+                "compression level of the frames that are recompressed; use the "
+                "archive's own level to keep it (1-22, default: 3)"
+            ),
+        )
+        parser_delete.set_defaults(func=cmd_delete)
+
+    # Convert command
+    if _builds(command, "convert"):
+        parser_convert = subparsers.add_parser(
+            "convert",
+            help="convert tar, tar.gz, tar.bz2, tar.xz or zip archives to tzst",
+        )
+        parser_convert.add_argument(
+            "source",
+            help=(
+                "archive to convert ('-' reads it from stdin), or a directory whose "
+                "archives are converted in parallel"
+            ),
+        )
+        parser_convert.add_argument(
+            "target",
+            nargs="?",
+            help=(
+                "output archive ('-' writes it to stdout) or, for a directory, the "
+                "output directory (default: next to each source, e.g. logs.tar.gz "
+                "becomes logs.tzst)"
+            ),
+        )
+        parser_convert.add_argument(
+            "-c",
+            "-l",
+            "--level",
+            dest="compression_level",
+            type=validate_compression_level,
+            default=3,
+            metavar="LEVEL",
+            help="compression level (1-22, default: 3)",
+        )
+        parser_convert.add_argument(
+            "--threads",
+            type=int,
+            default=0,
+            metavar="N",
+            help="zstd worker threads per archive (default: 0, -1 for one per CPU)",
+        )
+        parser_convert.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=None,
+            metavar="N",
+            help="archives converted at once for a directory (default: one per CPU)",
+        )
+        parser_convert.add_argument(
+            "--durability",
+            choices=["none", "batch", "strict"],
+            default="batch",
+            help="how to flush the finished archives to disk (default: batch)",
+        )
+        parser_convert.set_defaults(func=cmd_convert)
+
+    # Recompress command
+    if _builds(command, "recompress"):
+        parser_recompress = subparsers.add_parser(
+            "recompress", help="re-encode an archive at another compression level"
+        )
+        parser_recompress.add_argument(
+            "source", help="archive to re-encode ('-' reads it from stdin)"
+        )
+        parser_recompress.add_argument(
+            "target",
+            help="output archive ('-' writes it to stdout); may be the source itself",
+        )
+        parser_recompress.add_argument(
+            "-c",
+            "-l",
+            "--level",
+            dest="compression_level",
+            type=validate_compression_level,
+            default=3,
+            metavar="LEVEL",
+            help="compression level (1-22, default: 3)",
+        )
+        parser_recompress.add_argument(
+            "--threads",
+            type=int,
+            default=0,
+            metavar="N",
+            help="zstd worker threads (default: 0, -1 for one per CPU)",
+        )
+        parser_recompress.add_argument(
+            "--long",
+            action="store_true",
+            help="enable long distance matching with a 128 MiB window",
+        )
+        parser_recompress.add_argument(
+            "--memory-limit",
+            type=validate_memory_limit,
+            default=None,
+            metavar="SIZE",
+            help="bound the memory used for recompression to SIZE (at least 16M)",
+        )
+        parser_recompress.add_argument(
+            "--durability",
+            choices=["none", "batch", "strict"],
+            default="batch",
+            help="how to flush the finished archive to disk (default: batch)",
+        )
+        parser_recompress.set_defaults(func=cmd_recompress)
+
+    # Serve command
+    if _builds(command, "serve"):
+        parser_serve = subparsers.add_parser(
+            "serve", help="run as a worker answering JSON requests on a socket"
+        )
+        parser_serve.add_argument(
+            "--socket", required=True, metavar="PATH", help="Unix domain socket path"
+        )
+        parser_serve.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=None,
+            metavar="N",
+            help="requests run at the same time (default: one per CPU)",
+        )
+        parser_serve.set_defaults(func=cmd_serve)
+
+    # Merge command
+    if _builds(command, "merge"):
+        parser_merge = subparsers.add_parser(
+            "merge", help="concatenate archives without recompressing them"
+        )
+        parser_merge.add_argument("target", help="path of the merged archive")
+        parser_merge.add_argument(
+            "sources", nargs="+", help="archives to merge, in order"
+        )
+        parser_merge.add_argument(
+            "--duplicates",
+            choices=["keep", "first", "last", "error"],
+            default="keep",
+            help=(
+                "files found in more than one archive: keep every copy (default; "
+                "extraction ends with the last), keep only the first or last, or fail"
+            ),
+        )
+        parser_merge.add_argument(
+            "-c",
+            "-l",
+            "--level",
+            dest="compression_level",
+            type=validate_compression_level,
+            default=3,
+            metavar="LEVEL",
+            help="compression level for archives that must be recompressed (default: 3)",
+        )
+        parser_merge.add_argument(
+            "--durability",
+            choices=["none", "batch", "strict"],
+            default="batch",
+            help="how to flush the finished archive to disk (default: batch)",
+        )
+        parser_merge.set_defaults(func=cmd_merge)
 
     return parser
 
 
+# Valid commands and their aliases
+_COMMANDS = frozenset(
+    {
+        "a",
+        "add",
+        "create",
+        "x",
+        "extract",
+        "e",
+        "extract-flat",
+        "l",
+        "list",
+        "t",
+        "test",
+        "d",
+        "delete",
+        "convert",
+        "recompress",
+        "merge",
+        "serve",
+    }
+)
+
+
 def _validate_compression_level_in_argv(argv: list[str]) -> bool:
     """Check for compression level validation errors in argv.
 
@@ -1264,20 +2926,7 @@ def _validate_command_in_argv(argv: list[str]) -> bool:
     if not argv:
         return False
 
-    # Valid commands and their aliases
-    valid_commands = {
-        "a",
-        "add",
-        "create",
-        "x",
-        "extract",
-        "e",
-        "extract-flat",
-        "l",
-        "list",
-        "t",
-        "test",
-    }
+    valid_commands = _COMMANDS
 
     # Find the first argument that's not a flag (doesn't start with -)
     for arg in argv:
@@ -1294,6 +2943,18 @@ def _validate_command_in_argv(argv: list[str]) -> bool:
     return False
 
 
+def _command_in_argv(argv: list[str]) -> str | None:
+    """Return the command named in argv, or None if there is no valid one.
+
+    Global options are all flags, so the command is the first argument that
+    does not start with ``-``.
+    """
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg if arg in _COMMANDS else None
+    return None
+
+
 def _is_extreme_compression_level_in_argv(argv: list[str]) -> bool:
     """Check for extreme compression level values that warrant special handling.
 
@@ -1412,14 +3073,32 @@ def main(argv: list[str] | None = None) -> int:
     See Also:
         :func:`create_parser`: Creates the argument parser used by this function
     """
-    if _should_print_banner(argv):
+    cli_args = argv if argv is not None else sys.argv[1:]
+    # "-" may stream the archive through stdout, which must stay clean, so
+    # the banner waits until the parsed arguments show whether it does
+    banner = _should_print_banner(argv)
+    if banner and "-" not in cli_args:
         print_banner()
 
-    parser = create_parser()
+    if "--version" in cli_args and {*cli_args} <= {
+        "--version",
+        "--json",
+        "--no-banner",
+    }:
+        # Answer without building the parser
+        return cmd_version(
+            argparse.Namespace(
+                json_output="--json" in cli_args, no_banner="--no-banner" in cli_args
+            )
+        )
+
+    parser = create_parser(_command_in_argv(cli_args))
     args, error_code = _parse_arguments(parser, argv)
 
     if error_code is not None:
         return error_code
+    if banner and "-" in cli_args and not _streams_archive(args):
+        print_banner()
 
     return _execute_command(args, parser)
 
@@ -1,18 +1,35 @@
 """Core functionality for tzst archives."""
 
+import bisect
+import contextlib
+import copy
+import errno
+import glob
 import io
+import mmap
 import os
+import posixpath
+import re
+import shutil
+import stat
+import struct
+import sys
 import tarfile
 import tempfile
+import threading
 import time
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from enum import Enum
 from pathlib import Path
 from typing import BinaryIO
 
 import zstandard as zstd
 
-from .exceptions import TzstArchiveError, TzstDecompressionError
+from .exceptions import (
+    TzstArchiveError,
+    TzstDecompressionError,
+    TzstMemoryLimitError,
+)
 
 
 class ConflictResolution(Enum):
@@ -69,6 +86,58 @@ class ConflictResolutionState:
             self.global_resolution = resolution
 
 
+class Durability(Enum):
+    """How hard to try to get written files onto stable storage.
+
+    - ``NONE``: leave it to the operating system (fastest)
+    - ``BATCH``: flush everything once the operation finishes, using
+      ``syncfs`` where available and parallel ``fsync`` calls otherwise
+    - ``STRICT``: ``fsync`` every file and its directory as soon as it is
+      written, so each finished file survives a crash
+    """
+
+    NONE = "none"
+    BATCH = "batch"
+    STRICT = "strict"
+
+
+def _durability(value: "Durability | str") -> Durability:
+    """Convert a durability name to :class:`Durability`."""
+    try:
+        return Durability(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid durability {value!r}. Must be one of: "
+            + ", ".join(d.value for d in Durability)
+        ) from None
+
+
+class DuplicatePolicy(Enum):
+    """What to do with members that appear in more than one merged archive.
+
+    - ``KEEP``: keep every copy; like tar, extraction ends up with the last
+    - ``FIRST``: keep only the first copy of each name
+    - ``LAST``: keep only the last copy of each name
+    - ``ERROR``: refuse to merge archives that share a name
+    """
+
+    KEEP = "keep"
+    FIRST = "first"
+    LAST = "last"
+    ERROR = "error"
+
+
+def _duplicate_policy(value: "DuplicatePolicy | str") -> DuplicatePolicy:
+    """Convert a duplicate policy name to :class:`DuplicatePolicy`."""
+    try:
+        return DuplicatePolicy(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid duplicate policy {value!r}. Must be one of: "
+            + ", ".join(p.value for p in DuplicatePolicy)
+        ) from None
+
+
 def _get_unique_filename(file_path: Path) -> Path:
     """Generate a unique filename by appending a number if the file exists."""
     if not file_path.exists():
@@ -87,6 +156,561 @@ def _get_unique_filename(file_path: Path) -> Path:
         counter += 1
 
 
+def _split_suffix(name: str) -> tuple[str, str]:
+    """Split *name* into stem and suffix the way :class:`pathlib.Path` does."""
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ""
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a path glob into a regular expression.
+
+    Unlike :mod:`fnmatch`, wildcards respect path separators: ``*`` and ``?``
+    never match ``/``, while ``**`` matches across directories (``a/**/b``
+    also matches ``a/b``). Character classes such as ``[0-9]`` and ``[!x]``
+    are supported.
+    """
+    parts: list[str] = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == "*":
+            if pattern.startswith("**", i):
+                i += 2
+                if pattern.startswith("/", i):
+                    # "**/" matches zero or more whole directories
+                    parts.append("(?:.*/)?")
+                    i += 1
+                else:
+                    parts.append(".*")
+                continue
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) else i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return "".join(parts)
+
+
+def _glob_literal_prefix(pattern: str) -> str:
+    """Return the part of *pattern* before its first wildcard."""
+    match = re.search(r"[*?\[]", pattern)
+    return pattern[: match.start()] if match else pattern
+
+
+def _compile_patterns(
+    patterns: Iterable[str | re.Pattern[str]] | None,
+) -> list[re.Pattern[str]]:
+    """Compile globs into one alternation; regex objects are kept as given."""
+    if not patterns:
+        return []
+    globs = []
+    compiled = []
+    for pattern in patterns:
+        if isinstance(pattern, re.Pattern):
+            compiled.append(pattern)
+        else:
+            globs.append(f"(?:{_glob_to_regex(pattern.rstrip('/'))})")
+    if globs:
+        compiled.insert(0, re.compile("|".join(globs)))
+    return compiled
+
+
+class _MemberMatcher:
+    """Decide which archive members to extract.
+
+    A member is selected when it is named in ``names`` or matches an
+    ``include`` pattern (everything is selected when neither is given), and
+    it does not match an ``exclude`` pattern. Strings are path globs (see
+    :func:`_glob_to_regex`), compiled :class:`re.Pattern` objects are matched
+    as regular expressions against the whole member name.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str] | None = None,
+        include: Iterable[str | re.Pattern[str]] | None = None,
+        exclude: Iterable[str | re.Pattern[str]] | None = None,
+    ):
+        self._names = {name.rstrip("/") for name in names} if names else set()
+        self._include = _compile_patterns(include)
+        self._exclude = _compile_patterns(exclude)
+        # Exact names can only be exhausted when no pattern can match later;
+        # until count_copies() is called, each is expected once
+        self._remaining = (
+            dict.fromkeys(self._names, 1) if self._names and not self._include else None
+        )
+
+    @property
+    def exhausted(self) -> bool:
+        """True once no later member can be selected."""
+        return self._remaining is not None and not self._remaining
+
+    def count_copies(self, members: Iterable[tarfile.TarInfo]) -> None:
+        """Expect every copy of the requested names before becoming exhausted.
+
+        A later copy of a member replaces an earlier one on extraction, as
+        with tar. Without the member list, in streaming mode, only the first
+        copy of a name found more than once is read, like ``tar
+        --occurrence``.
+        """
+        if self._remaining is None:
+            return
+        copies: dict[str, int] = {}
+        for member in members:
+            name = member.name.rstrip("/")
+            if name in self._remaining:
+                copies[name] = copies.get(name, 0) + 1
+        self._remaining = copies
+
+    def __call__(self, name: str) -> bool:
+        name = name.rstrip("/")
+        if self._remaining is not None and name in self._remaining:
+            self._remaining[name] -= 1
+            if not self._remaining[name]:
+                del self._remaining[name]
+        if any(regex.fullmatch(name) for regex in self._exclude):
+            return False
+        if not self._names and not self._include:
+            return True
+        return name in self._names or any(
+            regex.fullmatch(name) for regex in self._include
+        )
+
+    def select(self, members: Iterable[tarfile.TarInfo]):
+        """Yield the selected members, stopping as soon as none can follow."""
+        for member in members:
+            if self(member.name):
+                yield member
+            if self.exhausted:
+                # Don't read (and decompress) past the last wanted member
+                return
+
+
+class _IgnoreRules:
+    """Precompiled path rules in ``.gitignore`` syntax.
+
+    Patterns without a slash match a name at any depth (``node_modules``,
+    ``*.pyc``), patterns containing one are anchored to *base* (``/build``,
+    ``docs/_build``), a trailing slash matches directories only and a leading
+    ``!`` re-includes a path excluded by an earlier rule. The last matching
+    rule wins. Rules are immutable; :meth:`extended` returns a new set, so
+    nested ``.gitignore`` files only affect their own subtree.
+    """
+
+    def __init__(self, rules: tuple[tuple[re.Pattern[str], bool, bool], ...] = ()):
+        self._rules = rules
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def extended(self, lines: Iterable[str], base: str = "") -> "_IgnoreRules":
+        """Return a copy with *lines* added, anchored at archive path *base*."""
+        prefix = re.escape(base.rstrip("/") + "/") if base else ""
+        rules = list(self._rules)
+        for line in lines:
+            pattern = line.rstrip("\n\r")
+            if not pattern.strip() or pattern.startswith("#"):
+                continue
+            pattern = pattern.rstrip(" ")
+            negate = pattern.startswith("!")
+            if negate:
+                pattern = pattern[1:]
+            elif pattern.startswith(("\\#", "\\!")):
+                pattern = pattern[1:]
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if not pattern:
+                continue
+            anchored = "/" in pattern
+            regex = prefix + ("" if anchored else "(?:.*/)?")
+            regex += _glob_to_regex(pattern.lstrip("/"))
+            rules.append((re.compile(regex), negate, dir_only))
+        return _IgnoreRules(tuple(rules))
+
+    def match(self, path: str, is_dir: bool) -> bool:
+        """Return True if *path* (an archive name) matches the rules."""
+        for regex, negate, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(path):
+                return not negate
+        return False
+
+
+class _TreeFilter:
+    """Walk input paths for archive creation, skipping excluded entries.
+
+    Excluded directories are pruned before they are entered, so nothing
+    below them is listed or stat'ed. Entries are yielded in the same order
+    as :meth:`tarfile.TarFile.add`. With include patterns, only matching
+    non-directories are kept and directories are emitted lazily, right
+    before the first entry stored beneath them.
+    """
+
+    def __init__(
+        self,
+        exclude: Iterable[str] | None = None,
+        include: Iterable[str] | None = None,
+        respect_gitignore: bool = False,
+    ):
+        exclude_lines = list(exclude or [])
+        if respect_gitignore:
+            exclude_lines.insert(0, ".git/")
+        self._exclude = _IgnoreRules().extended(exclude_lines)
+        self._include = _IgnoreRules().extended(include) if include else None
+        self._respect_gitignore = respect_gitignore
+        self._root_rules: dict[Path, _IgnoreRules] = {}
+
+    def _with_gitignore(
+        self, rules: _IgnoreRules, directory: Path, base: str
+    ) -> _IgnoreRules:
+        if not self._respect_gitignore:
+            return rules
+        try:
+            with open(directory / ".gitignore", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return rules
+        return rules.extended(lines, base)
+
+    def walk(self, path: Path, arcname: str) -> Iterator[tuple[Path, str]]:
+        """Yield the ``(path, arcname)`` pairs to store for one input path."""
+        # Rules from the .gitignore next to the input apply to the input itself
+        root = path
+        for _ in arcname.split("/"):
+            root = root.parent
+        if root not in self._root_rules:
+            self._root_rules[root] = self._with_gitignore(self._exclude, root, "")
+        rules = self._root_rules[root]
+
+        is_dir = path.is_dir() and not path.is_symlink()
+        if rules.match(arcname, is_dir):
+            return
+        if is_dir:
+            yield from self._walk_dir(path, arcname, rules, [])
+        elif self._include is None or self._include.match(arcname, False):
+            yield path, arcname
+
+    def _walk_dir(
+        self,
+        path: Path,
+        arcname: str,
+        rules: _IgnoreRules,
+        pending: list[tuple[Path, str]],
+    ) -> Iterator[tuple[Path, str]]:
+        rules = self._with_gitignore(rules, path, arcname)
+        pending.append((path, arcname))
+        if self._include is None:
+            yield from pending
+            pending.clear()
+
+        with os.scandir(path) as it:
+            children = sorted(it, key=lambda entry: entry.name)
+        for entry in children:
+            child_arcname = f"{arcname}/{entry.name}"
+            # DirEntry.is_dir uses the type from the directory listing, no stat
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if rules.match(child_arcname, is_dir):
+                continue
+            if is_dir:
+                yield from self._walk_dir(
+                    Path(entry.path), child_arcname, rules, pending
+                )
+            elif self._include is None or self._include.match(child_arcname, False):
+                yield from pending
+                pending.clear()
+                yield Path(entry.path), child_arcname
+
+        if pending and pending[-1][1] == arcname:
+            # Nothing below this directory was included
+            pending.pop()
+
+
+def _fsync_path(path: Path) -> None:
+    """Flush a file's or directory's data and metadata to stable storage."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Windows cannot open directories; their entries need no fsync there
+        if path.is_dir():
+            return
+        raise
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Some filesystems cannot fsync directories
+        if not path.is_dir():
+            raise
+    finally:
+        os.close(fd)
+
+
+def _syncfs(path: Path) -> bool:
+    """Flush the whole filesystem holding *path*; False if not possible."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import ctypes
+
+    try:
+        syncfs = ctypes.CDLL(None, use_errno=True).syncfs
+    except (AttributeError, OSError):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return syncfs(fd) == 0
+    finally:
+        os.close(fd)
+
+
+def _commit_file(temp_path: Path, target_path: Path, durability: Durability) -> None:
+    """Move a finished temporary file into place, durably unless NONE.
+
+    Without the fsync calls a crash shortly after the rename can leave an
+    empty file, or the old one, at *target_path*. A file that is replaced
+    keeps its permissions rather than taking mkstemp's 0600.
+    """
+    with contextlib.suppress(FileNotFoundError):
+        shutil.copymode(target_path, temp_path)
+    if durability is not Durability.NONE:
+        _fsync_path(temp_path)
+    temp_path.replace(target_path)
+    if durability is not Durability.NONE:
+        _fsync_path(target_path.parent)
+
+
+def _iter_files(root: Path) -> Iterator[Path]:
+    """Yield the files below *root*, top-down, without a stat per entry."""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        # Read the directory fully first; callers move files out of it
+        with os.scandir(directory) as it:
+            entries = list(it)
+        subdirectories = []
+        for entry in entries:
+            if entry.is_file():
+                yield Path(entry.path)
+            elif entry.is_dir(follow_symlinks=False):
+                subdirectories.append(Path(entry.path))
+        pending.extend(reversed(subdirectories))
+
+
+class _DestinationCache:
+    """Extraction-scoped view of which paths exist below the destination.
+
+    Each directory is listed once with :func:`os.scandir` the first time a
+    path inside it is checked, so conflict detection is a set lookup rather
+    than a ``stat`` per member, and directories created during the
+    extraction are remembered instead of being created again. Changes made
+    by other processes while extracting are not seen.
+    """
+
+    def __init__(self):
+        # Paths are plain absolute strings; pathlib is too slow per member
+        self._listings: dict[str, set[str] | None] = {}
+        self._directories: set[str] = set()
+        # Highest N of the stem_N.suffix names per (directory, stem, suffix)
+        self._rename_counters: dict[tuple[str, str, str], int] = {}
+        self._counted: set[str] = set()
+
+    @staticmethod
+    def _key(name: str) -> str:
+        # Case-insensitive filesystems report a conflict for any casing
+        if sys.platform in ("win32", "darwin"):
+            return name.casefold()
+        return name
+
+    def _listing(self, directory: str) -> set[str] | None:
+        """Return the entry names of *directory*, or None if it is missing."""
+        try:
+            return self._listings[directory]
+        except KeyError:
+            pass
+        try:
+            with os.scandir(directory) as entries:
+                listing = {self._key(entry.name) for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            listing = None
+        self._listings[directory] = listing
+        return listing
+
+    def exists(self, path: str | Path) -> bool:
+        """Return True if *path* exists (like ``Path.exists`` without a stat)."""
+        path = os.path.abspath(path)
+        if path in self._directories:
+            return True
+        parent, name = os.path.split(path)
+        listing = self._listing(parent)
+        return listing is not None and self._key(name) in listing
+
+    def mkdir(self, directory: str | Path) -> None:
+        """Create *directory* and its parents unless already done."""
+        directory = os.path.abspath(directory)
+        if directory in self._directories:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self.added(directory)
+        while directory not in self._directories:
+            self._directories.add(directory)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+    def added(self, path: str | Path) -> None:
+        """Record that *path*, and any parents created with it, now exist."""
+        path = os.path.abspath(path)
+        while path not in self._directories:
+            parent, name = os.path.split(path)
+            if parent == path:
+                break
+            listing = self._listings.get(parent)
+            if listing is not None:
+                listing.add(self._key(name))
+                break
+            # The parent was missing when listed, or never listed; an
+            # ancestor listed earlier may still lack it
+            self._listings.pop(parent, None)
+            path = parent
+
+    def removed(self, path: str | Path) -> None:
+        """Record that *path* has been deleted."""
+        parent, name = os.path.split(os.path.abspath(path))
+        listing = self._listings.get(parent)
+        if listing is not None:
+            listing.discard(self._key(name))
+
+    def _count_renamed(self, directory: str, listing: set[str]) -> None:
+        """Seed the rename counters of *directory* from its listing."""
+        self._counted.add(directory)
+        for name in listing:
+            stem, suffix = _split_suffix(name)
+            base, sep, number = stem.rpartition("_")
+            if sep and number.isascii() and number.isdigit():
+                key = (directory, base, suffix)
+                self._rename_counters[key] = max(
+                    self._rename_counters.get(key, 0), int(number)
+                )
+
+    def reserve_unique(self, path: str | Path) -> Path:
+        """Create and return a free ``stem_N.suffix`` sibling of *path*.
+
+        The next number comes from a per-directory counter instead of probing
+        ``stem_1``, ``stem_2``, ... one ``stat`` at a time. The name is
+        claimed with an ``O_EXCL`` create, so a file created concurrently
+        by another process is never overwritten; the caller replaces the
+        empty placeholder with the extracted data.
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        listing = self._listing(directory) or set()
+        if directory not in self._counted:
+            self._count_renamed(directory, listing)
+
+        stem, suffix = _split_suffix(name)
+        key = (directory, self._key(stem), self._key(suffix))
+        number = self._rename_counters.get(key, 0)
+        while True:
+            number += 1
+            candidate = f"{stem}_{number}{suffix}"
+            if self._key(candidate) in listing:
+                continue
+            candidate_path = os.path.join(directory, candidate)
+            try:
+                fd = os.open(
+                    candidate_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666
+                )
+            except FileExistsError:
+                continue
+            os.close(fd)
+            break
+        self._rename_counters[key] = number
+        self.added(candidate_path)
+        return Path(candidate_path)
+
+    def discard(self, path: str | Path) -> None:
+        """Delete a placeholder from :meth:`reserve_unique` that was not filled."""
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        self.removed(path)
+
+
+class _ExtractionSync:
+    """Apply a :class:`Durability` policy to the files an extraction writes."""
+
+    def __init__(self, durability: Durability, root: Path):
+        self.durability = durability
+        self.root = Path(os.path.abspath(root))
+        self._files: list[Path] = []
+        self._directories: set[Path] = set()
+
+    def _new_directories(self, path: Path) -> list[Path]:
+        """Return the not yet recorded directories whose entries led to *path*."""
+        directories = []
+        parent = path.parent
+        while parent not in self._directories:
+            self._directories.add(parent)
+            directories.append(parent)
+            # The root's parent gains an entry too if the root was created
+            if parent == self.root.parent or parent == parent.parent:
+                break
+            parent = parent.parent
+        return directories
+
+    def written(self, path: Path, fileobj: BinaryIO | None = None) -> None:
+        """Record a regular file that has just been extracted to *path*."""
+        if self.durability is Durability.NONE:
+            return
+        path = Path(os.path.abspath(path))
+        if self.durability is Durability.BATCH:
+            self._files.append(path)
+            self._new_directories(path)
+            return
+
+        if fileobj is not None:
+            fileobj.flush()
+            os.fsync(fileobj.fileno())
+        else:
+            _fsync_path(path)
+        # The parent always gains a new entry; other ancestors only once
+        for directory in {path.parent, *self._new_directories(path)}:
+            _fsync_path(directory)
+
+    def finish(self) -> None:
+        """Flush everything recorded in BATCH mode."""
+        if not self._files:
+            return
+        # One syncfs per filesystem replaces an fsync per file
+        devices: dict[int, Path] = {}
+        for directory in self._directories:
+            devices.setdefault(os.stat(directory).st_dev, directory)
+        if all(_syncfs(directory) for directory in devices.values()):
+            self._files.clear()
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor() as pool:
+            # Files before directories, so no entry is persisted before its data
+            list(pool.map(_fsync_path, self._files))
+            list(pool.map(_fsync_path, self._directories))
+        self._files.clear()
+
+
 def _move_file_cross_platform(src: Path, dst: Path) -> None:
     """Move a file from src to dst, handling cross-drive moves on Windows."""
     try:
@@ -109,6 +733,7 @@ def _handle_file_conflict(
     target_path: Path,
     resolution: ConflictResolution | str,
     interactive_callback: Callable[[Path], ConflictResolution] | None = None,
+    destination: "_DestinationCache | None" = None,
 ) -> tuple[ConflictResolution, Path | None]:
     """
     Handle file conflicts during extraction.
@@ -117,6 +742,8 @@ def _handle_file_conflict(
         target_path: The path where a conflict occurred
         resolution: The conflict resolution strategy
         interactive_callback: Optional callback for interactive resolution
+        destination: Extraction cache used to allocate and reserve renamed
+                     paths; without it the next free name is probed on disk
 
     Returns:
         Tuple of (actual_resolution, final_path)"""
@@ -143,6 +770,8 @@ def _handle_file_conflict(
         ConflictResolution.AUTO_RENAME,
         ConflictResolution.AUTO_RENAME_ALL,
     ):
+        if destination is not None:
+            return resolution, destination.reserve_unique(target_path)
         unique_path = _get_unique_filename(target_path)
         return resolution, unique_path
     elif resolution == ConflictResolution.EXIT:
@@ -152,15 +781,1002 @@ def _handle_file_conflict(
         return ConflictResolution.REPLACE, target_path
 
 
+#: Chunk size used when copying member data.
+_COPY_BUFSIZE = 1024 * 1024
+#: Members at least this large are preallocated and get page cache hints.
+_HINT_THRESHOLD = 8 * 1024 * 1024
+#: Extracted data is dropped from the page cache every this many bytes.
+_DROP_BEHIND_WINDOW = 64 * 1024 * 1024
+
+
+def _data_regions(fileobj: BinaryIO, size: int) -> list[tuple[int, int]] | None:
+    """Return the ``(offset, length)`` data regions of a file with holes.
+
+    Uses ``SEEK_DATA``/``SEEK_HOLE``, so only the file's extent map is read.
+    Returns None for files without holes, file objects that are not plain
+    files positioned at their start, and platforms or filesystems that do
+    not report holes. A file ending in a hole gets a final zero-length region
+    at *size*, as GNU tar writes it.
+    """
+    if not hasattr(os, "SEEK_HOLE") or size == 0:
+        return None
+    try:
+        fd = fileobj.fileno()
+        if os.lseek(fd, 0, os.SEEK_CUR) != 0 or os.fstat(fd).st_size != size:
+            return None
+        first_hole = os.lseek(fd, 0, os.SEEK_HOLE)
+        os.lseek(fd, 0, os.SEEK_SET)
+    except (OSError, AttributeError, ValueError):
+        return None
+    if first_hole >= size:
+        return None
+
+    regions: list[tuple[int, int]] = []
+    position = 0
+    try:
+        while position < size:
+            try:
+                data = os.lseek(fd, position, os.SEEK_DATA)
+            except OSError:
+                # ENXIO: only a hole remains up to the end of the file
+                break
+            if data >= size:
+                break
+            hole = min(os.lseek(fd, data, os.SEEK_HOLE), size)
+            regions.append((data, hole - data))
+            position = hole
+    except OSError:
+        return None
+    finally:
+        os.lseek(fd, 0, os.SEEK_SET)
+
+    if not regions or regions[-1][0] + regions[-1][1] < size:
+        regions.append((size, 0))
+    return regions
+
+
+class _SparseSource:
+    """Stored data of a PAX 1.0 sparse member: the sparse map, then the data."""
+
+    def __init__(
+        self, fileobj: BinaryIO, regions: list[tuple[int, int]], map_block: bytes
+    ):
+        self._fileobj = fileobj
+        self._regions = iter(regions)
+        self._pending = map_block
+        self._remaining = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        wanted = size if size >= 0 else float("inf")
+        while wanted > 0:
+            if self._pending:
+                chunk = self._pending[: int(min(wanted, len(self._pending)))]
+                self._pending = self._pending[len(chunk) :]
+            elif self._remaining:
+                chunk = self._fileobj.read(int(min(wanted, self._remaining)))
+                if not chunk:
+                    break
+                self._remaining -= len(chunk)
+            else:
+                region = next(self._regions, None)
+                if region is None:
+                    break
+                self._fileobj.seek(region[0])
+                self._remaining = region[1]
+                continue
+            chunks.append(chunk)
+            wanted -= len(chunk)
+        return b"".join(chunks)
+
+
+def _sparse_member(
+    tarinfo: tarfile.TarInfo, fileobj: BinaryIO, regions: list[tuple[int, int]]
+) -> tuple[tarfile.TarInfo, _SparseSource]:
+    """Describe a file with holes as a GNU PAX 1.0 sparse member.
+
+    The data block starts with the sparse map (region count, then offset and
+    length of each region, newline separated and padded to a full block)
+    followed by the data regions only. The header name follows GNU tar's
+    ``GNUSparseFile.0`` convention so tools without sparse support don't
+    overwrite the real file with the encoded data.
+    """
+    numbers = [len(regions), *(n for region in regions for n in region)]
+    map_block = "".join(f"{n}\n" for n in numbers).encode("ascii")
+    map_block += tarfile.NUL * (-len(map_block) % tarfile.BLOCKSIZE)
+
+    dirname, basename = posixpath.split(tarinfo.name)
+    stored = copy.copy(tarinfo)
+    stored.name = posixpath.join(dirname, "GNUSparseFile.0", basename)
+    stored.size = len(map_block) + sum(length for _, length in regions)
+    # "path" (and "size", needed above 8 GiB) go first so that the sparse
+    # name and real size, which follow, win when readers apply them in order
+    pax_headers = {"path": stored.name}
+    if stored.size >= 8**11:
+        pax_headers["size"] = str(stored.size)
+    stored.pax_headers = {
+        **pax_headers,
+        **tarinfo.pax_headers,
+        "GNU.sparse.major": "1",
+        "GNU.sparse.minor": "0",
+        "GNU.sparse.name": tarinfo.name,
+        "GNU.sparse.realsize": str(tarinfo.size),
+    }
+    return stored, _SparseSource(fileobj, regions, map_block)
+
+
+# Settings that decide how a compressor encodes, and so which pooled
+# compressors are interchangeable
+_PARAMETER_FIELDS = (
+    "format",
+    "compression_level",
+    "window_log",
+    "hash_log",
+    "chain_log",
+    "search_log",
+    "min_match",
+    "target_length",
+    "strategy",
+    "write_content_size",
+    "write_checksum",
+    "write_dict_id",
+    "job_size",
+    "overlap_log",
+    "force_max_window",
+    "enable_ldm",
+    "ldm_hash_log",
+    "ldm_min_match",
+    "ldm_bucket_size_log",
+    "ldm_hash_rate_log",
+    "threads",
+)
+
+
+def _compressor_key(
+    level: int,
+    threads: int = 0,
+    params: zstd.ZstdCompressionParameters | None = None,
+    dictionary: zstd.ZstdCompressionDict | None = None,
+) -> tuple:
+    if params is not None:
+        # Parameter objects compare by identity; their values do not
+        return (
+            "compressor",
+            tuple(getattr(params, field) for field in _PARAMETER_FIELDS),
+            dictionary,
+        )
+    return ("compressor", level, threads, dictionary)
+
+
+def _new_compressor(
+    level: int,
+    threads: int = 0,
+    params: zstd.ZstdCompressionParameters | None = None,
+    dictionary: zstd.ZstdCompressionDict | None = None,
+) -> zstd.ZstdCompressor:
+    if params is not None:
+        return zstd.ZstdCompressor(dict_data=dictionary, compression_params=params)
+    return zstd.ZstdCompressor(
+        level=level, dict_data=dictionary, write_content_size=True, threads=threads
+    )
+
+
+class ContextPool:
+    """Idle zstd contexts kept for the next archive that needs the same settings.
+
+    Creating a context allocates its tables, which at high compression levels
+    costs more than compressing a small archive. Contexts are pooled under
+    their compression level, parameters and dictionary: a context serves one
+    stream at a time and goes back to the pool when its stream is finished.
+    The pool is safe to share between threads.
+
+    Archives draw from a pool passed as their ``context_pool`` argument, or
+    from the pool activated on the current thread, which also covers the
+    convenience functions.
+
+    Args:
+        max_idle: Idle contexts kept for each combination of settings; the
+                  number of threads sharing the pool is a good choice
+
+    Example:
+        >>> pool = ContextPool()
+        >>> with pool.activate():
+        ...     healthy = [test_archive(path) for path in paths]
+        >>> with pool.compressor(level=19) as cctx:
+        ...     frame = cctx.compress(data)
+    """
+
+    def __init__(self, max_idle: int = 4):
+        if max_idle < 0:
+            raise ValueError(f"Invalid idle context count '{max_idle}'.")
+        self._max_idle = max_idle
+        self._idle: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: tuple, factory: Callable[[], object]):
+        """Return an idle context stored under *key*, or a new one from *factory*."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        return factory()
+
+    def release(self, key: tuple, context: object) -> None:
+        """Keep *context* for reuse, unless enough are already idle."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(context)
+
+    @contextlib.contextmanager
+    def compressor(
+        self,
+        level: int = 3,
+        *,
+        threads: int = 0,
+        params: zstd.ZstdCompressionParameters | None = None,
+        dictionary: zstd.ZstdCompressionDict | None = None,
+    ) -> Iterator[zstd.ZstdCompressor]:
+        """Borrow a compressor for the duration of a ``with`` block.
+
+        Args:
+            level: Compression level, unless *params* are given
+            threads: zstd worker threads, unless *params* are given
+            params: Full compression parameters, e.g. for long distance matching
+            dictionary: Compression dictionary
+
+        The compressor writes the content size into its frames, like those of
+        :class:`TzstArchive`, unless *params* say otherwise.
+        """
+        key = _compressor_key(level, threads, params, dictionary)
+        context = self.acquire(
+            key, lambda: _new_compressor(level, threads, params, dictionary)
+        )
+        try:
+            yield context
+        finally:
+            self.release(key, context)
+
+    @contextlib.contextmanager
+    def decompressor(
+        self, *, dictionary: zstd.ZstdCompressionDict | None = None
+    ) -> Iterator[zstd.ZstdDecompressor]:
+        """Borrow a decompressor for the duration of a ``with`` block."""
+        key = ("decompressor", dictionary)
+        context = self.acquire(key, lambda: zstd.ZstdDecompressor(dict_data=dictionary))
+        try:
+            yield context
+        finally:
+            self.release(key, context)
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["ContextPool"]:
+        """Let archives opened on this thread within the block use this pool."""
+        previous = getattr(_job, "context_pool", None)
+        _job.context_pool = self
+        try:
+            yield self
+        finally:
+            _job.context_pool = previous
+
+    def clear(self) -> None:
+        """Free all idle contexts."""
+        with self._lock:
+            self._idle.clear()
+
+
+# Per-thread settings of the job running on a worker thread: the context
+# pool archives draw from and a callback told about every member
+_job = threading.local()
+
+
+@contextlib.contextmanager
+def _job_scope(
+    context_pool: ContextPool | None = None,
+    progress: Callable[[tarfile.TarInfo], None] | None = None,
+) -> Iterator[None]:
+    """Let archives opened on this thread reuse contexts and report progress.
+
+    *progress* is called with each member as it is read from or written to
+    an archive; an exception it raises aborts the operation.
+    """
+    previous = getattr(_job, "context_pool", None), getattr(_job, "progress", None)
+    _job.context_pool, _job.progress = context_pool, progress
+    try:
+        yield
+    finally:
+        _job.context_pool, _job.progress = previous
+
+
+def _report_progress(tarinfo: tarfile.TarInfo) -> None:
+    """Pass a member to the progress callback of the current thread's job."""
+    progress = getattr(_job, "progress", None)
+    if progress is not None:
+        progress(tarinfo)
+
+
+#: Smallest memory limit accepted; the buffers of a copy would not fit below it.
+_MIN_MEMORY_LIMIT = 16 * 1024 * 1024
+#: zstd's smallest window, hash and chain table sizes (log2)
+_MIN_WINDOW_LOG = 10
+_MIN_TABLE_LOG = 6
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):g} MiB"
+
+
+class _MemoryBudget:
+    """How the memory limit of one operation is shared between its buffers.
+
+    A quarter goes to the window of the zstd decompressor and a quarter to
+    decompressed data kept in memory for random access, which beyond that
+    spills to a temporary file. Compression contexts get half; copy buffers
+    and read-ahead queues are kept to a few small chunks.
+    """
+
+    def __init__(self, limit: int):
+        if limit < _MIN_MEMORY_LIMIT:
+            raise ValueError(
+                f"Invalid memory limit '{limit}'. "
+                f"Must be at least {_MIN_MEMORY_LIMIT} bytes."
+            )
+        self.limit = limit
+        self.window = limit // 4
+        self.spill = limit // 4
+        self.chunk = min(_COPY_BUFSIZE, limit // 32)
+        self.queue_depth = max(1, min(4, limit // 16 // self.chunk))
+
+    def check_window(self, window_size: int | None, name: str) -> None:
+        """Fail before decompressing if a frame's window does not fit."""
+        if window_size is not None and window_size > self.window:
+            raise TzstMemoryLimitError(
+                f"{name} needs a {_mib(window_size)} window to decompress, more "
+                f"than a memory limit of {_mib(self.limit)} allows "
+                f"({_mib(self.window)})"
+            )
+
+    def window_error(self, name: str) -> TzstMemoryLimitError:
+        """Return the error for a frame whose window zstd refused to allocate."""
+        return TzstMemoryLimitError(
+            f"{name} has a zstd frame that needs a larger window than a memory "
+            f"limit of {_mib(self.limit)} allows ({_mib(self.window)})"
+        )
+
+    def compression_params(
+        self, level: int, threads: int = 0, **overrides
+    ) -> zstd.ZstdCompressionParameters:
+        """Return compression parameters for *level* that fit in the budget.
+
+        The window, hash and chain tables shrink together until the window
+        fits in a quarter of the limit and the context in half; worker
+        threads, each with a context of its own and buffers for a job of
+        about four windows, are then limited to what is left.
+        """
+        if threads < 0:
+            threads = os.cpu_count() or 1
+        base = zstd.ZstdCompressionParameters.from_level(level, **overrides)
+        logs = {
+            "window_log": base.window_log,
+            "hash_log": base.hash_log,
+            "chain_log": base.chain_log,
+        }
+        share = self.limit // 2
+        while True:
+            if overrides.get("enable_ldm"):
+                # zstd's own long-distance defaults, which its estimate needs
+                # spelled out
+                logs["ldm_hash_log"] = max(logs["window_log"] - 7, _MIN_TABLE_LOG)
+                logs["ldm_hash_rate_log"] = logs["window_log"] - logs["ldm_hash_log"]
+                logs.setdefault("ldm_bucket_size_log", 3)
+                logs.setdefault("ldm_min_match", 64)
+            # zstd cannot estimate multi-threaded contexts; count them per thread
+            context = zstd.ZstdCompressionParameters.from_level(
+                level, **{**overrides, **logs}
+            ).estimated_compression_context_size()
+            if (1 << logs["window_log"]) <= self.window and context <= share:
+                break
+            if logs["window_log"] <= _MIN_WINDOW_LOG:
+                raise TzstMemoryLimitError(
+                    f"Compression level {level} does not fit in a memory limit "
+                    f"of {_mib(self.limit)}"
+                )
+            for name in ("window_log", "hash_log", "chain_log"):
+                logs[name] = max(logs[name] - 1, _MIN_TABLE_LOG)
+            logs["window_log"] = max(logs["window_log"], _MIN_WINDOW_LOG)
+        threads = min(threads, share // (context + (4 << logs["window_log"])))
+        return zstd.ZstdCompressionParameters.from_level(
+            level, **{**overrides, **logs}, threads=threads
+        )
+
+
+def _first_window_size(fileobj: BinaryIO) -> int | None:
+    """Return the window size of the first zstd frame in a seekable file.
+
+    Skippable frames are passed over and the position is left unchanged.
+    Returns None if the file cannot be peeked into or holds no valid frame,
+    which decompression reports by itself.
+    """
+    if not _is_seekable(fileobj):
+        return None
+    start = position = fileobj.tell()
+    try:
+        while True:
+            fileobj.seek(position)
+            head = fileobj.read(_FRAME_HEADER_MAX)
+            if (
+                len(head) >= 8
+                and head[1:4] == b"\x2a\x4d\x18"
+                and head[0] & 0xF0 == 0x50
+            ):
+                position += 8 + int.from_bytes(head[4:8], "little")
+                continue
+            try:
+                return zstd.get_frame_parameters(head).window_size
+            except zstd.ZstdError:
+                return None
+    finally:
+        fileobj.seek(start)
+
+
+def _is_window_error(error: BaseException) -> bool:
+    """Return True for zstd's refusal to decode a frame with too large a window."""
+    return "too much memory" in str(error)
+
+
+class _BudgetedReader:
+    """Decompression stream that reports frames too large for a memory limit.
+
+    Only the first frame is checked before reading; zstd refuses later ones
+    with a generic error, which is turned into :class:`TzstMemoryLimitError`.
+    """
+
+    def __init__(self, reader: BinaryIO, budget: _MemoryBudget, name: str):
+        self._reader = reader
+        self._budget = budget
+        self._name = name
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            return self._reader.read(size)
+        except zstd.ZstdError as e:
+            if _is_window_error(e):
+                raise self._budget.window_error(self._name) from e
+            raise
+
+    def close(self) -> None:
+        self._reader.close()
+
+
+class _TzstTarInfo(tarfile.TarInfo):
+    """TarInfo that reads large PAX 1.0 sparse members correctly.
+
+    :mod:`tarfile` computes the position of the next header from the real
+    (expanded) size when a sparse member also has a ``size`` record, which
+    is the case once the stored data reaches 8 GiB.
+    """
+
+    def _proc_gnusparse_10(self, next, pax_headers, tarfile):
+        next._sparse_data_start = next.offset_data
+        super()._proc_gnusparse_10(next, pax_headers, tarfile)
+
+    def _proc_pax(self, tarfile):
+        next = super()._proc_pax(tarfile)
+        start = getattr(next, "_sparse_data_start", None)
+        if start is not None and "size" in next.pax_headers:
+            stored_size = int(next.pax_headers["size"])
+            tarfile.offset = start + next._block(stored_size)
+            next.size = int(next.pax_headers["GNU.sparse.realsize"])
+        return next
+
+
+#: Uncompressed bytes after which a zstd frame is ended at the next member
+#: boundary, so editing a member only recompresses the frames around it.
+_MEMBER_FRAME_SIZE = 8 * 1024 * 1024
+
+
+class _TzstTarFile(tarfile.TarFile):
+    """TarFile that stores files with holes as sparse members."""
+
+    tarinfo = _TzstTarInfo
+    #: Detect holes in regular files added from disk
+    sparse = True
+    #: Preallocate large extracted files
+    preallocate = True
+    _copy_buffer: bytearray | None = None
+    #: Tar offset at which the current zstd frame started
+    _frame_start = 0
+
+    def addfile(self, tarinfo, fileobj=None):
+        if self.sparse and fileobj is not None and tarinfo.isreg():
+            regions = _data_regions(fileobj, tarinfo.size)
+            if regions is not None:
+                tarinfo, fileobj = _sparse_member(tarinfo, fileobj, regions)
+        if isinstance(self.fileobj, _VolumeSplitter):
+            self.fileobj.member_start(tarinfo.size if tarinfo.isreg() else 0)
+        super().addfile(tarinfo, fileobj)
+        if (
+            isinstance(self.fileobj, zstd.ZstdCompressionWriter)
+            and self.offset - self._frame_start >= _MEMBER_FRAME_SIZE
+        ):
+            self.fileobj.flush(zstd.FLUSH_FRAME)
+            self._frame_start = self.offset
+        _report_progress(tarinfo)
+
+    def next(self):
+        # The first member is read once on opening and then handed out again
+        cached = self.firstmember is not None
+        tarinfo = super().next()
+        if tarinfo is not None and not cached:
+            _report_progress(tarinfo)
+        return tarinfo
+
+    def close(self):
+        if (
+            not self.closed
+            and self.mode == "w"
+            and isinstance(self.fileobj, zstd.ZstdCompressionWriter | _VolumeSplitter)
+        ):
+            # The end-of-archive blocks get a zstd frame of their own, so
+            # merge_archives() can drop them without recompressing anything
+            self.fileobj.flush(zstd.FLUSH_FRAME)
+        super().close()
+
+    def copy_buffer(self) -> memoryview:
+        """Return the buffer reused for copying member data out."""
+        if self._copy_buffer is None:
+            self._copy_buffer = bytearray(_COPY_BUFSIZE)
+        return memoryview(self._copy_buffer)
+
+    def _extract_member(self, tarinfo, targetpath, *args, **kwargs):
+        # Volumes extracted in parallel may create the same parent directory
+        upperdirs = os.path.dirname(targetpath)
+        if upperdirs:
+            os.makedirs(upperdirs, exist_ok=True)
+        super()._extract_member(tarinfo, targetpath, *args, **kwargs)
+
+    def makefile(self, tarinfo, targetpath):
+        # Used by extract()/extractall(); shares the flat extraction copy path
+        with open(targetpath, "wb") as target:
+            _write_member_data(self, tarinfo, target)
+
+
+def _copy_file_range(source: BinaryIO, target: BinaryIO, length: int, name: str) -> int:
+    """Copy up to *length* bytes between two files inside the kernel.
+
+    Returns the number of bytes copied, which is 0 when either side is not a
+    plain file or the kernel or filesystem cannot copy between them; the
+    caller then copies the rest through a buffer.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return 0
+    try:
+        source_fd, target_fd = source.fileno(), target.fileno()
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+    target.flush()
+    source_pos, target_pos = source.tell(), target.tell()
+    copied = 0
+    try:
+        while copied < length:
+            count = os.copy_file_range(
+                source_fd,
+                target_fd,
+                length - copied,
+                source_pos + copied,
+                target_pos + copied,
+            )
+            if count == 0:
+                raise TzstArchiveError(f"Unexpected end of data in {name}")
+            copied += count
+    except OSError:
+        # EXDEV, ENOSYS, EINVAL...: fall back to copying what is left
+        pass
+    finally:
+        source.seek(source_pos + copied)
+        target.seek(target_pos + copied)
+    return copied
+
+
+def _copy_data(
+    source: BinaryIO, target: BinaryIO, length: int, buffer: memoryview, name: str
+) -> None:
+    """Copy *length* bytes from the current position of *source* to *target*.
+
+    In-memory archives are written straight from their buffer and plain files
+    are copied with ``copy_file_range``. Anything else is read into *buffer*,
+    which is reused for every chunk, so memory use does not depend on the
+    member size.
+    """
+    if isinstance(source, io.BytesIO):
+        start = source.tell()
+        with source.getbuffer() as data:
+            if start + length > len(data):
+                raise TzstArchiveError(f"Unexpected end of data in {name}")
+            target.write(data[start : start + length])
+        source.seek(start + length)
+        return
+
+    length -= _copy_file_range(source, target, length, name)
+    readinto = getattr(source, "readinto", None)
+    while length > 0:
+        chunk = buffer[: min(length, len(buffer))]
+        if readinto is not None:
+            count = readinto(chunk)
+            data = chunk[:count]
+        else:
+            # tarfile's stream wrapper only offers read()
+            data = source.read(len(chunk))
+            count = len(data)
+        if not count:
+            raise TzstArchiveError(f"Unexpected end of data in {name}")
+        target.write(data)
+        length -= count
+
+
+def _prepare_target(
+    tf: "_TzstTarFile", member: tarfile.TarInfo, target: BinaryIO
+) -> int | None:
+    """Preallocate and hint the file a large member is about to be written to.
+
+    Reserving the full size up front lets the filesystem allocate contiguous
+    extents instead of growing the file append by append. Sparse members are
+    not preallocated, which would fill their holes.
+
+    Returns:
+        The target's file descriptor if written data should be dropped from
+        the page cache, otherwise None
+    """
+    if member.size < _HINT_THRESHOLD:
+        return None
+    try:
+        fd = target.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    if tf.preallocate and member.sparse is None and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, member.size)
+        except OSError as e:
+            # Unsupported filesystems are fine; a full disk fails early
+            if e.errno == errno.ENOSPC:
+                raise
+    if not hasattr(os, "posix_fadvise"):
+        return None
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:
+        return None
+    return fd
+
+
+def _drop_written(target: BinaryIO, fd: int) -> None:
+    """Ask the kernel to drop the data written so far from the page cache.
+
+    Pages still being written back stay cached; they are dropped by the next
+    call, so a large restore does not evict everything else.
+    """
+    target.flush()
+    try:
+        os.posix_fadvise(fd, 0, target.tell(), os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
+
+def _write_member_data(
+    tf: "_TzstTarFile", member: tarfile.TarInfo, target: BinaryIO
+) -> None:
+    """Copy a regular member's data into *target*, recreating sparse holes.
+
+    Reads straight from the archive stream like
+    :meth:`tarfile.TarFile.makefile`, which also works in streaming mode.
+    Holes become seeks and a final truncate instead of written zeros.
+    """
+    source = tf.fileobj
+    source.seek(member.offset_data)
+    buffer = tf.copy_buffer()
+    fd = _prepare_target(tf, member, target)
+    for offset, length in member.sparse or [(0, member.size)]:
+        if member.sparse is not None:
+            target.seek(offset)
+        if fd is None:
+            _copy_data(source, target, length, buffer, member.name)
+            continue
+        while length > 0:
+            window = min(length, _DROP_BEHIND_WINDOW)
+            _copy_data(source, target, window, buffer, member.name)
+            _drop_written(target, fd)
+            length -= window
+    if member.sparse is not None:
+        target.truncate(member.size)
+
+
+def _is_seekable(fileobj: BinaryIO) -> bool:
+    """Return True if *fileobj* supports random access."""
+    try:
+        return bool(fileobj.seekable())
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _map_file(fileobj: BinaryIO) -> mmap.mmap | None:
+    """Map an open file read-only, or return None if it cannot be mapped.
+
+    Empty files, pipes and volume readers cannot be mapped.
+    """
+    try:
+        mapping = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        return None
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        # Archives are decompressed front to back: read ahead aggressively
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+    return mapping
+
+
+def _archive_source(archive: "str | Path | BinaryIO") -> dict:
+    """Map a path or binary file object to TzstArchive keyword arguments."""
+    if isinstance(archive, str | os.PathLike):
+        return {"filename": archive}
+    return {"fileobj": archive}
+
+
+#: Magic number of the skippable zstd frame that opens every volume
+_VOLUME_MAGIC = 0x184D2A5B
+#: Volume header payload: tag, volume number, flags
+_VOLUME_HEADER = struct.Struct("<4sIB")
+#: Flag: the volume starts with a member header
+_VOLUME_AT_MEMBER = 1
+_MIN_VOLUME_SIZE = 64 * 1024
+#: Largest uncompressed input per frame in volumes
+_VOLUME_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def _volume_path(path: Path, number: int) -> Path:
+    """Return the path of volume *number* of the archive at *path*."""
+    return path.with_name(f"{path.name}.{number:03d}")
+
+
+def _volume_paths(first: Path) -> list[Path] | None:
+    """Return all volumes of a split archive given its first one (``*.001``).
+
+    Returns None if *first* is not an existing first volume.
+    """
+    if not first.name.endswith(".001"):
+        return None
+    base = first.with_name(first.name[:-4])
+    paths = []
+    while (path := _volume_path(base, len(paths) + 1)).is_file():
+        paths.append(path)
+    return paths or None
+
+
+def _read_volume_header(fileobj: BinaryIO) -> tuple[int, bool] | None:
+    """Read the header of a volume: its number and whether it starts a member.
+
+    Returns None, leaving the file at its start, for volumes without one
+    (such as pieces cut with ``split``).
+    """
+    head = fileobj.read(8 + _VOLUME_HEADER.size)
+    if (
+        len(head) == 8 + _VOLUME_HEADER.size
+        and int.from_bytes(head[:4], "little") == _VOLUME_MAGIC
+    ):
+        tag, number, flags = _VOLUME_HEADER.unpack_from(head, 8)
+        if tag == b"TZVL":
+            return number, bool(flags & _VOLUME_AT_MEMBER)
+    fileobj.seek(0)
+    return None
+
+
+def _split_volumes(path: Path) -> list[Path] | None:
+    """Return the volumes of a split archive, or None for a single file.
+
+    Raises:
+        TzstArchiveError: If *path* is a volume other than the first
+    """
+    volumes = _volume_paths(path)
+    if volumes is not None:
+        return volumes
+    with open(path, "rb") as f:
+        header = _read_volume_header(f)
+    if header is not None:
+        raise TzstArchiveError(
+            f"{path} is volume {header[0]} of a split archive; "
+            "pass its first volume (.001)"
+        )
+    return None
+
+
+class _VolumeReader:
+    """Read the volumes of a split archive as one stream."""
+
+    def __init__(self, paths: list[Path], first: int = 1):
+        self._paths = paths
+        self._first = first
+        self._next = 0
+        self._file: BinaryIO | None = None
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            return b"".join(iter(lambda: self.read(_COPY_BUFSIZE), b""))
+        while True:
+            if self._file is None:
+                if self._next == len(self._paths):
+                    return b""
+                self._open(self._paths[self._next])
+            data = self._file.read(size)
+            if data or not size:
+                return data
+            self._file.close()
+            self._file = None
+
+    def _open(self, path: Path) -> None:
+        self._file = open(path, "rb")
+        self._next += 1
+        # The header frame is skippable; it is only read to check the order
+        header = _read_volume_header(self._file)
+        self._file.seek(0)
+        expected = self._first + self._next - 1
+        if header is not None and header[0] != expected:
+            raise TzstArchiveError(
+                f"{path} is volume {header[0]} of its archive, expected {expected}"
+            )
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _VolumeWriter:
+    """Write zstd frames into the numbered volume files of an archive."""
+
+    def __init__(self, path: Path, volume_size: int):
+        self._path = path
+        self.volume_size = volume_size
+        self.paths: list[Path] = []
+        self.size = 0
+        self._file: BinaryIO | None = None
+
+    def start_volume(self, at_member: bool) -> None:
+        """Close the current volume and open the next one."""
+        self.close()
+        path = _volume_path(self._path, len(self.paths) + 1)
+        self._file = open(path, "wb")
+        self.paths.append(path)
+        payload = _VOLUME_HEADER.pack(
+            b"TZVL", len(self.paths), _VOLUME_AT_MEMBER if at_member else 0
+        )
+        self.size = 0
+        self.write(
+            _VOLUME_MAGIC.to_bytes(4, "little")
+            + len(payload).to_bytes(4, "little")
+            + payload
+        )
+
+    def write(self, data: bytes) -> int:
+        self._file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _frame_bound(size: int) -> int:
+    """Upper bound for the compressed size of a frame of *size* input bytes."""
+    return size + (size >> 7) + 1024
+
+
+class _VolumeSplitter:
+    """Compress a tar stream into volumes that each begin with a new zstd frame.
+
+    A frame ends after at most a quarter of a volume (or 16 MiB) of input,
+    so its compressed size is bounded and a new volume is started whenever
+    the next frame might not fit. A member that does not fit in the rest of
+    a volume but fits in an empty one starts the next volume, so most
+    volumes begin with a member header and can be extracted on their own.
+    """
+
+    def __init__(self, cctx: zstd.ZstdCompressor, volumes: _VolumeWriter):
+        self._volumes = volumes
+        self._writer = cctx.stream_writer(volumes, closefd=False)
+        self._frame_size = min(_VOLUME_FRAME_SIZE, volumes.volume_size // 4)
+        self._pending = 0
+        self._position = 0
+        self._at_member = True
+        volumes.start_volume(at_member=True)
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data: bytes) -> int:
+        view = memoryview(data).cast("B")
+        while view:
+            if not self._pending:
+                self._start_frame()
+            chunk = view[: self._frame_size - self._pending]
+            self._writer.write(chunk)
+            self._pending += len(chunk)
+            self._position += len(chunk)
+            self._at_member = False
+            view = view[len(chunk) :]
+            if self._pending >= self._frame_size:
+                self.flush(zstd.FLUSH_FRAME)
+        return len(data)
+
+    def _start_frame(self) -> None:
+        volumes = self._volumes
+        if volumes.size + _frame_bound(self._frame_size) > volumes.volume_size:
+            volumes.start_volume(self._at_member)
+
+    def member_start(self, size: int) -> None:
+        """Note a member boundary before a member holding *size* bytes of data.
+
+        If the member cannot fit in the rest of this volume but fits in an
+        empty one, the next volume is started here.
+        """
+        self._at_member = True
+        volumes = self._volumes
+        # Headers and padding take at most three blocks besides PAX records
+        needed = size + 3 * tarfile.BLOCKSIZE
+        needed = _frame_bound(needed) + 1024 * (needed // self._frame_size)
+        header = 8 + _VOLUME_HEADER.size
+        fresh = volumes.size == header and not self._pending
+        if (
+            not fresh
+            and volumes.size + _frame_bound(self._pending) + needed
+            > volumes.volume_size
+            and header + needed <= volumes.volume_size
+        ):
+            self.flush(zstd.FLUSH_FRAME)
+            volumes.start_volume(at_member=True)
+
+    def flush(self, flush_mode: int = zstd.FLUSH_BLOCK) -> None:
+        if flush_mode == zstd.FLUSH_FRAME:
+            # Ending a frame without input would write an empty frame
+            if self._pending:
+                self._writer.flush(zstd.FLUSH_FRAME)
+                self._pending = 0
+        else:
+            self._writer.flush(flush_mode)
+
+    def close(self) -> None:
+        self.flush(zstd.FLUSH_FRAME)
+
+
 class TzstArchive:
     """A class for handling .tzst/.tar.zst archives."""
 
+    # Caller-supplied file object; never closed by the archive
+    _external_fileobj: BinaryIO | None = None
+    #: zstd contexts borrowed from a context pool, returned on close
+    _contexts: tuple[tuple[ContextPool, tuple, object], ...] = ()
+    #: Read-only mapping of the archive file when reading with memory_map
+    _mapping: mmap.mmap | None = None
+
     def __init__(
         self,
-        filename: str | Path,
+        filename: str | Path | None = None,
         mode: str = "r",
         compression_level: int = 3,
         streaming: bool = False,
+        fileobj: BinaryIO | None = None,
+        sparse: bool = True,
+        preallocate: bool = True,
+        threads: int = 0,
+        volume_size: int | None = None,
+        context_pool: ContextPool | None = None,
+        memory_map: bool = False,
+        memory_limit: int | None = None,
     ):
         """
         Initialize a TzstArchive.
@@ -172,13 +1788,80 @@ class TzstArchive:
             streaming: If True, use streaming mode for reading (reduces memory usage
                       for very large archives but may limit some tarfile operations
                       that require seeking. Recommended for archives > 100MB)
+            fileobj: Binary file object to read from or write to instead of
+                     ``filename`` (e.g. a socket file, pipe or ``io.BytesIO``).
+                     It is left open when the archive is closed. Streaming mode
+                     is selected automatically for non-seekable sources.
+            sparse: In write mode, store files with holes (VM images, database
+                    files) as GNU sparse members holding only their data
+                    regions. Holes are detected with ``SEEK_DATA``/``SEEK_HOLE``
+                    where the platform supports it. Reading always recreates
+                    holes.
+            preallocate: When extracting members of 8 MiB or more, reserve
+                         their full size with ``posix_fallocate`` before
+                         writing. Such files are also written with
+                         sequential and drop-behind ``posix_fadvise`` hints
+                         so large restores do not evict the page cache.
+            threads: In write mode, the number of zstd worker threads
+                     compressing in parallel with the caller. 0 (default)
+                     compresses on the calling thread, -1 uses one worker
+                     per CPU.
+            volume_size: In write mode, split the archive into volumes of at
+                         most this many bytes, named ``<filename>.001``,
+                         ``.002``, and so on. Every volume starts with a new
+                         zstd frame. To read a split archive, open its first
+                         volume; the others are read after it.
+            context_pool: Pool to borrow the zstd context from and return it
+                          to on close. Defaults to the pool activated on the
+                          calling thread with :meth:`ContextPool.activate`,
+                          if any.
+            memory_map: In read mode, map the archive file into memory and
+                        decompress straight from the mapping instead of
+                        copying it through a file buffer. Volumes, file
+                        objects and files that cannot be mapped are read as
+                        usual.
+            memory_limit: Bytes of memory the archive's buffers may use, at
+                          least 16 MiB. Reading fails with
+                          :class:`~tzst.exceptions.TzstMemoryLimitError` if
+                          the archive needs a zstd window larger than a
+                          quarter of it; in buffered mode, decompressed data
+                          beyond a quarter of it spills to a temporary file.
+                          Writing limits the window and worker threads to
+                          fit, and :meth:`list` and :meth:`test` do not keep
+                          the members they read in streaming mode.
         """
-        self.filename = Path(filename)
+        if filename is None and fileobj is None:
+            raise ValueError("Either filename or fileobj must be provided")
+        if volume_size is not None:
+            if filename is None:
+                raise ValueError("Volumes can only be written to a file name")
+            if volume_size < _MIN_VOLUME_SIZE:
+                raise ValueError(
+                    f"Invalid volume size '{volume_size}'. "
+                    f"Must be at least {_MIN_VOLUME_SIZE} bytes."
+                )
+
+        self.filename = Path(filename) if filename is not None else None
+        self._external_fileobj = fileobj
+        if fileobj is not None and mode.startswith("r") and not _is_seekable(fileobj):
+            # Pipes and sockets can only be read once, front to back
+            streaming = True
         self.mode = mode
         self.compression_level = compression_level
         self.streaming = streaming
+        self.sparse = sparse
+        self.preallocate = preallocate
+        self.threads = threads
+        self.volume_size = volume_size
+        self.context_pool = context_pool
+        self.memory_map = memory_map
+        self.memory_limit = memory_limit
+        self._budget = None if memory_limit is None else _MemoryBudget(memory_limit)
         self._tarfile: tarfile.TarFile | None = None
         self._fileobj: BinaryIO | None = None
+        # Lazily built name -> TarInfo index and sorted names for prefix queries
+        self._member_index: dict[str, tarfile.TarInfo] | None = None
+        self._sorted_names: list[str] = []
         self._compressed_stream: (
             zstd.ZstdCompressionWriter
             | zstd.ZstdDecompressionReader
@@ -229,42 +1912,97 @@ class TzstArchive:
             :meth:`close`: Method to close the archive
         """
         try:
+            # Leave caller-supplied file objects open when the zstd stream closes
+            stream_kwargs = {} if self._external_fileobj is None else {"closefd": False}
+            budget = self._budget
+            chunk_size = _COPY_BUFSIZE if budget is None else budget.chunk
             if self.mode.startswith("r"):
                 # Read mode
-                self._fileobj = open(self.filename, "rb")
-                dctx = zstd.ZstdDecompressor()
+                self._fileobj = source = self._open_fileobj("rb")
+                if budget is not None:
+                    budget.check_window(
+                        _first_window_size(self._fileobj), self._display_name()
+                    )
+                if self.memory_map and self._external_fileobj is None:
+                    self._mapping = _map_file(self._fileobj)
+                    if self._mapping is not None:
+                        source = self._mapping
+                if budget is None:
+                    dctx = self._context(("decompressor", None), zstd.ZstdDecompressor)
+                else:
+                    # Frames further on are held to the limit by zstd itself
+                    dctx = self._context(
+                        ("decompressor", None, budget.window),
+                        lambda: zstd.ZstdDecompressor(max_window_size=budget.window),
+                    )
 
                 if self.streaming:
                     # Streaming mode - use stream reader directly (memory efficient)
                     # Note: This may limit some tarfile operations that require seeking
-                    self._compressed_stream = dctx.stream_reader(self._fileobj)
-                    self._tarfile = tarfile.open(
-                        fileobj=self._compressed_stream, mode="r|"
+                    self._compressed_stream = dctx.stream_reader(
+                        source, read_across_frames=True, **stream_kwargs
+                    )
+                    if budget is not None:
+                        self._compressed_stream = _BudgetedReader(
+                            self._compressed_stream, budget, self._display_name()
+                        )
+                    self._tarfile = _TzstTarFile.open(
+                        fileobj=self._compressed_stream,
+                        mode="r|",
+                        bufsize=chunk_size,
                     )
                 else:
                     # Buffer mode - decompress to memory buffer for random access
                     # Better compatibility but higher memory usage for large archives
-                    decompressed_chunks = []
-                    with dctx.stream_reader(self._fileobj) as reader:
-                        while True:
-                            chunk = reader.read(8192)
-                            if not chunk:
-                                break
-                            decompressed_chunks.append(chunk)
-                    decompressed_data = b"".join(decompressed_chunks)
-                    self._compressed_stream = io.BytesIO(decompressed_data)
-                    self._tarfile = tarfile.open(
+                    decompressed = (
+                        io.BytesIO()
+                        if budget is None
+                        else tempfile.SpooledTemporaryFile(max_size=budget.spill)
+                    )
+                    chunk = memoryview(bytearray(chunk_size))
+                    with dctx.stream_reader(
+                        source, read_across_frames=True, **stream_kwargs
+                    ) as reader:
+                        while count := reader.readinto(chunk):
+                            decompressed.write(chunk[:count])
+                    decompressed.seek(0)
+                    self._compressed_stream = decompressed
+                    self._tarfile = _TzstTarFile.open(
                         fileobj=self._compressed_stream, mode="r"
                     )
+                self._tarfile.preallocate = self.preallocate
 
             elif self.mode.startswith("w"):
                 # Write mode - use streaming compression
-                self._fileobj = open(self.filename, "wb")
-                cctx = zstd.ZstdCompressor(
-                    level=self.compression_level, write_content_size=True
+                if budget is None:
+                    cctx = self._context(
+                        _compressor_key(self.compression_level, self.threads),
+                        lambda: _new_compressor(self.compression_level, self.threads),
+                    )
+                else:
+                    params = budget.compression_params(
+                        self.compression_level,
+                        self.threads,
+                        write_content_size=True,
+                    )
+                    cctx = self._context(
+                        _compressor_key(self.compression_level, params=params),
+                        lambda: _new_compressor(self.compression_level, params=params),
+                    )
+                if self.volume_size is not None:
+                    self._fileobj = _VolumeWriter(self.filename, self.volume_size)
+                    self._compressed_stream = _VolumeSplitter(cctx, self._fileobj)
+                else:
+                    self._fileobj = self._open_fileobj("wb")
+                    self._compressed_stream = cctx.stream_writer(
+                        self._fileobj, **stream_kwargs
+                    )
+                # Plain "w" mode writes straight into the compressor, so the
+                # zstd frame can be ended exactly where the members end
+                self._tarfile = _TzstTarFile.open(
+                    fileobj=self._compressed_stream, mode="w"
                 )
-                self._compressed_stream = cctx.stream_writer(self._fileobj)
-                self._tarfile = tarfile.open(fileobj=self._compressed_stream, mode="w|")
+                self._tarfile.sparse = self.sparse
             elif self.mode.startswith("a"):
                 # Append mode - for tar.zst, this is complex as we need to decompress,
                 # add files, and recompress. For simplicity, we'll raise an error for now.
@@ -277,15 +2015,34 @@ class TzstArchive:
                 )
             else:
                 raise ValueError(f"Invalid mode: {self.mode}")
+        except TzstMemoryLimitError:
+            self.close()
+            raise
         except Exception as e:
             self.close()
+            if self._budget is not None and _is_window_error(e):
+                raise self._budget.window_error(self._display_name()) from e
             if "zstd" in str(e).lower():
                 raise TzstDecompressionError(f"Failed to open archive: {e}") from e
             else:
                 raise TzstArchiveError(f"Failed to open archive: {e}") from e
 
+    def _display_name(self) -> str:
+        return str(self.filename) if self.filename is not None else "Archive"
+
+    def _context(self, key: tuple, factory: Callable[[], object]):
+        """Return a zstd context, from a context pool if there is one."""
+        pool = self.context_pool or getattr(_job, "context_pool", None)
+        if pool is None:
+            return factory()
+        context = pool.acquire(key, factory)
+        self._contexts += ((pool, key, context),)
+        return context
+
     def close(self):
         """Close the archive."""
+        self._member_index = None
+        self._sorted_names = []
         if self._tarfile:
             try:
                 self._tarfile.close()
@@ -302,11 +2059,36 @@ class TzstArchive:
 
         if self._fileobj:
             try:
-                self._fileobj.close()
+                if self._external_fileobj is None:
+                    self._fileobj.close()
+                else:
+                    self._fileobj.flush()
             except Exception:
                 pass
             self._fileobj = None
 
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # A member file object still reads from it; the mapping is
+                # released along with that object
+                pass
+            self._mapping = None
+
+        # Only now that no stream uses them can the contexts serve another archive
+        for pool, key, context in self._contexts:
+            pool.release(key, context)
+        self._contexts = ()
+
+    def _open_fileobj(self, mode: str) -> BinaryIO:
+        """Return the caller's file object or open the archive file."""
+        if self._external_fileobj is not None:
+            return self._external_fileobj
+        if mode == "rb" and (volumes := _volume_paths(self.filename)):
+            return _VolumeReader(volumes)
+        return open(self.filename, mode)
+
     def add(
         self,
         name: str | Path,
@@ -338,9 +2120,101 @@ class TzstArchive:
         except PermissionError as e:
             raise TzstArchiveError(f"Failed to add {name}: {e}") from e
 
+    def addbytes(
+        self,
+        name: str,
+        data: bytes | bytearray | memoryview,
+        mtime: float | None = None,
+        mode: int = 0o644,
+    ):
+        """
+        Add in-memory data to the archive as a regular file.
+
+        Args:
+            name: Name of the file in the archive
+            data: File content
+            mtime: Modification time (default: now)
+            mode: Permission bits (default: 0o644)
+
+        See Also:
+            :func:`create_archive_from_iter`: Build a whole archive from memory
+        """
+        size = memoryview(data).nbytes
+        # BytesIO shares the buffer of a bytes object instead of copying it
+        self.addfileobj(name, io.BytesIO(data), size, mtime=mtime, mode=mode)
+
+    def addfileobj(
+        self,
+        name: str,
+        fileobj: BinaryIO,
+        size: int,
+        mtime: float | None = None,
+        mode: int = 0o644,
+    ):
+        """
+        Add a regular file whose content is read from a file object.
+
+        Exactly ``size`` bytes are copied from ``fileobj`` in chunks straight
+        into the compressor, so the data never has to exist on disk or fully
+        in memory.
+
+        Args:
+            name: Name of the file in the archive
+            fileobj: Binary file-like object providing the content
+            size: Number of bytes to read from ``fileobj``
+            mtime: Modification time (default: now)
+            mode: Permission bits (default: 0o644)
+
+        Raises:
+            TzstArchiveError: If ``fileobj`` ends before ``size`` bytes were read
+        """
+        tarinfo = tarfile.TarInfo(str(name).replace("\\", "/"))
+        tarinfo.size = size
+        tarinfo.mtime = time.time() if mtime is None else mtime
+        tarinfo.mode = mode
+        self._addfile(tarinfo, fileobj)
+
+    def _addfile(self, tarinfo: tarfile.TarInfo, fileobj: BinaryIO | None = None):
+        """Write a prepared TarInfo (and its data) to the archive."""
+        if not self._tarfile:
+            raise RuntimeError("Archive not open")
+        if not self.mode.startswith("w"):
+            raise RuntimeError("Archive not open for writing")
+
+        try:
+            self._tarfile.addfile(tarinfo, fileobj)
+        except OSError as e:
+            raise TzstArchiveError(f"Failed to add {tarinfo.name}: {e}") from e
+
+    def _add_node(self, path: Path, arcname: str):
+        """Add a single filesystem entry without recursing into directories."""
+        if not self._tarfile:
+            raise RuntimeError("Archive not open")
+        if not self.mode.startswith("w"):
+            raise RuntimeError("Archive not open for writing")
+
+        try:
+            self._tarfile.add(str(path), arcname=arcname, recursive=False)
+        except PermissionError as e:
+            raise TzstArchiveError(f"Failed to add {path}: {e}") from e
+
+    def _add_entry(self, entry: tuple):
+        """Add one ``create_archive_from_iter`` entry."""
+        if len(entry) == 2 and isinstance(entry[0], tarfile.TarInfo):
+            self._addfile(entry[0], entry[1])
+        elif len(entry) == 2:
+            self.addbytes(entry[0], entry[1])
+        elif len(entry) == 3:
+            self.addfileobj(entry[0], entry[1], entry[2])
+        else:
+            raise ValueError(
+                "Archive entries must be (name, data), (name, fileobj, size) "
+                f"or (tarinfo, fileobj) tuples, got {len(entry)} items"
+            )
+
     def extract(
         self,
-        member: str | None = None,
+        member: str | tarfile.TarInfo | None = None,
         path: str | Path = ".",
         set_attrs: bool = True,
         numeric_owner: bool = False,
@@ -367,9 +2241,10 @@ class TzstArchive:
             dangerous security issues like path traversal attacks.
 
         Note:
-            In streaming mode, extracting specific members is not supported.
-            Some extraction operations may be limited due to the sequential
-            nature of streaming mode.
+            In streaming mode, members cannot be extracted by name. The
+            TarInfo of the member currently reached while iterating over the
+            archive can be extracted. Some extraction operations may be limited
+            due to the sequential nature of streaming mode.
 
         See Also:
             :func:`extract_archive`: Convenience function for extracting archives
@@ -382,8 +2257,9 @@ class TzstArchive:
         extract_path = Path(path)
         extract_path.mkdir(parents=True, exist_ok=True)
 
-        if self.streaming and member:
-            # Specific member extraction not supported in streaming mode
+        if self.streaming and isinstance(member, str):
+            # Looking a member up by name is not supported in streaming mode;
+            # the TarInfo of the member currently being read can be extracted
             raise RuntimeError(
                 "Extracting specific members is not supported in streaming mode. "
                 "Please use non-streaming mode for selective extraction, or extract all files."
@@ -425,12 +2301,18 @@ class TzstArchive:
 
         Returns:
             File-like object or None if member is not a file
+
+        Note:
+            Names are resolved through the member index, so repeated lookups
+            on one archive cost O(1) each instead of a scan of all members.
         """
         if not self._tarfile:
             raise RuntimeError("Archive not open")
         if not self.mode.startswith("r"):
             raise RuntimeError("Archive not open for reading")
 
+        if isinstance(member, str) and not self.streaming:
+            member = self.getmember(member)
         return self._tarfile.extractfile(member)
 
     def extractall(
@@ -508,6 +2390,35 @@ class TzstArchive:
             else:
                 raise
 
+    def __iter__(self) -> Iterator[tarfile.TarInfo]:
+        """
+        Iterate over the members in archive order.
+
+        Headers are read lazily, so in streaming mode a loop that stops early
+        does not decompress the rest of the archive.
+        """
+        if not self._tarfile:
+            raise RuntimeError("Archive not open")
+        if not self.mode.startswith("r"):
+            raise RuntimeError("Archive not open for reading")
+
+        return iter(self._tarfile)
+
+    def _iter_transient(self) -> Iterator[tarfile.TarInfo]:
+        """Iterate like :meth:`__iter__` without keeping members in streaming mode.
+
+        :mod:`tarfile` remembers every header it has read, which grows with
+        the number of members. A streaming pass that never looks back (such
+        as flat extraction, which skips links) can drop them as it goes.
+        """
+        if not self.streaming:
+            yield from self
+            return
+        tf = self._tarfile
+        while (member := tf.next()) is not None:
+            tf.members.clear()
+            yield member
+
     def getmembers(self) -> list[tarfile.TarInfo]:
         """Get list of all members in the archive."""
         if not self._tarfile:
@@ -526,6 +2437,75 @@ class TzstArchive:
 
         return self._tarfile.getnames()
 
+    def _get_member_index(self) -> dict[str, tarfile.TarInfo]:
+        """Return the name -> TarInfo index, building it on first use."""
+        if self._member_index is None:
+            index: dict[str, tarfile.TarInfo] = {}
+            for member in self.getmembers():
+                # Later entries win, matching tarfile.getmember for duplicates
+                index[member.name.rstrip("/")] = member
+            self._member_index = index
+            self._sorted_names = sorted(index)
+        return self._member_index
+
+    def getmember(self, name: str) -> tarfile.TarInfo:
+        """
+        Get the TarInfo for a member by name.
+
+        The first lookup builds a hash index of all members; later lookups are
+        O(1) instead of the linear scan done by :meth:`tarfile.TarFile.getmember`.
+        If a name occurs more than once, the last occurrence is returned.
+
+        Raises:
+            KeyError: If no member has the given name
+        """
+        if not self._tarfile:
+            raise RuntimeError("Archive not open")
+        if not self.mode.startswith("r"):
+            raise RuntimeError("Archive not open for reading")
+
+        try:
+            return self._get_member_index()[name.rstrip("/")]
+        except KeyError:
+            raise KeyError(f"filename {name!r} not found") from None
+
+    def prefix(self, prefix: str) -> list[tarfile.TarInfo]:
+        """
+        Get all members whose name starts with ``prefix``, in archive order.
+
+        Use a trailing slash (``"logs/2024-06/"``) to query the contents of a
+        directory. Lookups use binary search over the sorted member names, so
+        the cost is O(log N) plus the number of matches.
+        """
+        if not self._tarfile:
+            raise RuntimeError("Archive not open")
+        if not self.mode.startswith("r"):
+            raise RuntimeError("Archive not open for reading")
+
+        index = self._get_member_index()
+        matches = []
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        for name in self._sorted_names[start:]:
+            if not name.startswith(prefix):
+                break
+            matches.append(index[name])
+        return sorted(matches, key=lambda member: member.offset)
+
+    def glob(self, pattern: str) -> list[tarfile.TarInfo]:
+        """
+        Get all members matching a path glob, in archive order.
+
+        ``*`` and ``?`` match within one path component, ``**`` matches across
+        directories, e.g. ``logs/2024-06-*/*.json`` or ``src/**/*.py``. Only
+        names sharing the pattern's literal prefix are tested.
+        """
+        regex = re.compile(_glob_to_regex(pattern))
+        return [
+            member
+            for member in self.prefix(_glob_literal_prefix(pattern))
+            if regex.fullmatch(member.name)
+        ]
+
     def list(self, verbose: bool = False) -> list[dict]:
         """
         List contents of the archive.
@@ -546,7 +2526,8 @@ class TzstArchive:
         if not self.mode.startswith("r"):
             raise RuntimeError("Archive not open for reading")
 
-        members = self.getmembers()
+        # Under a memory limit, streaming archives do not keep what they read
+        members = self.getmembers() if self._budget is None else self._iter_transient()
         result = []
 
         for member in members:
@@ -595,8 +2576,11 @@ class TzstArchive:
             raise RuntimeError("Archive not open for reading")
 
         try:
+            members = (
+                self.getmembers() if self._budget is None else self._iter_transient()
+            )
             # Try to iterate through all members and read file contents
-            for member in self.getmembers():
+            for member in members:
                 if member.isfile():
                     # Try to extract each file to verify integrity
                     fileobj = self.extractfile(member)
@@ -607,28 +2591,205 @@ class TzstArchive:
                             if not chunk:
                                 break
             return True
+        except TzstMemoryLimitError:
+            # Not a defect of the archive
+            raise
         except Exception:
             return False
 
+    def delete(
+        self, names: str | Iterable[str], compression_level: int | None = None
+    ) -> int:
+        """
+        Remove members from the archive file.
+
+        Only the zstd frames that hold the named members are recompressed;
+        all other frames are copied into the new archive byte for byte, and
+        the new archive replaces the old one atomically. tzst ends a frame at
+        the first member boundary after every 8 MiB of tar data, so an edit
+        rewrites about that much plus the members themselves. Locating the
+        members decompresses the archive once. Archives kept in a single
+        frame (written by other tools or older tzst versions) are rewritten
+        in one streaming pass instead. The archive is reopened afterwards.
+
+        Args:
+            names: Name or names of the members to remove; every member with
+                   one of these names is removed
+            compression_level: Zstandard compression level (1-22) of the
+                               recompressed frames. The level an archive was
+                               written at is not stored in it, so pass it to
+                               keep it; the default is the level this
+                               archive object was created with (3 unless
+                               given)
+
+        Returns:
+            Number of members removed
+
+        Raises:
+            KeyError: If a name is not in the archive (nothing is changed)
+            ValueError: If the compression level is invalid
+
+        See Also:
+            :func:`merge_archives`: Relies on the same frame layout
+        """
+        if isinstance(names, str):
+            names = [names]
+        return self._edit(
+            {name.rstrip("/") for name in names},
+            lambda member: None,
+            compression_level,
+        )
+
+    def replace(
+        self,
+        name: str,
+        data: bytes | bytearray | memoryview,
+        compression_level: int | None = None,
+    ) -> int:
+        """
+        Replace the content of a member in the archive file.
+
+        The member keeps its name, position, permissions and ownership,
+        becomes a regular file with ``data`` as its content and gets the
+        current time as its modification time. Like :meth:`delete`, only the
+        frames that hold the member are recompressed.
+
+        Args:
+            name: Name of the member; every member with this name is replaced
+            data: New content
+            compression_level: Zstandard compression level (1-22) of the
+                               recompressed frames; see :meth:`delete`
+
+        Returns:
+            Number of members replaced
+
+        Raises:
+            KeyError: If the name is not in the archive (nothing is changed)
+            ValueError: If the compression level is invalid
+        """
+        size = memoryview(data).nbytes
+        mtime = time.time()
+
+        def edit(member: tarfile.TarInfo) -> tuple[tarfile.TarInfo, BinaryIO]:
+            replacement = copy.copy(member)
+            replacement.type = tarfile.REGTYPE
+            replacement.linkname = ""
+            replacement.size = size
+            replacement.mtime = mtime
+            replacement.sparse = None
+            # Headers from the old member would override the new values
+            replacement.pax_headers = {
+                key: value
+                for key, value in member.pax_headers.items()
+                if key not in ("size", "mtime", "linkpath")
+                and not key.startswith("GNU.sparse.")
+            }
+            return replacement, io.BytesIO(data)
+
+        return self._edit({name.rstrip("/")}, edit, compression_level)
+
+    def _edit(
+        self,
+        names: set[str],
+        edit: Callable[[tarfile.TarInfo], tuple[tarfile.TarInfo, BinaryIO] | None],
+        compression_level: int | None,
+    ) -> int:
+        """Rewrite the archive file with *edit* applied to the named members."""
+        if compression_level is None:
+            compression_level = self.compression_level
+        elif not 1 <= compression_level <= 22:
+            raise ValueError(
+                f"Invalid compression level '{compression_level}'. Must be between 1 and 22."
+            )
+        if not self._tarfile:
+            raise RuntimeError("Archive not open")
+        if not self.mode.startswith("r"):
+            raise RuntimeError("Archive not open for reading")
+        if self.filename is None or self._external_fileobj is not None:
+            raise RuntimeError("Only archives opened by file name can be modified")
+        if _split_volumes(self.filename):
+            raise TzstArchiveError(
+                f"Cannot modify split archive {self.filename} in place; "
+                "recompress it into a single file first"
+            )
+        if not names:
+            return 0
+
+        self.close()
+        try:
+            return _edit_archive(
+                self.filename, names, edit, compression_level, self.threads
+            )
+        finally:
+            self.open()
+
 
 # Convenience functions
 
 
+def _normalize_archive_path(archive_path: str | Path) -> Path:
+    """Ensure an archive path carries a .tzst/.tar.zst extension."""
+    archive_path = Path(archive_path)
+    if archive_path.suffix.lower() not in [".tzst", ".zst"]:
+        if archive_path.suffix.lower() == ".tar":
+            archive_path = archive_path.with_suffix(".tar.zst")
+        else:
+            archive_path = archive_path.with_suffix(archive_path.suffix + ".tzst")
+    return archive_path
+
+
 def create_archive(
-    archive_path: str | Path,
+    archive_path: str | Path | BinaryIO,
     files: Sequence[str | Path],
     compression_level: int = 3,
     use_temp_file: bool = True,
+    exclude: Iterable[str] | None = None,
+    include: Iterable[str] | None = None,
+    respect_gitignore: bool = False,
+    sparse: bool = True,
+    durability: Durability | str = Durability.BATCH,
+    volume_size: int | None = None,
+    shards: int | None = 1,
+    memory_limit: int | None = None,
 ) -> None:
     """
     Create a new .tzst archive with atomic file operations.
 
     Args:
-        archive_path: Path for the new archive
+        archive_path: Path for the new archive, or a writable binary file object
+                      (e.g. ``sys.stdout.buffer``) to stream the archive into
         files: List of files/directories to add
         compression_level: Zstandard compression level (1-22)
         use_temp_file: If True, create archive in temporary file first, then move
                       to final location for atomic operation
+        exclude: Patterns in ``.gitignore`` syntax for paths to leave out, e.g.
+                ``["node_modules/", "*.pyc", "/build"]``. They are matched
+                against archive names; excluded directories are not descended
+                into.
+        include: If given, only files matching one of these patterns (same
+                syntax) are stored, together with the directories leading to them
+        respect_gitignore: If True, also honour ``.gitignore`` files found in
+                the input directories (and next to the inputs) and skip ``.git``
+        sparse: If True, store files with holes as sparse members so that
+                neither the archive nor the extracted copy contains the zeros
+        durability: ``"none"`` skips flushing; ``"batch"`` (default) and
+                ``"strict"`` fsync the finished archive and its directory, so a
+                crash never leaves an empty or truncated archive in place
+        volume_size: Split the archive into volumes of at most this many
+                bytes, written as ``<archive>.001``, ``.002``, ... next to
+                ``archive_path``. Each volume starts with a new zstd frame,
+                so ``cat`` of the volumes is a valid archive. Leftover
+                volumes of an earlier, longer archive of that name are removed.
+        shards: Number of worker processes that each read and compress a
+                share of the files, balanced by size, into an archive of
+                their own; None uses one per CPU. The shards' zstd frames
+                are then concatenated into the result, as by
+                :func:`merge_archives`, with directories stored first.
+                Worth it for many files or large inputs on multi-core
+                machines; cannot be combined with ``volume_size``.
+        memory_limit: Bytes of memory compression may use, at least 16 MiB.
+                The zstd window and worker threads are reduced to fit, and
+                shards share the limit, so fewer of them run if it is small.
 
     See Also:
         :meth:`TzstArchive.add`: Method for adding files to an open archive
@@ -638,16 +2799,128 @@ def create_archive(
         raise ValueError(
             f"Invalid compression level '{compression_level}'. Must be between 1 and 22."
         )
+    if shards is None:
+        shards = os.cpu_count() or 1
+    if shards < 1:
+        raise ValueError(f"Invalid shard count '{shards}'. Must be at least 1.")
+    if shards > 1 and volume_size is not None:
+        raise ValueError("Sharded archives cannot be split into volumes")
+    if memory_limit is not None:
+        _MemoryBudget(memory_limit)
+        shards = max(1, min(shards, memory_limit // _MIN_MEMORY_LIMIT))
+
+    durability = _durability(durability)
+    tree_filter = (
+        _TreeFilter(exclude, include, respect_gitignore)
+        if exclude or include or respect_gitignore
+        else None
+    )
+
+    def build(target: Path | BinaryIO) -> None:
+        if shards > 1:
+            _create_sharded(
+                target,
+                files,
+                compression_level,
+                tree_filter,
+                sparse,
+                shards,
+                None if memory_limit is None else memory_limit // shards,
+            )
+        else:
+            _create_archive_impl(
+                target,
+                files,
+                compression_level,
+                tree_filter,
+                sparse,
+                volume_size,
+                memory_limit,
+            )
 
-    archive_path = Path(archive_path)
+    if not isinstance(archive_path, str | os.PathLike):
+        if volume_size is not None:
+            raise ValueError("Volumes can only be written to a file name")
+        # File objects are written directly; there is no path to rename atomically
+        build(archive_path)
+        return
 
-    # Ensure archive has correct extension
-    if archive_path.suffix.lower() not in [".tzst", ".zst"]:
-        if archive_path.suffix.lower() == ".tar":
-            archive_path = archive_path.with_suffix(".tar.zst")
-        else:
-            archive_path = archive_path.with_suffix(archive_path.suffix + ".tzst")
+    archive_path = _normalize_archive_path(archive_path)
+    (_write_archive if volume_size is None else _write_volumes)(
+        archive_path, build, use_temp_file, durability
+    )
+
+
+def create_archive_from_iter(
+    archive_path: str | Path | BinaryIO,
+    entries: Iterable[tuple],
+    compression_level: int = 3,
+    use_temp_file: bool = True,
+    durability: Durability | str = Durability.BATCH,
+    memory_limit: int | None = None,
+) -> None:
+    """
+    Create a new .tzst archive from in-memory data without touching disk.
+
+    Each entry is streamed straight into the zstd writer as it is produced,
+    so generators can build arbitrarily large archives in bounded memory.
+
+    Args:
+        archive_path: Path for the new archive, or a writable binary file object
+        entries: Iterable of entries, each one of:
+                 - ``(name, data)``: bytes-like content stored as a regular file
+                 - ``(name, fileobj, size)``: ``size`` bytes read from ``fileobj``
+                 - ``(tarinfo, fileobj)``: a prepared :class:`tarfile.TarInfo`
+                   with its data (``None`` for directories, links, etc.)
+        compression_level: Zstandard compression level (1-22)
+        use_temp_file: If True, create archive in temporary file first, then move
+                      to final location for atomic operation
+        durability: How to flush the finished archive; see :func:`create_archive`
+        memory_limit: Bytes of memory compression may use; see
+                      :func:`create_archive`
+
+    Example:
+        >>> def generate():
+        ...     yield "hello.txt", b"Hello, World!"
+        ...     yield "data/report.csv", open("report.csv", "rb"), 1024
+        >>> create_archive_from_iter("generated.tzst", generate())
 
+    See Also:
+        :meth:`TzstArchive.addbytes`: Add in-memory data to an open archive
+        :meth:`TzstArchive.addfileobj`: Add file object data to an open archive
+    """
+    if not 1 <= compression_level <= 22:
+        raise ValueError(
+            f"Invalid compression level '{compression_level}'. Must be between 1 and 22."
+        )
+    durability = _durability(durability)
+
+    def build(target: Path | BinaryIO) -> None:
+        with TzstArchive(
+            **_archive_source(target),
+            mode="w",
+            compression_level=compression_level,
+            memory_limit=memory_limit,
+        ) as archive:
+            for entry in entries:
+                archive._add_entry(entry)
+
+    if not isinstance(archive_path, str | os.PathLike):
+        build(archive_path)
+        return
+
+    _write_archive(
+        _normalize_archive_path(archive_path), build, use_temp_file, durability
+    )
+
+
+def _write_archive(
+    archive_path: Path,
+    build: Callable[[Path], None],
+    use_temp_file: bool,
+    durability: Durability = Durability.BATCH,
+) -> None:
+    """Run *build* against *archive_path*, optionally via an atomic temp file."""
     # Use temporary file for atomic operation if requested
     if use_temp_file:
         temp_fd = None
@@ -661,10 +2934,10 @@ def create_archive(
             temp_path = Path(temp_path_str)
 
             # Create archive in temporary location
-            _create_archive_impl(temp_path, files, compression_level)
+            build(temp_path)
 
             # Atomic move to final location
-            temp_path.replace(archive_path)
+            _commit_file(temp_path, archive_path, durability)
 
         except Exception:
             # Clean up temporary file on error
@@ -676,83 +2949,268 @@ def create_archive(
             raise
     else:
         # Direct creation (non-atomic)
-        _create_archive_impl(archive_path, files, compression_level)
+        build(archive_path)
+        if durability is not Durability.NONE:
+            _fsync_path(archive_path)
+            _fsync_path(archive_path.parent)
 
 
-def _create_archive_impl(
+def _write_volumes(
     archive_path: Path,
+    build: Callable[[Path], None],
+    use_temp_file: bool,
+    durability: Durability = Durability.BATCH,
+) -> None:
+    """Like :func:`_write_archive` for an archive that *build* splits into volumes."""
+    if not use_temp_file:
+        build(archive_path)
+        written = _volume_paths(_volume_path(archive_path, 1)) or []
+        if durability is not Durability.NONE:
+            for path in written:
+                _fsync_path(path)
+    else:
+        temp_fd, temp_path_str = tempfile.mkstemp(
+            suffix=".tmp", prefix=f".{archive_path.name}.", dir=archive_path.parent
+        )
+        os.close(temp_fd)
+        temp_path = Path(temp_path_str)
+        try:
+            build(temp_path)
+            temp_volumes = _volume_paths(_volume_path(temp_path, 1)) or []
+            written = [
+                _volume_path(archive_path, number)
+                for number in range(1, len(temp_volumes) + 1)
+            ]
+            for temp_volume, path in zip(temp_volumes, written, strict=True):
+                _commit_file(temp_volume, path, durability)
+        finally:
+            # Volumes of a failed build, then the name reserved by mkstemp
+            for path in temp_path.parent.glob(f"{glob.escape(temp_path.name)}.*"):
+                path.unlink()
+            temp_path.unlink()
+
+    # A shorter archive must not be followed by volumes of an older one
+    number = len(written) + 1
+    while (stale := _volume_path(archive_path, number)).is_file():
+        stale.unlink()
+        number += 1
+    if durability is not Durability.NONE:
+        _fsync_path(archive_path.parent)
+
+
+def _collect_archive_entries(
+    archive_path: Path | None,
+    files: Sequence[str | Path],
+) -> list[tuple[Path, str]]:
+    """Resolve the (source path, archive name) pairs that make up a new archive.
+
+    Paths are kept relative to the caller's working directory and the archive
+    names are computed from their common parent, so no ``os.chdir`` is needed
+    and the helper is safe to call from worker threads. *archive_path* is
+    skipped when adding the current directory; pass None for file objects.
+
+    Raises:
+        FileNotFoundError: If files were given but none of them exist
+    """
+    if not files:
+        return []
+
+    file_paths = [Path(f) for f in files if Path(f).exists()]
+    if not file_paths:
+        raise FileNotFoundError("No valid files found")
+
+    entries: list[tuple[Path, str]] = []
+    current_dir = Path.cwd().resolve()
+    # Special handling for current directory "."
+    if len(file_paths) == 1 and (
+        str(file_paths[0]) == "." or file_paths[0].resolve() == current_dir
+    ):  # When adding current directory, add its contents without "./" prefix
+        archive_abs_path = archive_path.resolve() if archive_path else None
+        archive_name = archive_path.name if archive_path else None
+        for item in Path(".").iterdir():
+            item_abs_path = item.resolve()
+            # Skip archives and temp files for consistency
+            if (
+                item_abs_path == archive_abs_path
+                or item.name == archive_name
+                or (item.name.startswith(".") and item.name.endswith(".tmp"))
+                or item.suffix.lower() in [".tzst", ".zst"]
+                or item.name.lower().endswith(".tar.zst")
+            ):
+                continue
+            # Use item name as archive name to avoid "./" prefix
+            entries.append((item, str(item.name).replace("\\", "/")))
+        return entries
+
+    # Find the common parent directory
+    try:
+        common_parent = Path(os.path.commonpath([p.parent for p in file_paths]))
+    except ValueError:
+        # No common path, use parent of first file
+        common_parent = file_paths[0].parent
+
+    for file_path in file_paths:
+        # Calculate relative path from common parent
+        relative_path = file_path.relative_to(common_parent)
+        # Normalize path separators and remove Windows prefixes
+        path_str = str(relative_path).replace("\\", "/")
+        if path_str.startswith("./") or path_str.startswith(".\\"):
+            path_str = path_str[2:]
+        entries.append((file_path, path_str))
+    return entries
+
+
+def _create_archive_impl(
+    archive_path: Path | BinaryIO,
     files: Sequence[str | Path],
     compression_level: int,
+    tree_filter: _TreeFilter | None = None,
+    sparse: bool = True,
+    volume_size: int | None = None,
+    memory_limit: int | None = None,
 ) -> None:
     """Internal implementation for creating archives."""
-    # Find common parent directory for relative paths
-    if files:
-        file_paths = [Path(f) for f in files if Path(f).exists()]
-        if file_paths:  # Special handling for current directory "."
-            current_dir = Path.cwd().resolve()
-            if len(file_paths) == 1 and (
-                str(file_paths[0]) == "." or file_paths[0].resolve() == current_dir
-            ):  # When adding current directory, add its contents without "./" prefix
-                with TzstArchive(archive_path, "w", compression_level) as archive:
-                    # Add all items in current directory, excluding archive and temp files
-                    archive_abs_path = archive_path.resolve()
-                    archive_name = archive_path.name
-                    for item in Path(".").iterdir():
-                        item_abs_path = item.resolve()
-                        # Skip archives and temp files for consistency
-                        if (
-                            item_abs_path == archive_abs_path
-                            or item.name == archive_name
-                            or (
-                                item.name.startswith(".") and item.name.endswith(".tmp")
-                            )
-                            or item.suffix.lower() in [".tzst", ".zst"]
-                            or item.name.lower().endswith(".tar.zst")
-                        ):
-                            continue
-                        # Use item name as archive name to avoid "./" prefix
-                        item_name = str(item.name).replace("\\", "/")
-                        archive.add(str(item), arcname=item_name)
-            else:
-                # Find the common parent directory
-                try:
-                    common_parent = Path(
-                        os.path.commonpath([p.parent for p in file_paths])
+    entries = _collect_archive_entries(
+        archive_path if isinstance(archive_path, Path) else None, files
+    )
+    with TzstArchive(
+        **_archive_source(archive_path),
+        mode="w",
+        compression_level=compression_level,
+        sparse=sparse,
+        volume_size=volume_size,
+        memory_limit=memory_limit,
+    ) as archive:
+        for source_path, arcname in entries:
+            if tree_filter is None:
+                # Use arcname to control the name in the archive
+                archive.add(str(source_path), arcname=arcname)
+                continue
+            for path, name in tree_filter.walk(source_path, arcname):
+                archive._add_node(path, name)
+
+
+def _partition_by_size(
+    nodes: list[tuple[Path, str]], shards: int
+) -> list[list[tuple[Path, str]]]:
+    """Split archive entries into at most *shards* groups holding similar amounts of data.
+
+    Directories and other entries without data go to the first group, so
+    they come first in the archive. Files are dealt out largest first to the
+    group with the least data; every group keeps the original order.
+    """
+    import heapq
+
+    groups: list[list[int]] = [[] for _ in range(shards)]
+    others = []
+    files = []
+    for position, (path, _) in enumerate(nodes):
+        info = path.lstat()
+        if stat.S_ISREG(info.st_mode):
+            files.append((info.st_size, position))
+        else:
+            others.append(position)
+
+    totals = [(0, index) for index in range(shards)]
+    for size, position in sorted(files, reverse=True):
+        total, index = heapq.heappop(totals)
+        groups[index].append(position)
+        # Count the header too, so many small files are spread as well
+        heapq.heappush(totals, (total + size + tarfile.BLOCKSIZE, index))
+    groups = [sorted(group) for group in groups]
+    groups[0][:0] = others
+    return [[nodes[position] for position in group] for group in groups if group]
+
+
+def _create_shard(
+    path: str,
+    nodes: list[tuple[str, str]],
+    compression_level: int,
+    sparse: bool,
+    memory_limit: int | None = None,
+) -> None:
+    """Write one shard of a sharded archive; runs in a worker process."""
+    with TzstArchive(
+        path,
+        mode="w",
+        compression_level=compression_level,
+        sparse=sparse,
+        memory_limit=memory_limit,
+    ) as archive:
+        for source, arcname in nodes:
+            archive._add_node(Path(source), arcname)
+
+
+def _create_sharded(
+    target: Path | BinaryIO,
+    files: Sequence[str | Path],
+    compression_level: int,
+    tree_filter: _TreeFilter | None,
+    sparse: bool,
+    shards: int,
+    memory_limit: int | None = None,
+) -> None:
+    """Create an archive from shards written by parallel worker processes."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    walker = tree_filter or _TreeFilter()
+    nodes = [
+        node
+        for source, arcname in _collect_archive_entries(
+            target if isinstance(target, Path) else None, files
+        )
+        for node in walker.walk(source, arcname)
+    ]
+    groups = _partition_by_size(nodes, shards)
+
+    shard_paths: list[Path] = []
+    try:
+        for _ in groups:
+            fd, name = tempfile.mkstemp(
+                suffix=".tmp",
+                prefix=".shard.",
+                dir=target.parent if isinstance(target, Path) else None,
+            )
+            os.close(fd)
+            shard_paths.append(Path(name))
+        if groups:
+            with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+                futures = [
+                    pool.submit(
+                        _create_shard,
+                        str(path),
+                        [(str(source), arcname) for source, arcname in group],
+                        compression_level,
+                        sparse,
+                        memory_limit,
                     )
-                except ValueError:
-                    # No common path, use parent of first file
-                    common_parent = file_paths[
-                        0
-                    ].parent  # Change to common parent directory to get relative paths
-                original_cwd = Path.cwd()
-                # Convert archive path to absolute to avoid issues when changing working directory
-                absolute_archive_path = archive_path.resolve()
-                try:
-                    os.chdir(common_parent)
-                    with TzstArchive(
-                        absolute_archive_path, "w", compression_level
-                    ) as archive:
-                        for file_path in file_paths:
-                            # Calculate relative path from common parent
-                            relative_path = file_path.relative_to(common_parent)
-                            # Normalize path separators and remove Windows prefixes
-                            path_str = str(relative_path).replace("\\", "/")
-                            if path_str.startswith("./") or path_str.startswith(".\\"):
-                                path_str = path_str[2:]
-                            # Use arcname to control the name in the archive
-                            archive.add(str(relative_path), arcname=path_str)
-                finally:
-                    os.chdir(original_cwd)
-        else:
-            raise FileNotFoundError("No valid files found")
-    else:
-        # Empty archive
-        with TzstArchive(archive_path, "w", compression_level) as archive:
-            pass
+                    for path, group in zip(shard_paths, groups, strict=True)
+                ]
+                for future in futures:
+                    future.result()
+
+        buffer = memoryview(bytearray(_COPY_BUFSIZE))
+        with (
+            open(target, "wb")
+            if isinstance(target, Path)
+            else contextlib.nullcontext(target)
+        ) as output:
+            for path in shard_paths:
+                with open(path, "rb") as shard:
+                    # Shards keep their end-of-archive blocks in a frame of
+                    # their own, so the cheap frame check is enough
+                    frames = _archive_frames(shard, str(path))
+                    if frames is None:
+                        raise TzstArchiveError(f"Shard {path} lost its frame layout")
+                    _copy_ranges(shard, output, frames[:-1], buffer, str(path))
+            output.write(_end_of_archive_frame(compression_level))
+    finally:
+        for path in shard_paths:
+            path.unlink(missing_ok=True)
 
 
 def extract_archive(
-    archive_path: str | Path,
+    archive_path: str | Path | BinaryIO,
     extract_path: str | Path = ".",
     members: list[str] | None = None,
     flatten: bool = False,
@@ -760,12 +3218,19 @@ def extract_archive(
     filter: str | Callable | None = "data",
     conflict_resolution: ConflictResolution | str = ConflictResolution.REPLACE,
     interactive_callback: Callable[[Path], ConflictResolution] | None = None,
+    include: Iterable[str | re.Pattern[str]] | None = None,
+    exclude: Iterable[str | re.Pattern[str]] | None = None,
+    preallocate: bool = True,
+    durability: Durability | str = Durability.NONE,
+    workers: int | None = 1,
+    memory_map: bool = False,
+    memory_limit: int | None = None,
 ) -> None:
     """
     Extract files from a .tzst archive.
 
     Args:
-        archive_path: Path to the archive
+        archive_path: Path to the archive, or a binary file object to read it from
         extract_path: Destination directory
         members: Specific members to extract (None for all)
         flatten: If True, extract without directory structure
@@ -778,6 +3243,38 @@ def extract_archive(
                - callable: Custom filter function
         conflict_resolution: How to handle file conflicts during extraction
         interactive_callback: Function to call for interactive conflict resolution
+        include: Only extract members matching one of these patterns (in
+                addition to any listed in ``members``). Strings are path
+                globs such as ``logs/2024-06-*/*.json`` or ``src/**/*.py``;
+                compiled :func:`re.compile` patterns must match the whole name.
+        exclude: Skip members matching one of these patterns, even if they are
+                listed in ``members`` or match ``include``
+        preallocate: Reserve the full size of large files before writing
+                    them; see :class:`TzstArchive`
+        durability: ``"none"`` (default) leaves flushing to the OS,
+                   ``"batch"`` flushes all extracted files and their
+                   directories once at the end and ``"strict"`` fsyncs each
+                   file and its directory as soon as it is written; see
+                   :class:`Durability`
+        workers: For an archive split into volumes (``archive_path`` is its
+                 first volume), the number of threads extracting volumes in
+                 parallel; None uses one per CPU. Each thread takes a run of
+                 volumes that starts with a member header. Conflict answers
+                 that apply to all files only apply to the current run, and
+                 if several runs hold the same path, which copy is kept is
+                 not defined.
+        memory_map: Decompress from a read-only memory mapping of the archive
+                    file; see :class:`TzstArchive`
+        memory_limit: Bytes of memory extraction may use for its buffers; see
+                      :class:`TzstArchive`. Volumes extracted in parallel
+                      share it, so fewer threads run if it is small.
+
+    Note:
+        Selected members are extracted in a single pass over the archive. When
+        only exact ``members`` are requested, reading stops after the last of
+        them, so in streaming mode the rest of the archive is not decompressed.
+        A name stored more than once is extracted from its last copy, except
+        in streaming mode, where reading stops at its first copy.
 
     Warning:
         Never extract archives from untrusted sources without proper filtering.        The 'data' filter is recommended for most use cases as it prevents
@@ -786,7 +3283,47 @@ def extract_archive(
         See Also:
         :meth:`TzstArchive.extract`: Method for extracting from an open archive
     """
-    with TzstArchive(archive_path, "r", streaming=streaming) as archive:
+    if workers != 1 and isinstance(archive_path, str | os.PathLike):
+        groups = _volume_groups(Path(archive_path))
+        if len(groups) > 1:
+            if memory_limit is not None:
+                _MemoryBudget(memory_limit)
+                workers = max(
+                    1,
+                    min(
+                        workers or os.cpu_count() or 1,
+                        len(groups),
+                        memory_limit // _MIN_MEMORY_LIMIT,
+                    ),
+                )
+                memory_limit //= workers
+            _extract_volume_groups(
+                groups,
+                workers,
+                interactive_callback,
+                extract_path=extract_path,
+                members=members,
+                flatten=flatten,
+                filter=filter,
+                conflict_resolution=conflict_resolution,
+                include=include,
+                exclude=exclude,
+                preallocate=preallocate,
+                durability=durability,
+                memory_limit=memory_limit,
+            )
+            return
+
+    sync = _ExtractionSync(_durability(durability), Path(extract_path))
+    destination = _DestinationCache()
+    with TzstArchive(
+        **_archive_source(archive_path),
+        mode="r",
+        streaming=streaming,
+        preallocate=preallocate,
+        memory_map=memory_map,
+        memory_limit=memory_limit,
+    ) as archive:
         # Convert string resolution to enum if needed
         if isinstance(conflict_resolution, str):
             try:
@@ -795,18 +3332,21 @@ def extract_archive(
                 conflict_resolution = ConflictResolution.REPLACE
 
         state = ConflictResolutionState(conflict_resolution)
+        matcher = (
+            _MemberMatcher(members, include, exclude)
+            if members or include or exclude
+            else None
+        )
+        if matcher and not archive.streaming:
+            matcher.count_copies(archive.getmembers())
 
         if flatten:
             # Extract files without directory structure
             extract_dir = Path(extract_path)
             extract_dir.mkdir(parents=True, exist_ok=True)
 
-            if members:
-                member_list = [m for m in archive.getmembers() if m.name in members]
-            else:
-                member_list = archive.getmembers()
-
-            for member in member_list:
+            members_iter = archive._iter_transient()
+            for member in matcher.select(members_iter) if matcher else members_iter:
                 if not state.should_continue():
                     break
 
@@ -816,12 +3356,15 @@ def extract_archive(
                     target_path = extract_dir / filename
 
                     # Handle conflicts
-                    if target_path.exists():
+                    if destination.exists(target_path):
                         current_resolution = (
                             state.global_resolution or conflict_resolution
                         )
                         actual_resolution, final_path = _handle_file_conflict(
-                            target_path, current_resolution, interactive_callback
+                            target_path,
+                            current_resolution,
+                            interactive_callback,
+                            destination,
                         )
                         state.update_resolution(actual_resolution)
 
@@ -832,28 +3375,46 @@ def extract_archive(
                             continue
                         elif actual_resolution == ConflictResolution.EXIT:
                             break
+                        renamed = target_path != final_path
                         target_path = final_path
+                    else:
+                        renamed = False
 
-                    fileobj = archive.extractfile(member)
-                    if fileobj:
+                    try:
                         with open(target_path, "wb") as f:
-                            f.write(fileobj.read())
+                            _write_member_data(archive._tarfile, member, f)
+                            sync.written(target_path, f)
+                    except BaseException:
+                        if renamed:
+                            destination.discard(target_path)
+                        raise
+                    destination.added(target_path)
         else:
             # Extract with full directory structure
-            if members:
-                for member in members:
+            if matcher:
+                if members and not (include or exclude) and not archive.streaming:
+                    # Resolve exact names through the member index, in the order given
+                    selected = ((name, archive.getmember(name)) for name in members)
+                else:
+                    # Single pass over the archive; stops after the last match
+                    selected = ((m.name, m) for m in matcher.select(archive))
+
+                for member, member_info in selected:
                     if not state.should_continue():
                         break
 
                     target_path = Path(extract_path) / member
 
                     # Handle conflicts
-                    if target_path.exists():
+                    if destination.exists(target_path):
                         current_resolution = (
                             state.global_resolution or conflict_resolution
                         )
                         actual_resolution, final_path = _handle_file_conflict(
-                            target_path, current_resolution, interactive_callback
+                            target_path,
+                            current_resolution,
+                            interactive_callback,
+                            destination if member_info.isfile() else None,
                         )
                         state.update_resolution(actual_resolution)
 
@@ -870,25 +3431,41 @@ def extract_archive(
                         ):
                             # Create parent directories for renamed file
                             if final_path:
-                                final_path.parent.mkdir(parents=True, exist_ok=True)
+                                destination.mkdir(final_path.parent)
                             # Extract to temporary location, then move
                             temp_extract_path = Path(tempfile.mkdtemp())
                             try:
-                                archive.extract(
-                                    member, temp_extract_path, filter=filter
-                                )
-                                temp_file = temp_extract_path / member
+                                try:
+                                    archive.extract(
+                                        member_info, temp_extract_path, filter=filter
+                                    )
+                                    temp_file = temp_extract_path / member
+                                    if final_path:
+                                        _move_file_cross_platform(temp_file, final_path)
+                                except BaseException:
+                                    # e.g. the filter rejected the member
+                                    if final_path and member_info.isfile():
+                                        destination.discard(final_path)
+                                    raise
                                 if final_path:
-                                    _move_file_cross_platform(temp_file, final_path)
+                                    destination.added(final_path)
+                                    if member_info.isreg():
+                                        sync.written(final_path)
                             finally:
                                 # Clean up temp directory
                                 import shutil
 
                                 shutil.rmtree(temp_extract_path, ignore_errors=True)
                         else:
-                            archive.extract(member, extract_path, filter=filter)
+                            archive.extract(member_info, extract_path, filter=filter)
+                            destination.added(target_path)
+                            if member_info.isreg():
+                                sync.written(target_path)
                     else:
-                        archive.extract(member, extract_path, filter=filter)
+                        archive.extract(member_info, extract_path, filter=filter)
+                        destination.added(target_path)
+                        if member_info.isreg():
+                            sync.written(target_path)
             else:
                 # For extractall, we need a different approach
                 # We'll extract to a temp location and handle conflicts file by file
@@ -897,65 +3474,137 @@ def extract_archive(
                     archive.extractall(temp_extract_path, filter=filter)
 
                     # Move files with conflict resolution
-                    for temp_file in temp_extract_path.rglob("*"):
+                    for temp_file in _iter_files(temp_extract_path):
                         if not state.should_continue():
                             break
 
-                        if temp_file.is_file():
-                            rel_path = temp_file.relative_to(temp_extract_path)
-                            target_path = Path(extract_path) / rel_path
-
-                            # Create parent directories
-                            target_path.parent.mkdir(
-                                parents=True, exist_ok=True
-                            )  # Handle conflicts
-                            if target_path.exists():
-                                current_resolution = (
-                                    state.global_resolution or conflict_resolution
-                                )
-                                actual_resolution, final_path = _handle_file_conflict(
-                                    target_path,
-                                    current_resolution,
-                                    interactive_callback,
-                                )
-                                state.update_resolution(actual_resolution)
+                        rel_path = temp_file.relative_to(temp_extract_path)
+                        target_path = Path(extract_path) / rel_path
 
+                        # Create parent directories
+                        destination.mkdir(target_path.parent)
+                        renamed = False
+                        # Handle conflicts
+                        if destination.exists(target_path):
+                            current_resolution = (
+                                state.global_resolution or conflict_resolution
+                            )
+                            actual_resolution, final_path = _handle_file_conflict(
+                                target_path,
+                                current_resolution,
+                                interactive_callback,
+                                destination,
+                            )
+                            state.update_resolution(actual_resolution)
+
+                            if actual_resolution in (
+                                ConflictResolution.SKIP,
+                                ConflictResolution.SKIP_ALL,
+                            ):
+                                continue
+                            elif actual_resolution == ConflictResolution.EXIT:
+                                break
+                            renamed = target_path != final_path
+                            target_path = final_path
+
+                            # Handle file replacement on Windows
+                            if target_path and destination.exists(target_path):
                                 if actual_resolution in (
-                                    ConflictResolution.SKIP,
-                                    ConflictResolution.SKIP_ALL,
+                                    ConflictResolution.REPLACE,
+                                    ConflictResolution.REPLACE_ALL,
                                 ):
-                                    continue
-                                elif actual_resolution == ConflictResolution.EXIT:
-                                    break
-                                target_path = final_path
-
-                                # Handle file replacement on Windows
-                                if target_path and target_path.exists():
-                                    if actual_resolution in (
-                                        ConflictResolution.REPLACE,
-                                        ConflictResolution.REPLACE_ALL,
-                                    ):
-                                        target_path.unlink()  # Remove existing file
+                                    target_path.unlink()  # Remove existing file
+                                    destination.removed(target_path)
 
-                            if target_path:
+                        if target_path:
+                            try:
                                 _move_file_cross_platform(temp_file, target_path)
+                            except BaseException:
+                                if renamed:
+                                    destination.discard(target_path)
+                                raise
+                            destination.added(target_path)
+                            sync.written(target_path)
                 finally:
                     # Clean up temp directory
                     import shutil
 
                     shutil.rmtree(temp_extract_path, ignore_errors=True)
 
+        sync.finish()
+
+
+def _volume_groups(first: Path) -> list[list[Path]]:
+    """Split the volumes of an archive into runs that each start with a member."""
+    groups: list[list[Path]] = []
+    for path in _volume_paths(first) or []:
+        with open(path, "rb") as f:
+            header = _read_volume_header(f)
+        if not groups or (header is not None and header[1]):
+            groups.append([path])
+        else:
+            groups[-1].append(path)
+    return groups
+
+
+def _extract_volume_groups(
+    groups: list[list[Path]],
+    workers: int | None,
+    interactive_callback: Callable[[Path], ConflictResolution] | None,
+    **kwargs,
+) -> None:
+    """Extract runs of volumes on a thread pool; see :func:`extract_archive`."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    callback = interactive_callback
+    if interactive_callback is not None:
+        lock = threading.Lock()
+
+        def callback(path: Path) -> ConflictResolution:
+            # One question at a time
+            with lock:
+                return interactive_callback(path)
+
+    def extract(group: list[Path], first: int) -> None:
+        reader = _VolumeReader(group, first)
+        try:
+            extract_archive(
+                reader, streaming=True, interactive_callback=callback, **kwargs
+            )
+        finally:
+            reader.close()
+
+    firsts = [1]
+    for group in groups[:-1]:
+        firsts.append(firsts[-1] + len(group))
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [
+            pool.submit(extract, group, first)
+            for group, first in zip(groups, firsts, strict=True)
+        ]
+        for future in futures:
+            future.result()
+
 
 def list_archive(
-    archive_path: str | Path, verbose: bool = False, streaming: bool = False
+    archive_path: str | Path | BinaryIO,
+    verbose: bool = False,
+    streaming: bool = False,
+    memory_map: bool = False,
+    memory_limit: int | None = None,
 ) -> list[dict]:
     """
     List contents of a .tzst archive.
 
     Args:
-        archive_path: Path to the archive
+        archive_path: Path to the archive, or a binary file object to read it from
         verbose: Include detailed information
         streaming: If True, use streaming mode (memory efficient for large archives)
+        memory_map: Decompress from a read-only memory mapping of the archive
+                    file; see :class:`TzstArchive`
+        memory_limit: Bytes of memory listing may use; see :class:`TzstArchive`.
+                      The archive is then always streamed.
 
     Returns:
         List of file information dictionaries
@@ -963,33 +3612,64 @@ def list_archive(
     See Also:
         :meth:`TzstArchive.list`: Method for listing an open archive
     """
-    with TzstArchive(archive_path, "r", streaming=streaming) as archive:
+    with TzstArchive(
+        **_archive_source(archive_path),
+        mode="r",
+        # Listing is a single pass, which streaming does in constant memory
+        streaming=streaming or memory_limit is not None,
+        memory_map=memory_map,
+        memory_limit=memory_limit,
+    ) as archive:
         return archive.list(verbose=verbose)
 
 
-def test_archive(archive_path: str | Path, streaming: bool = False) -> bool:
+def test_archive(
+    archive_path: str | Path | BinaryIO,
+    streaming: bool = False,
+    memory_map: bool = False,
+    memory_limit: int | None = None,
+) -> bool:
     """
     Test the integrity of a .tzst archive.
 
     Args:
-        archive_path: Path to the archive
+        archive_path: Path to the archive, or a binary file object to read it from
         streaming: If True, use streaming mode (memory efficient for large archives)
+        memory_map: Decompress from a read-only memory mapping of the archive
+                    file; see :class:`TzstArchive`
+        memory_limit: Bytes of memory testing may use; see :class:`TzstArchive`.
+                      The archive is then always streamed.
 
     Returns:
         True if archive is valid, False otherwise
 
+    Raises:
+        TzstMemoryLimitError: If the archive cannot be decompressed within
+                              ``memory_limit``
+
     See Also:
         :meth:`TzstArchive.test`: Method for testing an open archive
     """
     try:
         # Open a fresh archive instance for testing
-        with TzstArchive(archive_path, "r", streaming=streaming) as archive:
+        with TzstArchive(
+            **_archive_source(archive_path),
+            mode="r",
+            streaming=streaming or memory_limit is not None,
+            memory_map=memory_map,
+            memory_limit=memory_limit,
+        ) as archive:
+            members = (
+                archive.getmembers()
+                if memory_limit is None
+                else archive._iter_transient()
+            )
             # Try to iterate through all members and read file contents
-            for member in archive.getmembers():
+            for member in members:
                 if member.isfile():
                     # In streaming mode, extractfile may not work properly with r| mode
                     # So we'll just check that we can iterate through members
-                    if streaming:
+                    if archive.streaming:
                         # For streaming mode, just verify we can read the member info
                         # This tests that the archive structure is valid
                         continue
@@ -1003,5 +3683,1233 @@ def test_archive(archive_path: str | Path, streaming: bool = False) -> bool:
                                 if not chunk:
                                     break
             return True
+    except TzstMemoryLimitError:
+        # Not a defect of the archive
+        raise
     except Exception:
         return False
+
+
+#: Leading bytes of the compressed inputs :func:`convert` recognises
+_CONVERT_SIGNATURES = (
+    (b"\x1f\x8b", "gz"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"PK\x03\x04", "zip"),
+    (b"PK\x05\x06", "zip"),
+    (b"\x28\xb5\x2f\xfd", "zst"),
+)
+
+#: File name suffixes of the archives :func:`convert_many` picks up
+_CONVERTIBLE_SUFFIXES = (
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tbz",
+    ".tar.xz",
+    ".txz",
+    ".zip",
+    ".tar",
+)
+
+
+def _sniff_format(fileobj: BinaryIO) -> str:
+    """Identify the format of *fileobj* from its first bytes, without consuming them."""
+    if _is_seekable(fileobj):
+        position = fileobj.tell()
+        head = fileobj.read(8)
+        fileobj.seek(position)
+    elif hasattr(fileobj, "peek"):
+        head = fileobj.peek(8)[:8]
+    else:
+        raise TzstArchiveError(
+            "Cannot detect the input format of a stream without peek() support"
+        )
+    for signature, name in _CONVERT_SIGNATURES:
+        if head.startswith(signature):
+            return name
+    # Uncompressed tar has no magic at offset 0; tarfile validates the header
+    return "tar"
+
+
+def _converted_name(path: Path) -> str:
+    """Return the .tzst file name for a convertible archive."""
+    name = path.name
+    for suffix in _CONVERTIBLE_SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[: -len(suffix)] + ".tzst"
+    return name + ".tzst"
+
+
+def _tar_entries(
+    fileobj: BinaryIO, compression: str
+) -> Iterator[tuple[tarfile.TarInfo, BinaryIO | None]]:
+    """Yield the members of a (compressed) tar stream in a single pass."""
+    mode = "r|" if compression == "tar" else f"r|{compression}"
+    with _TzstTarFile.open(fileobj=fileobj, mode=mode, bufsize=_COPY_BUFSIZE) as tf:
+        while (member := tf.next()) is not None:
+            # Nothing looks back at earlier members
+            tf.members.clear()
+            if not member.isreg():
+                yield member, None
+                continue
+            data = tf.extractfile(member)
+            if member.sparse is None:
+                yield member, data
+                continue
+            # Keep the holes: store the same regions in the PAX 1.0 layout
+            regular = copy.copy(member)
+            regular.type = tarfile.REGTYPE
+            regular.sparse = None
+            regular.pax_headers = {
+                key: value
+                for key, value in member.pax_headers.items()
+                if not key.startswith("GNU.sparse.")
+            }
+            regions = [region for region in member.sparse if region[1]]
+            if not regions or sum(regions[-1]) < member.size:
+                regions.append((member.size, 0))
+            # The unbuffered reader seeks forward within a stream; the
+            # buffered one refuses because the stream is not seekable
+            yield _sparse_member(regular, data.raw, regions)
+
+
+def _zip_entries(
+    fileobj: BinaryIO,
+) -> Iterator[tuple[tarfile.TarInfo, BinaryIO | None]]:
+    """Yield the entries of a zip file as tar members."""
+    import zipfile
+
+    if not _is_seekable(fileobj):
+        raise TzstArchiveError(
+            "Zip input must be seekable: its directory is stored at the end"
+        )
+    try:
+        zf = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile as e:
+        raise TzstArchiveError(f"Invalid zip file: {e}") from e
+    with zf:
+        for info in zf.infolist():
+            tarinfo = tarfile.TarInfo(info.filename.replace("\\", "/").rstrip("/"))
+            tarinfo.mtime = time.mktime((*info.date_time, 0, 0, -1))
+            # Zip files made on Unix keep st_mode in the high external_attr bits
+            unix_mode = info.external_attr >> 16
+            if info.is_dir():
+                tarinfo.type = tarfile.DIRTYPE
+                tarinfo.mode = stat.S_IMODE(unix_mode) or 0o755
+                yield tarinfo, None
+            elif stat.S_ISLNK(unix_mode):
+                tarinfo.type = tarfile.SYMTYPE
+                tarinfo.mode = stat.S_IMODE(unix_mode)
+                tarinfo.linkname = zf.read(info).decode("utf-8")
+                yield tarinfo, None
+            else:
+                tarinfo.size = info.file_size
+                tarinfo.mode = stat.S_IMODE(unix_mode) or 0o644
+                with zf.open(info) as data:
+                    yield tarinfo, data
+
+
+def convert(
+    source: str | Path | BinaryIO,
+    target: str | Path | BinaryIO | None = None,
+    compression_level: int = 3,
+    threads: int = 0,
+    use_temp_file: bool = True,
+    durability: Durability | str = Durability.BATCH,
+) -> dict:
+    """
+    Rewrite a tar, tar.gz, tar.bz2, tar.xz or zip archive as .tzst.
+
+    The input is decoded and re-encoded in a single pass: members are copied
+    from the source stream straight into the zstd writer and never touch the
+    filesystem. Tar inputs are read front to back, so they can come from a
+    pipe; zip inputs need random access. Sparse tar members keep their holes.
+
+    Args:
+        source: Path of the archive to convert, or a binary file object
+        target: Path for the new archive, or a writable binary file object.
+                Defaults to the source path with its archive suffix replaced
+                by ``.tzst``, e.g. ``logs.tar.gz`` becomes ``logs.tzst``.
+        compression_level: Zstandard compression level (1-22)
+        threads: Number of zstd worker threads (0 compresses on the calling
+                 thread, -1 uses one per CPU)
+        use_temp_file: If True, create the archive in a temporary file first,
+                      then move it to its final location
+        durability: How to flush the finished archive; see :func:`create_archive`
+
+    Returns:
+        Dictionary describing the conversion: ``source``, ``target``,
+        ``format`` (``tar``, ``gz``, ``bz2``, ``xz`` or ``zip``), ``members``,
+        ``size`` (bytes of member data), ``source_size`` and ``target_size``
+        (archive sizes in bytes, None where unknown for file objects) and
+        ``seconds``.
+
+    Raises:
+        TzstArchiveError: If the source is not a supported archive or is corrupt
+        ValueError: If no target is given for a file object source
+
+    See Also:
+        :func:`convert_many`: Convert many archives in parallel
+    """
+    if not 1 <= compression_level <= 22:
+        raise ValueError(
+            f"Invalid compression level '{compression_level}'. Must be between 1 and 22."
+        )
+    durability = _durability(durability)
+    if target is None:
+        if not isinstance(source, str | os.PathLike):
+            raise ValueError("A target is required when converting a file object")
+        target = Path(source).parent / _converted_name(Path(source))
+    elif isinstance(target, str | os.PathLike):
+        target = _normalize_archive_path(target)
+
+    started = time.perf_counter()
+    try:
+        if isinstance(source, str | os.PathLike):
+            with open(source, "rb") as stream:
+                result = _convert_stream(
+                    stream,
+                    target,
+                    compression_level,
+                    threads,
+                    use_temp_file,
+                    durability,
+                )
+            result["source"] = str(source)
+            result["source_size"] = os.path.getsize(source)
+        else:
+            result = _convert_stream(
+                source, target, compression_level, threads, use_temp_file, durability
+            )
+    except FileNotFoundError:
+        raise
+    except (tarfile.TarError, EOFError, OSError) as e:
+        raise TzstArchiveError(f"Failed to convert {source}: {e}") from e
+
+    if isinstance(target, Path):
+        result["target"] = str(target)
+        result["target_size"] = os.path.getsize(target)
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def _convert_stream(
+    stream: BinaryIO,
+    target: Path | BinaryIO,
+    compression_level: int,
+    threads: int,
+    use_temp_file: bool,
+    durability: Durability,
+) -> dict:
+    """Copy the members of the archive in *stream* into a new .tzst archive."""
+    compression = _sniff_format(stream)
+    if compression == "zst":
+        raise TzstArchiveError("Source is already a Zstandard-compressed archive")
+    result = {
+        "source": None,
+        "target": None,
+        "format": compression,
+        "members": 0,
+        "size": 0,
+        "source_size": None,
+        "target_size": None,
+    }
+
+    def build(output: Path | BinaryIO) -> None:
+        entries = (
+            _zip_entries(stream)
+            if compression == "zip"
+            else _tar_entries(stream, compression)
+        )
+        with TzstArchive(
+            **_archive_source(output),
+            mode="w",
+            compression_level=compression_level,
+            threads=threads,
+        ) as archive:
+            for tarinfo, data in entries:
+                archive._addfile(tarinfo, data)
+                result["members"] += 1
+                if tarinfo.isreg():
+                    result["size"] += int(
+                        tarinfo.pax_headers.get("GNU.sparse.realsize", tarinfo.size)
+                    )
+
+    if isinstance(target, Path):
+        _write_archive(target, build, use_temp_file, durability)
+    else:
+        build(target)
+    return result
+
+
+def _convertible_sources(sources: Iterable[str | Path]) -> Iterator[Path]:
+    """Expand directories in *sources* to the archives directly inside them."""
+    for source in sources:
+        source = Path(source)
+        if not source.is_dir():
+            yield source
+            continue
+        for entry in sorted(os.scandir(source), key=lambda entry: entry.name):
+            if entry.is_file() and entry.name.lower().endswith(_CONVERTIBLE_SUFFIXES):
+                yield Path(entry.path)
+
+
+def convert_many(
+    sources: Iterable[str | Path],
+    output_dir: str | Path | None = None,
+    compression_level: int = 3,
+    threads: int = 0,
+    workers: int | None = None,
+    durability: Durability | str = Durability.BATCH,
+) -> list[dict]:
+    """
+    Convert many archives to .tzst in parallel worker processes.
+
+    Each archive is converted by :func:`convert` in its own process, so
+    decompressing the inputs (gzip, bz2 and xz decoding is single-threaded)
+    scales with the number of CPUs.
+
+    Args:
+        sources: Paths of the archives to convert. A directory stands for
+                 the archives directly inside it (``.tar``, ``.tar.gz``,
+                 ``.tgz``, ``.tar.bz2``, ``.tbz2``, ``.tbz``, ``.tar.xz``,
+                 ``.txz`` and ``.zip`` files).
+        output_dir: Directory for the new archives (default: next to each
+                    source). Names keep the source stem with a ``.tzst``
+                    suffix, e.g. ``logs.tar.gz`` becomes ``logs.tzst``.
+        compression_level: Zstandard compression level (1-22)
+        threads: zstd worker threads per conversion
+        workers: Number of worker processes (default: one per CPU)
+        durability: How to flush each finished archive
+
+    Returns:
+        One dictionary per source, in input order, as returned by
+        :func:`convert`. A conversion that failed is reported with
+        ``source``, ``target`` and an ``error`` message instead of
+        stopping the others.
+
+    Raises:
+        ValueError: If two sources would be written to the same target
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not 1 <= compression_level <= 22:
+        raise ValueError(
+            f"Invalid compression level '{compression_level}'. Must be between 1 and 22."
+        )
+    durability = _durability(durability).value
+    jobs: dict[Path, Path] = {}
+    for source in _convertible_sources(sources):
+        directory = Path(output_dir) if output_dir is not None else source.parent
+        target = directory / _converted_name(source)
+        if target in jobs.values():
+            raise ValueError(f"More than one source would be converted to {target}")
+        jobs[source] = target
+    if not jobs:
+        return []
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                convert,
+                source,
+                target,
+                compression_level=compression_level,
+                threads=threads,
+                durability=durability,
+            )
+            for source, target in jobs.items()
+        ]
+        for (source, target), future in zip(jobs.items(), futures, strict=True):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(
+                    {"source": str(source), "target": str(target), "error": str(e)}
+                )
+    return results
+
+
+#: Window of ``long_distance`` matching, 128 MiB like ``zstd --long``. It is
+#: the largest window decoders accept without raising their memory limit.
+_LONG_WINDOW_LOG = 27
+
+
+class _NeedMoreData(Exception):
+    """Raised by :class:`_HeaderBuffer` when a header runs past the bytes seen."""
+
+
+class _HeaderBuffer:
+    """File-like view of buffered tar bytes that begin at stream offset *start*."""
+
+    def __init__(self, data: bytes | bytearray | memoryview, start: int):
+        self._data = data
+        self._start = start
+        self._position = 0
+
+    def read(self, size: int) -> bytes:
+        if self._position + size > len(self._data):
+            raise _NeedMoreData
+        chunk = bytes(self._data[self._position : self._position + size])
+        self._position += size
+        return chunk
+
+    def tell(self) -> int:
+        return self._start + self._position
+
+
+#: The ``size`` record of a PAX extended header
+_PAX_SIZE = re.compile(rb"(?:^|\n)\d+ size=(\d+)\n")
+
+
+def _blocks(size: int) -> int:
+    """Return *size* rounded up to whole tar blocks."""
+    return -(-size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+
+def _block_at(data: memoryview, offset: int, size: int) -> bytes:
+    """Return *size* bytes of *data* at *offset*, or raise _NeedMoreData."""
+    if offset + size > len(data):
+        raise _NeedMoreData
+    return bytes(data[offset : offset + size])
+
+
+class _MemberFrameWriter:
+    """Pass a tar stream to a zstd writer, ending frames on member boundaries.
+
+    The tar headers in the stream are followed to end a frame at the first
+    member boundary after every ``_MEMBER_FRAME_SIZE`` bytes and before the
+    end-of-archive blocks, as :class:`_TzstTarFile` does when writing. The
+    bytes themselves pass through unchanged; after a header that cannot be
+    parsed, the rest of the stream stays in the current frame.
+    """
+
+    # Read by TarInfo.fromtarfile(), which is handed this object as its TarFile
+    encoding = tarfile.ENCODING
+    errors = "surrogateescape"
+
+    def __init__(self, writer: zstd.ZstdCompressionWriter):
+        self._writer = writer
+        self._position = 0
+        self._frame_start = 0
+        # Offset of the next header, None once headers are no longer followed
+        self._header: int | None = 0
+        self._pending = bytearray()
+        self.fileobj: _HeaderBuffer | None = None
+        self.offset = 0
+        self.pax_headers: dict[str, str] = {}
+
+    def write(self, data: bytes) -> int:
+        if self._pending:
+            # The stream stopped inside a header last time; it starts this one
+            self._pending += data
+            view = memoryview(bytes(self._pending))
+            self._pending.clear()
+        else:
+            view = memoryview(data)
+        # Bytes pass through in as few writes as the frame ends allow
+        start = offset = 0
+        while offset < len(view):
+            if self._header is None or self._position < self._header:
+                length = len(view) - offset
+                if self._header is not None:
+                    length = min(length, self._header - self._position)
+                offset += length
+                self._position += length
+                continue
+            try:
+                end = self._member_end(view[offset:])
+            except _NeedMoreData:
+                self._pending += view[offset:]
+                break
+            except (tarfile.TarError, ValueError):
+                self._header = None
+                continue
+            if end is None or self._position - self._frame_start >= _MEMBER_FRAME_SIZE:
+                self._writer.write(view[start:offset])
+                start = offset
+                self._end_frame()
+            # The end-of-archive blocks get a frame of their own
+            self._header = None if end is None else self._position + end
+        self._writer.write(view[start:offset])
+        return len(data)
+
+    def close(self) -> None:
+        """Pass on the bytes of a header the stream ended inside of."""
+        self._writer.write(self._pending)
+        self._pending.clear()
+
+    def _member_end(self, data: memoryview) -> int | None:
+        """Return the length of the member at the start of *data*.
+
+        Returns None for the end-of-archive blocks. Only the fields that
+        locate the next header are decoded; sparse members, whose layout is
+        more involved, are left to :meth:`tarfile.TarInfo.fromtarfile`.
+        """
+        offset = 0
+        size_override = None
+        while True:
+            block = _block_at(data, offset, tarfile.BLOCKSIZE)
+            if not offset and not block.strip(tarfile.NUL):
+                return None
+            kind = bytes(block[156:157])
+            size = tarfile.nti(block[124:136])
+            if kind == tarfile.GNUTYPE_SPARSE:
+                return self._parsed_member_end(data)
+            if kind in (tarfile.XHDTYPE, tarfile.SOLARIS_XHDTYPE):
+                records = _block_at(data, offset + tarfile.BLOCKSIZE, size)
+                if b"GNU.sparse" in records:
+                    return self._parsed_member_end(data)
+                if match := _PAX_SIZE.search(records):
+                    size_override = int(match[1])
+            elif kind == tarfile.XGLTYPE:
+                if b"size=" in _block_at(data, offset + tarfile.BLOCKSIZE, size):
+                    return self._parsed_member_end(data)
+            elif kind not in (tarfile.GNUTYPE_LONGNAME, tarfile.GNUTYPE_LONGLINK):
+                break
+            # An extended header: the member's own header follows its records
+            offset += tarfile.BLOCKSIZE + _blocks(size)
+        if size_override is not None:
+            size = size_override
+        offset += tarfile.BLOCKSIZE
+        if kind in tarfile.REGULAR_TYPES or kind not in tarfile.SUPPORTED_TYPES:
+            offset += _blocks(size)
+        return offset
+
+    def _parsed_member_end(self, data: memoryview) -> int:
+        """Locate the next header with :mod:`tarfile`'s own header parser."""
+        self.fileobj = _HeaderBuffer(data, self._position)
+        tarfile.TarInfo.fromtarfile(self)
+        return self.offset - self._position
+
+    def _end_frame(self) -> None:
+        if self._position > self._frame_start:
+            self._writer.flush(zstd.FLUSH_FRAME)
+            self._frame_start = self._position
+
+
+def _pipelined_copy(
+    reader: BinaryIO,
+    writer: BinaryIO,
+    chunk_size: int = _COPY_BUFSIZE,
+    depth: int = 4,
+) -> int:
+    """Copy *reader* to *writer* with reads running on a second thread.
+
+    zstd releases the GIL while it works, so decompressing the next chunks
+    overlaps with compressing the current one. At most *depth* chunks of
+    *chunk_size* bytes are read ahead. Returns the bytes copied.
+    """
+    import queue
+    import threading
+
+    chunks: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            while not stop.is_set() and (chunk := reader.read(chunk_size)):
+                chunks.put(chunk)
+            chunks.put(None)
+        except Exception as e:
+            chunks.put(e)
+
+    thread = threading.Thread(target=produce, name="tzst-decompress", daemon=True)
+    thread.start()
+    total = 0
+    try:
+        while (chunk := chunks.get()) is not None:
+            if isinstance(chunk, Exception):
+                raise chunk
+            writer.write(chunk)
+            total += len(chunk)
+    finally:
+        stop.set()
+        # Unblock a producer waiting for room in the queue
+        while thread.is_alive():
+            try:
+                chunks.get(timeout=0.05)
+            except queue.Empty:
+                pass
+    return total
+
+
+def recompress(
+    source: str | Path | BinaryIO,
+    target: str | Path | BinaryIO,
+    compression_level: int = 3,
+    threads: int = 0,
+    long_distance: bool = False,
+    use_temp_file: bool = True,
+    durability: Durability | str = Durability.BATCH,
+    memory_limit: int | None = None,
+) -> dict:
+    """
+    Re-encode a .tzst archive at another compression level without extracting it.
+
+    Only the zstd layer is replaced: the decompressed tar stream is fed
+    straight back into a new compressor, so the members, their order and
+    every header byte stay exactly as they were. Decompression runs on its
+    own thread, overlapping with compression. Frames end on member
+    boundaries as in archives tzst creates, so the result can still be
+    edited with :meth:`TzstArchive.delete` and merged without recompressing
+    everything.
+
+    Args:
+        source: Path of the archive to re-encode, or a binary file object
+        target: Path for the new archive (may be the same as ``source`` when
+                ``use_temp_file`` is True), or a writable binary file object
+        compression_level: Zstandard compression level (1-22)
+        threads: Number of zstd worker threads (0 compresses on the calling
+                 thread, -1 uses one per CPU)
+        long_distance: Enable long distance matching with a 128 MiB window,
+                       like ``zstd --long``. This finds repeats far apart in
+                       large archives; the result still extracts with the
+                       default decoder settings.
+        use_temp_file: If True, write a temporary file first, then move it to
+                      its final location
+        durability: How to flush the finished archive; see :func:`create_archive`
+        memory_limit: Bytes of memory recompression may use, at least 16 MiB.
+                      The new window (including a ``long_distance`` one) and
+                      worker threads are reduced to fit and less data is
+                      read ahead.
+
+    Returns:
+        Dictionary with ``source``, ``target``, ``size`` (bytes of the tar
+        stream), ``source_size`` and ``target_size`` (archive sizes in
+        bytes, None where unknown for file objects) and ``seconds``.
+
+    Raises:
+        TzstDecompressionError: If the source is not a valid zstd stream
+        TzstMemoryLimitError: If the source cannot be decompressed within
+                              ``memory_limit``
+
+    See Also:
+        :func:`convert`: Convert archives in other formats to .tzst
+    """
+    if not 1 <= compression_level <= 22:
+        raise ValueError(
+            f"Invalid compression level '{compression_level}'. Must be between 1 and 22."
+        )
+    durability = _durability(durability)
+    if isinstance(target, str | os.PathLike):
+        target = _normalize_archive_path(target)
+        if (
+            not use_temp_file
+            and isinstance(source, str | os.PathLike)
+            and target.exists()
+            and os.path.samefile(source, target)
+        ):
+            raise ValueError("Recompressing in place requires use_temp_file=True")
+    overrides = (
+        {"enable_ldm": True, "window_log": _LONG_WINDOW_LOG} if long_distance else {}
+    )
+    volumes = (
+        _split_volumes(Path(source)) if isinstance(source, str | os.PathLike) else None
+    )
+    budget = None if memory_limit is None else _MemoryBudget(memory_limit)
+    if budget is None:
+        params = zstd.ZstdCompressionParameters.from_level(
+            compression_level, write_content_size=True, threads=threads, **overrides
+        )
+        dctx = zstd.ZstdDecompressor()
+        copy_options = {}
+    else:
+        params = budget.compression_params(
+            compression_level, threads, write_content_size=True, **overrides
+        )
+        dctx = zstd.ZstdDecompressor(max_window_size=budget.window)
+        copy_options = {"chunk_size": budget.chunk, "depth": budget.queue_depth}
+    result = {
+        "source": str(source) if isinstance(source, str | os.PathLike) else None,
+        "target": str(target) if isinstance(target, Path) else None,
+        "size": 0,
+        "source_size": (
+            sum(map(os.path.getsize, volumes or [source]))
+            if isinstance(source, str | os.PathLike)
+            else None
+        ),
+        "target_size": None,
+    }
+
+    def build(output: Path | BinaryIO, stream: BinaryIO) -> None:
+        target_file = (
+            open(output, "wb")
+            if isinstance(output, Path)
+            else contextlib.nullcontext(output)
+        )
+        with target_file as raw_output:
+            writer = zstd.ZstdCompressor(compression_params=params).stream_writer(
+                raw_output, closefd=False
+            )
+            reader = dctx.stream_reader(stream, read_across_frames=True, closefd=False)
+            with reader, writer:
+                # Frames end on member boundaries as in archives tzst writes,
+                # so the result can still be edited and merged cheaply
+                with contextlib.closing(_MemberFrameWriter(writer)) as frames:
+                    result["size"] = _pipelined_copy(reader, frames, **copy_options)
+
+    started = time.perf_counter()
+    try:
+        with (
+            contextlib.closing(_VolumeReader(volumes))
+            if volumes
+            else open(source, "rb")
+            if isinstance(source, str | os.PathLike)
+            else contextlib.nullcontext(source)
+        ) as stream:
+            if budget is not None:
+                budget.check_window(_first_window_size(stream), str(source))
+            if isinstance(target, Path):
+                _write_archive(
+                    target, lambda path: build(path, stream), use_temp_file, durability
+                )
+            else:
+                build(target, stream)
+    except zstd.ZstdError as e:
+        if budget is not None and _is_window_error(e):
+            raise TzstMemoryLimitError(
+                f"Failed to recompress {source}: {e} within a memory limit of "
+                f"{_mib(budget.limit)}"
+            ) from e
+        raise TzstDecompressionError(f"Failed to recompress {source}: {e}") from e
+
+    if isinstance(target, Path):
+        result["target_size"] = os.path.getsize(target)
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+#: Largest zstd frame header (magic number included)
+_FRAME_HEADER_MAX = 18
+
+
+def _zstd_frames(fileobj: BinaryIO, name: str) -> list[tuple[int, int]]:
+    """Return the ``(offset, size)`` of every zstd frame in *fileobj*.
+
+    Only frame and block headers are read, so this costs a few bytes per
+    128 KiB block rather than a decompression. Skippable frames are left out.
+
+    Raises:
+        TzstDecompressionError: If the file is not a sequence of zstd frames
+    """
+    end = fileobj.seek(0, os.SEEK_END)
+    frames = []
+    position = 0
+    while position < end:
+        fileobj.seek(position)
+        head = fileobj.read(_FRAME_HEADER_MAX)
+        if head[1:4] == b"\x2a\x4d\x18" and head[0] & 0xF0 == 0x50:
+            position += 8 + int.from_bytes(head[4:8], "little")
+            continue
+        if not head.startswith(b"\x28\xb5\x2f\xfd"):
+            raise TzstDecompressionError(
+                f"Not a Zstandard frame at offset {position} in {name}"
+            )
+        try:
+            has_checksum = zstd.get_frame_parameters(head).has_checksum
+            offset = position + zstd.frame_header_size(head)
+        except zstd.ZstdError as e:
+            raise TzstDecompressionError(f"Invalid frame in {name}: {e}") from e
+        while True:
+            fileobj.seek(offset)
+            block = int.from_bytes(fileobj.read(3), "little")
+            # Bit 0: last block; bits 1-2: type (1 = RLE, a single stored byte)
+            block_type = (block >> 1) & 3
+            offset += 3 + (1 if block_type == 1 else block >> 3)
+            if block_type == 3 or offset > end:
+                raise TzstDecompressionError(f"Corrupt or truncated frame in {name}")
+            if block & 1:
+                break
+        offset += 4 if has_checksum else 0
+        frames.append((position, offset - position))
+        position = offset
+    return frames
+
+
+def _is_end_of_archive_frame(fileobj: BinaryIO, offset: int, size: int) -> bool:
+    """Return True if a frame holds only tar end-of-archive blocks."""
+    # The marker and its padding never exceed a record plus two blocks,
+    # and a run of zeros compresses to a few bytes
+    limit = tarfile.RECORDSIZE + 2 * tarfile.BLOCKSIZE
+    if size > 1024:
+        return False
+    fileobj.seek(offset)
+    reader = zstd.ZstdDecompressor().stream_reader(io.BytesIO(fileobj.read(size)))
+    try:
+        data = reader.read(limit + 1)
+    except zstd.ZstdError:
+        return False
+    return 2 * tarfile.BLOCKSIZE <= len(data) <= limit and not any(data)
+
+
+def _members_to_keep(
+    sources: list[Path], policy: DuplicatePolicy
+) -> list[list[bool] | None]:
+    """Decide per member of every source whether a merge keeps it.
+
+    Entries are None for sources whose members are all kept. Directories
+    are never treated as duplicates.
+    """
+    if policy is DuplicatePolicy.KEEP:
+        return [None] * len(sources)
+
+    listings = []
+    for source in sources:
+        with TzstArchive(source, streaming=True) as archive:
+            listings.append(
+                [(m.name.rstrip("/"), m.isdir()) for m in archive._iter_transient()]
+            )
+
+    owner: dict[str, tuple[int, int]] = {}
+    order = range(len(sources))
+    if policy is DuplicatePolicy.LAST:
+        order = reversed(order)
+    keep: list[list[bool]] = [[True] * len(listing) for listing in listings]
+    for index in order:
+        positions = range(len(listings[index]))
+        if policy is DuplicatePolicy.LAST:
+            positions = reversed(positions)
+        for position in positions:
+            name, is_dir = listings[index][position]
+            if is_dir:
+                continue
+            if name not in owner:
+                owner[name] = (index, position)
+                continue
+            if policy is DuplicatePolicy.ERROR:
+                raise TzstArchiveError(
+                    f"Duplicate member '{name}' in {sources[owner[name][0]]} "
+                    f"and {sources[index]}"
+                )
+            keep[index][position] = False
+    return [None if all(flags) else flags for flags in keep]
+
+
+def _archive_frames(fileobj: BinaryIO, name: str) -> list[tuple[int, int]] | None:
+    """Return the frames of an archive whose last frame is its end-of-archive marker.
+
+    Returns None if the end-of-archive blocks do not have a frame of their
+    own, as in archives written before tzst separated them. The file is
+    left at its start.
+    """
+    frames = _zstd_frames(fileobj, name)
+    if not frames or not _is_end_of_archive_frame(fileobj, *frames[-1]):
+        frames = None
+    fileobj.seek(0)
+    return frames
+
+
+def _end_of_archive_frame(compression_level: int) -> bytes:
+    """Return a zstd frame holding the two tar end-of-archive blocks."""
+    end = tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+    return zstd.ZstdCompressor(level=compression_level).compress(end)
+
+
+class _LimitedReader:
+    """File-like view of the next *length* bytes of a file object."""
+
+    def __init__(self, fileobj: BinaryIO, length: int):
+        self._fileobj = fileobj
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fileobj.read(size)
+        self._remaining -= len(data)
+        return data
+
+
+def _member_frames(
+    fileobj: BinaryIO, name: str
+) -> tuple[list[tuple[int, int]], tuple[int, int, int] | None]:
+    """Find where the members of an archive end among its zstd frames.
+
+    The end-of-archive blocks need not start on a frame boundary: other
+    writers may split them across frames or put them in the frame of the
+    last member. The archive is decompressed once, without recompressing,
+    and its tar headers are read to find where the members end in the
+    decompressed stream; everything after that is end-of-archive zeros.
+
+    Returns the frames wholly before that point and, if it falls inside a
+    frame, that frame as ``(offset, size, length)``, whose first *length*
+    decompressed bytes still belong to the members. The file is left at
+    its start.
+    """
+    frames = _zstd_frames(fileobj, name)
+    reader = _FrameReader(fileobj, frames)
+    try:
+        with _TzstTarFile.open(fileobj=reader, mode="r|", bufsize=_COPY_BUFSIZE) as tf:
+            while tf.next() is not None:
+                tf.members.clear()
+            end = tf.offset
+    except tarfile.ReadError:
+        # An archive without members is nothing but end-of-archive blocks
+        fileobj.seek(0)
+        head = zstd.ZstdDecompressor().stream_reader(
+            fileobj, read_across_frames=True, closefd=False
+        )
+        if any(head.read(tarfile.BLOCKSIZE)):
+            raise
+        end = 0
+    fileobj.seek(0)
+    whole = bisect.bisect_right(reader.ends, end)
+    start = reader.ends[whole - 1] if whole else 0
+    if start == end:
+        return frames[:whole], None
+    return frames[:whole], (*frames[whole], end - start)
+
+
+def _copy_ranges(
+    source: BinaryIO,
+    output: BinaryIO,
+    frames: list[tuple[int, int]],
+    buffer: memoryview,
+    name: str,
+) -> None:
+    """Copy zstd frames verbatim, adjacent frames as one range."""
+    ranges: list[list[int]] = []
+    for offset, size in frames:
+        if ranges and sum(ranges[-1]) == offset:
+            ranges[-1][1] += size
+        else:
+            ranges.append([offset, size])
+    for offset, size in ranges:
+        source.seek(offset)
+        _copy_data(source, output, size, buffer, name)
+
+
+def _copy_frames(
+    source: BinaryIO,
+    output: BinaryIO,
+    buffer: memoryview,
+    name: str,
+    compression_level: int,
+) -> bool:
+    """Copy the members of an archive, leaving out its end-of-archive blocks.
+
+    Frames holding only members are copied verbatim. If the end-of-archive
+    blocks begin inside a frame, the members' part of that frame is
+    recompressed into a frame of its own. Returns True if nothing had to be
+    recompressed.
+    """
+    frames, partial = _member_frames(source, name)
+    _copy_ranges(source, output, frames, buffer, name)
+    if partial is None:
+        return True
+    offset, size, length = partial
+    source.seek(offset)
+    reader = zstd.ZstdDecompressor().stream_reader(_LimitedReader(source, size))
+    writer = zstd.ZstdCompressor(level=compression_level).stream_writer(
+        output, closefd=False
+    )
+    while length and (chunk := reader.read(min(length, _COPY_BUFSIZE))):
+        writer.write(chunk)
+        length -= len(chunk)
+    writer.flush(zstd.FLUSH_FRAME)
+    return False
+
+
+def _rewrite_members(
+    source: BinaryIO,
+    output: BinaryIO,
+    selected: list[bool] | None,
+    compression_level: int,
+) -> int:
+    """Recompress the selected members of an archive as one frame, without end marker.
+
+    Returns the number of members left out.
+    """
+    reader = zstd.ZstdDecompressor().stream_reader(
+        source, read_across_frames=True, closefd=False
+    )
+    dropped = 0
+
+    def kept() -> Iterator[tuple[tarfile.TarInfo, BinaryIO | None]]:
+        nonlocal dropped
+        for position, entry in enumerate(_tar_entries(reader, "tar")):
+            if selected is None or selected[position]:
+                yield entry
+            else:
+                dropped += 1
+
+    _write_members(kept(), output, compression_level)
+    return dropped
+
+
+def _write_members(
+    entries: Iterable[tuple[tarfile.TarInfo, BinaryIO | None]],
+    output: BinaryIO,
+    compression_level: int,
+    threads: int = 0,
+) -> None:
+    """Compress tar members into *output*, without end marker.
+
+    Frames end on member boundaries as in any archive tzst writes.
+    """
+    writer = zstd.ZstdCompressor(
+        level=compression_level, threads=threads
+    ).stream_writer(output, closefd=False)
+    tf = _TzstTarFile.open(fileobj=writer, mode="w")
+    for tarinfo, data in entries:
+        tf.addfile(tarinfo, data)
+    # Neither tf nor writer is closed: that would append the end-of-archive
+    # blocks, which only the archive's last frame may hold
+    writer.flush(zstd.FLUSH_FRAME)
+
+
+def merge_archives(
+    target: str | Path,
+    sources: Sequence[str | Path],
+    duplicates: DuplicatePolicy | str = DuplicatePolicy.KEEP,
+    compression_level: int = 3,
+    use_temp_file: bool = True,
+    durability: Durability | str = Durability.BATCH,
+) -> dict:
+    """
+    Concatenate .tzst archives into one without recompressing their members.
+
+    zstd frames can be concatenated, and tzst ends every archive's member
+    data with its own frame, followed by a tiny frame holding the tar
+    end-of-archive blocks. Merging therefore copies each source's member
+    frames byte for byte (with ``copy_file_range`` where the kernel supports
+    it) and writes a single new end marker. Each source is decompressed
+    once to find where its members end, since other writers may split the
+    end-of-archive blocks across frames or share a frame with them; only
+    the members' part of such a frame is recompressed. Archives with
+    members that the duplicate policy drops are recompressed whole.
+
+    Args:
+        target: Path for the merged archive
+        sources: Archives to merge, in order
+        duplicates: How to treat a file name found more than once (see
+                    :class:`DuplicatePolicy`): ``"keep"`` (default) keeps all
+                    copies, ``"first"`` or ``"last"`` keeps one, ``"error"``
+                    refuses to merge. Other policies than ``"keep"`` read
+                    every source's member list first.
+        compression_level: Zstandard compression level for sources that
+                           have to be recompressed (1-22)
+        use_temp_file: If True, write a temporary file first, then move it to
+                      its final location
+        durability: How to flush the finished archive; see :func:`create_archive`
+
+    Returns:
+        Dictionary with ``target``, ``sources`` (number of inputs),
+        ``copied`` and ``recompressed`` (how many sources took each path),
+        ``dropped`` (members left out as duplicates), ``target_size`` and
+        ``seconds``.
+
+    Raises:
+        TzstArchiveError: If ``duplicates`` is ``"error"`` and a name repeats
+        TzstDecompressionError: If a source is not a valid archive
+    """
+    if not 1 <= compression_level <= 22:
+        raise ValueError(
+            f"Invalid compression level '{compression_level}'. Must be between 1 and 22."
+        )
+    policy = _duplicate_policy(duplicates)
+    durability = _durability(durability)
+    if not sources:
+        raise ValueError("No archives to merge")
+    target = _normalize_archive_path(target)
+    sources = [Path(source) for source in sources]
+    for source in sources:
+        if not source.is_file():
+            raise FileNotFoundError(f"Archive not found: {source}")
+        if not use_temp_file and target.exists() and os.path.samefile(source, target):
+            raise ValueError("Merging into a source requires use_temp_file=True")
+
+    started = time.perf_counter()
+    keep = _members_to_keep(sources, policy)
+    result = {
+        "target": str(target),
+        "sources": len(sources),
+        "copied": 0,
+        "recompressed": 0,
+        "dropped": 0,
+    }
+
+    def build(path: Path) -> None:
+        buffer = memoryview(bytearray(_COPY_BUFSIZE))
+        with open(path, "wb") as output:
+            for source, selected in zip(sources, keep, strict=True):
+                if volumes := _split_volumes(source):
+                    # Volumes cannot be copied frame by frame into one file
+                    with contextlib.closing(_VolumeReader(volumes)) as stream:
+                        result["dropped"] += _rewrite_members(
+                            stream, output, selected, compression_level
+                        )
+                    result["recompressed"] += 1
+                    continue
+                with open(source, "rb") as stream:
+                    if selected is None:
+                        copied = _copy_frames(
+                            stream, output, buffer, str(source), compression_level
+                        )
+                        result["copied" if copied else "recompressed"] += 1
+                        continue
+                    result["dropped"] += _rewrite_members(
+                        stream, output, selected, compression_level
+                    )
+                    result["recompressed"] += 1
+            output.write(_end_of_archive_frame(compression_level))
+
+    try:
+        _write_archive(target, build, use_temp_file, durability)
+    except zstd.ZstdError as e:
+        raise TzstDecompressionError(f"Failed to merge archives: {e}") from e
+    except tarfile.TarError as e:
+        raise TzstArchiveError(f"Failed to merge archives: {e}") from e
+
+    result["target_size"] = os.path.getsize(target)
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+class _FrameReader:
+    """Decompress zstd frames one after another, noting where each one ends.
+
+    ``ends`` holds the offset in the decompressed stream at which every
+    frame read so far ended.
+    """
+
+    def __init__(self, fileobj: BinaryIO, frames: list[tuple[int, int]]):
+        self._fileobj = fileobj
+        self._frames = iter(frames)
+        self._reader: zstd.ZstdDecompressionReader | None = None
+        self._position = 0
+        self.ends: list[int] = []
+
+    def read(self, size: int = -1) -> bytes:
+        while True:
+            if self._reader is None:
+                frame = next(self._frames, None)
+                if frame is None:
+                    return b""
+                self._fileobj.seek(frame[0])
+                self._reader = zstd.ZstdDecompressor().stream_reader(
+                    _LimitedReader(self._fileobj, frame[1])
+                )
+            data = self._reader.read(size)
+            if data:
+                self._position += len(data)
+                return data
+            self.ends.append(self._position)
+            self._reader = None
+
+
+def _frame_segments(
+    fileobj: BinaryIO, frames: list[tuple[int, int]], names: set[str], name: str
+) -> tuple[list[tuple[int, int, bool]], set[str]]:
+    """Group member frames into runs that begin and end on member boundaries.
+
+    A run can be copied or rewritten on its own. Returns ``(offset, size,
+    affected)`` for every run, where ``affected`` tells whether it holds one
+    of *names*, and the set of *names* found.
+    """
+    reader = _FrameReader(fileobj, frames)
+    boundaries = {0}
+    hits = []
+    found = set()
+    with _TzstTarFile.open(fileobj=reader, mode="r|", bufsize=_COPY_BUFSIZE) as tf:
+        start = 0
+        while (member := tf.next()) is not None:
+            tf.members.clear()
+            member_name = member.name.rstrip("/")
+            if member_name in names:
+                found.add(member_name)
+                hits.append(start)
+            # In stream mode the offset is now just past the member's data
+            start = tf.offset
+            boundaries.add(start)
+
+    segments = []
+    first = 0
+    segment_start = 0
+    for index, (offset, size) in enumerate(frames):
+        end = reader.ends[index] if index < len(reader.ends) else None
+        if index < len(frames) - 1 and end not in boundaries:
+            continue
+        affected = any(
+            segment_start <= hit and (end is None or hit < end) for hit in hits
+        )
+        segments.append((frames[first][0], offset + size - frames[first][0], affected))
+        first = index + 1
+        segment_start = end
+    return segments, found
+
+
+def _edit_archive(
+    path: Path,
+    names: set[str],
+    edit: Callable[[tarfile.TarInfo], tuple[tarfile.TarInfo, BinaryIO] | None],
+    compression_level: int,
+    threads: int = 0,
+) -> int:
+    """Replace or drop the members called *names* in an archive file.
+
+    *edit* returns the new member and its data, or None to drop it. Runs of
+    frames holding none of the members are copied verbatim; the others are
+    recompressed. Returns the number of members edited.
+
+    Raises:
+        KeyError: If one of *names* is not in the archive
+    """
+    found = set()
+    edited = 0
+
+    def entries(
+        reader: BinaryIO,
+    ) -> Iterator[tuple[tarfile.TarInfo, BinaryIO | None]]:
+        nonlocal edited
+        for tarinfo, data in _tar_entries(reader, "tar"):
+            member_name = tarinfo.name.rstrip("/")
+            if member_name in names:
+                found.add(member_name)
+                edited += 1
+                replacement = edit(tarinfo)
+                if replacement is None:
+                    continue
+                tarinfo, data = replacement
+            yield tarinfo, data
+
+    def build(output_path: Path) -> None:
+        buffer = memoryview(bytearray(_COPY_BUFSIZE))
+        with open(path, "rb") as source, open(output_path, "wb") as output:
+            for offset, size, affected in segments:
+                source.seek(offset)
+                if not affected:
+                    _copy_data(source, output, size, buffer, str(path))
+                    continue
+                reader = zstd.ZstdDecompressor().stream_reader(
+                    _LimitedReader(source, size), read_across_frames=True
+                )
+                _write_members(entries(reader), output, compression_level, threads)
+            output.write(_end_of_archive_frame(compression_level))
+        if missing := names - found:
+            raise KeyError(f"filename {min(missing)!r} not found")
+
+    try:
+        with open(path, "rb") as source:
+            frames = _archive_frames(source, str(path))
+            if frames is None:
+                # A single frame that also holds the end marker: rewrite it all
+                segments = [(0, source.seek(0, os.SEEK_END), True)]
+            else:
+                segments, present = _frame_segments(
+                    source, frames[:-1], names, str(path)
+                )
+                if missing := names - present:
+                    raise KeyError(f"filename {min(missing)!r} not found")
+        _write_archive(path, build, use_temp_file=True)
+    except zstd.ZstdError as e:
+        raise TzstDecompressionError(f"Failed to rewrite {path}: {e}") from e
+    except tarfile.TarError as e:
+        raise TzstArchiveError(f"Failed to rewrite {path}: {e}") from e
+    return edited
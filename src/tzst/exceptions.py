@@ -65,3 +65,18 @@ class TzstFileNotFoundError(TzstError, FileNotFoundError):
     """
 
     pass
+
+
+class TzstMemoryLimitError(TzstArchiveError):
+    """Exception raised when an operation cannot stay within its memory limit.
+
+    This can occur when:
+    - An archive was compressed with a window larger than the limit allows
+      (e.g. with long distance matching) and cannot be decompressed within it
+    - The limit is too small for the buffers an operation needs
+
+    Inherits from TzstArchiveError, so existing handlers of archive errors
+    also catch it.
+    """
+
+    pass
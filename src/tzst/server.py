@@ -0,0 +1,399 @@
+"""Long-running tzst worker serving JSON requests on a local socket.
+
+Starting Python and importing zstandard costs more than listing or testing a
+small archive. ``tzst serve --socket PATH`` keeps one process running that
+answers requests sent over a Unix domain socket, and the zstd contexts it
+creates are reused from one job to the next.
+
+Protocol:
+    A client connects and writes requests as JSON objects, one per line,
+    and may send any number of them on one connection. A request names its
+    ``command`` (``add``, ``extract``, ``list``, ``test`` or ``ping``) and
+    takes that command's options under the keys of its ``tzst --json``
+    output, e.g. ``{"command": "test", "archive": "/data/a.tzst"}``. Two
+    optional keys apply to every request: ``id``, echoed in each reply, and
+    ``timeout``, a limit in seconds checked between members.
+
+    For each request the server writes JSON lines back: progress events
+    ``{"id": ..., "event": "progress", "members": N, "bytes": N, "member":
+    NAME}`` while the job runs, then one result line. As with ``tzst --json``,
+    the result's ``ok`` is true on success; on failure it carries
+    ``{"type": ..., "message": ...}`` under ``error``. Requests run
+    concurrently on a fixed number of worker threads, so the replies to
+    several requests on one connection may interleave.
+
+    Relative paths are resolved against the server's working directory.
+    Reading operations stream the archive unless a request sets
+    ``"streaming": false``, and decompress from a memory mapping of it if
+    it sets ``"memory_map": true``. A ``"memory_limit"`` in bytes bounds the
+    memory of a request's buffers and zstd contexts.
+
+Example:
+    >>> import json, socket
+    >>> with socket.socket(socket.AF_UNIX) as sock:
+    ...     sock.connect("/run/tzst.sock")
+    ...     sock.sendall(b'{"id": 1, "command": "test", "archive": "a.tzst"}\\n')
+    ...     for line in sock.makefile():
+    ...         reply = json.loads(line)
+    ...         if "event" not in reply:
+    ...             break
+"""
+
+import json
+import os
+import re
+import socket
+import socketserver
+import tarfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .cli import _BATCH_ERRORS, _summarize_listing
+from .core import (
+    ContextPool,
+    _job_scope,
+    _normalize_archive_path,
+    create_archive,
+    extract_archive,
+    list_archive,
+    test_archive,
+)
+
+#: Longest request line accepted, in bytes.
+MAX_REQUEST_SIZE = 1024 * 1024
+
+#: Shortest time between two progress events of one request, in seconds.
+PROGRESS_INTERVAL = 0.1
+
+_FILTERS = ("data", "tar", "fully_trusted")
+
+
+class _TimeLimitExceeded(Exception):
+    """Raised from the progress callback once a request runs out of time."""
+
+
+class _ArchiveNotFound(FileNotFoundError):
+    """Raised when the archive a request reads does not exist."""
+
+
+def _archive(request: dict[str, Any], must_exist: bool = True) -> str:
+    """Return the request's archive path, checking that it exists."""
+    archive = request.get("archive")
+    if not isinstance(archive, str) or not archive:
+        raise ValueError("'archive' must be a path")
+    if must_exist and not Path(archive).exists():
+        raise _ArchiveNotFound(f"Archive not found - {archive}")
+    return archive
+
+
+def _patterns(request: dict[str, Any], key: str) -> list[str | re.Pattern[str]]:
+    """Collect the globs under *key* and regular expressions under *key*_regex."""
+    return [
+        *(request.get(key) or []),
+        *(re.compile(pattern) for pattern in request.get(f"{key}_regex") or []),
+    ]
+
+
+def _add(request: dict[str, Any]) -> dict[str, Any]:
+    archive = _archive(request, must_exist=False)
+    files = request.get("files")
+    if not files or not isinstance(files, list):
+        raise ValueError("'files' must be a non-empty list of paths")
+    compression_level = request.get("compression_level", 3)
+    create_archive(
+        archive,
+        files,
+        compression_level,
+        use_temp_file=request.get("atomic", True),
+        exclude=request.get("exclude") or None,
+        include=request.get("include") or None,
+        respect_gitignore=request.get("respect_gitignore", False),
+        sparse=request.get("sparse", True),
+        durability=request.get("durability", "batch"),
+        memory_limit=request.get("memory_limit"),
+    )
+    return {
+        "archive": archive,
+        "normalized_archive": str(_normalize_archive_path(Path(archive))),
+        "added": files,
+        "compression_level": compression_level,
+    }
+
+
+def _extract(request: dict[str, Any]) -> dict[str, Any]:
+    archive = _archive(request)
+    output_dir = request.get("output_dir")
+    if not isinstance(output_dir, str) or not output_dir:
+        raise ValueError("'output_dir' must be a path")
+    filter_type = request.get("filter", "data")
+    if filter_type not in _FILTERS:
+        raise ValueError(f"'filter' must be one of {', '.join(_FILTERS)}")
+    conflict_resolution = request.get("conflict_resolution", "replace")
+    if conflict_resolution == "ask":
+        raise ValueError("interactive conflict prompts are unavailable")
+    include, exclude = _patterns(request, "include"), _patterns(request, "exclude")
+    extract_archive(
+        archive,
+        output_dir,
+        request.get("members") or None,
+        flatten=request.get("flatten", False),
+        streaming=request.get("streaming", True),
+        filter=filter_type,
+        conflict_resolution=conflict_resolution,
+        include=include or None,
+        exclude=exclude or None,
+        durability=request.get("durability", "none"),
+        memory_map=request.get("memory_map", False),
+        memory_limit=request.get("memory_limit"),
+    )
+    return {"archive": archive, "output_dir": output_dir}
+
+
+def _list(request: dict[str, Any]) -> dict[str, Any]:
+    archive = _archive(request)
+    contents = list_archive(
+        archive,
+        verbose=request.get("verbose", False),
+        streaming=request.get("streaming", True),
+        memory_map=request.get("memory_map", False),
+        memory_limit=request.get("memory_limit"),
+    )
+    return {
+        "archive": archive,
+        "contents": contents,
+        "summary": _summarize_listing(contents),
+    }
+
+
+def _test(request: dict[str, Any]) -> dict[str, Any]:
+    archive = _archive(request)
+    healthy = test_archive(
+        archive,
+        streaming=request.get("streaming", True),
+        memory_map=request.get("memory_map", False),
+        memory_limit=request.get("memory_limit"),
+    )
+    result: dict[str, Any] = {"archive": archive, "ok": healthy, "healthy": healthy}
+    if not healthy:
+        result["error"] = {
+            "type": "integrity_check_failed",
+            "message": "Archive test failed - errors detected",
+        }
+    return result
+
+
+def _ping(request: dict[str, Any]) -> dict[str, Any]:
+    return {"version": __version__}
+
+
+_COMMANDS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "add": _add,
+    "extract": _extract,
+    "list": _list,
+    "test": _test,
+    "ping": _ping,
+}
+
+
+class _Job:
+    """Progress reporting and time limit of one request."""
+
+    def __init__(self, send: Callable[[dict[str, Any]], None], timeout: float | None):
+        self._send = send
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._last_event = 0.0
+        self.members = 0
+        self.bytes = 0
+        self.timed_out = False
+
+    def progress(self, tarinfo: tarfile.TarInfo) -> None:
+        self.members += 1
+        self.bytes += tarinfo.size
+        now = time.monotonic()
+        if self._deadline is not None and now > self._deadline:
+            self.timed_out = True
+            raise _TimeLimitExceeded
+        if now - self._last_event >= PROGRESS_INTERVAL:
+            self._last_event = now
+            self._send(
+                {
+                    "event": "progress",
+                    "members": self.members,
+                    "bytes": self.bytes,
+                    "member": tarinfo.name,
+                }
+            )
+
+
+def _error(error_type: str, message: str) -> dict[str, Any]:
+    return {"ok": False, "error": {"type": error_type, "message": message}}
+
+
+class _Connection(socketserver.StreamRequestHandler):
+    """Read the requests of one client and send back their replies."""
+
+    server: "TzstServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+    def handle(self) -> None:
+        pending: list[Future] = []
+        while line := self.rfile.readline(MAX_REQUEST_SIZE + 1):
+            if len(line) > MAX_REQUEST_SIZE:
+                self._send(
+                    _error(
+                        "invalid_request",
+                        f"Error: Request longer than {MAX_REQUEST_SIZE} bytes",
+                    )
+                )
+                break
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a JSON object")
+            except ValueError as e:
+                self._send(_error("invalid_request", f"Error: Invalid request - {e}"))
+                continue
+            pending.append(self.server.jobs.submit(self._run, request))
+        # Answer everything already sent before the connection closes
+        wait(pending)
+
+    def _send(self, payload: dict[str, Any]) -> None:
+        data = (json.dumps(payload, ensure_ascii=True) + "\n").encode()
+        with self._write_lock:
+            if self._closed:
+                return
+            try:
+                self.wfile.write(data)
+                self.wfile.flush()
+            except OSError:
+                # The client went away; finish the job without replies
+                self._closed = True
+
+    def _run(self, request: dict[str, Any]) -> None:
+        command = request.get("command")
+        reply: dict[str, Any] = {"command": command}
+        if "id" in request:
+            reply["id"] = request["id"]
+
+        def send(payload: dict[str, Any]) -> None:
+            self._send({**reply, **payload})
+
+        handler = _COMMANDS.get(command) if isinstance(command, str) else None
+        timeout = request.get("timeout")
+        if handler is None:
+            send(_error("unknown_command", f"Error: Unknown command - {command}"))
+            return
+        if timeout is not None and (
+            not isinstance(timeout, int | float) or timeout <= 0
+        ):
+            send(_error("invalid_parameter", "Error: 'timeout' must be positive"))
+            return
+
+        job = _Job(send, timeout)
+        started = time.monotonic()
+        try:
+            with _job_scope(self.server.context_pool, job.progress):
+                result = handler(request)
+            if job.timed_out:
+                # test_archive() reports any failure, this one too, as unhealthy
+                raise _TimeLimitExceeded
+        except Exception as e:
+            if job.timed_out:
+                result = _error(
+                    "timeout", f"Error: Time limit of {timeout} seconds exceeded"
+                )
+            elif isinstance(e, ValueError):
+                result = _error("invalid_parameter", f"Error: Invalid parameter - {e}")
+            elif isinstance(e, _ArchiveNotFound):
+                result = _error("archive_not_found", f"Error: {e}")
+            else:
+                error_type, reason = next(
+                    (
+                        (error_type, reason)
+                        for error, error_type, reason in _BATCH_ERRORS
+                        if isinstance(e, error)
+                    ),
+                    (f"{command}_failed", f"Failed to {command} archive"),
+                )
+                result = _error(error_type, f"Error: {reason} - {e}")
+        send({"ok": True, **result, "seconds": round(time.monotonic() - started, 6)})
+
+
+class TzstServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server running tzst requests on a pool of worker threads.
+
+    Each connection is read by a thread of its own, while the requests run
+    on at most *workers* threads at a time; zstandard releases the GIL while
+    it compresses and decompresses, so they run in parallel. The socket is
+    only accessible to the user running the server.
+
+    Args:
+        socket_path: Path of the Unix domain socket to listen on; a stale
+                     socket left by a server that is no longer running is
+                     replaced
+        workers: Requests run at the same time; None uses one per CPU
+
+    Raises:
+        OSError: If another server is listening on *socket_path*
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str | os.PathLike, workers: int | None = None):
+        if workers is not None and workers < 1:
+            raise ValueError(f"Invalid worker count '{workers}'. Must be at least 1.")
+        self.socket_path = Path(socket_path)
+        _remove_stale_socket(self.socket_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.jobs = ThreadPoolExecutor(self.workers, thread_name_prefix="tzst-job")
+        self.context_pool = ContextPool(max_idle=self.workers)
+        super().__init__(str(self.socket_path), _Connection)
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        # Nobody can connect before listen(), so restricting the socket here
+        # leaves no window, without touching the process-wide umask
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.jobs.shutdown(wait=True, cancel_futures=True)
+        self.socket_path.unlink(missing_ok=True)
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Remove a socket file nobody listens on any more."""
+    if not path.is_socket():
+        return
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(str(path))
+        except ConnectionRefusedError:
+            path.unlink(missing_ok=True)
+            return
+    raise OSError(f"Another server is listening on {path}")
+
+
+def serve(socket_path: str | os.PathLike, workers: int | None = None) -> None:
+    """Serve tzst requests on a Unix domain socket until interrupted.
+
+    Args:
+        socket_path: Path of the socket to listen on
+        workers: Requests run at the same time; None uses one per CPU
+
+    See Also:
+        :class:`TzstServer`: The server, for running it in a thread of your own
+    """
+    with TzstServer(socket_path, workers) as server:
+        server.serve_forever()
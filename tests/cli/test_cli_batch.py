@@ -0,0 +1,114 @@
+"""Tests for running list, test and extract over many archives at once."""
+
+import io
+import json
+import sys
+
+import pytest
+
+from tzst import create_archive_from_iter
+from tzst.cli import main
+
+
+@pytest.fixture
+def archives(temp_dir):
+    paths = []
+    for name, size in (("small", 10), ("large", 50000), ("medium", 2000)):
+        path = temp_dir / f"{name}.tzst"
+        create_archive_from_iter(
+            path, [(f"{name}.bin", bytes(range(256)) * (size // 256 + 1))]
+        )
+        paths.append(path)
+    return paths
+
+
+def _lines(output):
+    return [json.loads(line) for line in output.splitlines()]
+
+
+@pytest.mark.cli
+class TestBatchCommands:
+    """Test several archives given to `tzst l`, `t`, `x` and `e`."""
+
+    def test_test_reports_one_line_per_archive(self, archives, capsys):
+        assert main(["--json", "t", *map(str, archives)]) == 0
+
+        results = _lines(capsys.readouterr().out)
+        assert [result["archive"] for result in results] == [
+            str(archives[1]),
+            str(archives[2]),
+            str(archives[0]),
+        ]
+        assert all(result["ok"] and result["healthy"] for result in results)
+
+    def test_failures_set_the_exit_code(self, archives, temp_dir, capsys):
+        (temp_dir / "bad.tzst").write_bytes(b"junk" * 100)
+        args = [str(archives[0]), str(temp_dir / "bad.tzst"), str(temp_dir / "no")]
+
+        assert main(["--json", "t", *args, "-j", "2"]) == 1
+
+        results = {r["archive"]: r for r in _lines(capsys.readouterr().out)}
+        assert results[str(archives[0])]["ok"] is True
+        assert results[str(temp_dir / "bad.tzst")]["ok"] is False
+        assert results[str(temp_dir / "no")]["error"]["type"] == "archive_not_found"
+
+    def test_list_from_file(self, archives, temp_dir, capsys):
+        listing = temp_dir / "archives.txt"
+        listing.write_text("# nightly\n" + "".join(f"{p}\n\n" for p in archives))
+
+        assert main(["--no-banner", "l", "--from-file", str(listing), "-j", "2"]) == 0
+
+        output = capsys.readouterr().out
+        for name in ("small.bin", "medium.bin", "large.bin"):
+            assert name in output
+        assert "Processed 3 archives, 0 failed" in output
+
+    def test_list_from_stdin_in_threads(self, archives, monkeypatch, capsys):
+        names = "".join(f"{path}\n" for path in archives)
+        monkeypatch.setattr(sys, "stdin", io.StringIO(names))
+
+        args = ["--json", "l", "--from-file", "-", "-j", "3", "--pool", "thread"]
+        assert main(args) == 0
+
+        results = _lines(capsys.readouterr().out)
+        assert sorted(r["contents"][0]["name"] for r in results) == [
+            "large.bin",
+            "medium.bin",
+            "small.bin",
+        ]
+
+    def test_memory_mapped_reads(self, archives, temp_dir, capsys):
+        assert main(["--json", "t", "--mmap", str(archives[1])]) == 0
+        assert main(["--json", "t", "--mmap", *map(str, archives)]) == 0
+        assert main(["--json", "l", "--mmap", str(archives[0])]) == 0
+        args = ["x", str(archives[2]), "-o", str(temp_dir / "out"), "--mmap"]
+        assert main(["--no-banner", *args]) == 0
+
+        assert (temp_dir / "out" / "medium.bin").stat().st_size == 2048
+
+    @pytest.mark.parametrize("command", ["x", "e"])
+    def test_extract_from_file(self, archives, temp_dir, capsys, command):
+        listing = temp_dir / "archives.txt"
+        listing.write_text("".join(f"{path}\n" for path in archives))
+        out = temp_dir / "out"
+        args = [command, "--from-file", str(listing), "-o", str(out), "-j", "2"]
+
+        assert main(["--no-banner", *args]) == 1
+        assert "--conflict-resolution" in capsys.readouterr().err
+
+        assert main(["--json", *args, "--conflict-resolution", "replace"]) == 0
+        assert sorted(p.name for p in out.iterdir()) == [
+            "large.bin",
+            "medium.bin",
+            "small.bin",
+        ]
+
+    def test_invalid_batches(self, archives, capsys):
+        assert main(["--no-banner", "t"]) == 1
+        assert "No archive given" in capsys.readouterr().err
+
+        assert main(["--no-banner", "t", str(archives[0]), "-"]) == 1
+        assert "stdin" in capsys.readouterr().err
+
+        assert main(["--no-banner", "l", "--from-file", "missing.txt"]) == 1
+        assert "Cannot read archive list" in capsys.readouterr().err
@@ -0,0 +1,74 @@
+"""Tests for the convert command."""
+
+import io
+import json
+import sys
+import tarfile
+
+import pytest
+
+from tzst import list_archive
+from tzst.cli import main
+
+
+def _make_tar_gz(path):
+    with tarfile.open(path, "w:gz") as tf:
+        info = tarfile.TarInfo("hello.txt")
+        info.size = 5
+        tf.addfile(info, io.BytesIO(b"hello"))
+    return path
+
+
+@pytest.mark.cli
+class TestConvertCommand:
+    """Test `tzst convert` for single archives, streams and directories."""
+
+    def test_single_archive_reports_throughput(self, temp_dir, capsys):
+        source = _make_tar_gz(temp_dir / "legacy.tar.gz")
+
+        assert main(["--no-banner", "convert", str(source), "-l", "9"]) == 0
+
+        output = capsys.readouterr().out
+        assert "Converted:" in output and "/s)" in output
+        names = [item["name"] for item in list_archive(temp_dir / "legacy.tzst")]
+        assert names == ["hello.txt"]
+
+    def test_stdin_to_stdout(self, temp_dir, monkeypatch, capsysbinary):
+        data = _make_tar_gz(temp_dir / "in.tar.gz").read_bytes()
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+        assert main(["convert", "-", "-"]) == 0
+
+        captured = capsysbinary.readouterr()
+        assert b"Converted: stdin -> stdout" in captured.err
+        (temp_dir / "out.tzst").write_bytes(captured.out)
+        assert [item["name"] for item in list_archive(temp_dir / "out.tzst")] == [
+            "hello.txt"
+        ]
+
+    def test_directory_json(self, temp_dir, capsys):
+        source_dir = temp_dir / "legacy"
+        source_dir.mkdir()
+        _make_tar_gz(source_dir / "a.tgz")
+        _make_tar_gz(source_dir / "b.tar.gz")
+
+        args = ["--json", "convert", str(source_dir), str(temp_dir / "out")]
+        assert main([*args, "-j", "2"]) == 0
+
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["ok"] is True
+        assert [item["format"] for item in payload["archives"]] == ["gz", "gz"]
+        assert all(
+            item["throughput_bytes_per_second"] is not None
+            for item in payload["archives"]
+        )
+        assert (temp_dir / "out" / "a.tzst").exists()
+        assert (temp_dir / "out" / "b.tzst").exists()
+
+    def test_failures(self, temp_dir, capsys):
+        assert main(["--no-banner", "convert", str(temp_dir / "missing.tgz")]) == 1
+        assert "Source not found" in capsys.readouterr().err
+
+        (temp_dir / "bad.tar").write_bytes(b"not a tar archive" * 40)
+        assert main(["--no-banner", "convert", str(temp_dir / "bad.tar")]) == 1
+        assert "Conversion failed" in capsys.readouterr().err
@@ -0,0 +1,67 @@
+"""Tests for exclude/include options of the add command."""
+
+import json
+
+import pytest
+
+from tzst import list_archive
+from tzst.cli import main
+
+
+@pytest.fixture
+def project(temp_dir):
+    """Create a project with ignored and kept files."""
+    root = temp_dir / "proj"
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "node_modules" / "dep" / "index.js").write_text("x")
+    (root / "app.py").write_text("print('hi')\n")
+    (root / "debug.log").write_text("noise")
+    (root / ".gitignore").write_text("*.log\n")
+    return root
+
+
+@pytest.mark.cli
+class TestAddFilterOptions:
+    """Test --exclude, --exclude-from and --respect-gitignore."""
+
+    def test_exclude_from_and_gitignore(self, project, temp_dir, capsys):
+        """Patterns from files and .gitignore are combined."""
+        patterns = temp_dir / "excludes.txt"
+        patterns.write_text("# dependencies\nnode_modules/\n")
+        archive_path = temp_dir / "out.tzst"
+
+        result = main(
+            [
+                "--json",
+                "a",
+                str(archive_path),
+                str(project),
+                "--exclude-from",
+                str(patterns),
+                "--respect-gitignore",
+            ]
+        )
+        payload = json.loads(capsys.readouterr().out)
+
+        assert result == 0
+        assert payload["respect_gitignore"] is True
+        assert "node_modules/" in payload["exclude"]
+        names = sorted(item["name"] for item in list_archive(archive_path))
+        assert names == ["proj", "proj/.gitignore", "proj/app.py"]
+
+    def test_missing_exclude_file(self, project, temp_dir, capsys):
+        """An unreadable pattern file is reported instead of ignored."""
+        result = main(
+            [
+                "--no-banner",
+                "a",
+                str(temp_dir / "out.tzst"),
+                str(project),
+                "--exclude-from",
+                str(temp_dir / "missing.txt"),
+            ]
+        )
+
+        assert result == 1
+        assert "Cannot read exclude file" in capsys.readouterr().err
+        assert not (temp_dir / "out.tzst").exists()
@@ -0,0 +1,50 @@
+"""Tests for the delete command."""
+
+import json
+
+import pytest
+
+from tzst import create_archive_from_iter, list_archive
+from tzst.cli import main
+
+
+@pytest.fixture
+def archive(temp_dir):
+    archive_path = temp_dir / "in.tzst"
+    create_archive_from_iter(
+        archive_path, [("keep.txt", b"keep"), ("secret.env", b"TOKEN=1")]
+    )
+    return archive_path
+
+
+@pytest.mark.cli
+class TestDeleteCommand:
+    """Test `tzst d`."""
+
+    def test_delete(self, archive, capsys):
+        assert main(["--no-banner", "d", str(archive), "secret.env"]) == 0
+
+        assert "Deleted 1 members" in capsys.readouterr().out
+        assert [item["name"] for item in list_archive(archive)] == ["keep.txt"]
+
+    def test_json(self, archive, capsys):
+        assert main(["--json", "delete", str(archive), "secret.env"]) == 0
+
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["ok"] is True and payload["deleted"] == 1
+
+    def test_compression_level(self, archive, capsys):
+        args = ["--json", "d", str(archive), "secret.env", "-l", "19"]
+
+        assert main(args) == 0
+
+        assert json.loads(capsys.readouterr().out)["compression_level"] == 19
+        assert [item["name"] for item in list_archive(archive)] == ["keep.txt"]
+
+    def test_failures(self, archive, temp_dir, capsys):
+        assert main(["--no-banner", "d", str(archive), "missing.txt"]) == 1
+        assert "Member not found" in capsys.readouterr().err
+        assert len(list_archive(archive)) == 2
+
+        assert main(["--no-banner", "d", str(temp_dir / "none.tzst"), "a"]) == 1
+        assert "Archive not found" in capsys.readouterr().err
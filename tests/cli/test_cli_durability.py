@@ -0,0 +1,25 @@
+"""Tests for the --durability option."""
+
+import json
+
+import pytest
+
+from tzst.cli import main
+
+
+@pytest.mark.cli
+class TestDurabilityOption:
+    """Test --durability on the add and extract commands."""
+
+    def test_defaults_and_explicit_mode(self, sample_files, temp_dir, capsys):
+        archive_path = temp_dir / "out.tzst"
+        assert main(["--json", "a", str(archive_path), str(sample_files[0])]) == 0
+        assert json.loads(capsys.readouterr().out)["durability"] == "batch"
+
+        output = temp_dir / "out"
+        for command, mode in (("x", "strict"), ("e", "batch")):
+            args = ["--json", command, str(archive_path), "-o", str(output)]
+            args += ["--conflict-resolution", "replace"]
+            assert main([*args, "--durability", mode]) == 0
+            assert json.loads(capsys.readouterr().out)["durability"] == mode
+        assert (output / sample_files[0].name).exists()
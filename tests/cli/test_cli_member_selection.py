@@ -0,0 +1,77 @@
+"""Tests for --include/--exclude member selection in the CLI."""
+
+import json
+
+import pytest
+
+from tzst import create_archive_from_iter
+from tzst.cli import main
+
+
+@pytest.fixture
+def logs_archive(temp_dir):
+    """Create an archive with JSON and text logs."""
+    archive_path = temp_dir / "logs.tzst"
+    create_archive_from_iter(
+        archive_path,
+        [
+            ("logs/2024-06-01/a.json", b"a"),
+            ("logs/2024-06-01/a.txt", b"t"),
+            ("logs/2024-07-01/b.json", b"b"),
+        ],
+    )
+    return archive_path
+
+
+@pytest.mark.cli
+class TestMemberSelectionOptions:
+    """Test extraction with include/exclude patterns."""
+
+    def test_extract_include_glob_json(self, logs_archive, temp_dir, capsys):
+        """Only matching members are extracted and the patterns are reported."""
+        output = temp_dir / "out"
+        result = main(
+            [
+                "--json",
+                "x",
+                str(logs_archive),
+                "-o",
+                str(output),
+                "--conflict-resolution",
+                "replace",
+                "--include",
+                "logs/2024-06-*/*",
+                "--exclude-regex",
+                r".*\.txt",
+            ]
+        )
+        payload = json.loads(capsys.readouterr().out)
+
+        assert result == 0
+        assert payload["include"] == ["logs/2024-06-*/*"]
+        assert payload["exclude"] == [r".*\.txt"]
+        assert [p.name for p in output.rglob("*") if p.is_file()] == ["a.json"]
+
+    def test_extract_flat_exclude(self, logs_archive, temp_dir):
+        """Flat extraction skips excluded members."""
+        output = temp_dir / "flat"
+        result = main(
+            [
+                "--no-banner",
+                "e",
+                str(logs_archive),
+                "-o",
+                str(output),
+                "--conflict-resolution",
+                "replace",
+                "--exclude",
+                "**/*.txt",
+            ]
+        )
+
+        assert result == 0
+        assert sorted(p.name for p in output.iterdir()) == ["a.json", "b.json"]
+
+    def test_invalid_regex_is_a_usage_error(self, logs_archive):
+        """Malformed regular expressions are rejected by the parser."""
+        assert main(["x", str(logs_archive), "--include-regex", "("]) != 0
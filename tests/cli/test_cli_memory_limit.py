@@ -0,0 +1,80 @@
+"""Tests for the --memory-limit option."""
+
+import json
+
+import pytest
+import zstandard as zstd
+
+from tzst import create_archive_from_iter, recompress
+from tzst.cli import main, validate_memory_limit
+
+
+@pytest.fixture
+def archive(temp_dir):
+    path = temp_dir / "a.tzst"
+    create_archive_from_iter(path, [("a.txt", b"a" * 100000)])
+    return path
+
+
+@pytest.fixture
+def long_archive(archive, temp_dir):
+    path = temp_dir / "long.tzst"
+    recompress(archive, path, long_distance=True)
+    return path
+
+
+@pytest.mark.cli
+class TestMemoryLimitOption:
+    """Test `--memory-limit` on the archive commands."""
+
+    def test_parse(self):
+        assert validate_memory_limit("256M") == 256 * 1024 * 1024
+        assert validate_memory_limit("1GiB") == 1024**3
+        with pytest.raises(Exception, match="at least 16M"):
+            validate_memory_limit("8M")
+        with pytest.raises(Exception, match="Invalid memory limit"):
+            validate_memory_limit("lots")
+
+    def test_reading_within_the_limit(self, archive, temp_dir, capsys):
+        assert main(["--no-banner", "t", str(archive), "--memory-limit", "16M"]) == 0
+        args = ["--no-banner", "x", str(archive), "-o", str(temp_dir / "out")]
+        assert main([*args, "--memory-limit", "16M"]) == 0
+        assert (temp_dir / "out" / "a.txt").read_bytes() == b"a" * 100000
+
+    def test_large_window_is_reported(self, long_archive, capsys):
+        args = ["--json", "t", str(long_archive), "--memory-limit", "64M"]
+
+        assert main(args) == 1
+
+        payload = json.loads(capsys.readouterr().err)
+        assert payload["error"]["type"] == "memory_limit_exceeded"
+        assert "128 MiB window" in payload["error"]["message"]
+
+    def test_batch(self, archive, long_archive, capsys):
+        args = ["--json", "l", str(archive), str(long_archive)]
+
+        assert main([*args, "--memory-limit", "64M"]) == 1
+
+        results = {
+            result["archive"]: result
+            for result in map(json.loads, capsys.readouterr().out.splitlines())
+        }
+        assert results[str(archive)]["ok"] is True
+        error = results[str(long_archive)]["error"]
+        assert error["type"] == "memory_limit_exceeded"
+
+    def test_add_and_recompress(self, archive, temp_dir, capsys):
+        target = temp_dir / "b.tzst"
+        args = ["--json", "a", str(target), str(archive), "-l", "22"]
+
+        assert main([*args, "--memory-limit", "32M"]) == 0
+
+        assert json.loads(capsys.readouterr().out)["memory_limit"] == 32 * 1024**2
+        header = target.read_bytes()[:18]
+        assert zstd.get_frame_parameters(header).window_size <= 8 * 1024**2
+
+        cold = temp_dir / "cold.tzst"
+        args = ["--no-banner", "recompress", str(target), str(cold), "--long"]
+        assert main([*args, "--memory-limit", "64M"]) == 0
+        header = cold.read_bytes()[:18]
+        assert zstd.get_frame_parameters(header).window_size <= 16 * 1024**2
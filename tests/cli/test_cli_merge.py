@@ -0,0 +1,53 @@
+"""Tests for the merge command."""
+
+import json
+
+import pytest
+
+from tzst import create_archive_from_iter, list_archive
+from tzst.cli import main
+
+
+@pytest.fixture
+def shards(temp_dir):
+    paths = []
+    for name in ("a", "b"):
+        path = temp_dir / f"{name}.tzst"
+        create_archive_from_iter(path, [(f"{name}.txt", b"x"), ("same.txt", b"y")])
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.cli
+class TestMergeCommand:
+    """Test `tzst merge`."""
+
+    def test_merge(self, shards, temp_dir, capsys):
+        target = temp_dir / "all.tzst"
+
+        assert main(["--no-banner", "merge", str(target), *shards]) == 0
+
+        assert "2 copied" in capsys.readouterr().out
+        names = [item["name"] for item in list_archive(target)]
+        assert names == ["a.txt", "same.txt", "b.txt", "same.txt"]
+
+    def test_duplicates_json(self, shards, temp_dir, capsys):
+        target = temp_dir / "all.tzst"
+        args = ["--json", "merge", str(target), *shards, "--duplicates", "first"]
+
+        assert main(args) == 0
+
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["ok"] is True and payload["dropped"] == 1
+        names = [item["name"] for item in list_archive(target)]
+        assert names == ["a.txt", "same.txt", "b.txt"]
+
+    def test_failures(self, shards, temp_dir, capsys):
+        target = str(temp_dir / "all.tzst")
+        args = ["--no-banner", "merge", target, *shards, "--duplicates", "error"]
+        assert main(args) == 1
+        assert "Duplicate member 'same.txt'" in capsys.readouterr().err
+
+        missing = str(temp_dir / "missing.tzst")
+        assert main(["--no-banner", "merge", target, shards[0], missing]) == 1
+        assert "Archive not found" in capsys.readouterr().err
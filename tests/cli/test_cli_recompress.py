@@ -0,0 +1,49 @@
+"""Tests for the recompress command."""
+
+import json
+
+import pytest
+
+from tzst import create_archive_from_iter, list_archive
+from tzst.cli import main
+
+
+@pytest.fixture
+def archive(temp_dir):
+    archive_path = temp_dir / "in.tzst"
+    create_archive_from_iter(archive_path, [("a.txt", b"a" * 10000)])
+    return archive_path
+
+
+@pytest.mark.cli
+class TestRecompressCommand:
+    """Test `tzst recompress`."""
+
+    def test_recompress(self, archive, temp_dir, capsys):
+        target = temp_dir / "cold.tzst"
+        args = ["--no-banner", "recompress", str(archive), str(target)]
+
+        assert main([*args, "-l", "19", "--long"]) == 0
+
+        assert "Recompressed:" in capsys.readouterr().out
+        assert [item["name"] for item in list_archive(target)] == ["a.txt"]
+
+    def test_json_in_place(self, archive, capsys):
+        args = ["--json", "recompress", str(archive), str(archive), "--threads", "2"]
+
+        assert main(args) == 0
+
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["ok"] is True
+        assert payload["command"] == "recompress"
+        assert payload["size"] > 10000
+        assert [item["name"] for item in list_archive(archive)] == ["a.txt"]
+
+    def test_invalid_archive(self, temp_dir, capsys):
+        (temp_dir / "bad.tzst").write_bytes(b"junk" * 100)
+        target = temp_dir / "out.tzst"
+        args = ["--no-banner", "recompress", str(temp_dir / "bad.tzst"), str(target)]
+
+        assert main(args) == 1
+        assert "decompression failed" in capsys.readouterr().err
+        assert not target.exists()
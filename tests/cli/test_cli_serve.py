@@ -0,0 +1,26 @@
+"""Tests for the serve command."""
+
+import socket
+
+import pytest
+
+from tzst.cli import main
+
+
+@pytest.mark.cli
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+class TestServeCommand:
+    """Test `tzst serve`."""
+
+    def test_socket_in_use(self, temp_dir, capsys):
+        from tzst.server import TzstServer
+
+        path = temp_dir / "s.sock"
+        with TzstServer(path, workers=1):
+            assert main(["--no-banner", "serve", "--socket", str(path)]) == 1
+        assert "Another server" in capsys.readouterr().err
+
+    def test_invalid_jobs(self, temp_dir, capsys):
+        args = ["--json", "serve", "--socket", str(temp_dir / "s.sock"), "-j", "0"]
+        assert main(args) == 1
+        assert "serve_failed" in capsys.readouterr().err
@@ -0,0 +1,34 @@
+"""Tests for creating archives in parallel shards from the CLI."""
+
+import json
+
+import pytest
+
+from tzst import list_archive
+from tzst.cli import main
+
+
+@pytest.mark.cli
+class TestShardedAddCommand:
+    """Test `tzst a -j N`."""
+
+    def test_add_with_jobs(self, temp_dir, capsys):
+        for index in range(6):
+            (temp_dir / f"{index}.txt").write_text(str(index) * 1000)
+        files = [str(temp_dir / f"{index}.txt") for index in range(6)]
+        archive = temp_dir / "out.tzst"
+
+        assert main(["--json", "a", str(archive), *files, "-j", "3"]) == 0
+
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["ok"] is True and payload["shards"] == 3
+        names = sorted(item["name"] for item in list_archive(archive))
+        assert names == [f"{index}.txt" for index in range(6)]
+
+    def test_invalid_jobs(self, temp_dir, capsys):
+        (temp_dir / "a.txt").write_text("a")
+        args = ["--no-banner", "a", str(temp_dir / "out.tzst"), str(temp_dir / "a.txt")]
+
+        assert main([*args, "-j", "0"]) == 1
+
+        assert "shard count" in capsys.readouterr().err
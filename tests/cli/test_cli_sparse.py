@@ -0,0 +1,33 @@
+"""Tests for the --no-sparse option of the add command."""
+
+import json
+
+import pytest
+
+from tzst.cli import main
+from tzst.core import TzstArchive
+
+
+@pytest.mark.cli
+class TestAddSparseOption:
+    """Test sparse handling on the command line."""
+
+    @pytest.mark.parametrize("no_sparse", [False, True])
+    def test_sparse_reported_in_json(self, temp_dir, capsys, no_sparse):
+        image = temp_dir / "disk.img"
+        with open(image, "wb") as f:
+            f.seek(4 * 1024 * 1024)
+            f.write(b"data")
+        archive_path = temp_dir / "out.tzst"
+
+        args = ["--json", "a", str(archive_path), str(image)]
+        result = main([*args, "--no-sparse"] if no_sparse else args)
+
+        assert result == 0
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["sparse"] is not no_sparse
+        with TzstArchive(archive_path) as archive:
+            member = archive.getmember("disk.img")
+        assert member.size == image.stat().st_size
+        if no_sparse:
+            assert member.sparse is None
@@ -0,0 +1,87 @@
+"""Tests that the CLI starts without importing what a command does not need."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import tzst
+
+# Coarse ceiling for `import tzst.cli`, in microseconds, to catch a heavy
+# import creeping back in; the module checks below are the precise guard.
+IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = {"zstandard", "tarfile", "tempfile", "tzst.core", "json"}
+
+
+def _python(*args):
+    env = dict(os.environ, PYTHONPATH=str(Path(tzst.__file__).parents[1]))
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+
+def _importtime(code):
+    """Return {module: cumulative microseconds} from ``python -X importtime``."""
+    modules = {}
+    for line in _python("-X", "importtime", "-c", code).stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.mark.cli
+class TestStartup:
+    """Test import cost of `tzst` and `tzst.cli`."""
+
+    def test_importing_the_cli_skips_heavy_modules(self):
+        modules = _importtime("import tzst.cli")
+
+        assert "tzst.cli" in modules
+        assert not HEAVY_MODULES & modules.keys()
+        assert modules["tzst.cli"] < IMPORT_BUDGET_US
+
+    def test_version_does_not_import_zstandard(self):
+        modules = _importtime(
+            "from tzst.cli import main; main(['--no-banner', '--version'])"
+        )
+        assert not (HEAVY_MODULES - {"json"}) & modules.keys()
+
+    def test_version_output(self):
+        result = _python("-m", "tzst", "--json", "--version")
+        assert json.loads(result.stdout)["version"] == tzst.__version__
+
+    def test_api_is_loaded_on_first_use(self):
+        code = (
+            "import sys, tzst; assert 'tzst.core' not in sys.modules; "
+            "from tzst import create_archive; from tzst.cli import list_archive; "
+            "assert create_archive.__module__ == 'tzst.core'; "
+            "assert list_archive is sys.modules['tzst.core'].list_archive"
+        )
+        _python("-c", code)
+
+    def test_patching_before_first_use(self, temp_dir):
+        archive = temp_dir / "a.tzst"
+        archive.touch()
+        code = (
+            "import sys; from unittest import mock; import tzst.cli as cli; "
+            "patch = mock.patch('tzst.cli.list_archive', return_value=[]); "
+            "fake = patch.start(); "
+            f"cli.main(['--no-banner', 'l', {str(archive)!r}]); "
+            "assert fake.called and cli.list_archive is fake; patch.stop(); "
+            "assert cli.list_archive is sys.modules['tzst.core'].list_archive"
+        )
+        _python("-c", code)
+
+    def test_unknown_attributes_still_raise(self):
+        import tzst.cli
+
+        with pytest.raises(AttributeError):
+            tzst.missing  # noqa: B018
+        with pytest.raises(AttributeError):
+            tzst.cli.missing  # noqa: B018
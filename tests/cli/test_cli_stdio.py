@@ -0,0 +1,89 @@
+"""Tests for using '-' as stdin/stdout archive in the CLI."""
+
+import io
+import json
+import sys
+
+import pytest
+
+from tzst import list_archive
+from tzst.cli import main
+
+
+@pytest.mark.cli
+class TestStdioArchives:
+    """Test streaming archives through stdin and stdout."""
+
+    def test_add_writes_archive_to_stdout(self, sample_files, temp_dir, capsysbinary):
+        """`tzst a -` writes only archive bytes to stdout."""
+        result = main(["a", "-", str(sample_files[0])])
+        captured = capsysbinary.readouterr()
+
+        assert result == 0
+        assert b"Creating archive" in captured.err
+        archive_file = temp_dir / "piped.tzst"
+        archive_file.write_bytes(captured.out)
+        assert [item["name"] for item in list_archive(archive_file)] == ["test.txt"]
+
+    def test_extract_and_list_from_stdin(
+        self, sample_files, temp_dir, monkeypatch, capsys
+    ):
+        """`tzst x -` and `tzst l -` read the archive from stdin."""
+        archive_file = temp_dir / "source.tzst"
+        main(["--no-banner", "a", str(archive_file), str(sample_files[0])])
+        data = archive_file.read_bytes()
+        capsys.readouterr()
+
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+        output_dir = temp_dir / "out"
+        result = main(
+            ["x", "-", "-o", str(output_dir), "--conflict-resolution", "replace"]
+        )
+        assert result == 0
+        assert (output_dir / "test.txt").read_bytes() == sample_files[0].read_bytes()
+
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+        capsys.readouterr()
+        assert main(["--json", "l", "-"]) == 0
+        payload = json.loads(capsys.readouterr().out)
+        assert [item["name"] for item in payload["contents"]] == ["test.txt"]
+
+    def test_stdin_archive_rejects_interactive_prompts(self, capsys):
+        """Prompts would read from the archive stream, so they are refused."""
+        result = main(["x", "-", "--conflict-resolution", "ask"])
+
+        assert result == 1
+        assert "--conflict-resolution" in capsys.readouterr().err
+
+    def test_stdin_archive_replaces_by_default(
+        self, sample_files, temp_dir, monkeypatch, capsys
+    ):
+        """`curl ... | tzst x -` works without --conflict-resolution."""
+        archive_file = temp_dir / "source.tzst"
+        main(["--no-banner", "a", str(archive_file), str(sample_files[0])])
+        output_dir = temp_dir / "out"
+        output_dir.mkdir()
+        (output_dir / "test.txt").write_text("stale")
+        data = archive_file.read_bytes()
+
+        for command in ("x", "e"):
+            monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+            assert main([command, "-", "-o", str(output_dir)]) == 0
+            assert (output_dir / "test.txt").read_bytes() == (
+                sample_files[0].read_bytes()
+            )
+
+    def test_banner_only_skipped_for_stdio_archives(
+        self, sample_files, temp_dir, capsys
+    ):
+        """A member named '-' does not hide the banner."""
+        archive_file = temp_dir / "source.tzst"
+        main(["--no-banner", "a", str(archive_file), str(sample_files[0])])
+        capsys.readouterr()
+
+        assert main(["l", str(archive_file)]) == 0
+        assert "Copyright" in capsys.readouterr().out
+        main(["x", str(archive_file), "-", "-o", str(temp_dir / "out")])
+        assert "Copyright" in capsys.readouterr().out
+        main(["d", str(archive_file), "-"])
+        assert "Copyright" in capsys.readouterr().out
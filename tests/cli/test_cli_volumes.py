@@ -0,0 +1,67 @@
+"""Tests for creating and extracting split archives from the CLI."""
+
+import argparse
+import json
+import random
+
+import pytest
+
+from tzst.cli import main, validate_volume_size
+
+
+@pytest.fixture
+def source(temp_dir):
+    rng = random.Random(7)
+    source_dir = temp_dir / "src"
+    source_dir.mkdir()
+    for index in range(12):
+        (source_dir / f"{index}.bin").write_bytes(rng.randbytes(15000))
+    return source_dir
+
+
+@pytest.mark.cli
+class TestVolumeOptions:
+    """Test `tzst a --volume-size` and `tzst x -j`."""
+
+    def test_create_list_extract(self, source, temp_dir, capsys):
+        archive = temp_dir / "out.tzst"
+        args = ["--no-banner", "a", str(archive), str(source), "--volume-size", "64K"]
+
+        assert main(args) == 0
+        assert "volumes)" in capsys.readouterr().out
+
+        first = f"{archive}.001"
+        assert main(["--json", "l", first]) == 0
+        assert len(json.loads(capsys.readouterr().out)["contents"]) == 13
+
+        dest = temp_dir / "dest"
+        assert main(["--no-banner", "x", first, "-o", str(dest), "-j", "4"]) == 0
+        for path in source.iterdir():
+            assert (dest / "src" / path.name).read_bytes() == path.read_bytes()
+
+    def test_json_lists_volumes(self, source, temp_dir, capsys):
+        archive = temp_dir / "out.tzst"
+        args = ["--json", "a", str(archive), str(source), "--volume-size", "65536"]
+
+        assert main(args) == 0
+
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["volume_size"] == 65536
+        assert payload["volumes"][0] == f"{archive}.001"
+        assert len(payload["volumes"]) > 1
+
+    def test_too_small(self, source, temp_dir, capsys):
+        args = ["--no-banner", "a", str(temp_dir / "o.tzst"), str(source)]
+        assert main([*args, "--volume-size", "1K"]) == 1
+        assert "volume size" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("65536", 65536), ("64K", 65536), ("5G", 5 << 30), ("2MiB", 2 << 20)],
+    )
+    def test_validate_volume_size(self, value, expected):
+        assert validate_volume_size(value) == expected
+
+    def test_validate_volume_size_rejects(self):
+        with pytest.raises(argparse.ArgumentTypeError):
+            validate_volume_size("5Q")
@@ -0,0 +1,309 @@
+"""Tests for the asyncio interface in tzst.aio."""
+
+import asyncio
+import io
+import tarfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import zstandard as zstd
+
+from tzst import (
+    aio,
+    create_archive,
+    create_archive_from_iter,
+    extract_archive,
+    list_archive,
+)
+from tzst.core import ConflictResolution
+
+
+@pytest.fixture
+def archive_with_files(sample_files, temp_dir):
+    """Create a sample archive with the synchronous API."""
+    archive_path = temp_dir / "sample.tzst"
+    create_archive(archive_path, [f for f in sample_files if f.is_file()])
+    return archive_path
+
+
+def _archive_of(path, name):
+    """Write an archive holding one member named *name*."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tf:
+        info = tarfile.TarInfo(name)
+        info.size = 7
+        tf.addfile(info, io.BytesIO(b"escaped"))
+    path.write_bytes(zstd.ZstdCompressor().compress(buffer.getvalue()))
+    return path
+
+
+@pytest.mark.unit
+class TestAsyncConvenienceFunctions:
+    """Test the async create/extract/list/test functions."""
+
+    def test_create_archive_round_trip(self, sample_files, temp_dir):
+        """Archives created asynchronously are readable by the sync API."""
+        archive_path = temp_dir / "async.tzst"
+        asyncio.run(aio.create_archive(archive_path, [temp_dir / "subdir"]))
+
+        names = {item["name"] for item in list_archive(archive_path)}
+        assert "subdir/sub.txt" in names
+        assert "subdir/nested/nested.txt" in names
+
+    def test_list_and_test_archive(self, archive_with_files):
+        """Async list and test agree with the sync results."""
+
+        async def run():
+            contents = await aio.list_archive(archive_with_files, verbose=True)
+            healthy = await aio.test_archive(archive_with_files, streaming=True)
+            return contents, healthy
+
+        contents, healthy = asyncio.run(run())
+        assert contents == list_archive(archive_with_files, verbose=True)
+        assert healthy is True
+
+    def test_test_archive_detects_corruption(self, temp_dir):
+        """Corrupted archives report False instead of raising."""
+        bad_archive = temp_dir / "bad.tzst"
+        bad_archive.write_bytes(b"not a zstd archive")
+        assert asyncio.run(aio.test_archive(bad_archive)) is False
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_extract_archive(
+        self, archive_with_files, sample_files, temp_dir, streaming
+    ):
+        """Extraction restores file contents in both read modes."""
+        output = temp_dir / "out"
+        asyncio.run(
+            aio.extract_archive(archive_with_files, output, streaming=streaming)
+        )
+
+        for file_path in sample_files:
+            relative = file_path.relative_to(temp_dir)
+            assert (output / relative).read_bytes() == file_path.read_bytes()
+
+    def test_extract_flatten_members_streaming(self, archive_with_files, temp_dir):
+        """Selective flat extraction works in a single streaming pass."""
+        output = temp_dir / "flat"
+        asyncio.run(
+            aio.extract_archive(
+                archive_with_files,
+                output,
+                members=["subdir/nested/nested.txt"],
+                flatten=True,
+                streaming=True,
+            )
+        )
+        assert [p.name for p in output.iterdir()] == ["nested.txt"]
+
+    def test_extract_include_exclude_patterns(self, archive_with_files, temp_dir):
+        """Include/exclude patterns select members like the sync API."""
+        output = temp_dir / "selected"
+        asyncio.run(
+            aio.extract_archive(
+                archive_with_files,
+                output,
+                include=["subdir/**"],
+                exclude=["**/nested.txt"],
+                streaming=True,
+            )
+        )
+        files = [p.relative_to(output).as_posix() for p in output.rglob("*.txt")]
+        assert files == ["subdir/sub.txt"]
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    @pytest.mark.parametrize("flatten", [False, True])
+    def test_extract_absolute_name(self, temp_dir, streaming, flatten):
+        """Absolute names land inside the output directory, like the sync API."""
+        escaped = temp_dir / "abs" / "escaped.txt"
+        archive = _archive_of(temp_dir / "abs.tzst", str(escaped))
+        output = temp_dir / "out"
+        expected = temp_dir / "expected"
+
+        asyncio.run(
+            aio.extract_archive(archive, output, streaming=streaming, flatten=flatten)
+        )
+        extract_archive(archive, expected, streaming=streaming, flatten=flatten)
+
+        relative = Path(escaped.name if flatten else escaped.relative_to("/"))
+        assert (output / relative).read_bytes() == b"escaped"
+        assert (expected / relative).read_bytes() == b"escaped"
+        assert not escaped.exists()
+
+    @pytest.mark.parametrize("flatten", [False, True])
+    def test_extract_parent_name(self, temp_dir, flatten):
+        """Names climbing out of the output directory are refused."""
+        archive = _archive_of(temp_dir / "dotdot.tzst", "../dotdot.txt")
+        output = temp_dir / "out"
+
+        with pytest.raises(tarfile.OutsideDestinationError):
+            asyncio.run(aio.extract_archive(archive, output, flatten=flatten))
+
+        assert not (temp_dir / "dotdot.txt").exists()
+        assert not list(output.iterdir())
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_extract_duplicate_name(self, temp_dir, streaming):
+        """Like the sync API: the last copy wins unless streaming."""
+        archive = temp_dir / "dup.tzst"
+        create_archive_from_iter(archive, [("a.txt", b"first"), ("a.txt", b"second")])
+        output = temp_dir / "out"
+
+        asyncio.run(
+            aio.extract_archive(archive, output, members=["a.txt"], streaming=streaming)
+        )
+
+        expected = b"first" if streaming else b"second"
+        assert (output / "a.txt").read_bytes() == expected
+
+    def test_extract_auto_rename_conflict(self, archive_with_files, temp_dir):
+        """Existing files are renamed according to the conflict policy."""
+        output = temp_dir / "renamed"
+        output.mkdir()
+        (output / "test.txt").write_text("existing")
+
+        asyncio.run(
+            aio.extract_archive(
+                archive_with_files,
+                output,
+                members=["test.txt"],
+                conflict_resolution=ConflictResolution.AUTO_RENAME,
+            )
+        )
+        assert (output / "test.txt").read_text() == "existing"
+        assert (output / "test_1.txt").read_text().startswith("Hello, World!")
+
+    def test_failed_auto_rename_removes_placeholder(
+        self, archive_with_files, temp_dir, monkeypatch
+    ):
+        """The reserved name is released when writing the member fails."""
+        output = temp_dir / "renamed"
+        output.mkdir()
+        (output / "test.txt").write_text("existing")
+
+        async def failing_extract(self, member, *args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(aio.TzstArchive, "extract_member", failing_extract)
+        with pytest.raises(OSError, match="disk full"):
+            asyncio.run(
+                aio.extract_archive(
+                    archive_with_files,
+                    output,
+                    members=["test.txt"],
+                    conflict_resolution=ConflictResolution.AUTO_RENAME,
+                )
+            )
+        assert [p.name for p in output.iterdir()] == ["test.txt"]
+
+
+@pytest.mark.unit
+class TestAsyncTzstArchive:
+    """Test the async TzstArchive class."""
+
+    def test_async_iteration_and_extractfile(self, archive_with_files):
+        """Members are yielded lazily and their data can be read in chunks."""
+
+        async def run():
+            data = {}
+            async with aio.TzstArchive(archive_with_files, streaming=True) as archive:
+                async for member in archive:
+                    reader = await archive.extractfile(member)
+                    if reader is not None:
+                        chunks = []
+                        while chunk := await reader.read(4):
+                            chunks.append(chunk)
+                        data[member.name] = b"".join(chunks)
+            return data
+
+        data = asyncio.run(run())
+        assert data["test.txt"] == b"Hello, World!\nThis is a test file.\n"
+
+    def test_async_iteration_after_getmembers(self, archive_with_files):
+        """Iteration reuses members that were already loaded."""
+
+        async def run():
+            async with aio.TzstArchive(archive_with_files) as archive:
+                members = await archive.getmembers()
+                iterated = [member async for member in archive]
+            return members, iterated
+
+        members, iterated = asyncio.run(run())
+        assert [m.name for m in iterated] == [m.name for m in members]
+
+    def test_add_requires_write_mode(self, archive_with_files):
+        """Adding to a read-mode archive is rejected."""
+
+        async def run():
+            async with aio.TzstArchive(archive_with_files) as archive:
+                await archive.add(archive_with_files)
+
+        with pytest.raises(RuntimeError, match="not open for writing"):
+            asyncio.run(run())
+
+
+@pytest.mark.unit
+class TestAsyncCancellation:
+    """Test cooperative cancellation."""
+
+    def test_cancelled_atomic_create_removes_temp_file(self, temp_dir, monkeypatch):
+        """Cancelling an atomic create leaves neither temp file nor archive."""
+        source = temp_dir / "big.bin"
+        source.write_bytes(b"x" * (4 * 1024 * 1024))
+        out_dir = temp_dir / "out"
+        out_dir.mkdir()
+        archive_path = out_dir / "big.tzst"
+
+        started = threading.Event()
+        original_read = aio._CancellableReader.read
+
+        def slow_read(self, size=-1):
+            started.set()
+            time.sleep(0.01)
+            return original_read(self, size)
+
+        monkeypatch.setattr(aio._CancellableReader, "read", slow_read)
+
+        async def run():
+            task = asyncio.create_task(aio.create_archive(archive_path, [source]))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert list(out_dir.iterdir()) == []
+
+    def test_cancelled_auto_rename_removes_placeholder(
+        self, archive_with_files, temp_dir, monkeypatch
+    ):
+        """Cancelling while a renamed member is written releases its name."""
+        output = temp_dir / "renamed"
+        output.mkdir()
+        (output / "test.txt").write_text("existing")
+        started = asyncio.Event()
+
+        async def blocked_extract(self, member, *args, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(aio.TzstArchive, "extract_member", blocked_extract)
+
+        async def run():
+            task = asyncio.create_task(
+                aio.extract_archive(
+                    archive_with_files,
+                    output,
+                    members=["test.txt"],
+                    conflict_resolution=ConflictResolution.AUTO_RENAME,
+                )
+            )
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert [p.name for p in output.iterdir()] == ["test.txt"]
@@ -0,0 +1,122 @@
+"""Tests for reusing zstd contexts across archives."""
+
+import io
+import threading
+
+import pytest
+import zstandard as zstd
+
+from tzst import ContextPool, TzstArchive, create_archive, list_archive
+from tzst import test_archive as tzst_test_archive
+
+
+@pytest.fixture
+def archive(temp_dir):
+    (temp_dir / "a.txt").write_text("hello " * 1000)
+    path = temp_dir / "a.tzst"
+    create_archive(path, [temp_dir / "a.txt"])
+    return path
+
+
+def _idle(pool):
+    return {key: len(contexts) for key, contexts in pool._idle.items()}
+
+
+@pytest.mark.unit
+class TestContextPool:
+    """Test ContextPool."""
+
+    def test_contexts_are_reused(self):
+        pool = ContextPool()
+        with pool.compressor(level=19) as first:
+            pass
+        with pool.compressor(level=19) as second:
+            with pool.compressor(level=19) as third:
+                assert third is not second
+        assert second is first
+
+    def test_settings_are_kept_apart(self):
+        pool = ContextPool()
+        dictionary = zstd.ZstdCompressionDict(b"tzst dictionary " * 64)
+        with pool.compressor(level=3) as plain:
+            pass
+        for options in (
+            {"level": 19},
+            {"level": 3, "threads": 2},
+            {"level": 3, "dictionary": dictionary},
+            {"params": zstd.ZstdCompressionParameters.from_level(3)},
+        ):
+            with pool.compressor(**options) as other:
+                assert other is not plain
+        with pool.decompressor() as dctx:
+            assert isinstance(dctx, zstd.ZstdDecompressor)
+
+    def test_equal_parameters_share_contexts(self):
+        pool = ContextPool()
+        params = [
+            zstd.ZstdCompressionParameters.from_level(9, enable_ldm=True)
+            for _ in range(2)
+        ]
+        with pool.compressor(params=params[0]) as first:
+            pass
+        with pool.compressor(params=params[1]) as second:
+            assert second is first
+
+    def test_reused_contexts_give_the_same_output(self):
+        pool = ContextPool()
+        data = b"some data " * 10000
+        expected = zstd.ZstdCompressor(level=5, write_content_size=True).compress(data)
+        for _ in range(3):
+            with pool.compressor(level=5) as cctx:
+                writer = cctx.stream_writer(io.BytesIO())
+                writer.write(data[:100])  # abandoned without ending the frame
+            with pool.compressor(level=5) as cctx:
+                assert cctx.compress(data) == expected
+
+    def test_idle_contexts_are_limited(self):
+        pool = ContextPool(max_idle=1)
+        with pool.decompressor(), pool.decompressor():
+            pass
+        assert _idle(pool) == {("decompressor", None): 1}
+        pool.clear()
+        assert _idle(pool) == {}
+        with pytest.raises(ValueError):
+            ContextPool(max_idle=-1)
+
+    def test_archives_use_the_activated_pool(self, archive, temp_dir):
+        pool = ContextPool()
+        with pool.activate():
+            for _ in range(3):
+                assert tzst_test_archive(archive)
+                assert len(list_archive(archive, streaming=True)) == 1
+                create_archive(temp_dir / "b.tzst", [archive], compression_level=7)
+        assert _idle(pool) == {
+            ("decompressor", None): 1,
+            ("compressor", 7, 0, None): 1,
+        }
+        tzst_test_archive(archive)
+        assert _idle(pool)[("decompressor", None)] == 1
+
+    def test_archive_argument(self, archive):
+        pool = ContextPool()
+        with TzstArchive(archive, context_pool=pool) as opened:
+            assert opened.getnames() == ["a.txt"]
+            assert _idle(pool) == {}
+        assert _idle(pool) == {("decompressor", None): 1}
+
+    def test_shared_between_threads(self, archive):
+        pool = ContextPool(max_idle=4)
+        results = []
+
+        def worker():
+            with pool.activate():
+                results.extend(tzst_test_archive(archive) for _ in range(20))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [True] * 80
+        assert 1 <= _idle(pool)[("decompressor", None)] <= 4
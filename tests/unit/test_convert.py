@@ -0,0 +1,190 @@
+"""Tests for converting other archive formats to tzst."""
+
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from tzst import TzstArchive, convert, convert_many
+from tzst.exceptions import TzstArchiveError
+
+FILES = {"docs/readme.txt": b"hello", "docs/data.bin": bytes(range(256)) * 64}
+
+
+def _make_tar(path, mode):
+    with tarfile.open(path, mode) as tf:
+        directory = tarfile.TarInfo("docs")
+        directory.type = tarfile.DIRTYPE
+        directory.mode = 0o755
+        tf.addfile(directory)
+        for name, data in FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1_700_000_000
+            tf.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo("docs/latest")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "readme.txt"
+        tf.addfile(link)
+    return path
+
+
+def _contents(archive_path):
+    with TzstArchive(archive_path) as archive:
+        return {
+            member.name: (
+                archive.extractfile(member).read() if member.isfile() else member.type
+            )
+            for member in archive.getmembers()
+        }
+
+
+EXPECTED = {
+    "docs": tarfile.DIRTYPE,
+    **FILES,
+    "docs/latest": tarfile.SYMTYPE,
+}
+
+
+@pytest.mark.unit
+class TestConvert:
+    """Test single archive conversion."""
+
+    @pytest.mark.parametrize(
+        "name, mode, fmt",
+        [
+            ("in.tar", "w", "tar"),
+            ("in.tar.gz", "w:gz", "gz"),
+            ("in.tar.bz2", "w:bz2", "bz2"),
+            ("in.tar.xz", "w:xz", "xz"),
+        ],
+    )
+    def test_tar_formats(self, temp_dir, name, mode, fmt):
+        source = _make_tar(temp_dir / name, mode)
+
+        result = convert(source, temp_dir / "out.tzst", compression_level=5)
+
+        assert _contents(temp_dir / "out.tzst") == EXPECTED
+        assert result["format"] == fmt
+        assert result["members"] == 4
+        assert result["size"] == sum(len(data) for data in FILES.values())
+        assert result["source_size"] == os.path.getsize(source)
+        assert result["target_size"] == os.path.getsize(temp_dir / "out.tzst")
+        assert result["seconds"] >= 0
+
+    def test_format_is_detected_from_content(self, temp_dir):
+        source = _make_tar(temp_dir / "misnamed.zip", "w:gz")
+        assert convert(source, temp_dir / "out.tzst")["format"] == "gz"
+
+    def test_default_target_replaces_suffix(self, temp_dir):
+        source = _make_tar(temp_dir / "legacy.tgz", "w:gz")
+        result = convert(source)
+        assert result["target"] == str(temp_dir / "legacy.tzst")
+        assert _contents(temp_dir / "legacy.tzst") == EXPECTED
+
+    def test_zip(self, temp_dir):
+        source = temp_dir / "in.zip"
+        with zipfile.ZipFile(source, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("docs/", b"")
+            for name, data in FILES.items():
+                zf.writestr(name, data)
+            link = zipfile.ZipInfo("docs/latest")
+            link.external_attr = (0o120777 << 16) & 0xFFFF0000
+            zf.writestr(link, b"readme.txt")
+
+        result = convert(source, temp_dir / "out.tzst")
+
+        assert result["format"] == "zip"
+        assert _contents(temp_dir / "out.tzst") == EXPECTED
+        with TzstArchive(temp_dir / "out.tzst") as archive:
+            assert archive.getmember("docs/latest").linkname == "readme.txt"
+
+    def test_non_seekable_stream(self, temp_dir):
+        source = _make_tar(temp_dir / "in.tar.xz", "w:xz")
+        read_fd, write_fd = os.pipe()
+        with open(source, "rb") as data, open(write_fd, "wb") as pipe:
+            pipe.write(data.read())
+        output = io.BytesIO()
+
+        with open(read_fd, "rb") as stream:
+            result = convert(stream, output)
+
+        assert result["format"] == "xz"
+        assert result["source"] is None and result["target_size"] is None
+        (temp_dir / "out.tzst").write_bytes(output.getvalue())
+        assert _contents(temp_dir / "out.tzst") == EXPECTED
+
+    def test_sparse_members_keep_holes(self, temp_dir):
+        sparse_tar = temp_dir / "sparse.tar"
+        with tarfile.open(sparse_tar, "w", format=tarfile.PAX_FORMAT) as tf:
+            info = tarfile.TarInfo("GNUSparseFile.0/disk.img")
+            block = b"x" * 512
+            sparse_map = b"1\n4096\n512\n".ljust(512, b"\0")
+            info.size = len(sparse_map) + len(block)
+            info.pax_headers = {
+                "GNU.sparse.major": "1",
+                "GNU.sparse.minor": "0",
+                "GNU.sparse.name": "disk.img",
+                "GNU.sparse.realsize": "65536",
+            }
+            tf.addfile(info, io.BytesIO(sparse_map + block))
+
+        result = convert(sparse_tar, temp_dir / "out.tzst")
+
+        assert result["size"] == 65536
+        with TzstArchive(temp_dir / "out.tzst") as archive:
+            member = archive.getmember("disk.img")
+            assert member.sparse == [(4096, 512), (65536, 0)]
+            data = archive.extractfile(member).read()
+        assert data == bytes(4096) + block + bytes(65536 - 4096 - 512)
+
+    def test_tzst_input_is_rejected(self, temp_dir):
+        with TzstArchive(temp_dir / "in.tzst", "w") as archive:
+            archive.addbytes("a.txt", b"a")
+        with pytest.raises(TzstArchiveError, match="already"):
+            convert(temp_dir / "in.tzst", temp_dir / "out.tzst")
+        assert not (temp_dir / "out.tzst").exists()
+
+    def test_corrupt_input(self, temp_dir):
+        (temp_dir / "bad.tar.gz").write_bytes(b"\x1f\x8b" + b"junk" * 100)
+        with pytest.raises(TzstArchiveError):
+            convert(temp_dir / "bad.tar.gz", temp_dir / "out.tzst")
+        assert list(temp_dir.iterdir()) == [temp_dir / "bad.tar.gz"]
+
+    def test_file_object_needs_target(self):
+        with pytest.raises(ValueError, match="target"):
+            convert(io.BytesIO())
+
+
+@pytest.mark.unit
+class TestConvertMany:
+    """Test batch conversion in worker processes."""
+
+    def test_directory(self, temp_dir):
+        source_dir = temp_dir / "legacy"
+        source_dir.mkdir()
+        _make_tar(source_dir / "a.tar.gz", "w:gz")
+        _make_tar(source_dir / "b.tar.xz", "w:xz")
+        (source_dir / "notes.txt").write_text("not an archive")
+        (source_dir / "c.tgz").write_bytes(b"\x1f\x8bbroken")
+
+        results = convert_many([source_dir], temp_dir / "out", workers=2)
+
+        assert [os.path.basename(r["target"]) for r in results] == [
+            "a.tzst",
+            "b.tzst",
+            "c.tzst",
+        ]
+        assert "error" not in results[0] and "error" not in results[1]
+        assert "error" in results[2]
+        assert _contents(temp_dir / "out" / "a.tzst") == EXPECTED
+        assert _contents(temp_dir / "out" / "b.tzst") == EXPECTED
+        assert not (temp_dir / "out" / "c.tzst").exists()
+
+    def test_target_collision(self, temp_dir):
+        _make_tar(temp_dir / "a.tar.gz", "w:gz")
+        _make_tar(temp_dir / "a.zip", "w")
+        with pytest.raises(ValueError, match=r"a\.tzst"):
+            convert_many([temp_dir / "a.tar.gz", temp_dir / "a.zip"])
@@ -96,7 +96,7 @@ class TestCoreCoverageGaps:
         archive_path.write_bytes(b"not-a-valid-archive")
 
         class BrokenDecompressor:
-            def stream_reader(self, fileobj):
+            def stream_reader(self, fileobj, **kwargs):
                 raise RuntimeError("zstd decoder exploded")
 
         monkeypatch.setattr(core_module.zstd, "ZstdDecompressor", BrokenDecompressor)
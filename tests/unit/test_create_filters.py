@@ -0,0 +1,135 @@
+"""Tests for exclude/include filters and .gitignore support on creation."""
+
+import os
+
+import pytest
+
+from tzst import create_archive, list_archive
+from tzst.core import _IgnoreRules
+
+
+def _names(archive_path):
+    return sorted(item["name"] for item in list_archive(archive_path))
+
+
+@pytest.fixture
+def project(temp_dir):
+    """Create a small project tree with build output and dependencies."""
+    root = temp_dir / "proj"
+    for relative, content in {
+        "src/pkg/app.py": "print('hi')\n",
+        "src/pkg/app.pyc": "bytecode",
+        "node_modules/dep/index.js": "module.exports = 1;\n",
+        ".git/HEAD": "ref: refs/heads/main\n",
+        "build/out.bin": "out",
+        "docs/debug.log": "noise",
+        "docs/keep.log": "keep",
+        "docs/guide.txt": "guide",
+    }.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    (root / ".gitignore").write_text("# build output\n/build/\n*.log\n!keep.log\n")
+    return root
+
+
+@pytest.mark.unit
+class TestIgnoreRules:
+    """Test the .gitignore-style rule matcher."""
+
+    def test_unanchored_pattern_matches_at_any_depth(self):
+        rules = _IgnoreRules().extended(["*.pyc"])
+        assert rules.match("a.pyc", False)
+        assert rules.match("src/pkg/a.pyc", False)
+        assert not rules.match("src/pkg/a.py", False)
+
+    def test_anchored_and_directory_only_patterns(self):
+        rules = _IgnoreRules().extended(["/build/", "docs/_build"], base="proj")
+        assert rules.match("proj/build", True)
+        assert not rules.match("proj/build", False)
+        assert not rules.match("proj/src/build", True)
+        assert rules.match("proj/docs/_build", True)
+
+    def test_last_matching_rule_wins(self):
+        rules = _IgnoreRules().extended(["*.log", "!keep.log"])
+        assert rules.match("x/debug.log", False)
+        assert not rules.match("x/keep.log", False)
+
+
+@pytest.mark.unit
+class TestCreateArchiveFilters:
+    """Test create_archive with exclude, include and respect_gitignore."""
+
+    def test_exclude_prunes_directories_before_scanning(
+        self, project, temp_dir, monkeypatch
+    ):
+        """Excluded directories are skipped without being listed."""
+        scanned = []
+        original_scandir = os.scandir
+
+        def recording_scandir(path):
+            scanned.append(os.path.basename(path))
+            return original_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", recording_scandir)
+
+        archive_path = temp_dir / "out.tzst"
+        create_archive(archive_path, [project], exclude=["node_modules/", "*.pyc"])
+
+        assert "node_modules" not in scanned
+        names = _names(archive_path)
+        assert "proj/src/pkg/app.py" in names
+        assert not any("node_modules" in name for name in names)
+        assert "proj/src/pkg/app.pyc" not in names
+
+    def test_respect_gitignore(self, project, temp_dir):
+        """.gitignore rules, negations and the .git directory are honoured."""
+        archive_path = temp_dir / "out.tzst"
+        create_archive(archive_path, [project], respect_gitignore=True)
+
+        assert _names(archive_path) == [
+            "proj",
+            "proj/.gitignore",
+            "proj/docs",
+            "proj/docs/guide.txt",
+            "proj/docs/keep.log",
+            "proj/node_modules",
+            "proj/node_modules/dep",
+            "proj/node_modules/dep/index.js",
+            "proj/src",
+            "proj/src/pkg",
+            "proj/src/pkg/app.py",
+            "proj/src/pkg/app.pyc",
+        ]
+
+    def test_include_keeps_only_matching_files_and_their_parents(
+        self, project, temp_dir
+    ):
+        """Directories without included files are left out."""
+        archive_path = temp_dir / "out.tzst"
+        create_archive(archive_path, [project], include=["*.py", "proj/docs/*.txt"])
+
+        assert _names(archive_path) == [
+            "proj",
+            "proj/docs",
+            "proj/docs/guide.txt",
+            "proj/src",
+            "proj/src/pkg",
+            "proj/src/pkg/app.py",
+        ]
+
+    def test_filters_apply_to_top_level_inputs(self, project, temp_dir):
+        """Inputs given directly on the command line are matched too."""
+        archive_path = temp_dir / "out.tzst"
+        create_archive(
+            archive_path,
+            [project / "src", project / "build"],
+            exclude=["build"],
+        )
+
+        assert _names(archive_path) == [
+            "src",
+            "src/pkg",
+            "src/pkg/app.py",
+            "src/pkg/app.pyc",
+        ]
@@ -0,0 +1,232 @@
+"""Tests for deleting and replacing members of an archive file."""
+
+import io
+import os
+import tarfile
+
+import pytest
+import zstandard as zstd
+
+from tzst import core, create_archive, create_archive_from_iter, merge_archives
+from tzst import test_archive as tzst_test_archive
+from tzst.core import TzstArchive, _archive_frames, _frame_segments
+
+
+def _frames(path):
+    with open(path, "rb") as f:
+        return _archive_frames(f, str(path))
+
+
+def _frame_bytes(path):
+    data = path.read_bytes()
+    return [data[offset : offset + size] for offset, size in _frames(path)]
+
+
+def _contents(path):
+    with TzstArchive(path) as archive:
+        return [
+            (member.name, archive.extractfile(member).read())
+            for member in archive.getmembers()
+        ]
+
+
+@pytest.fixture
+def merged(temp_dir):
+    """An archive of three frames holding two members each."""
+    shards = []
+    for shard in "abc":
+        path = temp_dir / f"{shard}.tzst"
+        create_archive_from_iter(
+            path, [(f"{shard}/1.txt", shard.encode() * 3000), (f"{shard}/2.txt", b"2")]
+        )
+        shards.append(path)
+    merge_archives(temp_dir / "merged.tzst", shards)
+    return temp_dir / "merged.tzst"
+
+
+@pytest.mark.unit
+class TestDelete:
+    """Test TzstArchive.delete()."""
+
+    def test_untouched_frames_are_copied(self, merged):
+        before = _frame_bytes(merged)
+
+        with TzstArchive(merged) as archive:
+            assert archive.delete("b/1.txt") == 1
+            assert "b/1.txt" not in archive.getnames()
+
+        after = _frame_bytes(merged)
+        assert after[0] == before[0] and after[2] == before[2]
+        assert after[1] != before[1]
+        assert [name for name, _ in _contents(merged)] == [
+            "a/1.txt",
+            "a/2.txt",
+            "b/2.txt",
+            "c/1.txt",
+            "c/2.txt",
+        ]
+        assert tzst_test_archive(merged, streaming=True)
+
+    def test_plain_archive_edits_stay_local(self, temp_dir):
+        source = temp_dir / "src"
+        source.mkdir()
+        for index in range(5):
+            (source / f"{index}.bin").write_bytes(os.urandom(3 * 1024 * 1024))
+        path = temp_dir / "plain.tzst"
+        create_archive(path, [source])
+        before = _frame_bytes(path)
+        assert len(before) == 3
+
+        with TzstArchive(path) as archive:
+            assert archive.delete("src/4.bin") == 1
+
+        after = _frame_bytes(path)
+        assert after[0] == before[0] and after[1] != before[1]
+        with TzstArchive(path) as archive:
+            names = archive.getnames()
+        assert names == [
+            "src",
+            "src/0.bin",
+            "src/1.bin",
+            "src/2.bin",
+            "src/3.bin",
+        ]
+
+    def test_every_copy_is_deleted(self, temp_dir):
+        path = temp_dir / "dup.tzst"
+        create_archive_from_iter(path, [("x", b"1"), ("y", b"2"), ("x", b"3")])
+
+        with TzstArchive(path, streaming=True) as archive:
+            assert archive.delete(["x"]) == 2
+
+        assert _contents(path) == [("y", b"2")]
+
+    def test_missing_name_changes_nothing(self, merged):
+        before = merged.read_bytes()
+        with TzstArchive(merged) as archive:
+            with pytest.raises(KeyError, match="missing"):
+                archive.delete(["a/1.txt", "missing"])
+            assert len(archive.getnames()) == 6
+        assert merged.read_bytes() == before
+        assert not list(merged.parent.glob(".*.tmp"))
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+    def test_file_mode_is_kept(self, merged):
+        os.chmod(merged, 0o644)
+        with TzstArchive(merged) as archive:
+            archive.delete("a/2.txt")
+            archive.replace("b/2.txt", b"new")
+        assert merged.stat().st_mode & 0o777 == 0o644
+
+    def test_single_frame_archive_is_rewritten(self, temp_dir):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tf:
+            for name in ("a", "b", "c"):
+                info = tarfile.TarInfo(name)
+                info.size = 1
+                tf.addfile(info, io.BytesIO(name.encode()))
+        path = temp_dir / "legacy.tzst"
+        path.write_bytes(zstd.ZstdCompressor().compress(buffer.getvalue()))
+        assert _frames(path) is None
+
+        with TzstArchive(path) as archive:
+            assert archive.delete("b") == 1
+
+        assert _contents(path) == [("a", b"a"), ("c", b"c")]
+        assert len(_frames(path)) == 2
+
+    @pytest.mark.parametrize(
+        "opened_with, requested, expected", [(3, 19, 19), (9, None, 9), (3, None, 3)]
+    )
+    def test_compression_level(
+        self, merged, monkeypatch, opened_with, requested, expected
+    ):
+        levels = []
+        write_members = core._write_members
+
+        def spy(entries, output, compression_level, threads=0):
+            levels.append(compression_level)
+            write_members(entries, output, compression_level, threads)
+
+        monkeypatch.setattr(core, "_write_members", spy)
+        with TzstArchive(merged, compression_level=opened_with) as archive:
+            archive.delete("b/1.txt", compression_level=requested)
+
+        assert levels == [expected]
+
+    def test_invalid_compression_level(self, merged):
+        before = merged.read_bytes()
+        with TzstArchive(merged) as archive:
+            with pytest.raises(ValueError, match="compression level"):
+                archive.replace("a/1.txt", b"x", compression_level=23)
+        assert merged.read_bytes() == before
+
+    def test_requires_archive_file(self, merged):
+        with open(merged, "rb") as f, TzstArchive(fileobj=f) as archive:
+            with pytest.raises(RuntimeError, match="file name"):
+                archive.delete("a/1.txt")
+        with pytest.raises(RuntimeError, match="not open"):
+            TzstArchive(merged).delete("a/1.txt")
+
+
+@pytest.mark.unit
+class TestReplace:
+    """Test TzstArchive.replace()."""
+
+    def test_content_is_replaced_in_place(self, merged):
+        before = _frame_bytes(merged)
+
+        with TzstArchive(merged) as archive:
+            assert archive.replace("c/2.txt", b"new content") == 1
+            member = archive.getmember("c/2.txt")
+            assert archive.extractfile(member).read() == b"new content"
+            assert member.size == len(b"new content")
+
+        assert _frame_bytes(merged)[:2] == before[:2]
+        assert [name for name, _ in _contents(merged)][-2:] == ["c/1.txt", "c/2.txt"]
+
+    def test_metadata_is_kept(self, temp_dir):
+        name = "long/" + "n" * 120 + ".txt"
+        info = tarfile.TarInfo(name)
+        info.mode = 0o600
+        info.uname = "alice"
+        info.mtime = 1.5
+        path = temp_dir / "meta.tzst"
+        create_archive_from_iter(path, [(info, io.BytesIO(b"")), ("other.txt", b"x")])
+
+        with TzstArchive(path) as archive:
+            archive.replace(name, b"secret removed")
+            member = archive.getmember(name)
+
+        assert (member.mode, member.uname) == (0o600, "alice")
+        assert member.mtime > 1.5
+        assert _contents(path)[0] == (name, b"secret removed")
+
+
+@pytest.mark.unit
+class TestFrameSegments:
+    """Test grouping frames on member boundaries."""
+
+    def test_frames_splitting_a_member_are_grouped(self, temp_dir):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tf:
+            for name in ("a", "b", "c"):
+                info = tarfile.TarInfo(name)
+                info.size = 1000
+                tf.addfile(info, io.BytesIO(bytes(1000)))
+        tar = buffer.getvalue()
+        # Frame ends: 1536 (after a), 2048 (inside b), 4608 (after c), end marker
+        cctx = zstd.ZstdCompressor()
+        pieces = [tar[:1536], tar[1536:2048], tar[2048:4608], tar[4608:]]
+        path = temp_dir / "split.tzst"
+        path.write_bytes(b"".join(cctx.compress(piece) for piece in pieces))
+        frames = _frames(path)
+        assert len(frames) == 4
+
+        with open(path, "rb") as f:
+            segments, found = _frame_segments(f, frames[:-1], {"b"}, "split")
+
+        assert found == {"b"}
+        assert [affected for _, _, affected in segments] == [False, True]
+        assert segments[1][0] == frames[1][0]
+        assert sum(segments[1][:2]) == frames[3][0]
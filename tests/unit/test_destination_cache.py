@@ -0,0 +1,208 @@
+"""Tests for the extraction-scoped destination cache."""
+
+import os
+import tarfile
+
+import pytest
+
+from tzst import core, create_archive_from_iter, extract_archive
+from tzst.core import _DestinationCache
+
+
+@pytest.fixture
+def scandir_calls(monkeypatch):
+    """Count os.scandir calls."""
+    calls = []
+    original = os.scandir
+
+    def counting_scandir(path):
+        calls.append(os.fspath(path))
+        return original(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    return calls
+
+
+@pytest.mark.unit
+class TestDestinationCache:
+    """Test existence checks and directory creation through the cache."""
+
+    def test_each_directory_is_listed_once(self, temp_dir, scandir_calls):
+        for name in ("a", "b", "c"):
+            (temp_dir / name).write_text(name)
+        cache = _DestinationCache()
+
+        assert all(cache.exists(temp_dir / name) for name in ("a", "b", "c"))
+        assert not cache.exists(temp_dir / "d")
+        assert not cache.exists(temp_dir / "missing" / "x")
+        assert scandir_calls == [str(temp_dir), str(temp_dir / "missing")]
+
+    def test_added_paths_are_seen(self, temp_dir):
+        cache = _DestinationCache()
+        assert not cache.exists(temp_dir / "new" / "file.txt")
+
+        (temp_dir / "new").mkdir()
+        (temp_dir / "new" / "file.txt").write_text("x")
+        cache.added(temp_dir / "new" / "file.txt")
+
+        assert cache.exists(temp_dir / "new")
+        assert cache.exists(temp_dir / "new" / "file.txt")
+
+        (temp_dir / "new" / "file.txt").unlink()
+        cache.removed(temp_dir / "new" / "file.txt")
+        assert not cache.exists(temp_dir / "new" / "file.txt")
+
+    def test_mkdir_creates_each_directory_once(self, temp_dir, monkeypatch):
+        created = []
+        original = os.makedirs
+
+        def recording_makedirs(path, exist_ok=False):
+            created.append(path)
+            original(path, exist_ok=exist_ok)
+
+        monkeypatch.setattr(os, "makedirs", recording_makedirs)
+        cache = _DestinationCache()
+
+        cache.mkdir(temp_dir / "x" / "y")
+        first_calls = len(created)
+        for _ in range(3):
+            cache.mkdir(temp_dir / "x" / "y")
+        cache.mkdir(temp_dir / "x")
+
+        assert created[0] == str(temp_dir / "x" / "y")
+        assert len(created) == first_calls
+        assert (temp_dir / "x" / "y").is_dir()
+        assert cache.exists(temp_dir / "x" / "y")
+
+
+@pytest.mark.unit
+class TestExtractionUsesCache:
+    """Test that extraction replaces per-member stat calls with the cache."""
+
+    def test_rerun_does_not_stat_each_member(self, temp_dir, monkeypatch):
+        archive_path = temp_dir / "many.tzst"
+        create_archive_from_iter(
+            archive_path, ((f"d/f{i}.txt", b"x") for i in range(50))
+        )
+        output = temp_dir / "out"
+        extract_archive(archive_path, output, flatten=True)
+
+        stats = []
+        original = os.stat
+
+        def counting_stat(path, *args, **kwargs):
+            stats.append(path)
+            return original(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, "stat", counting_stat)
+        extract_archive(archive_path, output, flatten=True, conflict_resolution="skip")
+
+        assert len(stats) < 5
+
+    def test_conflicts_within_one_extraction_are_detected(self, temp_dir):
+        """A file written earlier in the same run counts as existing."""
+        archive_path = temp_dir / "dupes.tzst"
+        create_archive_from_iter(
+            archive_path, [("x/a.txt", b"first"), ("y/a.txt", b"second")]
+        )
+        output = temp_dir / "flat"
+
+        extract_archive(
+            archive_path, output, flatten=True, conflict_resolution="auto_rename"
+        )
+
+        assert (output / "a.txt").read_bytes() == b"first"
+        assert (output / "a_1.txt").read_bytes() == b"second"
+
+
+@pytest.mark.unit
+class TestReserveUnique:
+    """Test allocation of AUTO_RENAME names."""
+
+    def test_counter_is_seeded_from_existing_copies(self, temp_dir, scandir_calls):
+        for name in ("a.txt", "a_1.txt", "a_7.txt", "a_x.txt", "b_9.txt"):
+            (temp_dir / name).write_text(name)
+        cache = _DestinationCache()
+
+        assert cache.reserve_unique(temp_dir / "a.txt") == temp_dir / "a_8.txt"
+        assert cache.reserve_unique(temp_dir / "a.txt") == temp_dir / "a_9.txt"
+        assert cache.reserve_unique(temp_dir / "b.txt") == temp_dir / "b_10.txt"
+        assert cache.reserve_unique(temp_dir / "c") == temp_dir / "c_1"
+        # Reserved names are created so nobody else can take them
+        assert (temp_dir / "a_8.txt").read_bytes() == b""
+        assert cache.exists(temp_dir / "a_9.txt")
+        assert scandir_calls == [str(temp_dir)]
+
+    def test_names_taken_after_the_scan_are_skipped(self, temp_dir):
+        (temp_dir / "a.txt").write_text("a")
+        cache = _DestinationCache()
+        cache.exists(temp_dir / "a.txt")
+
+        (temp_dir / "a_1.txt").write_text("created concurrently")
+
+        assert cache.reserve_unique(temp_dir / "a.txt") == temp_dir / "a_2.txt"
+        assert (temp_dir / "a_1.txt").read_text() == "created concurrently"
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_flatten_auto_rename_all(self, temp_dir, streaming):
+        archive_path = temp_dir / "site.tzst"
+        create_archive_from_iter(
+            archive_path,
+            ((f"page{i}/index.html", f"page {i}".encode()) for i in range(20)),
+        )
+        output = temp_dir / "flat"
+        output.mkdir()
+        (output / "index_3.html").write_text("kept")
+
+        extract_archive(
+            archive_path,
+            output,
+            flatten=True,
+            streaming=streaming,
+            conflict_resolution="auto_rename_all",
+        )
+
+        assert (output / "index.html").read_text() == "page 0"
+        assert (output / "index_3.html").read_text() == "kept"
+        assert (output / "index_4.html").read_text() == "page 1"
+        assert (output / "index_22.html").read_text() == "page 19"
+        assert len(list(output.iterdir())) == 21
+
+    def test_placeholder_removed_when_the_filter_rejects(self, temp_dir):
+        archive_path = temp_dir / "a.tzst"
+        create_archive_from_iter(archive_path, [("a.txt", b"new")])
+        output = temp_dir / "out"
+        output.mkdir()
+        (output / "a.txt").write_text("old")
+
+        def reject(member, path):
+            raise tarfile.FilterError(member.name)
+
+        with pytest.raises(tarfile.FilterError):
+            extract_archive(
+                archive_path,
+                output,
+                members=["a.txt"],
+                filter=reject,
+                conflict_resolution="auto_rename",
+            )
+
+        assert [path.name for path in output.iterdir()] == ["a.txt"]
+
+    def test_placeholder_removed_when_writing_fails(self, temp_dir, monkeypatch):
+        archive_path = temp_dir / "a.tzst"
+        create_archive_from_iter(archive_path, [("dir/a.txt", b"new")])
+        output = temp_dir / "flat"
+        output.mkdir()
+        (output / "a.txt").write_text("old")
+
+        def fail(tf, member, target):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(core, "_write_member_data", fail)
+        with pytest.raises(OSError, match="disk full"):
+            extract_archive(
+                archive_path, output, flatten=True, conflict_resolution="auto_rename"
+            )
+
+        assert [path.name for path in output.iterdir()] == ["a.txt"]
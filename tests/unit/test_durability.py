@@ -0,0 +1,129 @@
+"""Tests for the durability policy of archive creation and extraction."""
+
+import asyncio
+import os
+
+import pytest
+
+from tzst import aio, core, create_archive, create_archive_from_iter, extract_archive
+
+
+@pytest.fixture
+def fsynced(monkeypatch):
+    """Record every path passed to _fsync_path or fsynced through a file."""
+    if not os.path.isdir("/proc/self/fd"):
+        pytest.skip("needs /proc to map file descriptors to paths")
+    paths = []
+    original_fsync = os.fsync
+
+    def record_path(path):
+        paths.append(os.path.abspath(path))
+
+    def record_fd(fd):
+        paths.append(os.readlink(f"/proc/self/fd/{fd}"))
+        original_fsync(fd)
+
+    monkeypatch.setattr(core, "_fsync_path", record_path)
+    monkeypatch.setattr(os, "fsync", record_fd)
+    return paths
+
+
+@pytest.fixture
+def archive(temp_dir):
+    archive_path = temp_dir / "data.tzst"
+    create_archive_from_iter(
+        archive_path,
+        [("a/b/one.txt", b"one"), ("a/two.txt", b"two"), ("top.txt", b"top")],
+        durability="none",
+    )
+    return archive_path
+
+
+@pytest.mark.unit
+class TestCreateDurability:
+    """Test flushing of newly created archives."""
+
+    def test_atomic_create_syncs_before_and_after_rename(
+        self, sample_files, temp_dir, fsynced
+    ):
+        archive_path = temp_dir / "out.tzst"
+        create_archive(archive_path, [sample_files[0]])
+
+        assert len(fsynced) == 2
+        assert os.path.basename(fsynced[0]).startswith(".out.tzst.")
+        assert fsynced[1] == str(temp_dir)
+        assert archive_path.exists()
+
+    def test_none_skips_fsync(self, sample_files, temp_dir, fsynced):
+        create_archive(temp_dir / "out.tzst", [sample_files[0]], durability="none")
+        assert fsynced == []
+
+    def test_invalid_durability(self, sample_files, temp_dir):
+        with pytest.raises(ValueError, match="Invalid durability"):
+            create_archive(temp_dir / "out.tzst", [sample_files[0]], durability="x")
+
+
+@pytest.mark.unit
+class TestExtractDurability:
+    """Test flushing of extracted files."""
+
+    def test_default_does_not_sync(self, archive, temp_dir, fsynced):
+        extract_archive(archive, temp_dir / "out")
+        assert fsynced == []
+
+    @pytest.mark.parametrize("flatten", [False, True])
+    def test_strict_syncs_each_file_and_directory(
+        self, archive, temp_dir, fsynced, flatten
+    ):
+        output = temp_dir / "out"
+        extract_archive(archive, output, flatten=flatten, durability="strict")
+
+        if flatten:
+            files = ["one.txt", "two.txt", "top.txt"]
+            directories = [output]
+        else:
+            files = ["a/b/one.txt", "a/two.txt", "top.txt"]
+            directories = [output, output / "a", output / "a" / "b"]
+        for name in files:
+            assert str(output / name) in fsynced
+        for directory in [*directories, temp_dir]:
+            assert str(directory) in fsynced
+
+    def test_batch_uses_syncfs_once(self, archive, temp_dir, monkeypatch, fsynced):
+        calls = []
+        monkeypatch.setattr(core, "_syncfs", lambda path: calls.append(path) or True)
+
+        extract_archive(archive, temp_dir / "out", durability="batch")
+
+        assert len(calls) == 1
+        assert fsynced == []
+
+    def test_batch_falls_back_to_parallel_fsync(
+        self, archive, temp_dir, monkeypatch, fsynced
+    ):
+        monkeypatch.setattr(core, "_syncfs", lambda path: False)
+        output = temp_dir / "out"
+
+        extract_archive(archive, output, durability="batch")
+
+        expected = {
+            output / "a" / "b" / "one.txt",
+            output / "a" / "two.txt",
+            output / "top.txt",
+            output / "a" / "b",
+            output / "a",
+            output,
+            temp_dir,
+        }
+        assert set(fsynced) == {str(path) for path in expected}
+        # File data is flushed before any directory entry
+        assert all(os.path.isfile(path) for path in fsynced[:3])
+
+    def test_async_batch(self, archive, temp_dir, monkeypatch, fsynced):
+        monkeypatch.setattr(core, "_syncfs", lambda path: False)
+        output = temp_dir / "out"
+
+        asyncio.run(aio.extract_archive(archive, output, durability="batch"))
+
+        assert str(output / "a" / "b" / "one.txt") in fsynced
+        assert str(output / "a") in fsynced
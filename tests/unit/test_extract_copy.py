@@ -0,0 +1,93 @@
+"""Tests for the member data copy path used by extraction."""
+
+import errno
+import io
+import os
+import tarfile
+
+import pytest
+
+from tzst import core, create_archive_from_iter, extract_archive
+from tzst.core import _TzstTarFile, _write_member_data
+
+PAYLOAD = bytes(range(256)) * 400
+
+
+@pytest.fixture
+def plain_tar(temp_dir):
+    """Create an uncompressed tar file holding PAYLOAD."""
+    path = temp_dir / "plain.tar"
+    with tarfile.open(path, "w") as tf:
+        info = tarfile.TarInfo("payload.bin")
+        info.size = len(PAYLOAD)
+        tf.addfile(info, io.BytesIO(PAYLOAD))
+    return path
+
+
+@pytest.mark.unit
+class TestWriteMemberData:
+    """Test copying member data out of an archive."""
+
+    @pytest.mark.skipif(
+        not hasattr(os, "copy_file_range"), reason="copy_file_range not available"
+    )
+    def test_file_source_uses_copy_file_range(self, plain_tar, temp_dir, monkeypatch):
+        calls = []
+        original = os.copy_file_range
+
+        def recording_copy_file_range(*args):
+            calls.append(args[2])
+            return original(*args)
+
+        monkeypatch.setattr(os, "copy_file_range", recording_copy_file_range)
+
+        target_path = temp_dir / "out.bin"
+        with _TzstTarFile.open(plain_tar) as tf, open(target_path, "wb") as target:
+            _write_member_data(tf, tf.getmember("payload.bin"), target)
+
+        assert calls
+        assert target_path.read_bytes() == PAYLOAD
+
+    def test_falls_back_when_kernel_copy_fails(self, plain_tar, temp_dir, monkeypatch):
+        def failing_copy_file_range(*args):
+            raise OSError(errno.EXDEV, "cross-device")
+
+        monkeypatch.setattr(
+            os, "copy_file_range", failing_copy_file_range, raising=False
+        )
+
+        target_path = temp_dir / "out.bin"
+        with _TzstTarFile.open(plain_tar) as tf, open(target_path, "wb") as target:
+            _write_member_data(tf, tf.getmember("payload.bin"), target)
+
+        assert target_path.read_bytes() == PAYLOAD
+
+    def test_truncated_data_raises(self, plain_tar, temp_dir):
+        data = plain_tar.read_bytes()
+        with _TzstTarFile.open(fileobj=io.BytesIO(data)) as tf:
+            member = tf.getmember("payload.bin")
+        truncated = io.BytesIO(data[: member.offset_data + 100])
+        with _TzstTarFile.open(fileobj=truncated, mode="r|") as tf:
+            with pytest.raises(core.TzstArchiveError, match="Unexpected end"):
+                _write_member_data(tf, tf.next(), io.BytesIO())
+
+
+@pytest.mark.unit
+class TestBoundedExtraction:
+    """Test that members larger than the copy buffer extract intact."""
+
+    @pytest.mark.parametrize("flatten", [False, True])
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_member_larger_than_buffer(self, temp_dir, monkeypatch, streaming, flatten):
+        monkeypatch.setattr(core, "_COPY_BUFSIZE", 4096)
+        archive_path = temp_dir / "data.tzst"
+        create_archive_from_iter(
+            archive_path, [("d/a.bin", PAYLOAD), ("d/b.bin", PAYLOAD[::-1])]
+        )
+
+        output = temp_dir / "out"
+        extract_archive(archive_path, output, streaming=streaming, flatten=flatten)
+
+        prefix = output if flatten else output / "d"
+        assert (prefix / "a.bin").read_bytes() == PAYLOAD
+        assert (prefix / "b.bin").read_bytes() == PAYLOAD[::-1]
@@ -0,0 +1,97 @@
+"""Tests for preallocation and page cache hints during extraction."""
+
+import errno
+import os
+import tarfile
+from types import SimpleNamespace
+
+import pytest
+
+from tzst import core, create_archive_from_iter, extract_archive
+from tzst.core import _prepare_target
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "posix_fallocate") or not hasattr(os, "posix_fadvise"),
+    reason="posix_fallocate/posix_fadvise not available",
+)
+
+PAYLOAD = os.urandom(64 * 1024)
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Record posix_fallocate and posix_fadvise calls with a low threshold."""
+    calls = {"fallocate": [], "fadvise": []}
+    original_fallocate = os.posix_fallocate
+    original_fadvise = os.posix_fadvise
+
+    def fallocate(fd, offset, length):
+        calls["fallocate"].append(length)
+        original_fallocate(fd, offset, length)
+
+    def fadvise(fd, offset, length, advice):
+        calls["fadvise"].append(advice)
+        original_fadvise(fd, offset, length, advice)
+
+    monkeypatch.setattr(os, "posix_fallocate", fallocate)
+    monkeypatch.setattr(os, "posix_fadvise", fadvise)
+    monkeypatch.setattr(core, "_HINT_THRESHOLD", 1024)
+    monkeypatch.setattr(core, "_DROP_BEHIND_WINDOW", 16 * 1024)
+    return calls
+
+
+@pytest.fixture
+def archive(temp_dir):
+    archive_path = temp_dir / "data.tzst"
+    create_archive_from_iter(
+        archive_path, [("big.bin", PAYLOAD), ("small.txt", b"tiny")]
+    )
+    return archive_path
+
+
+@pytest.mark.unit
+class TestExtractionHints:
+    """Test posix_fallocate and posix_fadvise use while extracting."""
+
+    @pytest.mark.parametrize("flatten", [False, True])
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_large_members_are_preallocated(
+        self, archive, temp_dir, recorded, streaming, flatten
+    ):
+        output = temp_dir / "out"
+        extract_archive(archive, output, streaming=streaming, flatten=flatten)
+
+        assert recorded["fallocate"] == [len(PAYLOAD)]
+        assert os.POSIX_FADV_SEQUENTIAL in recorded["fadvise"]
+        # One drop-behind call per 16 KiB window of the 64 KiB member
+        assert recorded["fadvise"].count(os.POSIX_FADV_DONTNEED) == 4
+        assert (output / "big.bin").read_bytes() == PAYLOAD
+        assert (output / "small.txt").read_bytes() == b"tiny"
+
+    def test_preallocation_opt_out(self, archive, temp_dir, recorded):
+        extract_archive(archive, temp_dir / "out", preallocate=False)
+
+        assert recorded["fallocate"] == []
+        assert (temp_dir / "out" / "big.bin").read_bytes() == PAYLOAD
+
+    def test_sparse_members_are_not_preallocated(self, temp_dir, recorded):
+        member = tarfile.TarInfo("disk.img")
+        member.size = 1024 * 1024
+        member.sparse = [(0, 4096), (member.size, 0)]
+        with open(temp_dir / "disk.img", "wb") as target:
+            fd = _prepare_target(SimpleNamespace(preallocate=True), member, target)
+
+        assert fd is not None
+        assert recorded["fallocate"] == []
+
+    def test_full_disk_is_reported(self, temp_dir, monkeypatch):
+        def no_space(fd, offset, length):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        monkeypatch.setattr(os, "posix_fallocate", no_space)
+        member = tarfile.TarInfo("big.bin")
+        member.size = core._HINT_THRESHOLD
+        with open(temp_dir / "big.bin", "wb") as target:
+            with pytest.raises(OSError) as excinfo:
+                _prepare_target(SimpleNamespace(preallocate=True), member, target)
+        assert excinfo.value.errno == errno.ENOSPC
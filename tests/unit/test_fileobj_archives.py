@@ -0,0 +1,79 @@
+"""Tests for reading and writing archives through file objects."""
+
+import io
+
+import pytest
+
+from tzst import (
+    TzstArchive,
+    create_archive,
+    extract_archive,
+    list_archive,
+)
+from tzst import test_archive as tzst_test_archive
+
+
+class NonSeekableReader(io.RawIOBase):
+    """Pipe-like reader that refuses to seek."""
+
+    def __init__(self, data: bytes):
+        self._buffer = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def readinto(self, b):
+        chunk = self._buffer.read(len(b))
+        b[: len(chunk)] = chunk
+        return len(chunk)
+
+
+@pytest.fixture
+def archive_bytes(sample_files):
+    """Build an archive entirely in memory."""
+    buffer = io.BytesIO()
+    create_archive(buffer, [f for f in sample_files if f.is_file()])
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+class TestFileobjArchives:
+    """Test TzstArchive(fileobj=...) and file objects in convenience functions."""
+
+    def test_requires_filename_or_fileobj(self):
+        """An archive needs somewhere to read from or write to."""
+        with pytest.raises(ValueError, match="filename or fileobj"):
+            TzstArchive(mode="r")
+
+    def test_write_and_read_bytesio(self):
+        """Archives round-trip through BytesIO, which stays open afterwards."""
+        buffer = io.BytesIO()
+        with TzstArchive(fileobj=buffer, mode="w") as archive:
+            archive.addbytes("hello.txt", b"Hello!")
+        assert not buffer.closed
+
+        buffer.seek(0)
+        with TzstArchive(fileobj=buffer) as archive:
+            assert not archive.streaming
+            assert archive.extractfile("hello.txt").read() == b"Hello!"
+        assert not buffer.closed
+
+    def test_non_seekable_source_selects_streaming(self, archive_bytes):
+        """Pipes are read in streaming mode automatically."""
+        archive = TzstArchive(fileobj=NonSeekableReader(archive_bytes))
+        assert archive.streaming is True
+
+        with archive:
+            assert "test.txt" in archive.getnames()
+
+    def test_convenience_functions_accept_fileobj(self, archive_bytes, temp_dir):
+        """List, test and extract work from in-memory and pipe sources."""
+        names = {item["name"] for item in list_archive(io.BytesIO(archive_bytes))}
+        assert "subdir/nested/nested.txt" in names
+        assert tzst_test_archive(NonSeekableReader(archive_bytes)) is True
+
+        extract_archive(NonSeekableReader(archive_bytes), temp_dir / "out")
+        assert (temp_dir / "out" / "test.txt").read_text().startswith("Hello")
@@ -0,0 +1,95 @@
+"""Tests for creating archives from in-memory data and file objects."""
+
+import io
+import tarfile
+
+import pytest
+
+from tzst import TzstArchive, create_archive_from_iter
+from tzst.exceptions import TzstArchiveError
+
+
+@pytest.mark.unit
+class TestAddBytesAndFileobj:
+    """Test TzstArchive.addbytes and TzstArchive.addfileobj."""
+
+    def test_addbytes_round_trip(self, sample_archive_path):
+        """In-memory data is stored with the requested metadata."""
+        with TzstArchive(sample_archive_path, "w") as archive:
+            archive.addbytes(
+                "docs/hello.txt", b"Hello!", mtime=1_700_000_000, mode=0o600
+            )
+            archive.addbytes("view.bin", memoryview(b"abcdef")[2:])
+
+        with TzstArchive(sample_archive_path, "r") as archive:
+            member = archive._tarfile.getmember("docs/hello.txt")
+            assert member.mtime == 1_700_000_000
+            assert member.mode == 0o600
+            assert archive.extractfile(member).read() == b"Hello!"
+            assert archive.extractfile("view.bin").read() == b"cdef"
+
+    def test_addfileobj_reads_exact_size(self, sample_archive_path):
+        """Only ``size`` bytes are consumed from the file object."""
+        source = io.BytesIO(b"0123456789")
+        with TzstArchive(sample_archive_path, "w") as archive:
+            archive.addfileobj("digits.txt", source, 4)
+
+        assert source.tell() == 4
+        with TzstArchive(sample_archive_path, "r") as archive:
+            assert archive.extractfile("digits.txt").read() == b"0123"
+
+    def test_addfileobj_short_source_raises(self, sample_archive_path):
+        """A file object that ends early is reported as an archive error."""
+        with TzstArchive(sample_archive_path, "w") as archive:
+            with pytest.raises(TzstArchiveError, match=r"short\.txt"):
+                archive.addfileobj("short.txt", io.BytesIO(b"abc"), 10)
+
+    def test_addbytes_requires_write_mode(self, sample_archive_path):
+        """Adding data to a read-mode archive is rejected."""
+        with TzstArchive(sample_archive_path, "w") as archive:
+            archive.addbytes("a.txt", b"a")
+
+        with TzstArchive(sample_archive_path, "r") as archive:
+            with pytest.raises(RuntimeError, match="not open for writing"):
+                archive.addbytes("b.txt", b"b")
+
+
+@pytest.mark.unit
+class TestCreateArchiveFromIter:
+    """Test create_archive_from_iter."""
+
+    def test_mixed_entry_types(self, temp_dir):
+        """All supported entry shapes end up in the archive."""
+        directory = tarfile.TarInfo("generated")
+        directory.type = tarfile.DIRTYPE
+        directory.mode = 0o755
+
+        def entries():
+            yield directory, None
+            yield "generated/a.txt", b"alpha"
+            yield "generated/b.txt", io.BytesIO(b"bravo!!"), 5
+
+        archive_path = temp_dir / "generated"
+        create_archive_from_iter(archive_path, entries())
+
+        expected_path = temp_dir / "generated.tzst"
+        with TzstArchive(expected_path, "r") as archive:
+            assert archive.getnames() == [
+                "generated",
+                "generated/a.txt",
+                "generated/b.txt",
+            ]
+            assert archive.extractfile("generated/a.txt").read() == b"alpha"
+            assert archive.extractfile("generated/b.txt").read() == b"bravo"
+
+    def test_invalid_entry_cleans_up_temp_file(self, temp_dir):
+        """Malformed entries abort creation without leaving files behind."""
+        with pytest.raises(ValueError, match="Archive entries must be"):
+            create_archive_from_iter(temp_dir / "bad.tzst", [("only-name",)])
+
+        assert list(temp_dir.iterdir()) == []
+
+    def test_invalid_compression_level(self, temp_dir):
+        """Compression level is validated up front."""
+        with pytest.raises(ValueError, match="Invalid compression level"):
+            create_archive_from_iter(temp_dir / "x.tzst", [], compression_level=0)
@@ -0,0 +1,100 @@
+"""Tests for the lazy member index and member query API."""
+
+import tarfile
+
+import pytest
+
+from tzst import TzstArchive, create_archive_from_iter, extract_archive
+
+
+@pytest.fixture
+def log_archive(temp_dir):
+    """Archive with a small directory tree of log files."""
+    archive_path = temp_dir / "logs.tzst"
+    create_archive_from_iter(
+        archive_path,
+        [
+            ("logs/2024-05-31/app.json", b"may"),
+            ("logs/2024-06-01/app.json", b"june 1"),
+            ("logs/2024-06-01/app.txt", b"text"),
+            ("logs/2024-06-02/nested/app.json", b"nested"),
+            ("logs/2024-06-02/db.json", b"june 2"),
+            ("readme.md", b"first"),
+            ("readme.md", b"second"),
+        ],
+    )
+    return archive_path
+
+
+@pytest.mark.unit
+class TestMemberIndex:
+    """Test name lookups through the member index."""
+
+    def test_getmember_avoids_tarfile_scan(self, log_archive, monkeypatch):
+        """Lookups by name never fall back to tarfile's linear getmember."""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("tarfile.getmember should not be used")
+
+        monkeypatch.setattr(tarfile.TarFile, "getmember", fail)
+        with TzstArchive(log_archive) as archive:
+            member = archive.getmember("logs/2024-06-01/app.json")
+            assert member.size == len(b"june 1")
+            assert archive.extractfile("logs/2024-06-02/db.json").read() == b"june 2"
+
+    def test_duplicate_names_return_last_entry(self, log_archive):
+        """Duplicate names resolve to the last occurrence like tarfile."""
+        with TzstArchive(log_archive) as archive:
+            assert archive.extractfile("readme.md").read() == b"second"
+
+    def test_missing_member_raises_key_error(self, log_archive):
+        """Unknown names raise KeyError."""
+        with TzstArchive(log_archive) as archive:
+            with pytest.raises(KeyError, match=r"missing\.txt"):
+                archive.getmember("missing.txt")
+
+    def test_index_is_reset_on_close(self, log_archive):
+        """Closing the archive drops the index."""
+        archive = TzstArchive(log_archive)
+        with archive:
+            archive.getmember("readme.md")
+            assert archive._member_index is not None
+        assert archive._member_index is None
+
+    def test_selective_extraction_by_name(self, log_archive, temp_dir):
+        """Selective extraction resolves names through the index."""
+        output = temp_dir / "out"
+        extract_archive(log_archive, output, members=["logs/2024-06-02/db.json"])
+        assert (output / "logs/2024-06-02/db.json").read_bytes() == b"june 2"
+
+
+@pytest.mark.unit
+class TestMemberQueries:
+    """Test prefix and glob queries."""
+
+    def test_prefix_query_returns_archive_order(self, log_archive):
+        """Directory queries return all members below the prefix."""
+        with TzstArchive(log_archive) as archive:
+            names = [m.name for m in archive.prefix("logs/2024-06-02/")]
+        assert names == ["logs/2024-06-02/nested/app.json", "logs/2024-06-02/db.json"]
+
+    def test_glob_wildcards_respect_separators(self, log_archive):
+        """``*`` stays within one directory level."""
+        with TzstArchive(log_archive) as archive:
+            names = [m.name for m in archive.glob("logs/2024-06-*/*.json")]
+        assert names == ["logs/2024-06-01/app.json", "logs/2024-06-02/db.json"]
+
+    def test_glob_double_star_crosses_directories(self, log_archive):
+        """``**`` matches any number of directories, including none."""
+        with TzstArchive(log_archive) as archive:
+            names = [m.name for m in archive.glob("logs/**/app.json")]
+        assert names == [
+            "logs/2024-05-31/app.json",
+            "logs/2024-06-01/app.json",
+            "logs/2024-06-02/nested/app.json",
+        ]
+
+    def test_glob_without_matches(self, log_archive):
+        """Patterns without matches return an empty list."""
+        with TzstArchive(log_archive) as archive:
+            assert archive.glob("other/*") == []
@@ -0,0 +1,201 @@
+"""Tests for include/exclude member selection during extraction."""
+
+import re
+import tarfile
+
+import pytest
+
+from tzst import create_archive_from_iter, extract_archive
+from tzst.core import ConflictResolution, _MemberMatcher
+
+
+def _extracted(root):
+    """Return the relative paths of all files below root."""
+    return sorted(
+        p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file()
+    )
+
+
+@pytest.fixture
+def logs_archive(temp_dir):
+    """Create an archive with a small dated log tree."""
+    archive_path = temp_dir / "logs.tzst"
+    create_archive_from_iter(
+        archive_path,
+        [
+            ("logs/2024-05-31/a.json", b"may"),
+            ("logs/2024-06-01/a.json", b"june 1"),
+            ("logs/2024-06-01/a.txt", b"text"),
+            ("logs/2024-06-02/deep/b.json", b"deep"),
+            ("logs/2024-06-02/c.json", b"june 2"),
+            ("README", b"readme"),
+        ],
+    )
+    return archive_path
+
+
+@pytest.mark.unit
+class TestMemberMatcher:
+    """Test the compiled member matcher."""
+
+    def test_glob_respects_separators(self):
+        """``*`` stays within a directory while ``**`` spans directories."""
+        matcher = _MemberMatcher(include=["logs/*/*.json"])
+        assert matcher("logs/2024-06-01/a.json")
+        assert not matcher("logs/2024-06-02/deep/b.json")
+
+        matcher = _MemberMatcher(include=["logs/**/*.json"])
+        assert matcher("logs/2024-06-02/deep/b.json")
+
+    def test_exclude_wins_over_names_and_include(self):
+        """Excluded members are skipped even when listed explicitly."""
+        matcher = _MemberMatcher(
+            names=["README"], include=[re.compile(r".*\.json")], exclude=["README"]
+        )
+        assert not matcher("README")
+        assert matcher("x/y.json")
+
+    def test_exhausted_after_last_exact_name(self):
+        """Exact names are exhausted once all of them have been seen."""
+        matcher = _MemberMatcher(names=["a", "b/"])
+        assert not matcher.exhausted
+        matcher("a")
+        matcher("b")
+        assert matcher.exhausted
+
+    def test_waits_for_every_counted_copy(self):
+        """With the member list known, the last copy of a name is read too."""
+        matcher = _MemberMatcher(names=["a", "missing"])
+        matcher.count_copies(
+            [tarfile.TarInfo("a"), tarfile.TarInfo("b"), tarfile.TarInfo("a")]
+        )
+        matcher("a")
+        assert not matcher.exhausted
+        matcher("a")
+        assert matcher.exhausted
+
+    def test_patterns_are_never_exhausted(self):
+        """A pattern may match later members, so reading cannot stop early."""
+        matcher = _MemberMatcher(names=["a"], include=["*.txt"])
+        matcher("a")
+        assert not matcher.exhausted
+
+
+@pytest.mark.unit
+class TestExtractWithPatterns:
+    """Test extract_archive with include/exclude patterns."""
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_include_glob(self, logs_archive, temp_dir, streaming):
+        """Only members matching the glob are extracted."""
+        output = temp_dir / "out"
+        extract_archive(
+            logs_archive,
+            output,
+            include=["logs/2024-06-*/*.json"],
+            streaming=streaming,
+        )
+        assert _extracted(output) == [
+            "logs/2024-06-01/a.json",
+            "logs/2024-06-02/c.json",
+        ]
+
+    def test_include_regex_with_exclude(self, logs_archive, temp_dir):
+        """Regex includes combine with glob excludes."""
+        output = temp_dir / "out"
+        extract_archive(
+            logs_archive,
+            output,
+            include=[re.compile(r"logs/2024-06-\d\d/.*")],
+            exclude=["**/*.txt"],
+        )
+        assert _extracted(output) == [
+            "logs/2024-06-01/a.json",
+            "logs/2024-06-02/c.json",
+            "logs/2024-06-02/deep/b.json",
+        ]
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_flatten_with_exclude(self, logs_archive, temp_dir, streaming):
+        """Flat extraction honours the same selection."""
+        output = temp_dir / "flat"
+        extract_archive(
+            logs_archive,
+            output,
+            flatten=True,
+            streaming=streaming,
+            include=["logs/**"],
+            exclude=["**/*.json"],
+        )
+        assert _extracted(output) == ["a.txt"]
+
+    def test_streaming_members_stop_after_last_match(
+        self, logs_archive, temp_dir, monkeypatch
+    ):
+        """Reading stops once every requested member has been extracted."""
+        headers = []
+        original_fromtarfile = tarfile.TarInfo.fromtarfile.__func__
+
+        def counting_fromtarfile(cls, tarfile_obj):
+            tarinfo = original_fromtarfile(cls, tarfile_obj)
+            headers.append(tarinfo.name)
+            return tarinfo
+
+        monkeypatch.setattr(
+            tarfile.TarInfo, "fromtarfile", classmethod(counting_fromtarfile)
+        )
+
+        output = temp_dir / "out"
+        extract_archive(
+            logs_archive,
+            output,
+            members=["logs/2024-06-01/a.json"],
+            streaming=True,
+        )
+        assert _extracted(output) == ["logs/2024-06-01/a.json"]
+        # The remaining headers (and data) are never decompressed; PAX
+        # extended headers report the same name twice
+        assert list(dict.fromkeys(headers)) == [
+            "logs/2024-05-31/a.json",
+            "logs/2024-06-01/a.json",
+        ]
+
+    @pytest.mark.parametrize("flatten", [False, True])
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_duplicate_names(self, temp_dir, streaming, flatten):
+        """The last copy wins, except in streaming mode, which stops at the first."""
+        archive_path = temp_dir / "dup.tzst"
+        create_archive_from_iter(
+            archive_path,
+            [("dir/a.txt", b"first"), ("b.txt", b"b"), ("dir/a.txt", b"second")],
+        )
+        output = temp_dir / "out"
+
+        extract_archive(
+            archive_path,
+            output,
+            members=["dir/a.txt"],
+            streaming=streaming,
+            flatten=flatten,
+            conflict_resolution="replace",
+        )
+
+        target = output / ("a.txt" if flatten else "dir/a.txt")
+        assert target.read_bytes() == (b"first" if streaming else b"second")
+        assert _extracted(output) == ["a.txt" if flatten else "dir/a.txt"]
+
+    def test_streaming_members_auto_rename(self, logs_archive, temp_dir):
+        """Conflict handling works for members selected in streaming mode."""
+        output = temp_dir / "out"
+        (output / "logs/2024-06-01").mkdir(parents=True)
+        (output / "logs/2024-06-01/a.json").write_bytes(b"existing")
+
+        extract_archive(
+            logs_archive,
+            output,
+            members=["logs/2024-06-01/a.json"],
+            streaming=True,
+            conflict_resolution=ConflictResolution.AUTO_RENAME,
+        )
+        assert (output / "logs/2024-06-01/a.json").read_bytes() == b"existing"
+        assert (output / "logs/2024-06-01/a_1.json").read_bytes() == b"june 1"
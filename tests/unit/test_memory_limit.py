@@ -0,0 +1,240 @@
+"""Tests for reading, writing and recompressing archives within a memory limit."""
+
+import io
+import os
+import tarfile
+import tempfile
+
+import pytest
+import zstandard as zstd
+
+from tzst import (
+    TzstArchive,
+    create_archive,
+    create_archive_from_iter,
+    extract_archive,
+    list_archive,
+    recompress,
+)
+from tzst import test_archive as tzst_test_archive
+from tzst.core import _MemoryBudget
+from tzst.exceptions import TzstArchiveError, TzstMemoryLimitError
+
+MiB = 1024 * 1024
+
+
+def _window_size(path):
+    return zstd.get_frame_parameters(path.read_bytes()[:18]).window_size
+
+
+@pytest.fixture
+def archive(temp_dir):
+    path = temp_dir / "a.tzst"
+    create_archive_from_iter(
+        path,
+        [("zeros.bin", bytes(6 * MiB)), ("random.bin", os.urandom(200000))],
+    )
+    return path
+
+
+@pytest.fixture
+def long_archive(archive, temp_dir):
+    """An archive whose frames need a 128 MiB window."""
+    path = temp_dir / "long.tzst"
+    recompress(archive, path, long_distance=True)
+    return path
+
+
+@pytest.fixture
+def late_long_frame(temp_dir):
+    """An archive whose first frame is small and second needs 128 MiB."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tf:
+        for name in ("a.bin", "b.bin"):
+            info = tarfile.TarInfo(name)
+            info.size = 3 * MiB
+            tf.addfile(info, io.BytesIO(os.urandom(info.size)))
+    tar = buffer.getvalue()
+    split = 512 + 3 * MiB
+    params = zstd.ZstdCompressionParameters.from_level(
+        3, window_log=27, enable_ldm=True
+    )
+    # Streaming compression without a size keeps the full window
+    compressor = zstd.ZstdCompressor(compression_params=params).compressobj()
+    tail = compressor.compress(tar[split:]) + compressor.flush()
+    path = temp_dir / "late.tzst"
+    path.write_bytes(zstd.ZstdCompressor().compress(tar[:split]) + tail)
+    return path
+
+
+@pytest.mark.unit
+class TestMemoryBudget:
+    """Test how a memory limit is shared between buffers."""
+
+    def test_limit_below_minimum(self, archive, temp_dir):
+        with pytest.raises(ValueError, match="memory limit"):
+            TzstArchive(archive, memory_limit=MiB)
+        with pytest.raises(ValueError, match="memory limit"):
+            create_archive(temp_dir / "b.tzst", [archive], memory_limit=MiB)
+        with pytest.raises(ValueError, match="memory limit"):
+            extract_archive(archive, temp_dir / "out", memory_limit=MiB)
+
+    @pytest.mark.parametrize("limit", [16 * MiB, 64 * MiB, 512 * MiB])
+    @pytest.mark.parametrize("level", [3, 19, 22])
+    def test_compression_params_fit(self, limit, level):
+        budget = _MemoryBudget(limit)
+
+        params = budget.compression_params(level, threads=8)
+
+        assert 1 << params.window_log <= limit // 4
+        single = zstd.ZstdCompressionParameters.from_level(
+            level,
+            window_log=params.window_log,
+            hash_log=params.hash_log,
+            chain_log=params.chain_log,
+        )
+        assert single.estimated_compression_context_size() <= limit // 2
+        assert 0 <= params.threads <= 8
+
+    def test_long_distance_window_shrinks(self):
+        params = _MemoryBudget(64 * MiB).compression_params(
+            19, enable_ldm=True, window_log=27
+        )
+        assert params.enable_ldm
+        assert 1 << params.window_log <= 16 * MiB
+
+    def test_small_limits_shrink_buffers(self):
+        budget = _MemoryBudget(16 * MiB)
+        assert budget.window == budget.spill == 4 * MiB
+        assert budget.chunk * budget.queue_depth <= MiB
+
+
+@pytest.mark.unit
+class TestBudgetedReading:
+    """Test reading archives with memory_limit set."""
+
+    def test_reading_within_the_limit(self, archive, temp_dir):
+        assert [item["name"] for item in list_archive(archive, memory_limit=16 * MiB)]
+        assert tzst_test_archive(archive, memory_limit=16 * MiB)
+        extract_archive(archive, temp_dir / "out", memory_limit=16 * MiB)
+        assert (temp_dir / "out" / "zeros.bin").read_bytes() == bytes(6 * MiB)
+
+    def test_testing_drops_each_member(self, temp_dir, monkeypatch):
+        path = temp_dir / "many.tzst"
+        create_archive_from_iter(path, ((f"{index}.txt", b"x") for index in range(50)))
+        kept = []
+        original_next = tarfile.TarFile.next
+
+        def counting_next(tf):
+            member = original_next(tf)
+            kept.append(len(tf.members))
+            return member
+
+        monkeypatch.setattr(tarfile.TarFile, "next", counting_next)
+
+        assert tzst_test_archive(path, memory_limit=16 * MiB)
+        assert len(kept) > 50
+        assert max(kept) <= 1
+
+    def test_large_window_is_rejected(self, long_archive, temp_dir):
+        with pytest.raises(TzstMemoryLimitError, match="128 MiB window"):
+            list_archive(long_archive, memory_limit=64 * MiB)
+        with pytest.raises(TzstMemoryLimitError):
+            tzst_test_archive(long_archive, memory_limit=64 * MiB)
+        with pytest.raises(TzstArchiveError):
+            extract_archive(long_archive, temp_dir / "out", memory_limit=64 * MiB)
+        assert not (temp_dir / "out" / "zeros.bin").exists()
+
+    def test_large_window_in_a_later_frame(self, late_long_frame, temp_dir):
+        with pytest.raises(TzstMemoryLimitError, match="larger window"):
+            list_archive(late_long_frame, memory_limit=64 * MiB)
+        with pytest.raises(TzstMemoryLimitError):
+            tzst_test_archive(late_long_frame, memory_limit=64 * MiB)
+        with pytest.raises(TzstMemoryLimitError):
+            extract_archive(
+                late_long_frame,
+                temp_dir / "out",
+                streaming=True,
+                memory_limit=64 * MiB,
+            )
+        with pytest.raises(TzstMemoryLimitError):
+            TzstArchive(late_long_frame, memory_limit=64 * MiB).open()
+
+    def test_large_enough_limit(self, long_archive):
+        assert tzst_test_archive(long_archive, memory_limit=1024 * MiB)
+
+    def test_buffered_mode_spills_to_disk(self, archive):
+        with TzstArchive(archive, memory_limit=16 * MiB) as opened:
+            stream = opened._compressed_stream
+            assert isinstance(stream, tempfile.SpooledTemporaryFile)
+            assert stream._rolled
+            data = opened.extractfile("zeros.bin").read()
+        assert data == bytes(6 * MiB)
+
+    def test_without_a_limit_nothing_is_checked(self, long_archive):
+        with TzstArchive(long_archive) as opened:
+            assert opened.getnames() == ["zeros.bin", "random.bin"]
+
+
+@pytest.mark.unit
+class TestBudgetedWriting:
+    """Test creating and recompressing archives with memory_limit set."""
+
+    def test_create_shrinks_the_window(self, archive, temp_dir):
+        target = temp_dir / "small.tzst"
+
+        create_archive(target, [archive], compression_level=22, memory_limit=32 * MiB)
+
+        assert _window_size(target) <= 8 * MiB
+        assert tzst_test_archive(target, memory_limit=32 * MiB)
+
+    def test_create_from_iter(self, temp_dir):
+        target = temp_dir / "iter.tzst"
+        create_archive_from_iter(
+            target,
+            [("a.txt", b"a" * 100000)],
+            compression_level=19,
+            memory_limit=16 * MiB,
+        )
+        assert _window_size(target) <= 4 * MiB
+        assert list_archive(target)[0]["size"] == 100000
+
+    def test_sharded_create(self, temp_dir):
+        source = temp_dir / "src"
+        source.mkdir()
+        for index in range(6):
+            (source / f"{index}.bin").write_bytes(os.urandom(50000))
+        target = temp_dir / "shards.tzst"
+
+        create_archive(target, [source], shards=4, memory_limit=32 * MiB)
+
+        assert len(list_archive(target)) == 7
+        assert tzst_test_archive(target)
+
+    def test_recompress_within_the_limit(self, long_archive, temp_dir):
+        target = temp_dir / "small.tzst"
+
+        recompress(
+            long_archive,
+            target,
+            long_distance=True,
+            compression_level=19,
+            memory_limit=1024 * MiB,
+        )
+
+        assert _window_size(target) == 128 * MiB
+        assert tzst_test_archive(target, memory_limit=1024 * MiB)
+
+    def test_recompress_shrinks_the_window(self, archive, temp_dir):
+        target = temp_dir / "small.tzst"
+
+        recompress(archive, target, long_distance=True, memory_limit=64 * MiB)
+
+        assert _window_size(target) <= 16 * MiB
+        assert tzst_test_archive(target, memory_limit=64 * MiB)
+
+    def test_recompress_rejects_a_large_source_window(self, long_archive, temp_dir):
+        target = temp_dir / "out.tzst"
+        with pytest.raises(TzstMemoryLimitError):
+            recompress(long_archive, target, memory_limit=64 * MiB)
+        assert not target.exists()
@@ -0,0 +1,73 @@
+"""Tests for decompressing archives from a memory mapping of the file."""
+
+import io
+
+import pytest
+
+from tzst import (
+    TzstArchive,
+    create_archive,
+    create_archive_from_iter,
+    extract_archive,
+    list_archive,
+)
+from tzst import test_archive as tzst_test_archive
+from tzst.exceptions import TzstArchiveError
+
+
+@pytest.fixture
+def archive(temp_dir):
+    path = temp_dir / "a.tzst"
+    create_archive_from_iter(
+        path,
+        [(f"data/{index}.bin", bytes([index]) * 300000) for index in range(5)],
+    )
+    return path
+
+
+@pytest.mark.unit
+class TestMemoryMap:
+    """Test TzstArchive(memory_map=True) and the convenience functions."""
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_reads_through_the_mapping(self, archive, streaming):
+        with TzstArchive(archive, streaming=streaming, memory_map=True) as opened:
+            mapping = opened._mapping
+            assert mapping is not None
+            names = [member.name for member in opened.getmembers()]
+        assert names == [f"data/{index}.bin" for index in range(5)]
+        assert mapping.closed
+
+    def test_convenience_functions(self, archive, temp_dir):
+        assert list_archive(archive, memory_map=True) == list_archive(archive)
+        assert tzst_test_archive(archive, memory_map=True)
+        assert tzst_test_archive(archive, streaming=True, memory_map=True)
+
+        extract_archive(archive, temp_dir / "out", memory_map=True, streaming=True)
+
+        assert (temp_dir / "out" / "data" / "3.bin").read_bytes() == b"\3" * 300000
+
+    def test_corrupt_archive(self, archive):
+        data = archive.read_bytes()
+        archive.write_bytes(data[: len(data) // 2])
+        assert not tzst_test_archive(archive, memory_map=True)
+
+    def test_unmappable_sources_are_read_as_usual(self, archive, temp_dir):
+        empty = temp_dir / "empty.tzst"
+        empty.write_bytes(b"")
+        with pytest.raises(TzstArchiveError, match="empty file"):
+            TzstArchive(empty, memory_map=True).open()
+
+        with TzstArchive(
+            fileobj=io.BytesIO(archive.read_bytes()), memory_map=True
+        ) as opened:
+            assert opened._mapping is None
+            assert len(opened.getnames()) == 5
+
+        source = temp_dir / "big.bin"
+        source.write_bytes(b"x" * 200000)
+        create_archive(temp_dir / "split.tzst", [source], volume_size=64 * 1024)
+        first = temp_dir / "split.tzst.001"
+        with TzstArchive(first, memory_map=True) as opened:
+            assert opened._mapping is None
+            assert opened.getnames() == ["big.bin"]
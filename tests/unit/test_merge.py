@@ -0,0 +1,216 @@
+"""Tests for merging archives by concatenating their zstd frames."""
+
+import io
+import tarfile
+
+import pytest
+import zstandard as zstd
+
+from tzst import (
+    create_archive_from_iter,
+    extract_archive,
+    list_archive,
+    merge_archives,
+    recompress,
+)
+from tzst import test_archive as tzst_test_archive
+from tzst.core import TzstArchive, _archive_frames, _zstd_frames
+from tzst.exceptions import TzstArchiveError, TzstDecompressionError
+
+
+def _members(archive_path):
+    with TzstArchive(archive_path) as archive:
+        return [
+            (member.name, archive.extractfile(member).read())
+            for member in archive.getmembers()
+            if member.isfile()
+        ]
+
+
+@pytest.fixture
+def shards(temp_dir):
+    first = temp_dir / "a.tzst"
+    second = temp_dir / "b.tzst"
+    create_archive_from_iter(first, [("x/one.txt", b"1" * 5000), ("dup.txt", b"a")])
+    create_archive_from_iter(second, [("x/two.txt", b"2" * 100), ("dup.txt", b"b")])
+    return first, second
+
+
+@pytest.fixture
+def legacy(temp_dir):
+    """A single-frame archive holding the end-of-archive blocks too."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tf:
+        info = tarfile.TarInfo("legacy.txt")
+        info.size = 3
+        tf.addfile(info, io.BytesIO(b"old"))
+    path = temp_dir / "legacy.tzst"
+    path.write_bytes(zstd.ZstdCompressor().compress(buffer.getvalue()))
+    return path
+
+
+def _split_archive(path, members, split):
+    """Write a two-frame archive split *split* bytes after its members end."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tf:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+        end = tf.offset
+    tar = buffer.getvalue()
+    compressor = zstd.ZstdCompressor()
+    path.write_bytes(
+        compressor.compress(tar[: end + split])
+        + compressor.compress(tar[end + split :])
+    )
+    return path
+
+
+@pytest.mark.unit
+class TestFrameLayout:
+    """Test the frame layout that makes merging cheap."""
+
+    def test_end_of_archive_has_its_own_frame(self, shards):
+        with open(shards[0], "rb") as f:
+            frames = _archive_frames(f, "a.tzst")
+        assert frames is not None and len(frames) == 2
+        assert frames[1][0] == frames[0][1]
+
+    def test_legacy_archive_has_one_frame(self, legacy):
+        with open(legacy, "rb") as f:
+            assert len(_zstd_frames(f, "legacy")) == 1
+            assert _archive_frames(f, "legacy") is None
+
+    def test_recompress_keeps_the_layout(self, shards, temp_dir):
+        recompress(shards[0], temp_dir / "r.tzst", compression_level=19)
+        with open(temp_dir / "r.tzst", "rb") as f:
+            assert _archive_frames(f, "r.tzst") is not None
+
+    def test_skippable_frames_are_ignored(self, shards, temp_dir):
+        skippable = b"\x50\x2a\x4d\x18" + (4).to_bytes(4, "little") + b"meta"
+        path = temp_dir / "meta.tzst"
+        path.write_bytes(skippable + shards[0].read_bytes())
+        with open(path, "rb") as f:
+            frames = _zstd_frames(f, "meta")
+        assert frames[0][0] == len(skippable)
+        assert _members(path) == _members(shards[0])
+
+    def test_garbage_is_rejected(self, temp_dir):
+        with pytest.raises(TzstDecompressionError):
+            _zstd_frames(io.BytesIO(b"not zstd"), "junk")
+
+
+@pytest.mark.unit
+class TestMergeArchives:
+    """Test merge_archives()."""
+
+    def test_frames_are_copied(self, shards, temp_dir):
+        target = temp_dir / "merged.tzst"
+
+        result = merge_archives(target, shards)
+
+        assert result["copied"] == 2 and result["recompressed"] == 0
+        member_frames = b""
+        for shard in shards:
+            with open(shard, "rb") as f:
+                end = _archive_frames(f, str(shard))[-1][0]
+            member_frames += shard.read_bytes()[:end]
+        assert target.read_bytes().startswith(member_frames)
+        assert _members(target) == [
+            ("x/one.txt", b"1" * 5000),
+            ("dup.txt", b"a"),
+            ("x/two.txt", b"2" * 100),
+            ("dup.txt", b"b"),
+        ]
+        assert tzst_test_archive(target)
+        assert tzst_test_archive(target, streaming=True)
+
+    def test_merged_archive_merges_again(self, shards, temp_dir):
+        merge_archives(temp_dir / "ab.tzst", shards)
+        result = merge_archives(temp_dir / "abab.tzst", [temp_dir / "ab.tzst"] * 2)
+        assert result["copied"] == 2
+        assert len(list_archive(temp_dir / "abab.tzst")) == 2 * len(
+            list_archive(temp_dir / "ab.tzst")
+        )
+
+    def test_legacy_archive_is_recompressed(self, shards, legacy, temp_dir):
+        result = merge_archives(temp_dir / "m.tzst", [shards[0], legacy])
+
+        assert result["copied"] == 1 and result["recompressed"] == 1
+        names = [name for name, _ in _members(temp_dir / "m.tzst")]
+        assert names == ["x/one.txt", "dup.txt", "legacy.txt"]
+
+    def test_end_marker_split_across_frames(self, shards, temp_dir):
+        split = _split_archive(temp_dir / "split.tzst", [("s.txt", b"split")], 512)
+
+        result = merge_archives(temp_dir / "m.tzst", [split, shards[1]])
+
+        assert result["copied"] == 1 and result["recompressed"] == 1
+        assert [name for name, _ in _members(temp_dir / "m.tzst")] == [
+            "s.txt",
+            "x/two.txt",
+            "dup.txt",
+        ]
+        assert tzst_test_archive(temp_dir / "m.tzst", streaming=True)
+
+    def test_zero_data_before_a_frame_boundary_is_kept(self, shards, temp_dir):
+        # The last member's zeros share the final frame with the end marker
+        members = [("zeros.bin", b"z" + bytes(4000))]
+        split = _split_archive(temp_dir / "split.tzst", members, -3584)
+
+        merge_archives(temp_dir / "m.tzst", [split, shards[1]])
+
+        assert _members(temp_dir / "m.tzst")[0] == members[0]
+        assert len(_members(temp_dir / "m.tzst")) == 3
+
+    @pytest.mark.parametrize(
+        "policy, expected", [("first", b"a"), ("last", b"b"), ("keep", b"b")]
+    )
+    def test_duplicate_policies(self, shards, temp_dir, policy, expected):
+        target = temp_dir / "m.tzst"
+
+        result = merge_archives(target, shards, duplicates=policy)
+
+        copies = [data for name, data in _members(target) if name == "dup.txt"]
+        assert copies[-1] == expected
+        assert len(copies) == (2 if policy == "keep" else 1)
+        assert result["dropped"] == (0 if policy == "keep" else 1)
+        extract_archive(target, temp_dir / "out")
+        assert (temp_dir / "out" / "dup.txt").read_bytes() == expected
+
+    def test_duplicate_error(self, shards, temp_dir):
+        with pytest.raises(TzstArchiveError, match=r"dup\.txt"):
+            merge_archives(temp_dir / "m.tzst", shards, duplicates="error")
+        assert not (temp_dir / "m.tzst").exists()
+
+    def test_directories_are_not_duplicates(self, temp_dir):
+        directory = tarfile.TarInfo("x")
+        directory.type = tarfile.DIRTYPE
+        for name in ("a", "b"):
+            create_archive_from_iter(
+                temp_dir / f"{name}.tzst",
+                [(directory, None), (f"x/{name}.txt", name.encode())],
+            )
+        sources = [temp_dir / "a.tzst", temp_dir / "b.tzst"]
+
+        result = merge_archives(temp_dir / "m.tzst", sources, duplicates="error")
+
+        assert result["copied"] == 2
+
+    def test_invalid_arguments(self, shards, temp_dir):
+        with pytest.raises(ValueError, match="duplicate policy"):
+            merge_archives(temp_dir / "m.tzst", shards, duplicates="newest")
+        with pytest.raises(ValueError, match="No archives"):
+            merge_archives(temp_dir / "m.tzst", [])
+        with pytest.raises(FileNotFoundError):
+            merge_archives(temp_dir / "m.tzst", [temp_dir / "missing.tzst"])
+
+    def test_merge_into_a_source(self, shards):
+        merge_archives(shards[0], shards)
+        assert [name for name, _ in _members(shards[0])] == [
+            "x/one.txt",
+            "dup.txt",
+            "x/two.txt",
+            "dup.txt",
+        ]
@@ -0,0 +1,170 @@
+"""Tests for re-encoding archives at another compression level."""
+
+import io
+import os
+import threading
+
+import pytest
+import zstandard as zstd
+
+from tzst import (
+    core,
+    create_archive,
+    create_archive_from_iter,
+    list_archive,
+    recompress,
+)
+from tzst.core import TzstArchive, _archive_frames, _pipelined_copy, _zstd_frames
+from tzst.exceptions import TzstDecompressionError
+
+
+def _tar_stream_of(fileobj):
+    return (
+        zstd.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True).read()
+    )
+
+
+def _tar_stream(path):
+    with open(path, "rb") as f:
+        return _tar_stream_of(f)
+
+
+@pytest.fixture
+def archive(temp_dir):
+    archive_path = temp_dir / "in.tzst"
+    text = "".join(f"line {i}\n" for i in range(50000)).encode()
+    create_archive_from_iter(
+        archive_path,
+        [("logs/a.log", text), ("logs/b.log", text[::-1]), ("empty", b"")],
+        compression_level=1,
+    )
+    return archive_path
+
+
+@pytest.mark.unit
+class TestRecompress:
+    """Test recompress()."""
+
+    def test_tar_stream_is_preserved(self, archive, temp_dir):
+        target = temp_dir / "out.tzst"
+
+        result = recompress(archive, target, compression_level=19)
+
+        assert _tar_stream(target) == _tar_stream(archive)
+        assert result["size"] == len(_tar_stream(archive))
+        assert result["target_size"] == target.stat().st_size
+        assert result["target_size"] < result["source_size"]
+
+    def test_in_place(self, archive):
+        before = _tar_stream(archive)
+        recompress(archive, archive, compression_level=9)
+        assert _tar_stream(archive) == before
+        assert not list(archive.parent.glob(".*.tmp"))
+
+    def test_in_place_needs_temp_file(self, archive):
+        with pytest.raises(ValueError, match="in place"):
+            recompress(archive, archive, use_temp_file=False)
+
+    def test_long_distance_and_threads(self, archive, temp_dir):
+        target = temp_dir / "long.tzst"
+
+        recompress(archive, target, long_distance=True, threads=2)
+
+        assert zstd.get_frame_parameters(target.read_bytes()).window_size == 1 << 27
+        with TzstArchive(target) as reopened:
+            assert reopened.getnames() == ["logs/a.log", "logs/b.log", "empty"]
+
+    def test_all_frames_of_the_source_are_read(self, archive, temp_dir):
+        frames = archive.read_bytes()
+        tar = _tar_stream(archive)
+        split = temp_dir / "frames.tzst"
+        cctx = zstd.ZstdCompressor()
+        split.write_bytes(cctx.compress(tar[:10240]) + cctx.compress(tar[10240:]))
+        assert frames != split.read_bytes()
+
+        recompress(split, temp_dir / "out.tzst")
+
+        assert _tar_stream(temp_dir / "out.tzst") == tar
+        names = [item["name"] for item in list_archive(temp_dir / "out.tzst")]
+        assert names == ["logs/a.log", "logs/b.log", "empty"]
+
+    def test_frames_end_on_member_boundaries(self, temp_dir):
+        source = temp_dir / "src"
+        source.mkdir()
+        for index in range(7):
+            (source / f"{index}.bin").write_bytes(os.urandom(3 * 1024 * 1024))
+        (source / ("long-name-" * 20 + ".txt")).write_bytes(b"pax")
+        archive = temp_dir / "plain.tzst"
+        create_archive(archive, [source])
+        target = temp_dir / "cold.tzst"
+
+        recompress(archive, target, compression_level=19)
+
+        with open(archive, "rb") as a, open(target, "rb") as b:
+            assert len(_zstd_frames(b, "cold")) == len(_zstd_frames(a, "plain")) == 4
+            assert _archive_frames(b, "cold") is not None
+        assert _tar_stream(target) == _tar_stream(archive)
+
+    def test_headers_split_across_writes(self, archive, monkeypatch):
+        monkeypatch.setattr(core, "_MEMBER_FRAME_SIZE", 1)
+        tar = _tar_stream(archive)
+        output = io.BytesIO()
+        writer = zstd.ZstdCompressor().stream_writer(output, closefd=False)
+
+        members = core._MemberFrameWriter(writer)
+        for start in range(0, len(tar), 700):
+            members.write(tar[start : start + 700])
+        writer.close()
+
+        # One frame per member, then the end-of-archive frame
+        assert len(_zstd_frames(output, "out")) == 4
+        assert _archive_frames(output, "out") is not None
+        output.seek(0)
+        assert _tar_stream_of(output) == tar
+
+    def test_stream_ending_inside_a_header(self, temp_dir):
+        source = temp_dir / "short.tzst"
+        source.write_bytes(zstd.ZstdCompressor().compress(b"not a tar header"))
+        target = temp_dir / "out.tzst"
+        recompress(source, target)
+        with open(target, "rb") as f:
+            assert zstd.ZstdDecompressor().stream_reader(f).read() == (
+                b"not a tar header"
+            )
+
+    def test_file_objects(self, archive):
+        output = io.BytesIO()
+        with open(archive, "rb") as source:
+            result = recompress(source, output, compression_level=5)
+        assert result["source"] is None and result["target_size"] is None
+        output.seek(0)
+        reader = zstd.ZstdDecompressor().stream_reader(output)
+        assert reader.read() == _tar_stream(archive)
+
+    def test_invalid_source(self, temp_dir):
+        source = temp_dir / "bad.tzst"
+        source.write_bytes(b"not zstd" * 100)
+        with pytest.raises(TzstDecompressionError):
+            recompress(source, temp_dir / "out.tzst")
+        assert sorted(p.name for p in temp_dir.iterdir()) == ["bad.tzst"]
+
+
+@pytest.mark.unit
+class TestPipelinedCopy:
+    """Test the two-thread copy loop."""
+
+    def test_copies_everything(self):
+        data = bytes(range(256)) * 20000
+        output = io.BytesIO()
+        assert _pipelined_copy(io.BytesIO(data), output) == len(data)
+        assert output.getvalue() == data
+
+    def test_writer_failure_stops_reader(self):
+        class FailingWriter:
+            def write(self, data):
+                raise OSError("disk full")
+
+        before = threading.active_count()
+        with pytest.raises(OSError, match="disk full"):
+            _pipelined_copy(io.BytesIO(bytes(64 * 1024 * 1024)), FailingWriter())
+        assert threading.active_count() == before
@@ -0,0 +1,214 @@
+"""Tests for the long-running worker serving requests on a Unix socket."""
+
+import json
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from tzst import create_archive_from_iter, list_archive, recompress
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def server(temp_dir):
+    from tzst.server import TzstServer
+
+    # Unix socket paths are limited to about 100 bytes
+    server = TzstServer(temp_dir / "s.sock", workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def archive(temp_dir):
+    path = temp_dir / "a.tzst"
+    create_archive_from_iter(
+        path, [(f"dir/{index}.txt", str(index).encode() * 100) for index in range(20)]
+    )
+    return path
+
+
+def _exchange(server, *requests, lines=None):
+    """Send requests on one connection and return every reply line."""
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(str(server.socket_path))
+        payload = lines or b"".join(
+            json.dumps(request).encode() + b"\n" for request in requests
+        )
+        sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as replies:
+            return [json.loads(line) for line in replies]
+
+
+def _results(replies):
+    return {reply.get("id"): reply for reply in replies if "event" not in reply}
+
+
+@pytest.mark.unit
+class TestServer:
+    """Test TzstServer requests and replies."""
+
+    def test_ping(self, server):
+        (reply,) = _exchange(server, {"command": "ping", "id": "p"})
+        assert reply["ok"] is True and reply["id"] == "p"
+        assert reply["command"] == "ping" and "version" in reply
+
+    def test_list_and_test(self, server, archive):
+        replies = _exchange(
+            server,
+            {"id": 1, "command": "list", "archive": str(archive)},
+            {"id": 2, "command": "test", "archive": str(archive)},
+        )
+
+        results = _results(replies)
+        assert results[1]["ok"] is True
+        assert results[1]["contents"] == list_archive(archive)
+        assert results[1]["summary"]["files"] == 20
+        assert results[2]["ok"] is True and results[2]["healthy"] is True
+
+    def test_memory_limit(self, server, archive, temp_dir):
+        long_archive = temp_dir / "long.tzst"
+        recompress(archive, long_archive, long_distance=True)
+        limit = 64 * 1024 * 1024
+
+        results = _results(
+            _exchange(
+                server,
+                {
+                    "id": 1,
+                    "command": "test",
+                    "archive": str(archive),
+                    "memory_limit": limit,
+                },
+                {
+                    "id": 2,
+                    "command": "test",
+                    "archive": str(long_archive),
+                    "memory_limit": limit,
+                },
+            )
+        )
+
+        assert results[1]["ok"] is True
+        assert results[2]["error"]["type"] == "memory_limit_exceeded"
+
+    def test_add_and_extract(self, server, archive, temp_dir):
+        source = temp_dir / "src"
+        source.mkdir()
+        (source / "data.bin").write_bytes(os.urandom(5000))
+        target = temp_dir / "new.tzst"
+        output = temp_dir / "out"
+
+        results = _results(
+            _exchange(
+                server,
+                {
+                    "id": "add",
+                    "command": "add",
+                    "archive": str(target),
+                    "files": [str(source)],
+                    "compression_level": 9,
+                },
+            )
+            + _exchange(
+                server,
+                {
+                    "id": "x",
+                    "command": "extract",
+                    "archive": str(target),
+                    "output_dir": str(output),
+                },
+            )
+        )
+
+        assert results["add"]["ok"] is True
+        assert results["x"]["ok"] is True
+        assert (output / "src" / "data.bin").read_bytes() == (
+            source / "data.bin"
+        ).read_bytes()
+
+    def test_progress_events(self, server, archive, monkeypatch):
+        monkeypatch.setattr("tzst.server.PROGRESS_INTERVAL", 0)
+
+        replies = _exchange(
+            server, {"id": 7, "command": "test", "archive": str(archive)}
+        )
+
+        events = [reply for reply in replies if reply.get("event") == "progress"]
+        assert [event["members"] for event in events] == list(range(1, 21))
+        assert events[-1]["member"] == "dir/19.txt" and events[-1]["id"] == 7
+        assert replies[-1]["ok"] is True
+
+    def test_timeout(self, server, archive):
+        for command in ("test", "list"):
+            request = {"command": command, "archive": str(archive), "timeout": 1e-9}
+            (reply,) = _results(_exchange(server, request)).values()
+            assert reply["ok"] is False
+            assert reply["error"]["type"] == "timeout"
+
+    def test_contexts_are_reused(self, server, archive):
+        for _ in range(3):
+            _exchange(server, {"command": "test", "archive": str(archive)})
+        assert len(server.context_pool._idle[("decompressor", None)]) == 1
+
+    def test_errors(self, server, temp_dir, archive):
+        lines = b"\n".join(
+            [
+                b"not json",
+                b"[1, 2]",
+                b'{"id": 1, "command": "delete"}',
+                b'{"id": 2, "command": "list", "archive": "%s"}'
+                % str(temp_dir / "missing.tzst").encode(),
+                b'{"id": 3, "command": "extract", "archive": "%s"}'
+                % str(archive).encode(),
+                b'{"id": 4, "command": "test", "archive": "%s", "timeout": -1}'
+                % str(archive).encode(),
+            ]
+        )
+
+        replies = _exchange(server, lines=lines + b"\n")
+
+        types = sorted(
+            (str(reply.get("id")), reply["error"]["type"]) for reply in replies
+        )
+        assert types == [
+            ("1", "unknown_command"),
+            ("2", "archive_not_found"),
+            ("3", "invalid_parameter"),
+            ("4", "invalid_parameter"),
+            ("None", "invalid_request"),
+            ("None", "invalid_request"),
+        ]
+
+    def test_socket_is_private_and_removed(self, temp_dir, monkeypatch):
+        from tzst.server import TzstServer
+
+        # The umask is process-wide; other threads may be creating files
+        monkeypatch.setattr(os, "umask", pytest.fail)
+        path = temp_dir / "p.sock"
+        with TzstServer(path, workers=1):
+            assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert not path.exists()
+
+    def test_stale_socket_is_replaced(self, temp_dir, server):
+        from tzst.server import TzstServer
+
+        with pytest.raises(OSError, match="Another server"):
+            TzstServer(server.socket_path)
+
+        stale = temp_dir / "stale.sock"
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.bind(str(stale))
+        with TzstServer(stale, workers=1) as replacement:
+            assert replacement.socket_path == stale
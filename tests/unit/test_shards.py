@@ -0,0 +1,126 @@
+"""Tests for creating archives from shards compressed in parallel."""
+
+import io
+import os
+
+import pytest
+
+from tzst import create_archive, extract_archive, list_archive
+from tzst import test_archive as tzst_test_archive
+from tzst.core import TzstArchive, _archive_frames, _partition_by_size
+
+
+@pytest.fixture
+def tree(temp_dir):
+    root = temp_dir / "src"
+    (root / "sub" / "empty").mkdir(parents=True)
+    for index in range(12):
+        (root / f"f{index:02d}.bin").write_bytes(os.urandom(1000 * (index + 1)))
+    (root / "sub" / "notes.txt").write_text("notes\n" * 500)
+    (root / "sub" / "link").symlink_to("notes.txt")
+    return root
+
+
+def _is_file(path):
+    return path.is_file() and not path.is_symlink()
+
+
+def _contents(archive_path):
+    with TzstArchive(archive_path) as archive:
+        return {
+            member.name: (
+                archive.extractfile(member).read() if member.isfile() else member.type
+            )
+            for member in archive.getmembers()
+        }
+
+
+@pytest.mark.unit
+class TestShardedCreate:
+    """Test create_archive(..., shards=N)."""
+
+    def test_same_members_as_unsharded(self, tree, temp_dir):
+        create_archive(temp_dir / "one.tzst", [tree])
+        create_archive(temp_dir / "four.tzst", [tree], shards=4)
+
+        assert _contents(temp_dir / "four.tzst") == _contents(temp_dir / "one.tzst")
+        assert tzst_test_archive(temp_dir / "four.tzst")
+        assert tzst_test_archive(temp_dir / "four.tzst", streaming=True)
+        assert not list(temp_dir.glob(".shard.*"))
+
+    def test_directories_come_first(self, tree, temp_dir):
+        create_archive(temp_dir / "a.tzst", [tree], shards=3)
+
+        names = [item["name"] for item in list_archive(temp_dir / "a.tzst")]
+        assert names[:3] == ["src", "src/sub", "src/sub/empty"]
+
+    def test_one_frame_range_per_shard(self, tree, temp_dir):
+        create_archive(temp_dir / "one.tzst", [tree])
+        create_archive(temp_dir / "three.tzst", [tree], shards=3)
+
+        with open(temp_dir / "one.tzst", "rb") as f:
+            assert len(_archive_frames(f, "one")) == 2
+        with open(temp_dir / "three.tzst", "rb") as f:
+            assert len(_archive_frames(f, "three")) == 4
+
+    def test_extract(self, tree, temp_dir):
+        create_archive(temp_dir / "a.tzst", [tree], shards=2)
+
+        extract_archive(temp_dir / "a.tzst", temp_dir / "out")
+
+        for path in tree.rglob("*"):
+            copy = temp_dir / "out" / "src" / path.relative_to(tree)
+            if path.is_file() and not path.is_symlink():
+                assert copy.read_bytes() == path.read_bytes()
+        assert (temp_dir / "out" / "src" / "sub" / "link").is_symlink()
+
+    def test_more_shards_than_files(self, temp_dir):
+        (temp_dir / "only.txt").write_text("only")
+
+        create_archive(temp_dir / "a.tzst", [temp_dir / "only.txt"], shards=8)
+
+        assert _contents(temp_dir / "a.tzst") == {"only.txt": b"only"}
+
+    def test_file_object(self, tree, temp_dir):
+        output = io.BytesIO()
+        create_archive(output, [tree], shards=2)
+        (temp_dir / "a.tzst").write_bytes(output.getvalue())
+        assert tzst_test_archive(temp_dir / "a.tzst")
+
+    def test_invalid_arguments(self, tree, temp_dir):
+        with pytest.raises(ValueError, match="shard count"):
+            create_archive(temp_dir / "a.tzst", [tree], shards=0)
+        with pytest.raises(ValueError, match="volumes"):
+            create_archive(
+                temp_dir / "a.tzst", [tree], shards=2, volume_size=1024 * 1024
+            )
+
+
+@pytest.mark.unit
+class TestPartitionBySize:
+    """Test how entries are dealt out to shards."""
+
+    def test_balanced_by_size(self, tree):
+        nodes = [(path, path.name) for path in sorted(tree.rglob("*"))]
+
+        groups = _partition_by_size(nodes, 3)
+
+        sizes = [
+            sum(path.lstat().st_size for path, _ in group if _is_file(path))
+            for group in groups
+        ]
+        assert len(groups) == 3
+        assert max(sizes) - min(sizes) <= 12000
+        assert sorted(node for group in groups for node in group) == nodes
+        for group in groups:
+            files = [node for node in group if _is_file(node[0])]
+            assert files == sorted(files, key=nodes.index)
+
+    def test_non_files_go_first(self, tree):
+        nodes = [(path, path.name) for path in sorted(tree.rglob("*"))]
+
+        groups = _partition_by_size(nodes, 2)
+
+        rest = [path for group in groups[1:] for path, _ in group]
+        assert groups[0][:3] == [node for node in nodes if not _is_file(node[0])]
+        assert all(_is_file(path) for path in rest)
@@ -0,0 +1,128 @@
+"""Tests for storing and extracting sparse files."""
+
+import asyncio
+import os
+import tarfile
+
+import pytest
+
+from tzst import aio, create_archive, extract_archive
+from tzst.core import TzstArchive, _data_regions
+
+SIZE = 16 * 1024 * 1024
+CHUNKS = [(1024 * 1024, b"a" * 5000), (12 * 1024 * 1024, b"b" * 70000)]
+
+
+def _write_sparse(path):
+    with open(path, "wb") as f:
+        for offset, data in CHUNKS:
+            f.seek(offset)
+            f.write(data)
+        f.truncate(SIZE)
+
+
+def _expected():
+    content = bytearray(SIZE)
+    for offset, data in CHUNKS:
+        content[offset : offset + len(data)] = data
+    return bytes(content)
+
+
+@pytest.fixture
+def sparse_file(temp_dir):
+    """Create a file with holes, skipping if the filesystem reports none."""
+    if not hasattr(os, "SEEK_HOLE"):
+        pytest.skip("SEEK_DATA/SEEK_HOLE not available")
+    path = temp_dir / "disk.img"
+    _write_sparse(path)
+    with open(path, "rb") as f:
+        if _data_regions(f, SIZE) is None:
+            pytest.skip("filesystem does not report holes")
+    return path
+
+
+@pytest.mark.unit
+class TestDataRegions:
+    """Test hole detection on the input side."""
+
+    def test_dense_file_has_no_regions(self, temp_dir):
+        path = temp_dir / "dense.bin"
+        path.write_bytes(b"x" * 10000)
+        with open(path, "rb") as f:
+            assert _data_regions(f, 10000) is None
+            assert f.tell() == 0
+
+    def test_regions_cover_data_and_trailing_hole(self, sparse_file):
+        with open(sparse_file, "rb") as f:
+            regions = _data_regions(f, SIZE)
+            assert f.tell() == 0
+        for offset, data in CHUNKS:
+            assert any(
+                start <= offset and offset + len(data) <= start + length
+                for start, length in regions
+            )
+        assert regions[-1] == (SIZE, 0)
+
+
+@pytest.mark.unit
+class TestSparseArchives:
+    """Test round-tripping sparse files through archives."""
+
+    def test_stored_as_sparse_member(self, sparse_file, temp_dir):
+        archive_path = temp_dir / "sparse.tzst"
+        create_archive(archive_path, [sparse_file])
+
+        assert archive_path.stat().st_size < 64 * 1024
+        with TzstArchive(archive_path) as archive:
+            member = archive.getmember("disk.img")
+        assert member.size == SIZE
+        assert member.sparse is not None
+
+    def test_no_sparse_stores_dense_member(self, sparse_file, temp_dir):
+        archive_path = temp_dir / "dense.tzst"
+        create_archive(archive_path, [sparse_file], sparse=False)
+
+        with TzstArchive(archive_path) as archive:
+            assert archive.getmember("disk.img").sparse is None
+
+    @pytest.mark.parametrize("flatten", [False, True])
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_extract_recreates_holes(self, sparse_file, temp_dir, streaming, flatten):
+        archive_path = temp_dir / "sparse.tzst"
+        create_archive(archive_path, [sparse_file])
+
+        output = temp_dir / "out"
+        extract_archive(archive_path, output, streaming=streaming, flatten=flatten)
+
+        extracted = output / "disk.img"
+        assert extracted.read_bytes() == _expected()
+        assert extracted.stat().st_blocks * 512 < SIZE // 2
+
+    def test_readable_by_stock_tarfile(self, sparse_file, temp_dir):
+        """The PAX 1.0 sparse format is understood by tarfile itself."""
+        import zstandard as zstd
+
+        archive_path = temp_dir / "sparse.tzst"
+        create_archive(archive_path, [sparse_file])
+
+        with open(archive_path, "rb") as raw:
+            reader = zstd.ZstdDecompressor().stream_reader(raw)
+            with tarfile.open(fileobj=reader, mode="r|") as tf:
+                member = tf.next()
+                assert member.name == "disk.img"
+                assert tf.extractfile(member).read() == _expected()
+
+    def test_async_extract_recreates_holes(self, sparse_file, temp_dir):
+        archive_path = temp_dir / "sparse.tzst"
+        create_archive(archive_path, [sparse_file])
+        output = temp_dir / "out"
+
+        async def run():
+            async with aio.TzstArchive(archive_path) as archive:
+                await archive.extractall(output)
+
+        asyncio.run(run())
+
+        extracted = output / "disk.img"
+        assert extracted.read_bytes() == _expected()
+        assert extracted.stat().st_blocks * 512 < SIZE // 2
@@ -0,0 +1,67 @@
+"""Tests for flat extraction in streaming mode."""
+
+import io
+import tracemalloc
+
+import pytest
+
+from tzst import create_archive_from_iter, extract_archive
+from tzst.core import TzstArchive
+
+BIG = 48 * 1024 * 1024
+
+
+def _big_entries():
+    block = bytes(range(256)) * 4096
+    reader = io.BytesIO(block * (BIG // len(block)))
+    yield "a/big.bin", reader, BIG
+    yield "a/name.txt", b"first"
+    yield "b/name.txt", b"second"
+
+
+@pytest.mark.unit
+class TestStreamingFlatten:
+    """Test that flat extraction is a single bounded pass over the stream."""
+
+    def test_memory_does_not_grow_with_member_size(self, temp_dir):
+        archive_path = temp_dir / "big.tzst"
+        create_archive_from_iter(archive_path, _big_entries(), compression_level=1)
+        output = temp_dir / "flat"
+
+        tracemalloc.start()
+        try:
+            extract_archive(
+                archive_path,
+                output,
+                flatten=True,
+                streaming=True,
+                conflict_resolution="auto_rename",
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert peak < 16 * 1024 * 1024
+        assert (output / "big.bin").stat().st_size == BIG
+        assert (output / "name.txt").read_bytes() == b"first"
+        assert (output / "name_1.txt").read_bytes() == b"second"
+
+    def test_headers_are_not_retained(self, temp_dir):
+        archive_path = temp_dir / "many.tzst"
+        create_archive_from_iter(
+            archive_path, ((f"d/{i}.txt", b"x") for i in range(100))
+        )
+
+        with TzstArchive(archive_path, streaming=True) as archive:
+            names = [member.name for member in archive._iter_transient()]
+            assert len(archive._tarfile.members) <= 1
+
+        assert names == [f"d/{i}.txt" for i in range(100)]
+
+    def test_non_streaming_iteration_is_unchanged(self, temp_dir):
+        archive_path = temp_dir / "few.tzst"
+        create_archive_from_iter(archive_path, [("a.txt", b"a"), ("b.txt", b"b")])
+
+        with TzstArchive(archive_path) as archive:
+            assert [m.name for m in archive._iter_transient()] == ["a.txt", "b.txt"]
+            assert archive.getnames() == ["a.txt", "b.txt"]
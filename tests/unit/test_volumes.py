@@ -0,0 +1,224 @@
+"""Tests for archives split into volumes."""
+
+import random
+import tarfile
+
+import pytest
+import zstandard as zstd
+
+from tzst import (
+    TzstArchive,
+    create_archive,
+    create_archive_from_iter,
+    extract_archive,
+    list_archive,
+    merge_archives,
+    recompress,
+)
+from tzst.core import _read_volume_header, _volume_groups
+from tzst.exceptions import TzstArchiveError
+
+VOLUME_SIZE = 64 * 1024
+
+
+@pytest.fixture
+def source(temp_dir):
+    """Incompressible files, so the archive needs several volumes."""
+    rng = random.Random(43)
+    source_dir = temp_dir / "src"
+    for index in range(24):
+        path = source_dir / f"dir{index % 3}" / f"file{index}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(rng.randbytes(rng.randrange(1, 20000)))
+    return source_dir
+
+
+def _volumes(archive):
+    return sorted(archive.parent.glob(archive.name + ".*"))
+
+
+def _tree(root):
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+@pytest.mark.unit
+class TestCreateVolumes:
+    """Test writing split archives."""
+
+    def test_volumes_are_frame_aligned(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+
+        volumes = _volumes(archive)
+        assert [path.name for path in volumes[:2]] == ["out.tzst.001", "out.tzst.002"]
+        assert not archive.exists()
+        for number, path in enumerate(volumes, 1):
+            assert path.stat().st_size <= VOLUME_SIZE
+            with open(path, "rb") as f:
+                assert _read_volume_header(f)[0] == number
+                f.seek(17)
+                # Right after the skippable header a new zstd frame begins
+                assert f.read(4) == b"\x28\xb5\x2f\xfd"
+        # Plain concatenation is a complete archive for any zstd reader
+        joined = temp_dir / "joined.tzst"
+        joined.write_bytes(b"".join(path.read_bytes() for path in volumes))
+        assert len(list_archive(joined)) == len(list_archive(volumes[0]))
+
+    def test_small_members_start_volumes(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+
+        groups = _volume_groups(_volumes(archive)[0])
+
+        assert len(groups) > 1
+        assert sum(len(group) for group in groups) == len(_volumes(archive))
+
+    def test_stale_volumes_are_removed(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+        many = len(_volumes(archive))
+
+        create_archive(archive, [source / "dir0"], volume_size=VOLUME_SIZE)
+
+        assert len(_volumes(archive)) < many
+        names = {item["name"] for item in list_archive(_volumes(archive)[0])}
+        assert all("dir1" not in name for name in names)
+        assert not list(temp_dir.glob(".*"))
+
+    def test_direct_write(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], use_temp_file=False, volume_size=VOLUME_SIZE)
+        assert len(list_archive(_volumes(archive)[0])) == 28
+
+    def test_invalid_volume_size(self, source, temp_dir):
+        with pytest.raises(ValueError, match="volume size"):
+            create_archive(temp_dir / "out.tzst", [source], volume_size=1000)
+        with pytest.raises(ValueError, match="file name"):
+            TzstArchive(fileobj=open(__file__, "rb"), mode="w", volume_size=1 << 20)
+
+
+@pytest.mark.unit
+class TestReadVolumes:
+    """Test reading and extracting split archives."""
+
+    @pytest.mark.parametrize("workers", [1, 4, None])
+    def test_extract(self, source, temp_dir, workers):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+
+        extract_archive(_volumes(archive)[0], temp_dir / "dest", workers=workers)
+
+        assert _tree(temp_dir / "dest" / "src") == _tree(source)
+
+    def test_member_spanning_volumes(self, temp_dir):
+        archive = temp_dir / "big.tzst"
+        data = random.Random(1).randbytes(5 * VOLUME_SIZE)
+        with TzstArchive(archive, "w", volume_size=VOLUME_SIZE) as out:
+            out.addbytes("small.txt", b"small")
+            out.addbytes("big.bin", data)
+            out.addbytes("after.txt", b"after")
+        first = _volumes(archive)[0]
+        assert len(_volumes(archive)) >= 5
+
+        with TzstArchive(first, streaming=True) as reopened:
+            assert reopened.getnames() == ["small.txt", "big.bin", "after.txt"]
+        extract_archive(first, temp_dir / "dest", members=["big.bin"], workers=3)
+        assert (temp_dir / "dest" / "big.bin").read_bytes() == data
+
+    def test_split_pieces_are_chained(self, source, temp_dir):
+        archive = temp_dir / "whole.tzst"
+        create_archive(archive, [source])
+        data = archive.read_bytes()
+        # Pieces cut at arbitrary offsets, as `split -b` would
+        for number, start in enumerate(range(0, len(data), 50000), 1):
+            piece = temp_dir / f"cut.tzst.{number:03d}"
+            piece.write_bytes(data[start : start + 50000])
+
+        assert _volume_groups(temp_dir / "cut.tzst.001") == [
+            sorted(temp_dir.glob("cut.tzst.*"))
+        ]
+        extract_archive(temp_dir / "cut.tzst.001", temp_dir / "dest", workers=2)
+        assert _tree(temp_dir / "dest" / "src") == _tree(source)
+
+    def test_volumes_out_of_order(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+        second, third = _volumes(archive)[1:3]
+        data = second.read_bytes()
+        second.write_bytes(third.read_bytes())
+        third.write_bytes(data)
+
+        with pytest.raises(TzstArchiveError, match="expected 2"):
+            list_archive(_volumes(archive)[0])
+
+    def test_volume_header_is_skippable(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+        first = _volumes(archive)[0].read_bytes()
+
+        reader = zstd.ZstdDecompressor().stream_reader(first, read_across_frames=True)
+        with tarfile.open(fileobj=reader, mode="r|") as tf:
+            assert tf.next().name == "src"
+
+
+@pytest.mark.unit
+class TestRewriteVolumes:
+    """Test recompressing, merging and editing split archives."""
+
+    def test_recompress_reads_every_volume(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+        target = temp_dir / "one.tzst"
+
+        result = recompress(_volumes(archive)[0], target, compression_level=5)
+
+        assert result["source_size"] == sum(
+            path.stat().st_size for path in _volumes(archive)
+        )
+        extract_archive(target, temp_dir / "dest")
+        assert _tree(temp_dir / "dest" / "src") == _tree(source)
+
+    def test_merge_reads_every_volume(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+        single = temp_dir / "single.tzst"
+        create_archive_from_iter(single, [("extra.txt", b"extra")])
+        target = temp_dir / "merged.tzst"
+
+        result = merge_archives(target, [_volumes(archive)[0], single])
+
+        assert result["recompressed"] == 1 and result["copied"] == 1
+        names = [item["name"] for item in list_archive(target)]
+        assert names == [
+            *(item["name"] for item in list_archive(_volumes(archive)[0])),
+            "extra.txt",
+        ]
+
+    def test_edits_are_refused(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+        volumes = _volumes(archive)
+        before = [path.read_bytes() for path in volumes]
+        last = list_archive(volumes[0])[-1]["name"]
+
+        with TzstArchive(volumes[0]) as opened:
+            with pytest.raises(TzstArchiveError, match="split archive"):
+                opened.delete([last])
+            with pytest.raises(TzstArchiveError, match="split archive"):
+                opened.replace(last, b"new")
+
+        assert [path.read_bytes() for path in volumes] == before
+
+    def test_later_volume_is_refused(self, source, temp_dir):
+        archive = temp_dir / "out.tzst"
+        create_archive(archive, [source], volume_size=VOLUME_SIZE)
+
+        with pytest.raises(TzstArchiveError, match="first volume"):
+            recompress(_volumes(archive)[1], temp_dir / "r.tzst")
+        with pytest.raises(TzstArchiveError, match="first volume"):
+            merge_archives(temp_dir / "m.tzst", [_volumes(archive)[1]])